@@ -9,7 +9,6 @@ import os
 import sys
 import json
 import subprocess
-import unittest
 import configparser
 import traceback
 from pathlib import Path
@@ -22,14 +21,11 @@ from colorama import init, Fore, Style
 # 初始化colorama，支持跨平台彩色输出
 init(autoreset=True)
 
+# 富途API（futu SDK、pandas）导入较慢，只在富途相关命令中通过 load_futu_api() 加载
 try:
-    from decidra.api.futu import FutuConfig, FutuClient, create_client
     from decidra.utils.global_vars import config, PATH_CONFIG, get_config_manager
 except ImportError as e:
     print(f"Import error: {e}")
-    FutuConfig = None
-    FutuClient = None
-    create_client = None
     config = None
     get_config_manager = None
 
@@ -55,6 +51,20 @@ def print_info(message: str):
     click.echo(f"{Fore.CYAN}ℹ {message}{Style.RESET_ALL}")
 
 
+def load_futu_api():
+    """按需加载富途API模块
+    
+    Returns:
+        decidra.api.futu 模块，加载失败时返回 None
+    """
+    try:
+        from decidra.api import futu as futu_api
+    except ImportError as e:
+        print_warning(f"Import error: {e}")
+        return None
+    return futu_api
+
+
 def get_project_root() -> Path:
     """获取项目根目录"""
     return Path(__file__).parent.parent
@@ -263,7 +273,7 @@ def test_config_manager(verbose: bool):
 @cli.group()
 def futu():
     """富途API相关命令"""
-    if FutuConfig is None:
+    if load_futu_api() is None:
         print_error("富途API模块未找到，请检查项目设置")
         sys.exit(1)
 
@@ -386,8 +396,9 @@ def futu_test_connection(config: Optional[str], host: Optional[str], port: Optio
         print_info(f"连接参数: {final_host}:{final_port}")
         print_info("正在测试连接...")
         
-        if create_client:
-            client = create_client(host=final_host, port=final_port)
+        futu_api = load_futu_api()
+        if futu_api is not None:
+            client = futu_api.create_client(host=final_host, port=final_port)
             
             with client:
                 print_success("连接成功！")
@@ -21,10 +21,14 @@ ft.set_futu_debug_model(False)
 from .futu_client import FutuClient
 from .futu_quote import QuoteManager
 from .futu_trade import TradeManager
+from .futu_paper import PaperClient, PaperTradeManager
+from .futu_sim_quote import SimQuoteClient, SimQuoteContext
+from .futu_journal import PushRecorder, JournalReader, JournalReplayer
 from .futu_factory import (
     create_client, create_default_client, 
     create_simulate_client, create_real_client
 )
+from .futu_registry import ClientRegistry, client_registry
 
 # 导入基础类定义
 from ..base.futu_class import (
@@ -40,6 +44,13 @@ __all__ = [
     'FutuClient',
     'QuoteManager', 
     'TradeManager',
+    'PaperClient',
+    'PaperTradeManager',
+    'SimQuoteClient',
+    'SimQuoteContext',
+    'PushRecorder',
+    'JournalReader',
+    'JournalReplayer',
     
     # 工厂函数
     'create_client',
@@ -47,6 +58,10 @@ __all__ = [
     'create_simulate_client', 
     'create_real_client',
     
+    # 共享连接注册表
+    'ClientRegistry',
+    'client_registry',
+    
     # 异常类
     'FutuException',
     'FutuConnectException',
@@ -5,7 +5,8 @@
 """
 
 import logging
-from typing import Optional
+import threading
+from typing import Any, Dict, Optional
 from ..utils.global_vars import get_logger
 from ..base.futu_class import FutuException, FutuConnectException, FutuTradeException, FutuConfig
 
@@ -46,6 +47,13 @@ class FutuClient:
         self._connected = False
         self._unlocked = False
         
+        # 多个模块共享同一客户端，连接与上下文创建需加锁
+        self._lock = threading.RLock()
+        # 交易推送回调 {市场: {回调类型: 回调}}，重建交易上下文后自动恢复
+        self._trade_handlers: Dict[str, Dict[type, Any]] = {}
+        self.reconnect_count = 0
+        self.last_error: Optional[str] = None
+        
         # 延迟导入管理器，避免循环导入
         self._quote_manager = None
         self._trade_manager = None
@@ -94,43 +102,99 @@ class FutuClient:
         Returns:
             bool: 连接是否成功
         """
-        try:
-            if self._connected:
-                return 1
-            # 创建行情上下文
-            self._quote_ctx = ft.OpenQuoteContext(
-                host=self.config.host,
-                port=self.config.port,
-                is_encrypt=self.config.enable_proto_encrypt,
-                is_async_connect=False
-            )
+        with self._lock:
+            try:
+                if self._connected:
+                    return 1
+                # 创建行情上下文
+                self._quote_ctx = ft.OpenQuoteContext(
+                    host=self.config.host,
+                    port=self.config.port,
+                    is_encrypt=self.config.enable_proto_encrypt,
+                    is_async_connect=False
+                )
             
-            # 测试连接
-            ret, data = self._quote_ctx.get_global_state()
-            if ret != ft.RET_OK:
-                raise FutuConnectException(ret, data)
+                # 测试连接
+                ret, data = self._quote_ctx.get_global_state()
+                if ret != ft.RET_OK:
+                    raise FutuConnectException(ret, data)
             
-            self._connected = True
-            self.logger.info("Successfully connected to FutuOpenD")
-            return True
+                self._connected = True
+                self.logger.info("Successfully connected to FutuOpenD")
+                return True
             
-        except Exception as e:
-            self.logger.error(f"Failed to connect: {e}")
-            self._cleanup_connections()
-            if isinstance(e, FutuException):
-                raise
-            raise FutuConnectException(-1, str(e))
+            except Exception as e:
+                self.logger.error(f"Failed to connect: {e}")
+                self.last_error = str(e)
+                self._cleanup_connections()
+                if isinstance(e, FutuException):
+                    raise
+                raise FutuConnectException(-1, str(e))
     
     def disconnect(self):
         """断开连接"""
         try:
-            self._cleanup_connections()
-            self._connected = False
-            self._unlocked = False
+            with self._lock:
+                self._cleanup_connections()
+                self._connected = False
+                self._unlocked = False
             self.logger.info("Disconnected from FutuOpenD")
         except Exception as e:
             self.logger.warning(f"Error during disconnect: {e}")
     
+    def reconnect(self) -> bool:
+        """
+        重建连接，并恢复行情推送回调、行情订阅和交易推送回调
+        
+        共享同一客户端的模块继续持有原对象，无需重新创建
+        
+        Returns:
+            bool: 重连是否成功
+        """
+        with self._lock:
+            self._cleanup_connections()
+            self._connected = False
+            self._unlocked = False
+            self.connect()
+            self.reconnect_count += 1
+            
+            if self._quote_manager is not None:
+                self._quote_manager.restore_after_reconnect()
+            for market in list(self._trade_handlers):
+                self._get_trade_context(market)
+        
+        self.logger.info(f"Reconnected to FutuOpenD (count: {self.reconnect_count})")
+        return True
+    
+    def set_trade_handler(self, handler, market: str = "HK"):
+        """
+        设置交易推送回调（同类型回调只保留最新的一个，交易上下文重建后自动恢复）
+        
+        Args:
+            handler: 富途交易推送回调
+            market: 市场代码
+        """
+        market = market.upper()
+        with self._lock:
+            self._trade_handlers.setdefault(market, {})[type(handler)] = handler
+            self._get_trade_context(market).set_handler(handler)
+    
+    def health(self) -> Dict[str, Any]:
+        """连接健康状况"""
+        trade_contexts = {
+            "HK": self._trade_hk_ctx,
+            "US": self._trade_us_ctx,
+            "CN": self._trade_cn_ctx,
+        }
+        return {
+            "connected": self._connected,
+            "unlocked": self._unlocked,
+            "quote_context": self._quote_ctx is not None,
+            "trade_markets": [market for market, ctx in trade_contexts.items() if ctx is not None],
+            "reconnect_count": self.reconnect_count,
+            "last_error": self.last_error,
+        }
+    
     def _cleanup_connections(self):
         """清理连接"""
         contexts = [
@@ -167,41 +231,48 @@ class FutuClient:
         
         market = market.upper()
         
+        with self._lock:
+            attr = {"HK": "_trade_hk_ctx", "US": "_trade_us_ctx", "CN": "_trade_cn_ctx"}.get(market)
+            if attr is None:
+                raise ValueError(f"Unsupported market: {market}")
+            
+            trade_ctx = getattr(self, attr)
+            if trade_ctx is None:
+                trade_ctx = self._create_trade_context(market)
+                for handler in self._trade_handlers.get(market, {}).values():
+                    trade_ctx.set_handler(handler)
+                setattr(self, attr, trade_ctx)
+            return trade_ctx
+    
+    def _create_trade_context(self, market: str):
+        """创建交易上下文"""
         if market == "HK":
-            if self._trade_hk_ctx is None:
-                self._trade_hk_ctx = ft.OpenSecTradeContext(
-                    filter_trdmarket=ft.TrdMarket.HK,
-                    host=self.config.host,
-                    port=self.config.port,
-                    is_encrypt=self.config.enable_proto_encrypt,
-                    security_firm=ft.SecurityFirm.FUTUSECURITIES
-                )
-            return self._trade_hk_ctx
-            #if self._trade_hk_ctx is None:
-            #    self._trade_hk_ctx = ft.OpenHKTradeContext(
-            #        host=self.config.host,
-            #        port=self.config.port,
-            #        is_encrypt=self.config.enable_proto_encrypt
-            #    )
-            #return self._trade_hk_ctx
+            return ft.OpenSecTradeContext(
+                filter_trdmarket=ft.TrdMarket.HK,
+                host=self.config.host,
+                port=self.config.port,
+                is_encrypt=self.config.enable_proto_encrypt,
+                security_firm=ft.SecurityFirm.FUTUSECURITIES
+            )
+            #return ft.OpenHKTradeContext(
+            #    host=self.config.host,
+            #    port=self.config.port,
+            #    is_encrypt=self.config.enable_proto_encrypt
+            #)
         
         elif market == "US":
-            if self._trade_us_ctx is None:
-                self._trade_us_ctx = ft.OpenUSTradeContext(
-                    host=self.config.host,
-                    port=self.config.port,
-                    is_encrypt=self.config.enable_proto_encrypt
-                )
-            return self._trade_us_ctx
+            return ft.OpenUSTradeContext(
+                host=self.config.host,
+                port=self.config.port,
+                is_encrypt=self.config.enable_proto_encrypt
+            )
         
         elif market == "CN":
-            if self._trade_cn_ctx is None:
-                self._trade_cn_ctx = ft.OpenCNTradeContext(
-                    host=self.config.host,
-                    port=self.config.port,
-                    is_encrypt=self.config.enable_proto_encrypt
-                )
-            return self._trade_cn_ctx
+            return ft.OpenCNTradeContext(
+                host=self.config.host,
+                port=self.config.port,
+                is_encrypt=self.config.enable_proto_encrypt
+            )
         
         else:
             raise ValueError(f"Unsupported market: {market}")
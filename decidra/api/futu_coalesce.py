@@ -0,0 +1,170 @@
+"""
+行情请求合并与短时缓存
+
+监控界面、分析标签页、AI 工具和策略经常在同一秒内查询同一只股票的快照/买卖盘/K线，
+每次都单独请求 FutuOpenD，容易触发频率限制。本模块在 QuoteManager 前面增加：
+1. 请求合并（single-flight）：相同参数的并发请求只实际调用一次，其余请求等待并共享结果
+2. 短时缓存：按数据类型设置有效期（买卖盘 500ms、股票基本信息 1 分钟等），有效期内直接返回
+3. 调用失败不缓存，异常同时抛给所有等待者
+"""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# 请求合并与缓存默认配置
+QUOTE_CACHE_CONFIG = {
+    'enabled': True,
+    'max_entries': 2000,            # 缓存条目上限（超出时淘汰最早写入的条目）
+    'ttl': {                        # 各数据类型的缓存有效期（秒），0 表示只合并并发请求不缓存
+        'order_book': 0.5,
+        'stock_quote': 0.5,
+        'ticker': 0.5,
+        'broker_queue': 0.5,
+        'market_snapshot': 1.0,
+        'rt_data': 1.0,
+        'current_kline': 1.0,
+        'global_state': 3.0,
+        'market_state': 5.0,
+        'capital_flow': 10.0,
+        'capital_distribution': 10.0,
+        'basicinfo': 60.0,
+        'history_kline': 60.0,
+        'owner_plate': 300.0,
+        'plate': 300.0,
+        'rehab': 3600.0,
+        'trading_days': 3600.0,
+    },
+}
+
+
+class _Flight:
+    """进行中的请求"""
+
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+def _freeze(value) -> Hashable:
+    """把请求参数转换为可哈希的缓存键"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, set):
+        return frozenset(_freeze(item) for item in value)
+    hash(value)
+    return value
+
+
+def _copy(result):
+    """返回给调用方的结果副本（避免调用方修改共享的缓存结果）"""
+    if isinstance(result, list):
+        return list(result)
+    if hasattr(result, 'copy') and hasattr(result, 'iloc'):
+        return result.copy()
+    if isinstance(result, dict):
+        return dict(result)
+    return result
+
+
+class RequestCoalescer:
+    """请求合并与短时缓存"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.config = {**QUOTE_CACHE_CONFIG, **config,
+                       'ttl': {**QUOTE_CACHE_CONFIG['ttl'], **config.get('ttl', {})}}
+        self._inflight: Dict[Hashable, _Flight] = {}
+        # {缓存键: (过期时间, 结果)}，按写入顺序排列
+        self._cache: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'cache_hits': 0, 'coalesced': 0}
+
+    def call(self, kind: str, key: Hashable, func: Callable[[], Any]):
+        """
+        执行请求：有效缓存直接返回，相同请求进行中则等待其结果，否则调用 func
+
+        Args:
+            kind: 数据类型（决定缓存有效期）
+            key: 请求键（相同键视为相同请求）
+            func: 实际请求函数
+        """
+        ttl = self.config['ttl'].get(kind, 0)
+        now = time.monotonic()
+
+        with self._lock:
+            if ttl > 0:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    if cached[0] > now:
+                        self.stats['cache_hits'] += 1
+                        return _copy(cached[1])
+                    del self._cache[key]
+
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self.stats['calls'] += 1
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return _copy(flight.result)
+
+        try:
+            flight.result = func()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            if ttl > 0:
+                with self._lock:
+                    self._cache[key] = (time.monotonic() + ttl, flight.result)
+                    while len(self._cache) > self.config['max_entries']:
+                        self._cache.popitem(last=False)
+            return _copy(flight.result)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    def invalidate(self, kind: Optional[str] = None) -> None:
+        """清除缓存（kind 为空时清除全部）"""
+        with self._lock:
+            if kind is None:
+                self._cache.clear()
+            else:
+                for key in [key for key in self._cache if key[0] == kind]:
+                    del self._cache[key]
+
+
+def coalesced(kind: str):
+    """
+    QuoteManager 查询方法装饰器：按方法参数合并并发请求并按 kind 的有效期缓存结果
+
+    实例没有 _coalescer 或参数不可哈希时直接调用原方法
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            coalescer = getattr(self, '_coalescer', None)
+            if coalescer is None:
+                return method(self, *args, **kwargs)
+            try:
+                key = (kind, method.__name__, _freeze(args), _freeze(kwargs))
+            except TypeError:
+                return method(self, *args, **kwargs)
+            return coalescer.call(kind, key, lambda: method(self, *args, **kwargs))
+        return wrapper
+    return decorator
@@ -0,0 +1,510 @@
+"""
+富途推送录制与回放模块
+
+把 QuoteManager.register_*_handler 注册的 Handler 收到的推送（报价、逐笔、买卖盘、K线）
+追加写入按天、按类型分目录的列式日志，之后可按原速或加速回放给同样的 Handler：
+
+    recorder = client.quote.enable_recording()       # 之后注册的 Handler 收到的推送都会落盘
+    ...
+    reader = JournalReader()
+    df = reader.to_frame("20260109", "ticker")      # 分析
+    replayer = JournalReplayer("20260109", speed=10)
+    replayer.set_handler(MyQuoteHandler())
+    replayer.run()                                  # 按接收时间顺序、10 倍速回放
+
+日志格式（<root>/<YYYYMMDD>/<类型>/）：
+1. 每列一个只追加的二进制文件（<列名>.bin，小端定长），读取时 np.memmap 零拷贝映射
+2. schema.json 记录列名与类型；股票代码按天编号，编号表为 <YYYYMMDD>/symbols.txt
+3. 写入按行缓冲，满 flush_rows 行或距上次写盘超过 flush_interval 秒时整批写入
+   （推送停止后由后台线程定时写盘）；进程异常退出时各列长度可能不一致，读取时按最短列截断
+4. 日期切换后关闭前一天的列文件
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from ..utils.global_vars import PATH_DATA, get_logger
+from .futu_sim_quote import SimPush, handler_kind, install_sim_parser
+
+try:
+    import futu as ft
+except ImportError:
+    raise ImportError(
+        "futu-api is required. Install it with: pip install futu-api"
+    )
+
+# 推送日志默认配置
+JOURNAL_CONFIG = {
+    'root': PATH_DATA / 'push_journal',  # 日志根目录
+    'flush_rows': 1000,                  # 缓冲行数上限
+    'flush_interval': 1.0,               # 最长缓冲时间（秒）
+    'order_book_depth': 10,              # 买卖盘记录档数
+}
+
+# K线类型编号（写入 int8 列）
+KLINE_TYPES = ['K_1M', 'K_3M', 'K_5M', 'K_15M', 'K_30M', 'K_60M', 'K_DAY', 'K_WEEK', 'K_MON', 'K_QUARTER', 'K_YEAR']
+# 逐笔方向编号
+TICKER_DIRECTIONS = ['NEUTRAL', 'BUY', 'SELL']
+
+_COMMON_COLUMNS = [('recv_ts', '<i8'), ('ts', '<i8'), ('code', '<i4')]
+
+
+def _order_book_columns(depth: int) -> List[tuple]:
+    columns = []
+    for side in ('bid', 'ask'):
+        for i in range(1, depth + 1):
+            columns.append((f'{side}_price_{i}', '<f8'))
+            columns.append((f'{side}_volume_{i}', '<i8'))
+    return columns
+
+
+# 各推送类型的列定义（ts 为行情时间，recv_ts 为本地接收时间，均为纳秒）
+JOURNAL_SCHEMAS = {
+    'quote': _COMMON_COLUMNS + [
+        ('last_price', '<f8'), ('open_price', '<f8'), ('high_price', '<f8'), ('low_price', '<f8'),
+        ('prev_close_price', '<f8'), ('volume', '<i8'), ('turnover', '<f8'),
+    ],
+    'ticker': _COMMON_COLUMNS + [
+        ('price', '<f8'), ('volume', '<i8'), ('turnover', '<f8'),
+        ('direction', '<i1'), ('sequence', '<i8'),
+    ],
+    'kline': _COMMON_COLUMNS + [
+        ('k_type', '<i1'), ('open', '<f8'), ('close', '<f8'), ('high', '<f8'), ('low', '<f8'),
+        ('volume', '<i8'), ('turnover', '<f8'), ('last_close', '<f8'),
+    ],
+    'order_book': _COMMON_COLUMNS + _order_book_columns(JOURNAL_CONFIG['order_book_depth']),
+}
+
+
+def _to_ns(value: Any) -> int:
+    """行情时间字符串转纳秒时间戳（无法解析时为 0）"""
+    if not value:
+        return 0
+    try:
+        return int(np.datetime64(str(value).strip(), 'ns').astype(np.int64))
+    except ValueError:
+        return 0
+
+
+def _from_ns(value: int, with_ms: bool = False) -> str:
+    """纳秒时间戳转回行情时间字符串"""
+    if not value:
+        return ''
+    text = str(np.datetime64(int(value), 'ns'))
+    text = text.replace('T', ' ')
+    return text[:23] if with_ms and '.' in text else text[:19]
+
+
+def _num(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class _ColumnWriter:
+    """单个 (日期, 类型) 目录的列式写入器"""
+
+    def __init__(self, directory: Path, schema: List[tuple]):
+        self.directory = directory
+        self.schema = schema
+        self.rows: List[tuple] = []
+        directory.mkdir(parents=True, exist_ok=True)
+
+        schema_file = directory / 'schema.json'
+        if not schema_file.exists():
+            schema_file.write_text(json.dumps(schema), encoding='utf-8')
+        self._files = [open(directory / f'{name}.bin', 'ab') for name, _ in schema]
+
+    def flush(self) -> int:
+        if not self.rows:
+            return 0
+        columns = list(zip(*self.rows))
+        for (name, dtype), values, fh in zip(self.schema, columns, self._files):
+            np.asarray(values, dtype=dtype).tofile(fh)
+            fh.flush()
+        count = len(self.rows)
+        self.rows = []
+        return count
+
+    def close(self) -> None:
+        self.flush()
+        for fh in self._files:
+            fh.close()
+
+
+class PushRecorder:
+    """
+    推送录制器
+
+    attach(handler) 后，handler 每次解析推送时把数据写入日志（在用户回调逻辑之前，
+    不依赖 on_recv_rsp 的返回值）。线程安全
+
+    首次写入时启动后台线程，每 flush_interval 秒检查一次，推送稀疏时缓冲的行也能按时写盘
+    """
+
+    def __init__(self, root: Optional[Union[str, Path]] = None,
+                 flush_rows: int = JOURNAL_CONFIG['flush_rows'],
+                 flush_interval: float = JOURNAL_CONFIG['flush_interval']):
+        self.root = Path(root) if root else Path(JOURNAL_CONFIG['root'])
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.logger = get_logger(__name__)
+
+        self._writers: Dict[tuple, _ColumnWriter] = {}
+        self._symbols: Dict[str, Dict[str, int]] = {}     # {日期: {股票代码: 编号}}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._stop_event = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self.record_count = 0
+        self.closed = False
+
+    # ================== Handler 接入 ==================
+
+    def attach(self, handler) -> bool:
+        """
+        录制 handler 收到的推送
+
+        Returns:
+            是否支持该 Handler 类型
+        """
+        kind = handler_kind(handler)
+        if kind is None or kind not in JOURNAL_SCHEMAS:
+            return False
+        if getattr(handler, '_push_recorder', None) is self:
+            return True
+
+        original = handler.parse_rsp_pb
+
+        def parse_rsp_pb(rsp_pb):
+            ret_code, content = original(rsp_pb)
+            if ret_code == ft.RET_OK and not self.closed:
+                try:
+                    self.record(kind, content)
+                except Exception as e:
+                    self.logger.warning(f"录制 {kind} 推送失败: {e}")
+            return ret_code, content
+
+        handler.parse_rsp_pb = parse_rsp_pb
+        handler._push_recorder = self
+        return True
+
+    # ================== 写入 ==================
+
+    def _symbol_id(self, day: str, code: str) -> int:
+        symbols = self._symbols.get(day)
+        if symbols is None:
+            symbols = {}
+            symbol_file = self.root / day / 'symbols.txt'
+            if symbol_file.exists():
+                for i, line in enumerate(symbol_file.read_text(encoding='utf-8').splitlines()):
+                    symbols[line] = i
+            self._symbols[day] = symbols
+
+        symbol_id = symbols.get(code)
+        if symbol_id is None:
+            symbol_id = len(symbols)
+            symbols[code] = symbol_id
+            (self.root / day).mkdir(parents=True, exist_ok=True)
+            with open(self.root / day / 'symbols.txt', 'a', encoding='utf-8') as fh:
+                fh.write(code + '\n')
+        return symbol_id
+
+    def _writer(self, day: str, kind: str) -> _ColumnWriter:
+        writer = self._writers.get((day, kind))
+        if writer is None:
+            self._close_stale_days(day)
+            writer = _ColumnWriter(self.root / day / kind, JOURNAL_SCHEMAS[kind])
+            self._writers[(day, kind)] = writer
+        return writer
+
+    def _close_stale_days(self, day: str) -> None:
+        """关闭并移除其他日期的写入器和编号表（日期切换后不会再写入）"""
+        for key in [key for key in self._writers if key[0] != day]:
+            self._writers.pop(key).close()
+        for stale_day in [d for d in self._symbols if d != day]:
+            del self._symbols[stale_day]
+
+    def _rows(self, kind: str, content: Any, day: str, recv_ts: int) -> List[tuple]:
+        """把解析后的推送内容转为日志行"""
+        if kind == 'order_book':
+            depth = JOURNAL_CONFIG['order_book_depth']
+            levels = []
+            for side in ('Bid', 'Ask'):
+                book = list(content.get(side) or [])[:depth]
+                for i in range(depth):
+                    price, volume = (book[i][0], book[i][1]) if i < len(book) else (0.0, 0)
+                    levels.extend((_num(price), int(_num(volume))))
+            ts = _to_ns(content.get('svr_recv_time_bid') or content.get('svr_recv_time_ask'))
+            return [(recv_ts, ts, self._symbol_id(day, content.get('code', ''))) + tuple(levels)]
+
+        rows = []
+        for item in content or []:
+            code_id = self._symbol_id(day, item.get('code', ''))
+            if kind == 'quote':
+                ts = _to_ns(f"{item.get('data_date', '')} {item.get('data_time', '')}")
+                rows.append((recv_ts, ts, code_id,
+                             _num(item.get('last_price')), _num(item.get('open_price')),
+                             _num(item.get('high_price')), _num(item.get('low_price')),
+                             _num(item.get('prev_close_price')), int(_num(item.get('volume'))),
+                             _num(item.get('turnover'))))
+            elif kind == 'ticker':
+                direction = str(item.get('ticker_direction', ''))
+                rows.append((recv_ts, _to_ns(item.get('time')), code_id,
+                             _num(item.get('price')), int(_num(item.get('volume'))),
+                             _num(item.get('turnover')),
+                             TICKER_DIRECTIONS.index(direction) if direction in TICKER_DIRECTIONS else 0,
+                             int(_num(item.get('sequence')))))
+            elif kind == 'kline':
+                k_type = str(item.get('k_type', ''))
+                rows.append((recv_ts, _to_ns(item.get('time_key')), code_id,
+                             KLINE_TYPES.index(k_type) if k_type in KLINE_TYPES else -1,
+                             _num(item.get('open')), _num(item.get('close')),
+                             _num(item.get('high')), _num(item.get('low')),
+                             int(_num(item.get('volume'))), _num(item.get('turnover')),
+                             _num(item.get('last_close'))))
+        return rows
+
+    def record(self, kind: str, content: Any) -> int:
+        """
+        写入一次推送的解析结果（与 Handler.parse_rsp_pb 返回的内容结构相同）
+
+        Returns:
+            写入行数
+        """
+        recv_ts = time.time_ns()
+        day = datetime.now().strftime('%Y%m%d')
+        with self._lock:
+            if self.closed:
+                return 0
+            self._start_flusher()
+            rows = self._rows(kind, content, day, recv_ts)
+            if rows:
+                writer = self._writer(day, kind)
+                writer.rows.extend(rows)
+                self.record_count += len(rows)
+                if len(writer.rows) >= self.flush_rows or \
+                        time.monotonic() - self._last_flush >= self.flush_interval:
+                    self._flush_locked()
+        return len(rows)
+
+    def _flush_locked(self) -> None:
+        for writer in self._writers.values():
+            writer.flush()
+        self._last_flush = time.monotonic()
+
+    def _start_flusher(self) -> None:
+        if self._flusher is None and self.flush_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, name="push-journal-flush", daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        """后台定时写盘，推送停止后缓冲的行最多延迟 flush_interval 秒落盘"""
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                with self._lock:
+                    if time.monotonic() - self._last_flush >= self.flush_interval:
+                        self._flush_locked()
+            except Exception as e:
+                self.logger.warning(f"推送日志定时写盘失败: {e}")
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        self._stop_event.set()
+        with self._lock:
+            self.closed = True
+            flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            flusher.join()
+        with self._lock:
+            for writer in self._writers.values():
+                writer.close()
+            self._writers.clear()
+
+
+class JournalReader:
+    """推送日志读取（列数据为只读 memmap）"""
+
+    def __init__(self, root: Optional[Union[str, Path]] = None):
+        self.root = Path(root) if root else Path(JOURNAL_CONFIG['root'])
+
+    def days(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir())
+
+    def kinds(self, day: str) -> List[str]:
+        directory = self.root / day
+        if not directory.exists():
+            return []
+        return sorted(p.name for p in directory.iterdir() if (p / 'schema.json').exists())
+
+    def symbols(self, day: str) -> List[str]:
+        symbol_file = self.root / day / 'symbols.txt'
+        if not symbol_file.exists():
+            return []
+        return symbol_file.read_text(encoding='utf-8').splitlines()
+
+    def read(self, day: str, kind: str) -> Dict[str, np.ndarray]:
+        """
+        读取列数据
+
+        Returns:
+            {列名: 数组}，各列按最短列截断
+        """
+        directory = self.root / day / kind
+        schema_file = directory / 'schema.json'
+        if not schema_file.exists():
+            return {}
+
+        schema = json.loads(schema_file.read_text(encoding='utf-8'))
+        columns = {}
+        for name, dtype in schema:
+            path = directory / f'{name}.bin'
+            if not path.exists() or path.stat().st_size == 0:
+                columns[name] = np.empty(0, dtype=dtype)
+            else:
+                columns[name] = np.memmap(path, dtype=dtype, mode='r')
+
+        rows = min((len(values) for values in columns.values()), default=0)
+        return {name: values[:rows] for name, values in columns.items()}
+
+    def to_frame(self, day: str, kind: str) -> pd.DataFrame:
+        """读取为 DataFrame（股票代码、时间与枚举列已解码）"""
+        columns = self.read(day, kind)
+        if not columns:
+            return pd.DataFrame()
+
+        df = pd.DataFrame({name: np.asarray(values) for name, values in columns.items()})
+        symbols = np.asarray(self.symbols(day) or [''], dtype=object)
+        df['code'] = symbols[df['code'].to_numpy()] if len(df) else df['code']
+        df['recv_ts'] = pd.to_datetime(df['recv_ts'], unit='ns')
+        df['ts'] = pd.to_datetime(df['ts'], unit='ns')
+        if kind == 'ticker':
+            df['direction'] = np.asarray(TICKER_DIRECTIONS, dtype=object)[df['direction'].to_numpy()]
+        elif kind == 'kline':
+            df['k_type'] = [KLINE_TYPES[i] if 0 <= i < len(KLINE_TYPES) else '' for i in df['k_type']]
+        return df
+
+
+class JournalReplayer:
+    """
+    推送日志回放
+
+    把一天内多个类型的推送按本地接收时间合并，以 SDK 推送的数据结构调用已设置的 Handler
+    """
+
+    def __init__(self, day: str, kinds: Optional[Iterable[str]] = None,
+                 speed: Optional[float] = 1.0, root: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            day: 日期 (YYYYMMDD)
+            kinds: 回放的类型，默认全部
+            speed: 回放倍速，1 为原速；None 或 0 表示不等待、尽快回放
+            root: 日志根目录
+        """
+        self.reader = JournalReader(root)
+        self.day = day
+        self.kinds = list(kinds) if kinds else self.reader.kinds(day)
+        self.speed = speed
+        self._handlers: Dict[str, Any] = {}
+        self._stop_event = threading.Event()
+        self.push_count = 0
+
+    def set_handler(self, handler) -> bool:
+        """设置回放目标 Handler（与 OpenQuoteContext.set_handler 用法一致）"""
+        kind = handler_kind(handler)
+        if kind is None:
+            return False
+        install_sim_parser(handler)
+        self._handlers[kind] = handler
+        return True
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def _content(self, kind: str, columns: Dict[str, list], i: int, symbols: List[str]) -> Any:
+        """第 i 行还原为 parse_rsp_pb 返回的内容结构"""
+        code = symbols[columns['code'][i]] if columns['code'][i] < len(symbols) else ''
+        if kind == 'order_book':
+            depth = JOURNAL_CONFIG['order_book_depth']
+            book = {'code': code, 'name': '',
+                    'svr_recv_time_bid': _from_ns(columns['ts'][i], True),
+                    'svr_recv_time_ask': _from_ns(columns['ts'][i], True)}
+            for side in ('bid', 'ask'):
+                book[side.capitalize()] = [
+                    (columns[f'{side}_price_{n}'][i], columns[f'{side}_volume_{n}'][i], 0, {})
+                    for n in range(1, depth + 1) if columns[f'{side}_price_{n}'][i]
+                ]
+            return book
+
+        row = {name: values[i] for name, values in columns.items() if name not in ('recv_ts', 'ts')}
+        row['code'] = code
+        row['name'] = ''
+        if kind == 'quote':
+            date_part, _, time_part = _from_ns(columns['ts'][i]).partition(' ')
+            row.update(data_date=date_part, data_time=time_part)
+        elif kind == 'ticker':
+            row['time'] = _from_ns(columns['ts'][i], True)
+            row['ticker_direction'] = TICKER_DIRECTIONS[row.pop('direction')]
+            row['type'] = 'AUTO_MATCH'
+            row['push_data_type'] = 'REALTIME'
+        elif kind == 'kline':
+            row['time_key'] = _from_ns(columns['ts'][i])
+            k_type = row['k_type']
+            row['k_type'] = KLINE_TYPES[k_type] if 0 <= k_type < len(KLINE_TYPES) else ''
+        return [row]
+
+    def run(self) -> int:
+        """
+        回放到结束（或 stop()），返回推送次数
+        """
+        symbols = self.reader.symbols(self.day)
+        tables = {}
+        order_kind, order_index, order_ts = [], [], []
+        for k, kind in enumerate(self.kinds):
+            columns = self.reader.read(self.day, kind)
+            if not columns or kind not in self._handlers:
+                continue
+            tables[kind] = {name: values.tolist() for name, values in columns.items()}
+            n = len(columns['recv_ts'])
+            order_kind.append(np.full(n, k, dtype=np.int8))
+            order_index.append(np.arange(n))
+            order_ts.append(np.asarray(columns['recv_ts']))
+
+        if not tables:
+            return 0
+
+        kinds = np.concatenate(order_kind)
+        indexes = np.concatenate(order_index)
+        recv_ts = np.concatenate(order_ts)
+        order = np.argsort(recv_ts, kind='stable')
+
+        self._stop_event.clear()
+        first_ts = int(recv_ts[order[0]])
+        started = time.perf_counter()
+        for pos in order:
+            if self._stop_event.is_set():
+                break
+            if self.speed:
+                due = (int(recv_ts[pos]) - first_ts) / 1e9 / self.speed
+                delay = due - (time.perf_counter() - started)
+                if delay > 0:
+                    self._stop_event.wait(delay)
+
+            kind = self.kinds[kinds[pos]]
+            content = self._content(kind, tables[kind], int(indexes[pos]), symbols)
+            self._handlers[kind].on_recv_rsp(SimPush(content))
+            self.push_count += 1
+        return self.push_count
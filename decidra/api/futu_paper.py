@@ -0,0 +1,513 @@
+"""
+富途模拟撮合模块
+
+进程内的模拟券商，实现与 TradeManager 相同的交易接口（下单/改单/撤单、订单与成交推送、
+持仓、资金），由历史或录制的逐笔成交驱动撮合，无需运行 FutuOpenD：
+
+    client = PaperClient(initial_cash=1_000_000)
+    trade = FutuTrade(client=client)
+    trade.place_order("HK.00700", 300.0, 100)
+    client.trade.replay(ticks)          # 逐笔数据驱动撮合并触发推送
+
+撮合规则：
+1. 限价单：买单在成交价 <= 限价时成交，卖单在成交价 >= 限价时成交；
+   下单时已可成交按最新价成交，挂单被穿价时按限价成交
+2. 市价单：按下一笔（或已知最新）成交价成交
+3. 止损单 / 止损限价单：成交价触及 aux_price 后转为市价单 / 限价单
+4. 逐笔数据带成交量时按成交量部分成交，不带成交量时视为流动性充足
+"""
+
+import itertools
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from ..base.futu_class import FutuTradeException
+from ..utils.global_vars import get_logger
+
+# 模拟券商默认配置
+PAPER_TRADE_CONFIG = {
+    'initial_cash': 1_000_000.0,  # 初始资金
+    'fee_rate': 0.0,              # 按成交额收取的费率
+    'min_fee': 0.0,               # 单笔最低费用
+    'currency': 'HKD',
+}
+
+# 撮合支持的订单类型
+LIMIT_ORDER_TYPES = {"NORMAL", "ABSOLUTE_LIMIT", "SPECIAL_LIMIT", "AUCTION_LIMIT"}
+MARKET_ORDER_TYPES = {"MARKET", "AUCTION"}
+STOP_ORDER_TYPES = {"STOP", "STOP_LIMIT"}
+
+OPEN_ORDER_STATUSES = {"SUBMITTED", "FILLED_PART"}
+
+
+def _market_of(code: str) -> str:
+    """由股票代码前缀推断市场"""
+    prefix = code.split('.', 1)[0].upper() if '.' in code else ''
+    return "CN" if prefix in ("SH", "SZ") else (prefix or "HK")
+
+
+def _to_result(records: List[Dict[str, Any]]):
+    """与 TradeManager._handle_response 一致：单行返回字典，多行（或空）返回 DataFrame"""
+    if len(records) == 1:
+        return dict(records[0])
+    return pd.DataFrame(records)
+
+
+class PaperTradeManager:
+    """
+    模拟交易管理器
+
+    接口签名与返回格式与 TradeManager 保持一致；所有状态由一把可重入锁保护，
+    推送回调在撮合线程（调用 feed_tick / 下单的线程）中同步触发
+    """
+
+    def __init__(self, initial_cash: float = PAPER_TRADE_CONFIG['initial_cash'],
+                 fee_rate: float = PAPER_TRADE_CONFIG['fee_rate'],
+                 min_fee: float = PAPER_TRADE_CONFIG['min_fee'],
+                 currency: str = PAPER_TRADE_CONFIG['currency']):
+        self.logger = get_logger(__name__)
+        self.fee_rate = fee_rate
+        self.min_fee = min_fee
+        self.currency = currency
+
+        self.cash = float(initial_cash)
+        self.positions: Dict[str, Dict[str, float]] = {}
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.deals: List[Dict[str, Any]] = []
+        self.last_prices: Dict[str, float] = {}
+        self.clock: Optional[str] = None  # 回放时使用逐笔时间，否则使用本地时间
+
+        self._order_seq = itertools.count(1)
+        self._deal_seq = itertools.count(1)
+        self._order_callbacks: Dict[str, Callable] = {}
+        self._deal_callbacks: Dict[str, Callable] = {}
+        self._lock = threading.RLock()
+
+    # ================== 内部工具 ==================
+
+    def _now(self) -> str:
+        if self.clock:
+            return self.clock
+        return datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+
+    def _fee(self, amount: float) -> float:
+        if self.fee_rate <= 0 and self.min_fee <= 0:
+            return 0.0
+        return max(amount * self.fee_rate, self.min_fee)
+
+    def _reserved_cash(self) -> float:
+        """未成交买单占用的资金"""
+        reserved = 0.0
+        for order in self.orders.values():
+            if order['trd_side'] == 'BUY' and order['order_status'] in OPEN_ORDER_STATUSES:
+                price = order['price'] or self.last_prices.get(order['code'], 0.0)
+                reserved += (order['qty'] - order['dealt_qty']) * price
+        return reserved
+
+    def _pending_sell_qty(self, code: str, exclude: Optional[str] = None) -> float:
+        return sum(
+            o['qty'] - o['dealt_qty'] for o in self.orders.values()
+            if o['code'] == code and o['trd_side'] == 'SELL'
+            and o['order_status'] in OPEN_ORDER_STATUSES and o['order_id'] != exclude
+        )
+
+    def _order_row(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in order.items() if not key.startswith('_')}
+
+    def _push_order(self, order: Dict[str, Any]) -> None:
+        callback = self._order_callbacks.get(order['_market'])
+        if callback:
+            try:
+                callback(pd.DataFrame([self._order_row(order)]))
+            except Exception as e:
+                self.logger.error(f"模拟订单推送回调异常: {e}")
+
+    def _push_deal(self, deal: Dict[str, Any], market: str) -> None:
+        callback = self._deal_callbacks.get(market)
+        if callback:
+            try:
+                callback(pd.DataFrame([deal]))
+            except Exception as e:
+                self.logger.error(f"模拟成交推送回调异常: {e}")
+
+    def _get_open_order(self, order_id: str) -> Dict[str, Any]:
+        order = self.orders.get(str(order_id))
+        if order is None:
+            raise FutuTradeException(-1, f"找不到订单 {order_id}")
+        if order['order_status'] not in OPEN_ORDER_STATUSES:
+            raise FutuTradeException(-1, f"订单 {order_id} 状态为 {order['order_status']}，不可修改")
+        return order
+
+    # ================== 撮合 ==================
+
+    def _fill(self, order: Dict[str, Any], qty: float, price: float) -> None:
+        """成交指定数量，更新持仓、资金、订单并触发推送"""
+        code = order['code']
+        amount = qty * price
+        fee = self._fee(amount)
+        position = self.positions.setdefault(code, {'qty': 0.0, 'cost_price': 0.0})
+
+        pnl = 0.0
+        if order['trd_side'] == 'BUY':
+            total_qty = position['qty'] + qty
+            position['cost_price'] = (position['cost_price'] * position['qty'] + amount) / total_qty
+            position['qty'] = total_qty
+            self.cash -= amount + fee
+        else:
+            pnl = (price - position['cost_price']) * qty
+            position['qty'] -= qty
+            self.cash += amount - fee
+            if position['qty'] <= 0:
+                self.positions.pop(code, None)
+
+        dealt = order['dealt_qty']
+        order['dealt_avg_price'] = (order['dealt_avg_price'] * dealt + amount) / (dealt + qty)
+        order['dealt_qty'] = dealt + qty
+        order['order_status'] = 'FILLED_ALL' if order['dealt_qty'] >= order['qty'] else 'FILLED_PART'
+        order['updated_time'] = self._now()
+
+        deal = {
+            'trd_env': order['trd_env'], 'code': code, 'stock_name': order['stock_name'],
+            'deal_id': str(next(self._deal_seq)), 'order_id': order['order_id'],
+            'qty': qty, 'price': price, 'trd_side': order['trd_side'],
+            'create_time': order['updated_time'], 'status': 'OK',
+            'pnl': pnl, 'fee': fee,
+        }
+        self.deals.append(deal)
+
+        self._push_order(order)
+        self._push_deal(deal, order['_market'])
+
+    def _match(self, order: Dict[str, Any], price: float, volume: Optional[float]) -> Optional[float]:
+        """
+        用一笔成交价撮合单个订单
+
+        Returns:
+            消耗的成交量（None 表示未成交）
+        """
+        side = order['trd_side']
+
+        # 止损类订单先判断是否触发
+        if order['order_type'] in STOP_ORDER_TYPES and not order['_triggered']:
+            aux = order['aux_price'] or 0.0
+            triggered = price >= aux if side == 'BUY' else price <= aux
+            if not triggered:
+                return None
+            order['_triggered'] = True
+
+        is_market = order['order_type'] in MARKET_ORDER_TYPES or order['order_type'] == 'STOP'
+        if is_market:
+            fill_price = price
+        else:
+            limit = order['price']
+            crossed = price <= limit if side == 'BUY' else price >= limit
+            if not crossed:
+                return None
+            # 挂单被穿价时按限价成交，下单即可成交时按成交价成交
+            fill_price = price if order['_marketable_on_entry'] else limit
+
+        remaining = order['qty'] - order['dealt_qty']
+        qty = remaining if volume is None else min(remaining, volume)
+        if qty <= 0:
+            return None
+        self._fill(order, qty, fill_price)
+        return qty
+
+    def feed_tick(self, code: str, price: float, volume: Optional[float] = None,
+                  time: Optional[str] = None) -> int:
+        """
+        输入一笔成交，按订单时间优先撮合该股票的所有挂单
+
+        Args:
+            code: 股票代码
+            price: 成交价
+            volume: 成交量，None 表示流动性充足
+            time: 成交时间（回放时作为撮合时钟）
+
+        Returns:
+            本笔数据产生的成交笔数
+        """
+        fills = 0
+        with self._lock:
+            if time:
+                self.clock = str(time)
+            self.last_prices[code] = float(price)
+            available = None if volume is None else float(volume)
+
+            for order in list(self.orders.values()):
+                if order['code'] != code or order['order_status'] not in OPEN_ORDER_STATUSES:
+                    continue
+                if available is not None and available <= 0:
+                    break
+                consumed = self._match(order, float(price), available)
+                if consumed:
+                    fills += 1
+                    if available is not None:
+                        available -= consumed
+                order['_marketable_on_entry'] = False
+        return fills
+
+    def replay(self, ticks: Iterable[Any]) -> int:
+        """
+        回放逐笔数据（TickerData、字典或 DataFrame 的行），返回成交笔数
+
+        成交量缺失时视为流动性充足，成交量为 0 的数据只更新最新价，不撮合
+        """
+        if isinstance(ticks, pd.DataFrame):
+            ticks = ticks.to_dict('records')
+
+        fills = 0
+        for tick in ticks:
+            data = tick if isinstance(tick, dict) else vars(tick)
+            volume = data.get('volume')
+            if volume is not None and pd.isna(volume):
+                volume = None
+            fills += self.feed_tick(data['code'], data['price'], volume, data.get('time'))
+        return fills
+
+    # ================== 连接与账户 ==================
+
+    def unlock_trade(self, password: str = None, password_md5: str = None, market: str = "HK"):
+        """模拟环境无需解锁"""
+        return True
+
+    def get_acc_list(self, market: str = "HK") -> List[Dict]:
+        return [{'acc_id': 0, 'trd_env': 'SIMULATE', 'acc_type': 'CASH', 'trd_market_auth': [market]}]
+
+    def get_funds(self, trd_env: str = "SIMULATE", market: str = "HK", currency: str = "HKD") -> Dict:
+        """账户资金（total_assets 按最新价计算持仓市值）"""
+        with self._lock:
+            market_val = sum(
+                p['qty'] * self.last_prices.get(code, p['cost_price'])
+                for code, p in self.positions.items()
+            )
+            power = self.cash - self._reserved_cash()
+            return {
+                'total_assets': self.cash + market_val,
+                'cash': self.cash,
+                'market_val': market_val,
+                'power': power,
+                'avl_withdrawal_cash': power,
+                'currency': currency or self.currency,
+            }
+
+    def get_account_info(self, trd_env: str = "SIMULATE", market: str = "HK", currency: str = "HKD") -> Dict:
+        return self.get_funds(trd_env, market, currency)
+
+    def get_cash_flow(self, *args, **kwargs) -> pd.DataFrame:
+        """模拟账户不记录资金流水"""
+        return pd.DataFrame()
+
+    def get_position_list(self, trd_env: str = "SIMULATE", market: str = "HK",
+                          code: Optional[str] = None, pl_ratio_min: Optional[float] = None,
+                          pl_ratio_max: Optional[float] = None, currency: str = "HKD") -> Dict:
+        with self._lock:
+            records = []
+            for pos_code, position in self.positions.items():
+                if code and pos_code != code:
+                    continue
+                nominal_price = self.last_prices.get(pos_code, position['cost_price'])
+                market_val = position['qty'] * nominal_price
+                pl_val = (nominal_price - position['cost_price']) * position['qty']
+                cost_val = position['cost_price'] * position['qty']
+                records.append({
+                    'code': pos_code, 'stock_name': pos_code, 'qty': position['qty'],
+                    'can_sell_qty': position['qty'] - self._pending_sell_qty(pos_code),
+                    'cost_price': position['cost_price'], 'nominal_price': nominal_price,
+                    'market_val': market_val, 'pl_val': pl_val,
+                    'pl_ratio': pl_val / cost_val * 100 if cost_val else 0.0,
+                    'currency': currency,
+                })
+            return _to_result(records)
+
+    # ================== 订单 ==================
+
+    def place_order(self, code: str, price: float, qty: int, order_type: str = "NORMAL",
+                    trd_side: str = "BUY", aux_price: Optional[float] = None,
+                    trd_env: str = "SIMULATE", market: str = "HK") -> Dict:
+        order_type = (order_type or "NORMAL").upper()
+        trd_side = "BUY" if (trd_side or "BUY").upper() == "BUY" else "SELL"
+        if order_type not in LIMIT_ORDER_TYPES | MARKET_ORDER_TYPES | STOP_ORDER_TYPES:
+            raise FutuTradeException(-1, f"模拟撮合不支持订单类型 {order_type}")
+        if qty <= 0:
+            raise FutuTradeException(-1, f"下单数量无效: {qty}")
+        if order_type in STOP_ORDER_TYPES and not aux_price:
+            raise FutuTradeException(-1, f"{order_type} 订单需要 aux_price")
+
+        with self._lock:
+            ref_price = price if order_type in LIMIT_ORDER_TYPES or order_type == 'STOP_LIMIT' \
+                else self.last_prices.get(code, price)
+            if trd_side == 'BUY':
+                power = self.cash - self._reserved_cash()
+                if ref_price * qty > power:
+                    raise FutuTradeException(-1, f"资金不足: 需要 {ref_price * qty:.2f}，可用 {power:.2f}")
+            else:
+                held = self.positions.get(code, {}).get('qty', 0.0)
+                if qty > held - self._pending_sell_qty(code):
+                    raise FutuTradeException(-1, f"可卖数量不足: {code}")
+
+            now = self._now()
+            order = {
+                'trd_env': trd_env, 'code': code, 'stock_name': code,
+                'dealt_avg_price': 0.0, 'dealt_qty': 0.0, 'qty': float(qty),
+                'order_id': str(next(self._order_seq)), 'order_type': order_type,
+                'price': float(price or 0.0), 'order_status': 'SUBMITTED',
+                'create_time': now, 'updated_time': now, 'trd_side': trd_side,
+                'last_err_msg': '', 'aux_price': aux_price, 'currency': self.currency,
+                '_market': _market_of(code), '_triggered': False, '_marketable_on_entry': True,
+            }
+            self.orders[order['order_id']] = order
+            self._push_order(order)
+
+            # 已有最新价时立即尝试撮合
+            last_price = self.last_prices.get(code)
+            if last_price is not None:
+                self._match(order, last_price, None)
+            order['_marketable_on_entry'] = False
+
+            return _to_result([self._order_row(order)])
+
+    def modify_order(self, order_id: str, price: Optional[float] = None, qty: Optional[int] = None,
+                     trd_env: str = "SIMULATE", market: str = "HK") -> Dict:
+        if price is None and qty is None:
+            raise FutuTradeException(-1, "修改订单至少需要指定价格或数量中的一个")
+
+        with self._lock:
+            order = self._get_open_order(order_id)
+            if qty is not None:
+                if qty < order['dealt_qty']:
+                    raise FutuTradeException(-1, f"新数量 {qty} 小于已成交数量 {order['dealt_qty']}")
+                order['qty'] = float(qty)
+            if price is not None:
+                order['price'] = float(price)
+
+            order['order_status'] = 'FILLED_ALL' if order['dealt_qty'] >= order['qty'] else order['order_status']
+            order['updated_time'] = self._now()
+            self._push_order(order)
+
+            last_price = self.last_prices.get(order['code'])
+            if last_price is not None and order['order_status'] in OPEN_ORDER_STATUSES:
+                order['_marketable_on_entry'] = True
+                self._match(order, last_price, None)
+                order['_marketable_on_entry'] = False
+
+            return {'order_id': order['order_id'], 'modify_order_op': 'NORMAL'}
+
+    def cancel_order(self, order_id: str, trd_env: str = "SIMULATE", market: str = "HK") -> Dict:
+        with self._lock:
+            order = self._get_open_order(order_id)
+            order['order_status'] = 'CANCELLED_PART' if order['dealt_qty'] > 0 else 'CANCELLED_ALL'
+            order['updated_time'] = self._now()
+            self._push_order(order)
+            return {'order_id': order['order_id'], 'modify_order_op': 'CANCEL'}
+
+    def get_order_list(self, order_status: Optional[str] = None, trd_env: str = "SIMULATE",
+                       market: str = "HK", start: Optional[str] = None,
+                       end: Optional[str] = None) -> Dict:
+        with self._lock:
+            records = [
+                self._order_row(o) for o in self.orders.values()
+                if o['_market'] == market
+                and (not order_status or o['order_status'] == order_status.upper())
+            ]
+            return _to_result(records)
+
+    def get_history_order_list(self, trd_env: str = "SIMULATE", market: str = "HK",
+                               start: Optional[str] = None, end: Optional[str] = None) -> Dict:
+        with self._lock:
+            records = [
+                self._order_row(o) for o in self.orders.values()
+                if o['_market'] == market
+                and (not start or o['create_time'][:10] >= start)
+                and (not end or o['create_time'][:10] <= end)
+            ]
+            return _to_result(records)
+
+    def get_deal_list(self, trd_env: str = "SIMULATE", market: str = "HK") -> Dict:
+        today = self._now()[:10]
+        with self._lock:
+            records = [dict(d) for d in self.deals
+                       if _market_of(d['code']) == market and d['create_time'][:10] == today]
+            return _to_result(records)
+
+    def get_history_deal_list(self, trd_env: str = "SIMULATE", market: str = "HK",
+                              start: Optional[str] = None, end: Optional[str] = None) -> Dict:
+        with self._lock:
+            records = [
+                dict(d) for d in self.deals
+                if _market_of(d['code']) == market
+                and (not start or d['create_time'][:10] >= start)
+                and (not end or d['create_time'][:10] <= end)
+            ]
+            return _to_result(records)
+
+    def get_max_trd_qty(self, order_type: str, code: str, price: float, trd_side: str = "BUY",
+                        trd_env: str = "SIMULATE", market: str = "HK") -> Dict:
+        with self._lock:
+            power = self.cash - self._reserved_cash()
+            held = self.positions.get(code, {}).get('qty', 0.0)
+            return {
+                'max_cash_buy': int(power // price) if price else 0,
+                'max_position_sell': held - self._pending_sell_qty(code),
+            }
+
+    def get_order_fee(self, order_type: str, code: str, price: float, qty: int,
+                      trd_side: str = "BUY", trd_env: str = "SIMULATE", market: str = "HK") -> Dict:
+        return {'code': code, 'fee_amount': self._fee(price * qty)}
+
+    # ================== 推送 ==================
+
+    def set_order_callback(self, callback_func, market: str = "HK"):
+        self._order_callbacks[market] = callback_func
+
+    def set_deal_callback(self, callback_func, market: str = "HK"):
+        self._deal_callbacks[market] = callback_func
+
+    def enable_subscribe_order(self, market: str = "HK"):
+        """模拟环境推送始终启用"""
+
+    def enable_subscribe_deal(self, market: str = "HK"):
+        """模拟环境推送始终启用"""
+
+
+class PaperClient:
+    """
+    模拟客户端
+
+    提供与 FutuClient 相同的 trade / quote 属性与连接接口，可直接传给 FutuTrade(client=...)
+    """
+
+    # 不经过 FutuOpenD，FutuTrade 据此跳过交易接口限流
+    is_simulated = True
+
+    def __init__(self, quote=None, **kwargs):
+        """
+        Args:
+            quote: 可选的行情管理器（FutuTrade 的市价买卖需要取最新价）
+            **kwargs: 传递给 PaperTradeManager 的参数
+        """
+        self.trade = PaperTradeManager(**kwargs)
+        self.quote = quote
+        self._connected = True
+        self._unlocked = True
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    @property
+    def is_unlocked(self) -> bool:
+        return self._unlocked
+
+    def connect(self) -> bool:
+        self._connected = True
+        return True
+
+    def disconnect(self):
+        self._connected = False
+
+    def __repr__(self):
+        return f"PaperClient(cash={self.trade.cash:.2f}, orders={len(self.trade.orders)})"
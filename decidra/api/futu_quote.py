@@ -10,6 +10,7 @@ import threading
 from typing import Optional, Dict, Any, List, Callable, TYPE_CHECKING
 from collections import defaultdict
 from ..utils.global_vars import get_logger
+from .futu_coalesce import QUOTE_CACHE_CONFIG, RequestCoalescer, coalesced
 
 if TYPE_CHECKING:
     from .futu_client import FutuClient
@@ -47,6 +48,13 @@ class QuoteManager:
         self._handlers: Dict[str, Callable] = {}
         self._lock = threading.Lock()
         
+        # 推送回调与录制
+        self._push_handlers: List[Any] = []
+        self._recorder = None
+        
+        # 相同查询请求合并与短时缓存
+        self._coalescer = RequestCoalescer() if QUOTE_CACHE_CONFIG['enabled'] else None
+        
         # 订阅类型映射
         self._sub_type_map = {
             'quote': ft.SubType.QUOTE,           # 基础报价
@@ -115,20 +123,23 @@ class QuoteManager:
     
     # ================== 基础行情接口 ==================
     
-    def get_stock_info(self, market: str = "HK", stock_type: str = "STOCK") -> List[StockInfo]:
+    @coalesced('basicinfo')
+    def get_stock_info(self, market: str = "HK", stock_type: str = "STOCK",
+                       code_list: Optional[List[str]] = None) -> List[StockInfo]:
         """
         获取股票基础信息
         
         Args:
             market: 市场代码 (HK/US/CN等)
             stock_type: 股票类型 (STOCK/WARRANT等)
+            code_list: 只查询指定股票（指定时忽略 market 和 stock_type）
         
         Returns:
             List[StockInfo]: 股票信息列表
         """
         try:
             quote_ctx = self._get_quote_context()
-            ret, data = quote_ctx.get_stock_basicinfo(market, stock_type)
+            ret, data = quote_ctx.get_stock_basicinfo(market, stock_type, code_list)
             
             df = self._handle_response(ret, data, "获取股票基础信息")
             
@@ -146,6 +157,7 @@ class QuoteManager:
                 raise
             raise FutuQuoteException(-1, f"获取股票基础信息异常: {str(e)}")
     
+    @coalesced('stock_quote')
     def get_stock_quote(self, codes: List[str]) -> List[StockQuote]:
         """
         获取股票实时报价
@@ -168,7 +180,7 @@ class QuoteManager:
                 quote = StockQuote.from_dict(row.to_dict())
                 quote_list.append(quote)
             
-            self.logger.debug(f"获取到 {len(quote_list)} 只股票的实时报价")
+            self.logger.debug("获取到 %d 只股票的实时报价", len(quote_list))
             return quote_list
             
         except Exception as e:
@@ -176,6 +188,7 @@ class QuoteManager:
                 raise
             raise FutuQuoteException(-1, f"获取股票报价异常: {str(e)}")
     
+    @coalesced('market_snapshot')
     def get_market_snapshot(self, codes: List[str]) -> List[MarketSnapshot]:
         """
         获取市场快照
@@ -198,7 +211,7 @@ class QuoteManager:
                 snapshot = MarketSnapshot.from_dict(row.to_dict())
                 snapshot_list.append(snapshot)
             
-            self.logger.info(f"获取到 {len(snapshot_list)} 只股票的市场快照")
+            self.logger.info("获取到 %d 只股票的市场快照", len(snapshot_list))
             return snapshot_list
             
         except Exception as e:
@@ -208,6 +221,7 @@ class QuoteManager:
     
     # ================== K线数据接口 ==================
     
+    @coalesced('current_kline')
     def get_current_kline(self, 
                          code: str, 
                          ktype: str = "K_DAY", 
@@ -249,7 +263,7 @@ class QuoteManager:
                 kline = KLineData.from_dict(row.to_dict())
                 kline_list.append(kline)
             
-            self.logger.info(f"获取到 {code} 的 {len(kline_list)} 条K线数据")
+            self.logger.info("获取到 %s 的 %d 条K线数据", code, len(kline_list))
             return kline_list
             
         except Exception as e:
@@ -257,6 +271,7 @@ class QuoteManager:
                 raise
             raise FutuQuoteException(-1, f"获取K线数据异常: {str(e)}")
     
+    @coalesced('history_kline')
     def get_history_kline(self, 
                          code: str,
                          start: str,
@@ -315,6 +330,7 @@ class QuoteManager:
     
     # ================== 实用方法 ==================
     
+    @coalesced('market_state')
     def get_market_state(self, codes: List[str]) -> List[MarketState]:
         """
         获取标的市场状态
@@ -337,7 +353,7 @@ class QuoteManager:
                 market_state = MarketState.from_dict(row.to_dict())
                 state_list.append(market_state)
             
-            self.logger.info(f"获取到 {len(state_list)} 只股票的市场状态")
+            self.logger.info("获取到 %d 只股票的市场状态", len(state_list))
             return state_list
             
         except Exception as e:
@@ -345,6 +361,7 @@ class QuoteManager:
                 raise
             raise FutuQuoteException(-1, f"获取市场状态异常: {str(e)}")
     
+    @coalesced('capital_flow')
     def get_capital_flow(self, 
                         code: str, 
                         period_type: str = "INTRADAY", 
@@ -393,6 +410,7 @@ class QuoteManager:
                 raise
             raise FutuQuoteException(-1, f"获取资金流向异常: {str(e)}")
     
+    @coalesced('capital_distribution')
     def get_capital_distribution(self, code: str) -> List[CapitalDistribution]:
         """
         获取资金分布
@@ -423,7 +441,7 @@ class QuoteManager:
                     try:
                         row_dict = row.to_dict()
                         row_dict['code'] = code  # 确保包含股票代码
-                        self.logger.debug(f"处理第{idx}行数据: {row_dict}")
+                        self.logger.debug("处理第%s行数据: %s", idx, row_dict)
                         capital_distribution = CapitalDistribution.from_dict(row_dict)
                         distribution_list.append(capital_distribution)
                     except Exception as row_error:
@@ -451,6 +469,7 @@ class QuoteManager:
                 raise
             raise FutuQuoteException(-1, f"获取资金分布异常: {str(e)}")
     
+    @coalesced('owner_plate')
     def get_owner_plate(self, codes: List[str]) -> List[OwnerPlate]:
         """
         获取股票所属板块
@@ -481,6 +500,7 @@ class QuoteManager:
                 raise
             raise FutuQuoteException(-1, f"获取股票所属板块异常: {str(e)}")
     
+    @coalesced('history_kline')
     def request_history_kline(self, 
                              code: str,
                              start: Optional[str] = None,
@@ -575,6 +595,7 @@ class QuoteManager:
                 raise
             raise FutuQuoteException(-1, f"获取历史K线数据异常: {str(e)}")
     
+    @coalesced('rehab')
     def get_rehab(self, code: str) -> List[AuTypeInfo]:
         """
         获取复权因子
@@ -607,6 +628,7 @@ class QuoteManager:
                 raise
             raise FutuQuoteException(-1, f"获取复权因子异常: {str(e)}")
     
+    @coalesced('trading_days')
     def get_trading_days(self, market: str = "HK", start: Optional[str] = None, end: Optional[str] = None) -> List[str]:
         """
         获取交易日历
@@ -644,6 +666,7 @@ class QuoteManager:
                 raise
             raise FutuQuoteException(-1, f"获取交易日历异常: {str(e)}")
 
+    @coalesced('rehab')
     def get_autype_list(self, codes: List[str]) -> List[AuTypeInfo]:
         """
         获取复权因子列表 (对多个股票代码调用get_rehab)
@@ -677,6 +700,7 @@ class QuoteManager:
                 raise
             raise FutuQuoteException(-1, f"获取复权因子列表异常: {str(e)}")
 
+    @coalesced('plate')
     def get_plate_list(self, market: str = "HK", plate_type: str = "ALL") -> List[PlateInfo]:
         """
         获取板块集合下的子板块列表
@@ -721,6 +745,7 @@ class QuoteManager:
                 raise
             raise FutuQuoteException(-1, f"获取板块列表异常: {str(e)}")
 
+    @coalesced('plate')
     def get_plate_stock(self, plate_code: str) -> List[PlateStock]:
         """
         获取板块下的股票列表
@@ -1055,6 +1080,7 @@ class QuoteManager:
     
     # ================== 实时数据获取接口 ==================
     
+    @coalesced('ticker')
     def get_rt_ticker(self, code: str, num: int = 100):
         """
         获取实时逐笔数据
@@ -1080,6 +1106,7 @@ class QuoteManager:
                 raise
             raise FutuQuoteException(-1, f"获取实时逐笔数据异常: {str(e)}")
     
+    @coalesced('ticker')
     def get_ticker_data(self, code: str, num: int = 100) -> List[TickerData]:
         """
         获取逐笔数据
@@ -1111,6 +1138,7 @@ class QuoteManager:
                 raise
             raise FutuQuoteException(-1, f"获取逐笔数据异常: {str(e)}")
     
+    @coalesced('order_book')
     def get_order_book(self, code: str, num = 10) -> OrderBookData:
         """
         获取买卖盘数据
@@ -1144,7 +1172,7 @@ class QuoteManager:
                 raise FutuQuoteException(-1, f"获取到意外的数据格式: {type(df)}")
             
             order_book = OrderBookData.from_dict(converted_data)
-            self.logger.info(f"获取到 {code} 的买卖盘数据")
+            self.logger.info("获取到 %s 的买卖盘数据", code)
             return order_book
                 
         except Exception as e:
@@ -1192,6 +1220,7 @@ class QuoteManager:
         
         return converted
     
+    @coalesced('rt_data')
     def get_rt_data(self, code: str) -> List[RTData]:
         """
         获取分时数据
@@ -1214,7 +1243,7 @@ class QuoteManager:
                 rt_data = RTData.from_dict(row.to_dict())
                 rt_list.append(rt_data)
             
-            self.logger.info(f"获取到 {code} 的 {len(rt_list)} 条分时数据")
+            self.logger.info("获取到 %s 的 %d 条分时数据", code, len(rt_list))
             return rt_list
             
         except Exception as e:
@@ -1222,6 +1251,7 @@ class QuoteManager:
                 raise
             raise FutuQuoteException(-1, f"获取分时数据异常: {str(e)}")
     
+    @coalesced('broker_queue')
     def get_broker_queue_data(self, code: str) -> BrokerQueueData:
         """
         获取经纪队列数据（返回BrokerQueueData对象）
@@ -1256,6 +1286,7 @@ class QuoteManager:
                 raise
             raise FutuQuoteException(-1, f"获取经纪队列数据异常: {str(e)}")
     
+    @coalesced('broker_queue')
     def get_broker_queue(self, code: str) -> Dict[str, Any]:
         """
         获取经纪队列
@@ -1572,6 +1603,7 @@ class QuoteManager:
                 raise
             raise FutuQuoteException(-1, f"获取IPO列表异常: {str(e)}")
     
+    @coalesced('plate')
     def get_plate_stock(self, plate_code: str, sort_field: str = "CODE", ascend: bool = True) -> Dict:
         """
         获取板块股票列表
@@ -1613,6 +1645,7 @@ class QuoteManager:
                 raise
             raise FutuQuoteException(-1, f"获取板块股票列表异常: {str(e)}")
     
+    @coalesced('global_state')
     def get_global_state(self) -> Dict:
         """
         获取全局状态
@@ -1766,68 +1799,124 @@ class QuoteManager:
 
     # ================== 推送回调处理器 ==================
     
-    def register_stock_quote_handler(self, handler) -> bool:
-        """注册股票报价推送回调"""
+    def _register_push_handler(self, handler, label: str) -> bool:
+        """向行情上下文注册推送回调，已启用录制时同时录制该回调收到的推送"""
         try:
             quote_ctx = self._get_quote_context()
             quote_ctx.set_handler(handler)
-            self.logger.info("股票报价推送回调注册成功")
+            with self._lock:
+                self._push_handlers.append(handler)
+                recorder = self._recorder
+            if recorder is not None:
+                recorder.attach(handler)
+            self.logger.info(f"{label}推送回调注册成功")
             return True
         except Exception as e:
-            self.logger.error(f"注册股票报价推送回调失败: {e}")
+            self.logger.error(f"注册{label}推送回调失败: {e}")
             return False
     
+    def register_stock_quote_handler(self, handler) -> bool:
+        """注册股票报价推送回调"""
+        return self._register_push_handler(handler, "股票报价")
+    
     def register_order_book_handler(self, handler) -> bool:
         """注册买卖盘推送回调"""
-        try:
-            quote_ctx = self._get_quote_context()
-            quote_ctx.set_handler(handler)
-            self.logger.info("买卖盘推送回调注册成功")
-            return True
-        except Exception as e:
-            self.logger.error(f"注册买卖盘推送回调失败: {e}")
-            return False
+        return self._register_push_handler(handler, "买卖盘")
     
     def register_kline_handler(self, handler) -> bool:
         """注册K线推送回调"""
-        try:
-            quote_ctx = self._get_quote_context()
-            quote_ctx.set_handler(handler)
-            self.logger.info("K线推送回调注册成功")
-            return True
-        except Exception as e:
-            self.logger.error(f"注册K线推送回调失败: {e}")
-            return False
+        return self._register_push_handler(handler, "K线")
     
     def register_ticker_handler(self, handler) -> bool:
         """注册逐笔推送回调"""
-        try:
-            quote_ctx = self._get_quote_context()
-            quote_ctx.set_handler(handler)
-            self.logger.info("逐笔推送回调注册成功")
-            return True
-        except Exception as e:
-            self.logger.error(f"注册逐笔推送回调失败: {e}")
-            return False
+        return self._register_push_handler(handler, "逐笔")
     
     def register_rt_data_handler(self, handler) -> bool:
         """注册分时推送回调"""
-        try:
-            quote_ctx = self._get_quote_context()
-            quote_ctx.set_handler(handler)
-            self.logger.info("分时推送回调注册成功")
-            return True
-        except Exception as e:
-            self.logger.error(f"注册分时推送回调失败: {e}")
-            return False
+        return self._register_push_handler(handler, "分时")
     
     def register_broker_handler(self, handler) -> bool:
         """注册经纪队列推送回调"""
-        try:
-            quote_ctx = self._get_quote_context()
+        return self._register_push_handler(handler, "经纪队列")
+    
+    def restore_after_reconnect(self) -> bool:
+        """
+        连接重建后恢复推送回调与订阅（新的行情上下文不保留旧上下文的回调和订阅）
+
+        Returns:
+            bool: 是否全部恢复成功
+        """
+        quote_ctx = self._get_quote_context()
+        self.clear_request_cache()
+        with self._lock:
+            handlers = list(self._push_handlers)
+            types_by_code: Dict[str, List[str]] = defaultdict(list)
+            for sub_type, code_dict in self._subscriptions.items():
+                for code in code_dict:
+                    types_by_code[code].append(sub_type)
+
+        for handler in handlers:
             quote_ctx.set_handler(handler)
-            self.logger.info("经纪队列推送回调注册成功")
-            return True
-        except Exception as e:
-            self.logger.error(f"注册经纪队列推送回调失败: {e}")
-            return False
\ No newline at end of file
+
+        # 订阅类型相同的股票合并为一次订阅
+        batches: Dict[tuple, List[str]] = defaultdict(list)
+        for code, sub_types in types_by_code.items():
+            batches[tuple(sorted(sub_types))].append(code)
+
+        success = True
+        for sub_types, codes in batches.items():
+            futu_sub_types = [self._sub_type_map[st] for st in sub_types if st in self._sub_type_map]
+            ret, err_msg = quote_ctx.subscribe(codes, futu_sub_types, False)
+            if ret != ft.RET_OK:
+                self.logger.error(f"恢复订阅失败: {codes} -> {list(sub_types)}: {err_msg}")
+                success = False
+
+        self.logger.info(f"重连后恢复 {len(handlers)} 个推送回调、{len(types_by_code)} 只股票的订阅")
+        return success
+
+    # ================== 请求合并与缓存 ==================
+    
+    def clear_request_cache(self, kind: Optional[str] = None) -> None:
+        """清除查询缓存（kind 为数据类型，如 'order_book'，为空时清除全部）"""
+        if self._coalescer is not None:
+            self._coalescer.invalidate(kind)
+    
+    def get_request_stats(self) -> Dict[str, int]:
+        """查询统计：实际请求数、缓存命中数、合并的并发请求数"""
+        if self._coalescer is None:
+            return {}
+        return dict(self._coalescer.stats)
+    
+    # ================== 推送录制 ==================
+    
+    def enable_recording(self, root: Optional[str] = None, **kwargs):
+        """
+        启用推送录制：已注册和之后注册的报价/逐笔/买卖盘/K线回调收到的推送都写入推送日志
+        
+        Args:
+            root: 日志根目录，默认 PATH_DATA/push_journal
+            **kwargs: 传递给 PushRecorder 的参数
+        
+        Returns:
+            PushRecorder: 录制器
+        """
+        from .futu_journal import PushRecorder
+        
+        with self._lock:
+            if self._recorder is None:
+                self._recorder = PushRecorder(root, **kwargs)
+            recorder = self._recorder
+            handlers = list(self._push_handlers)
+        
+        for handler in handlers:
+            recorder.attach(handler)
+        self.logger.info(f"推送录制已启用: {recorder.root}")
+        return recorder
+    
+    def disable_recording(self) -> None:
+        """停止推送录制并写盘"""
+        with self._lock:
+            recorder, self._recorder = self._recorder, None
+        if recorder is not None:
+            recorder.close()
+            self.logger.info(f"推送录制已停止，共 {recorder.record_count} 条")
@@ -0,0 +1,154 @@
+"""
+富途客户端连接注册表
+
+进程内所有 FutuModuleBase 实例（FutuMarket、FutuTrade、监控界面的数据管理器、
+分析数据管理器、策略、AI 工具等）共享同一个 FutuClient：
+1. 按 (host, port, password_md5) 复用客户端，只建立一个行情上下文，交易上下文按市场各一个
+2. 引用计数：最后一个使用者释放时才取消订阅并断开连接
+3. 重连：在原客户端对象上重建上下文并恢复推送回调和订阅，使用者无需重新创建
+4. 健康状况：连接状态、引用计数、重连次数和最近错误
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..utils.global_vars import get_logger
+from .futu_factory import create_client
+
+# 连接注册表默认配置
+REGISTRY_CONFIG = {
+    'reconnect_retries': 3,     # 重连失败后的重试次数
+    'reconnect_delay': 2.0,     # 重试间隔（秒）
+}
+
+
+class ClientRegistry:
+    """
+    共享客户端注册表
+
+    factory 与 create_client 签名一致，用于创建新的客户端
+    """
+
+    def __init__(self, factory: Optional[Callable[..., Any]] = None,
+                 config: Optional[Dict[str, Any]] = None):
+        self.config = {**REGISTRY_CONFIG, **(config or {})}
+        self.logger = get_logger(__name__)
+        self._factory = factory or create_client
+        # {连接键: {'client': 客户端, 'refs': 引用计数}}
+        self._entries: Dict[Tuple, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _key(host: str, port: int, password_md5: Optional[str]) -> Tuple:
+        return (host, int(port), password_md5 or None)
+
+    def _find(self, client) -> Optional[Tuple]:
+        for key, entry in self._entries.items():
+            if entry['client'] is client:
+                return key
+        return None
+
+    def acquire(self, host: str = '127.0.0.1', port: int = 11111,
+                password_md5: Optional[str] = None, **kwargs):
+        """
+        获取共享客户端（不存在时创建），引用计数加 1
+
+        Args:
+            host: FutuOpenD 地址
+            port: FutuOpenD 端口
+            password_md5: 交易密码 MD5
+            **kwargs: 首次创建时传递给 create_client 的其他参数
+
+        Returns:
+            共享的客户端实例
+        """
+        key = self._key(host, port, password_md5)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                client = self._factory(host=host, port=int(port), password_md5=password_md5, **kwargs)
+                entry = self._entries[key] = {'client': client, 'refs': 0}
+                self.logger.info(f"创建共享富途客户端: {host}:{port}")
+            entry['refs'] += 1
+            return entry['client']
+
+    def release(self, client) -> bool:
+        """
+        释放共享客户端，引用计数减 1，最后一个使用者释放时取消订阅并断开连接
+
+        Returns:
+            bool: 是否已断开连接
+        """
+        with self._lock:
+            key = self._find(client)
+            if key is None:
+                return False
+            entry = self._entries[key]
+            entry['refs'] -= 1
+            if entry['refs'] > 0:
+                self.logger.debug(f"释放共享富途客户端，剩余引用 {entry['refs']}")
+                return False
+            del self._entries[key]
+
+        self._close(client)
+        return True
+
+    def _close(self, client) -> None:
+        try:
+            if client.is_connected and client.quote:
+                client.quote.unsubscribe_all()
+        except Exception as e:
+            self.logger.warning(f"取消订阅时出错: {e}")
+        try:
+            client.disconnect()
+            self.logger.info("共享富途客户端已断开")
+        except Exception as e:
+            self.logger.warning(f"断开连接时出错: {e}")
+
+    def refcount(self, client) -> int:
+        with self._lock:
+            key = self._find(client)
+            return self._entries[key]['refs'] if key is not None else 0
+
+    def reconnect(self, client) -> bool:
+        """
+        重连共享客户端（按配置重试），所有使用者继续持有原客户端
+
+        Returns:
+            bool: 是否重连成功
+        """
+        retries = self.config['reconnect_retries']
+        for attempt in range(retries + 1):
+            try:
+                client.reconnect()
+                return True
+            except Exception as e:
+                self.logger.warning(f"重连失败 ({attempt + 1}/{retries + 1}): {e}")
+                if attempt < retries:
+                    time.sleep(self.config['reconnect_delay'])
+        return False
+
+    def health(self) -> List[Dict[str, Any]]:
+        """所有共享客户端的健康状况"""
+        with self._lock:
+            entries = list(self._entries.items())
+
+        result = []
+        for (host, port, _), entry in entries:
+            client = entry['client']
+            status = client.health() if hasattr(client, 'health') else {'connected': client.is_connected}
+            result.append({'host': host, 'port': port, 'refs': entry['refs'], **status})
+        return result
+
+    def shutdown(self) -> None:
+        """断开所有共享客户端（进程退出时调用）"""
+        with self._lock:
+            clients = [entry['client'] for entry in self._entries.values()]
+            self._entries.clear()
+        for client in clients:
+            self._close(client)
+
+
+# 进程级共享注册表
+client_registry = ClientRegistry()
@@ -0,0 +1,659 @@
+"""
+富途模拟行情模块
+
+进程内的 OpenQuoteContext 替身，不需要 FutuOpenD，用于基准测试与行情回放：
+
+    sim = SimQuoteClient(push_rate=20)
+    sim.context.load_klines("HK.00700", kline_df)      # 录制的K线（可选，缺省生成随机游走数据）
+    sim.context.load_ticks("HK.00700", ticker_df)      # 录制的逐笔（可选，推送时按顺序回放）
+    market = FutuMarket(client=sim)                     # QuoteManager / FutuMarket 无需改动
+    sim.quote.register_stock_quote_handler(MyQuoteHandler())
+    sim.quote.subscribe(codes, ["quote", "ticker"])
+    sim.context.start()                                 # 后台按 push_rate 推送
+    ...
+    print(sim.context.stats())                          # 实际推送速率、回调耗时、落后步数
+
+与模拟撮合联动：sim.context.add_tick_listener(paper_client.trade.feed_tick)
+
+说明：
+1. 查询接口返回与富途 SDK 相同的 (ret, data) 格式和字段名，可配置固定的请求往返耗时
+2. 报价/买卖盘/逐笔/分时/当前K线查询与 FutuOpenD 一样要求先订阅，订阅额度可配置
+3. 推送直接调用已注册的富途 Handler（StockQuoteHandlerBase 等）的 on_recv_rsp，
+   回调中 super().on_recv_rsp() 返回与真实推送相同结构的 DataFrame
+4. 分钟K线与日K线共用同一条价格序列，只用于压测，不代表真实的分钟行情
+"""
+
+import threading
+import time
+import random
+import zlib
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from ..utils.global_vars import get_logger
+
+try:
+    import futu as ft
+except ImportError:
+    raise ImportError(
+        "futu-api is required. Install it with: pip install futu-api"
+    )
+
+# 模拟行情默认配置
+SIM_QUOTE_CONFIG = {
+    'push_rate': 10.0,        # 每只已订阅股票每秒推送次数
+    'query_latency': 0.0,     # 模拟查询请求往返耗时（秒）
+    'sub_quota': 1000,        # 订阅额度（股票数 x 订阅类型数）
+    'history_bars': 250,      # 随机生成的历史日K数量
+    'base_price': 100.0,      # 随机生成数据的起始价格
+    'volatility': 0.002,      # 随机游走的单步波动率
+    'tick_size': 0.01,        # 最小价位
+    'tick_interval': 3.0,     # 每步推进的模拟时间（秒）
+    'order_book_depth': 10,   # 买卖盘档数
+    'ticker_buffer': 1000,    # 保留的逐笔条数
+    'seed': 42,
+}
+
+# 需要先订阅才能查询的订阅类型
+_KLINE_SUB_TYPES = {
+    ft.SubType.K_1M, ft.SubType.K_5M, ft.SubType.K_15M, ft.SubType.K_30M,
+    ft.SubType.K_60M, ft.SubType.K_DAY, ft.SubType.K_WEEK, ft.SubType.K_MON,
+}
+
+
+class SimPush:
+    """模拟推送数据包，替代富途推送的 protobuf 消息传给 Handler.on_recv_rsp"""
+
+    __slots__ = ('content',)
+
+    def __init__(self, content: Any):
+        self.content = content
+
+
+def install_sim_parser(handler) -> None:
+    """
+    让富途 Handler 能解析 SimPush
+
+    Handler.on_recv_rsp 通过 self.parse_rsp_pb 解析消息，在实例上覆盖该方法，
+    SimPush 直接返回内容，其余消息仍交给原解析方法
+    """
+    if getattr(handler, '_sim_parser_installed', False):
+        return
+    original = handler.parse_rsp_pb
+
+    def parse_rsp_pb(rsp_pb):
+        if isinstance(rsp_pb, SimPush):
+            return ft.RET_OK, rsp_pb.content
+        return original(rsp_pb)
+
+    handler.parse_rsp_pb = parse_rsp_pb
+    handler._sim_parser_installed = True
+
+
+def handler_kind(handler) -> Optional[str]:
+    """Handler 对应的推送类型"""
+    if isinstance(handler, ft.StockQuoteHandlerBase):
+        return 'quote'
+    if isinstance(handler, ft.OrderBookHandlerBase):
+        return 'order_book'
+    if isinstance(handler, ft.CurKlineHandlerBase):
+        return 'kline'
+    if isinstance(handler, ft.TickerHandlerBase):
+        return 'ticker'
+    if isinstance(handler, ft.RTDataHandlerBase):
+        return 'rt_data'
+    return None
+
+
+class _SimStock:
+    """单只股票的模拟行情状态"""
+
+    def __init__(self, code: str, name: str, klines: List[Dict[str, Any]],
+                 rng: random.Random, config: Dict[str, Any]):
+        self.code = code
+        self.name = name
+        self.klines = klines
+        self.rng = rng
+        self.config = config
+
+        self.ticks: deque = deque()
+        self.tickers: deque = deque(maxlen=config['ticker_buffer'])
+        self.rt_data: List[Dict[str, Any]] = []
+        self.sequence = 0
+
+        prev_close = klines[-1]['close'] if klines else config['base_price']
+        self.prev_close = prev_close
+        self.last_price = prev_close
+        self.open_price = 0.0
+        self.high_price = prev_close
+        self.low_price = prev_close
+        self.volume = 0
+        self.turnover = 0.0
+        self.update_time = ''
+
+    def _next_tick(self, clock: datetime) -> Dict[str, Any]:
+        """下一笔成交：优先回放录制数据，否则随机游走"""
+        if self.ticks:
+            return self.ticks.popleft()
+        tick_size = self.config['tick_size']
+        price = self.last_price * (1 + self.rng.gauss(0, self.config['volatility']))
+        price = max(round(round(price / tick_size) * tick_size, 4), tick_size)
+        return {
+            'time': clock.strftime('%Y-%m-%d %H:%M:%S'),
+            'price': price,
+            'volume': self.rng.randint(1, 20) * 100,
+        }
+
+    def advance(self, clock: datetime) -> Dict[str, Any]:
+        """推进一笔成交并更新当日统计，返回逐笔数据"""
+        tick = self._next_tick(clock)
+        price = float(tick['price'])
+        volume = int(tick.get('volume') or 0)
+
+        if not self.open_price:
+            self.open_price = self.high_price = self.low_price = price
+        self.high_price = max(self.high_price, price)
+        self.low_price = min(self.low_price, price)
+        self.last_price = price
+        self.volume += volume
+        self.turnover += price * volume
+        self.update_time = str(tick.get('time') or clock.strftime('%Y-%m-%d %H:%M:%S'))
+        self.sequence += 1
+
+        ticker = {
+            'code': self.code, 'name': self.name, 'time': self.update_time,
+            'price': price, 'volume': volume, 'turnover': price * volume,
+            'ticker_direction': 'BUY' if price >= self.prev_close else 'SELL',
+            'sequence': self.sequence, 'type': 'AUTO_MATCH', 'push_data_type': 'REALTIME',
+        }
+        self.tickers.append(ticker)
+
+        minute = self.update_time[:16] + ':00'
+        point = {
+            'code': self.code, 'name': self.name, 'time': minute, 'is_blank': False,
+            'opened_mins': len(self.rt_data), 'cur_price': price, 'last_close': self.prev_close,
+            'avg_price': self.turnover / self.volume if self.volume else price,
+            'turnover': self.turnover, 'volume': self.volume,
+        }
+        if self.rt_data and self.rt_data[-1]['time'] == minute:
+            point['opened_mins'] = self.rt_data[-1]['opened_mins']
+            self.rt_data[-1] = point
+        else:
+            self.rt_data.append(point)
+        return ticker
+
+    # ================== 数据格式 ==================
+
+    def quote_row(self) -> Dict[str, Any]:
+        date_part, _, time_part = self.update_time.partition(' ')
+        return {
+            'code': self.code, 'name': self.name,
+            'data_date': date_part, 'data_time': time_part,
+            'last_price': self.last_price, 'open_price': self.open_price,
+            'high_price': self.high_price, 'low_price': self.low_price,
+            'prev_close_price': self.prev_close, 'volume': self.volume,
+            'turnover': self.turnover, 'turnover_rate': 0.0,
+            'amplitude': (self.high_price - self.low_price) / self.prev_close * 100 if self.prev_close else 0.0,
+            'suspension': False,
+        }
+
+    def snapshot_row(self) -> Dict[str, Any]:
+        row = self.quote_row()
+        row['update_time'] = self.update_time
+        return row
+
+    def today_bar(self, k_type: str = ft.KLType.K_DAY) -> Dict[str, Any]:
+        return {
+            'code': self.code, 'name': self.name,
+            'time_key': self.update_time[:10] + ' 00:00:00' if self.update_time else '',
+            'open': self.open_price or self.last_price, 'close': self.last_price,
+            'high': self.high_price, 'low': self.low_price,
+            'volume': self.volume, 'turnover': self.turnover,
+            'k_type': k_type, 'last_close': self.prev_close,
+            'pe_ratio': 0.0, 'turnover_rate': 0.0, 'change_rate': 0.0,
+        }
+
+    def order_book(self, depth: int) -> Dict[str, Any]:
+        tick_size = self.config['tick_size']
+        bids = [(round(self.last_price - tick_size * (i + 1), 4), 100 * (i + 1), i + 1, {})
+                for i in range(depth)]
+        asks = [(round(self.last_price + tick_size * (i + 1), 4), 100 * (i + 1), i + 1, {})
+                for i in range(depth)]
+        return {
+            'code': self.code, 'name': self.name,
+            'svr_recv_time_bid': self.update_time, 'svr_recv_time_ask': self.update_time,
+            'Bid': bids, 'Ask': asks,
+        }
+
+
+class SimQuoteContext:
+    """
+    模拟行情上下文，接口与 ft.OpenQuoteContext 一致（只实现 QuoteManager 用到的部分）
+
+    线程安全：推送线程与查询线程可同时访问
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, **kwargs):
+        """
+        Args:
+            config: 覆盖 SIM_QUOTE_CONFIG 的配置
+            **kwargs: 同 config，便于直接传入单个配置项
+        """
+        self.config = {**SIM_QUOTE_CONFIG, **(config or {}), **kwargs}
+        self.logger = get_logger(__name__)
+
+        self._stocks: Dict[str, _SimStock] = {}
+        self._subscriptions: Dict[str, set] = {}     # {订阅类型: {股票代码}}
+        self._handlers: Dict[str, Any] = {}
+        self._tick_listeners: List[Callable] = []
+        self._lock = threading.RLock()
+
+        self.clock = datetime.now().replace(hour=9, minute=30, second=0, microsecond=0)
+
+        # 推送线程与统计
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._reset_stats()
+
+    # ================== 数据加载 ==================
+
+    def _rng(self, code: str) -> random.Random:
+        """每只股票独立的随机数发生器，同一 seed 下结果可复现"""
+        return random.Random(self.config['seed'] * 1000003 + zlib.crc32(code.encode('utf-8')))
+
+    def _synthetic_klines(self, code: str, rng: random.Random) -> List[Dict[str, Any]]:
+        """随机游走生成历史日K"""
+        bars = []
+        price = self.config['base_price'] * rng.uniform(0.2, 5)
+        day = self.clock.date() - timedelta(days=1)
+        dates = []
+        while len(dates) < self.config['history_bars']:
+            if day.weekday() < 5:
+                dates.append(day)
+            day -= timedelta(days=1)
+
+        vol = self.config['volatility'] * 10
+        for bar_date in reversed(dates):
+            open_price = price
+            close = max(open_price * (1 + rng.gauss(0, vol)), self.config['tick_size'])
+            high = max(open_price, close) * (1 + abs(rng.gauss(0, vol / 2)))
+            low = min(open_price, close) * (1 - abs(rng.gauss(0, vol / 2)))
+            volume = rng.randint(1_000, 100_000) * 100
+            bars.append({
+                'code': code, 'time_key': f"{bar_date:%Y-%m-%d} 00:00:00",
+                'open': round(open_price, 2), 'close': round(close, 2),
+                'high': round(high, 2), 'low': round(low, 2),
+                'volume': volume, 'turnover': round(volume * close, 2),
+            })
+            price = close
+        return bars
+
+    def _stock(self, code: str) -> _SimStock:
+        """获取股票状态，未加载数据的股票自动生成随机数据"""
+        stock = self._stocks.get(code)
+        if stock is None:
+            rng = self._rng(code)
+            stock = _SimStock(code, code, self._synthetic_klines(code, rng), rng, self.config)
+            self._stocks[code] = stock
+        return stock
+
+    def load_klines(self, code: str, klines: Any, name: Optional[str] = None) -> None:
+        """
+        加载录制的历史K线（DataFrame 或字典列表，字段同 get_cur_kline）
+
+        最后一根K线的收盘价作为当日昨收
+        """
+        records = klines.to_dict('records') if isinstance(klines, pd.DataFrame) else list(klines)
+        records = [{**bar, 'code': code} for bar in records]
+        with self._lock:
+            self._stocks[code] = _SimStock(code, name or code, records, self._rng(code), self.config)
+
+    def load_ticks(self, code: str, ticks: Any) -> None:
+        """
+        加载录制的逐笔成交（DataFrame 或字典列表，需要 price，可选 volume / time）
+
+        推送时按顺序回放，回放完毕后转为随机游走
+        """
+        records = ticks.to_dict('records') if isinstance(ticks, pd.DataFrame) else list(ticks)
+        with self._lock:
+            self._stock(code).ticks.extend(records)
+
+    def add_tick_listener(self, listener: Callable) -> None:
+        """
+        添加逐笔监听，每笔模拟成交调用 listener(code, price, volume, time)
+
+        可直接传入 PaperTradeManager.feed_tick 驱动模拟撮合
+        """
+        self._tick_listeners.append(listener)
+
+    # ================== 查询接口 ==================
+
+    def _delay(self) -> None:
+        if self.config['query_latency'] > 0:
+            time.sleep(self.config['query_latency'])
+
+    def _require_subscription(self, codes: Iterable[str], sub_types: Iterable[str]) -> Optional[str]:
+        """检查订阅，未订阅时返回与 FutuOpenD 类似的错误信息"""
+        for code in codes:
+            if not any(code in self._subscriptions.get(sub_type, ()) for sub_type in sub_types):
+                return f"请先订阅 {code} 的 {'/'.join(sub_types)} 数据"
+        return None
+
+    def get_global_state(self):
+        self._delay()
+        return ft.RET_OK, {
+            'market_hk': 'MORNING', 'market_us': 'CLOSED', 'market_sh': 'MORNING',
+            'market_sz': 'MORNING', 'market_hkfuture': 'MORNING', 'market_usfuture': 'CLOSED',
+            'server_ver': 'sim', 'trd_logined': True, 'qot_logined': True,
+            'timestamp': str(int(time.time())), 'local_timestamp': time.time(),
+            'program_status_type': 'READY',
+        }
+
+    def get_market_state(self, code_list):
+        self._delay()
+        with self._lock:
+            rows = [{'code': code, 'stock_name': self._stock(code).name, 'market_state': 'MORNING'}
+                    for code in code_list]
+        return ft.RET_OK, pd.DataFrame(rows)
+
+    def get_market_snapshot(self, code_list):
+        self._delay()
+        with self._lock:
+            rows = [self._stock(code).snapshot_row() for code in code_list]
+        return ft.RET_OK, pd.DataFrame(rows)
+
+    def get_stock_quote(self, code_list):
+        self._delay()
+        with self._lock:
+            error = self._require_subscription(code_list, [ft.SubType.QUOTE])
+            if error:
+                return ft.RET_ERROR, error
+            rows = [self._stock(code).quote_row() for code in code_list]
+        return ft.RET_OK, pd.DataFrame(rows)
+
+    def get_cur_kline(self, code, num, ktype=ft.KLType.K_DAY, autype=ft.AuType.QFQ):
+        self._delay()
+        with self._lock:
+            error = self._require_subscription([code], [ktype])
+            if error:
+                return ft.RET_ERROR, error
+            stock = self._stock(code)
+            bars = [{**bar, 'k_type': ktype} for bar in stock.klines]
+            if stock.update_time:
+                bars.append(stock.today_bar(ktype))
+        return ft.RET_OK, pd.DataFrame(bars[-num:])
+
+    def request_history_kline(self, code, start=None, end=None, ktype=ft.KLType.K_DAY,
+                              autype=ft.AuType.QFQ, fields=None, max_count=1000,
+                              page_req_key=None, **kwargs):
+        self._delay()
+        with self._lock:
+            bars = self._stock(code).klines
+            selected = [
+                bar for bar in bars
+                if (not start or bar['time_key'][:10] >= start[:10])
+                and (not end or bar['time_key'][:10] <= end[:10])
+            ]
+        offset = int(page_req_key or 0)
+        page = selected[offset:offset + max_count] if max_count else selected[offset:]
+        next_key = offset + len(page) if max_count and offset + len(page) < len(selected) else None
+        return ft.RET_OK, pd.DataFrame(page), next_key
+
+    def get_order_book(self, code, num=10):
+        self._delay()
+        with self._lock:
+            error = self._require_subscription([code], [ft.SubType.ORDER_BOOK])
+            if error:
+                return ft.RET_ERROR, error
+            return ft.RET_OK, self._stock(code).order_book(min(num, self.config['order_book_depth']))
+
+    def get_rt_ticker(self, code, num=500):
+        self._delay()
+        with self._lock:
+            error = self._require_subscription([code], [ft.SubType.TICKER])
+            if error:
+                return ft.RET_ERROR, error
+            rows = list(self._stock(code).tickers)[-num:]
+        return ft.RET_OK, pd.DataFrame(rows)
+
+    def get_rt_data(self, code):
+        self._delay()
+        with self._lock:
+            error = self._require_subscription([code], [ft.SubType.RT_DATA])
+            if error:
+                return ft.RET_ERROR, error
+            rows = list(self._stock(code).rt_data)
+        return ft.RET_OK, pd.DataFrame(rows)
+
+    # ================== 订阅与推送 ==================
+
+    def _used_quota(self) -> int:
+        return sum(len(codes) for codes in self._subscriptions.values())
+
+    def subscribe(self, code_list, subtype_list, is_first_push=True, *args, **kwargs):
+        with self._lock:
+            new = sum(1 for sub_type in subtype_list for code in code_list
+                      if code not in self._subscriptions.get(sub_type, ()))
+            if self._used_quota() + new > self.config['sub_quota']:
+                return ft.RET_ERROR, f"订阅额度不足: 已用 {self._used_quota()}, 需要 {new}"
+
+            for sub_type in subtype_list:
+                self._subscriptions.setdefault(sub_type, set()).update(code_list)
+                for code in code_list:
+                    self._stock(code)
+
+        if is_first_push:
+            for code in code_list:
+                self._dispatch(code, set(subtype_list))
+        return ft.RET_OK, None
+
+    def unsubscribe(self, code_list, subtype_list, *args, **kwargs):
+        with self._lock:
+            for sub_type in subtype_list:
+                self._subscriptions.get(sub_type, set()).difference_update(code_list)
+        return ft.RET_OK, None
+
+    def unsubscribe_all(self):
+        with self._lock:
+            self._subscriptions.clear()
+        return ft.RET_OK, None
+
+    def query_subscription(self, is_all_conn=True):
+        with self._lock:
+            used = self._used_quota()
+            sub_list = {sub_type: sorted(codes) for sub_type, codes in self._subscriptions.items() if codes}
+        return ft.RET_OK, {
+            'total_used': used, 'own_used': used,
+            'remain': self.config['sub_quota'] - used, 'sub_list': sub_list,
+        }
+
+    def set_handler(self, handler):
+        kind = handler_kind(handler)
+        if kind is None:
+            return ft.RET_ERROR
+        install_sim_parser(handler)
+        self._handlers[kind] = handler
+        return ft.RET_OK
+
+    def _subscribed_types(self, code: str) -> set:
+        return {sub_type for sub_type, codes in self._subscriptions.items() if code in codes}
+
+    def _dispatch(self, code: str, sub_types: set) -> int:
+        """按订阅类型调用对应 Handler，返回推送次数"""
+        with self._lock:
+            stock = self._stock(code)
+            payloads = []
+            for sub_type in sub_types:
+                if sub_type == ft.SubType.QUOTE:
+                    payloads.append(('quote', [stock.quote_row()]))
+                elif sub_type == ft.SubType.ORDER_BOOK:
+                    payloads.append(('order_book', stock.order_book(self.config['order_book_depth'])))
+                elif sub_type == ft.SubType.TICKER:
+                    payloads.append(('ticker', list(stock.tickers)[-1:]))
+                elif sub_type == ft.SubType.RT_DATA:
+                    payloads.append(('rt_data', stock.rt_data[-1:]))
+                elif sub_type in _KLINE_SUB_TYPES:
+                    payloads.append(('kline', [stock.today_bar(sub_type)]))
+
+        pushes = 0
+        for kind, content in payloads:
+            handler = self._handlers.get(kind)
+            if handler is None or not content:
+                continue
+            started = time.perf_counter()
+            try:
+                handler.on_recv_rsp(SimPush(content))
+            except Exception as e:
+                self.logger.warning(f"模拟推送回调异常 {kind} {code}: {e}")
+            elapsed = time.perf_counter() - started
+            self._handler_time += elapsed
+            self._max_handler_time = max(self._max_handler_time, elapsed)
+            pushes += 1
+        self.push_count += pushes
+        return pushes
+
+    def step(self, codes: Optional[Iterable[str]] = None) -> int:
+        """
+        所有已订阅股票（或指定股票）各推进一笔成交并推送
+
+        Returns:
+            本步推送次数
+        """
+        with self._lock:
+            self.clock += timedelta(seconds=self.config['tick_interval'])
+            if codes is None:
+                codes = set().union(*self._subscriptions.values()) if self._subscriptions else set()
+            ticks = []
+            for code in codes:
+                ticker = self._stock(code).advance(self.clock)
+                ticks.append(ticker)
+
+        pushes = 0
+        for ticker in ticks:
+            for listener in self._tick_listeners:
+                listener(ticker['code'], ticker['price'], ticker['volume'], ticker['time'])
+            pushes += self._dispatch(ticker['code'], self._subscribed_types(ticker['code']))
+        self.step_count += 1
+        return pushes
+
+    # ================== 推送线程 ==================
+
+    def start(self, push_rate: Optional[float] = None) -> None:
+        """按 push_rate（每秒步数）在后台持续推送"""
+        if self._thread and self._thread.is_alive():
+            return
+        if push_rate:
+            self.config['push_rate'] = push_rate
+        self._reset_stats()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="SimQuotePush", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def run(self, duration: float, push_rate: Optional[float] = None) -> Dict[str, Any]:
+        """在当前线程推送 duration 秒后返回统计"""
+        if push_rate:
+            self.config['push_rate'] = push_rate
+        self._reset_stats()
+        self._stop_event.clear()
+        self._run(time.perf_counter() + duration)
+        return self.stats()
+
+    def _run(self, deadline: Optional[float] = None) -> None:
+        interval = 1.0 / self.config['push_rate']
+        next_at = time.perf_counter()
+        while not self._stop_event.is_set():
+            self.step()
+            next_at += interval
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                self._stop_event.wait(delay)
+            else:
+                # 回调处理不过来，记录落后的步数并重新对齐节拍
+                self.lagged_steps += 1
+                next_at = time.perf_counter()
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        self._stopped_at = time.perf_counter()
+
+    def _reset_stats(self) -> None:
+        self.push_count = 0
+        self.step_count = 0
+        self.lagged_steps = 0
+        self._handler_time = 0.0
+        self._max_handler_time = 0.0
+        self._started_at = time.perf_counter()
+        self._stopped_at: Optional[float] = None
+
+    def stats(self) -> Dict[str, Any]:
+        """推送统计：实际推送速率、回调平均/最大耗时、因回调过慢落后的步数"""
+        elapsed = (self._stopped_at or time.perf_counter()) - self._started_at
+        with self._lock:
+            codes = len(set().union(*self._subscriptions.values())) if self._subscriptions else 0
+        return {
+            'codes': codes,
+            'steps': self.step_count,
+            'pushes': self.push_count,
+            'elapsed': elapsed,
+            'target_step_rate': self.config['push_rate'],
+            'steps_per_sec': self.step_count / elapsed if elapsed > 0 else 0.0,
+            'pushes_per_sec': self.push_count / elapsed if elapsed > 0 else 0.0,
+            'avg_handler_ms': self._handler_time / self.push_count * 1000 if self.push_count else 0.0,
+            'max_handler_ms': self._max_handler_time * 1000,
+            'lagged_steps': self.lagged_steps,
+        }
+
+    def close(self) -> None:
+        self.stop()
+
+
+class SimQuoteClient:
+    """
+    模拟行情客户端
+
+    提供与 FutuClient 相同的 quote 属性与连接接口，可直接传给 FutuMarket(client=...)
+    """
+
+    is_simulated = True
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, **kwargs):
+        self.context = SimQuoteContext(config, **kwargs)
+        self._quote_ctx = self.context
+        self._quote_manager = None
+        self._connected = True
+        self._unlocked = False
+
+    @property
+    def quote(self):
+        """行情管理器（真实的 QuoteManager，底层为模拟上下文）"""
+        if self._quote_manager is None:
+            from .futu_quote import QuoteManager
+            self._quote_manager = QuoteManager(self)
+        return self._quote_manager
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    @property
+    def is_unlocked(self) -> bool:
+        return self._unlocked
+
+    def connect(self) -> bool:
+        self._connected = True
+        return True
+
+    def disconnect(self):
+        self.context.stop()
+        self._connected = False
+
+    def __repr__(self):
+        return f"SimQuoteClient(stocks={len(self.context._stocks)})"
@@ -22,6 +22,34 @@ except ImportError:
     )
 
 
+class _TradeOrderPushHandler(ft.TradeOrderHandlerBase):
+    """订单推送处理器：将解析后的推送 DataFrame 转交回调函数"""
+
+    def __init__(self, callback_func):
+        super().__init__()
+        self.callback_func = callback_func
+
+    def on_recv_rsp(self, rsp_pb):
+        ret_code, data = super().on_recv_rsp(rsp_pb)
+        if ret_code == ft.RET_OK:
+            self.callback_func(data)
+        return ret_code, data
+
+
+class _TradeDealPushHandler(ft.TradeDealHandlerBase):
+    """成交推送处理器：将解析后的推送 DataFrame 转交回调函数"""
+
+    def __init__(self, callback_func):
+        super().__init__()
+        self.callback_func = callback_func
+
+    def on_recv_rsp(self, rsp_pb):
+        ret_code, data = super().on_recv_rsp(rsp_pb)
+        if ret_code == ft.RET_OK:
+            self.callback_func(data)
+        return ret_code, data
+
+
 class TradeManager:
     """富途交易管理器"""
     
@@ -1015,12 +1043,11 @@ class TradeManager:
         设置订单推送回调
         
         Args:
-            callback_func: 回调函数
+            callback_func: 回调函数，参数为订单推送 DataFrame
             market: 市场代码
         """
         try:
-            trade_ctx = self._get_trade_context(market)
-            trade_ctx.set_handler(ft.OrderStatus, callback_func)
+            self.client.set_trade_handler(_TradeOrderPushHandler(callback_func), market)
             self.logger.debug("订单推送回调设置成功")
             
         except Exception as e:
@@ -1032,12 +1059,11 @@ class TradeManager:
         设置成交推送回调
         
         Args:
-            callback_func: 回调函数
+            callback_func: 回调函数，参数为成交推送 DataFrame
             market: 市场代码
         """
         try:
-            trade_ctx = self._get_trade_context(market)
-            trade_ctx.set_handler(ft.DealStatus, callback_func)
+            self.client.set_trade_handler(_TradeDealPushHandler(callback_func), market)
             self.logger.debug("成交推送回调设置成功")
             
         except Exception as e:
@@ -1052,9 +1078,8 @@ class TradeManager:
             market: 市场代码
         """
         try:
-            trade_ctx = self._get_trade_context(market)
-            ret, data = trade_ctx.subscribe(subtype_list=[ft.SubType.ORDER])
-            self._handle_response(ret, data, "订单推送订阅")
+            # 交易上下文连接后 SDK 自动订阅账户推送，设置回调即可收到订单推送
+            self._get_trade_context(market)
             self.logger.debug("订单推送订阅启用成功")
             
         except Exception as e:
@@ -1069,9 +1094,8 @@ class TradeManager:
             market: 市场代码
         """
         try:
-            trade_ctx = self._get_trade_context(market)
-            ret, data = trade_ctx.subscribe(subtype_list=[ft.SubType.DEAL])
-            self._handle_response(ret, data, "成交推送订阅")
+            # 交易上下文连接后 SDK 自动订阅账户推送，设置回调即可收到成交推送
+            self._get_trade_context(market)
             self.logger.debug("成交推送订阅启用成功")
             
         except Exception as e:
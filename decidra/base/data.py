@@ -30,6 +30,8 @@ from tenacity import (
     retry_if_exception_type,
 )
 
+from . import indicators
+
 # 配置日志
 logger = logging.getLogger(__name__)
 
@@ -196,13 +198,12 @@ class BaseFetcher(ABC):
         df = df.copy()
         
         # 移动平均线
-        df['ma5'] = df['close'].rolling(window=5, min_periods=1).mean()
-        df['ma10'] = df['close'].rolling(window=10, min_periods=1).mean()
-        df['ma20'] = df['close'].rolling(window=20, min_periods=1).mean()
+        close = df['close'].to_numpy(dtype=float)
+        for period in (5, 10, 20):
+            df[f'ma{period}'] = indicators.ma(close, period, min_periods=1)
         
-        # 量比：当日成交量 / 5日平均成交量
-        avg_volume_5 = df['volume'].rolling(window=5, min_periods=1).mean()
-        df['volume_ratio'] = df['volume'] / avg_volume_5.shift(1)
+        # 量比：当日成交量 / 前5日平均成交量
+        df['volume_ratio'] = indicators.volume_ratio(df['volume'].to_numpy(dtype=float), 5, min_periods=1)
         df['volume_ratio'] = df['volume_ratio'].fillna(1.0)
         
         # 保留2位小数
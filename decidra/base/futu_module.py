@@ -12,7 +12,7 @@ from ..utils import logger
 from ..utils.global_vars import *
 
 # 使用新的API封装
-from ..api.futu import create_client
+from ..api.futu import client_registry
 from .futu_class import FutuException
 
 
@@ -23,8 +23,13 @@ class FutuModuleBase:
     提供连接管理和基础功能，其他功能类继承此类
     """
     
-    def __init__(self):
-        """初始化富途基础管理器"""
+    def __init__(self, client=None):
+        """
+        初始化富途基础管理器
+
+        Args:
+            client: 可选的客户端实例（如 PaperClient 模拟客户端），为空时使用进程内共享的 FutuClient
+        """
         self.config = config
         self.logger = get_logger("futu_base")
 
@@ -39,9 +44,16 @@ class FutuModuleBase:
         # 连接状态标志
         self._is_closed = False
         
-        # 创建客户端
+        # 使用外部传入的客户端
+        self._shared_client = client is None
+        if client is not None:
+            self.client = client
+            self.logger.info(f"FutuBase initialized with {client!r}")
+            return
+
+        # 获取共享客户端（同一 FutuOpenD 只建立一组连接）
         try:
-            self.client = create_client(
+            self.client = client_registry.acquire(
                 host=self.host,
                 port=self.port,
                 password_md5=self.password_md5
@@ -63,6 +75,15 @@ class FutuModuleBase:
             return self.get_connection_state()
         return _re
 
+    def reconnect(self) -> bool:
+        """重建连接，推送回调与订阅自动恢复（共享客户端的其他模块同时恢复）"""
+        self._is_closed = False
+        if getattr(self, '_shared_client', False):
+            return client_registry.reconnect(self.client)
+        if hasattr(self.client, 'reconnect'):
+            return self.client.reconnect()
+        self.client.disconnect()
+        return self.client.connect()
 
     def close(self):
         """优雅关闭连接"""
@@ -74,6 +95,12 @@ class FutuModuleBase:
         self._is_closed = True
             
         try:
+            # 共享客户端只释放引用，最后一个使用者释放时由注册表取消订阅并断开
+            if getattr(self, '_shared_client', False):
+                if client_registry.release(self.client):
+                    self.logger.info("富途连接已关闭")
+                return
+            
             self.logger.info("开始关闭富途连接...")
             
             # 1. 先取消所有订阅（快速操作）
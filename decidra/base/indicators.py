@@ -0,0 +1,390 @@
+"""
+技术指标计算库
+
+统一的 NumPy 向量化实现，供分析页面、数据源、趋势分析器和策略共用：
+- 批量模式：输入一维序列或二维面板（行为时间、列为股票），沿时间轴计算，返回同形状的 ndarray，
+  数据不足的位置为 NaN；每列开头的 NaN 视为该股票尚无数据
+- 流式模式：Streaming* 类逐根更新，结果与批量模式一致，输入可以是单个值或一行面板数据
+
+指数平滑（EMA/Wilder）按块使用闭式解计算，避免逐点的 Python 循环
+"""
+
+from collections import deque
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+ArrayLike = Union[np.ndarray, list, tuple]
+
+# 指数平滑分块计算时单块内允许的最大放大倍数（越小精度越高、块越多）
+_MAX_BLOCK_GAIN = 1e4
+
+
+# ================== 基础工具 ==================
+
+def _as_panel(values: ArrayLike) -> Tuple[np.ndarray, bool]:
+    """转换为 (时间, 股票) 二维浮点数组，返回是否为一维输入"""
+    arr = np.asarray(values, dtype=float)
+    if arr.ndim == 1:
+        return arr[:, None], True
+    if arr.ndim != 2:
+        raise ValueError(f"指标输入必须为一维或二维数组，实际为 {arr.ndim} 维")
+    return arr, False
+
+
+def _restore(result: np.ndarray, is_1d: bool) -> np.ndarray:
+    return result[:, 0] if is_1d else result
+
+
+def _first_valid(x: np.ndarray) -> np.ndarray:
+    """每列第一个非 NaN 的位置（全为 NaN 时为行数）"""
+    valid = ~np.isnan(x)
+    first = valid.argmax(axis=0)
+    first[~valid.any(axis=0)] = len(x)
+    return first
+
+
+def _ffill(x: np.ndarray) -> np.ndarray:
+    """沿时间轴向前填充 NaN（开头的 NaN 保留）"""
+    mask = np.isnan(x)
+    if not mask.any():
+        return x
+    idx = np.where(~mask, np.arange(len(x))[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    filled = x[idx, np.arange(x.shape[1])]
+    filled[np.arange(len(x))[:, None] < _first_valid(x)[None, :]] = np.nan
+    return filled
+
+
+def _mask_warmup(result: np.ndarray, first: np.ndarray, min_periods: int) -> np.ndarray:
+    """把每列有效数据不足 min_periods 的位置置为 NaN"""
+    if min_periods > 0 or first.any():
+        rows = np.arange(len(result))[:, None]
+        result[rows < (first + max(min_periods, 1) - 1)[None, :]] = np.nan
+    return result
+
+
+def _linear_filter(x: np.ndarray, beta: float) -> np.ndarray:
+    """
+    沿时间轴计算 y[t] = beta * y[t-1] + x[t]（y[-1] = 0）
+
+    块内闭式解 y[s+k] = beta^k * (beta * y[s-1] + Σ x[s+i] / beta^i)，
+    块长度保证 1 / beta^k 不超过 _MAX_BLOCK_GAIN
+    """
+    if beta <= 0:
+        return x.copy()
+    n = len(x)
+    block = n if beta >= 1 else max(1, int(np.log(_MAX_BLOCK_GAIN) / -np.log(beta)))
+    powers = beta ** np.arange(min(block, n))[:, None]
+    out = np.empty_like(x)
+    prev = np.zeros(x.shape[1])
+    for start in range(0, n, block):
+        seg = x[start:start + block]
+        p = powers[:len(seg)]
+        out[start:start + len(seg)] = p * (beta * prev + np.cumsum(seg / p, axis=0))
+        prev = out[start + len(seg) - 1]
+    return out
+
+
+def _rolling_sum(x: np.ndarray, period: int) -> np.ndarray:
+    csum = np.cumsum(x, axis=0)
+    csum[period:] = csum[period:] - csum[:-period]
+    return csum
+
+
+def _resolve_alpha(period: Optional[int], alpha: Optional[float], com: Optional[float]) -> float:
+    if alpha is not None:
+        return float(alpha)
+    if com is not None:
+        return 1.0 / (1.0 + com)
+    if period is None:
+        raise ValueError("需要指定 period、alpha 或 com")
+    return 2.0 / (period + 1.0)
+
+
+# ================== 批量指标 ==================
+
+def ma(values: ArrayLike, period: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    简单移动平均（与 pandas rolling(period, min_periods).mean() 一致）
+
+    Args:
+        values: 一维序列或二维面板
+        period: 周期
+        min_periods: 窗口内最少有效值数量，默认等于 period
+    """
+    x, is_1d = _as_panel(values)
+    min_periods = period if min_periods is None else min_periods
+    valid = ~np.isnan(x)
+    sums = _rolling_sum(np.where(valid, x, 0.0), period)
+    counts = _rolling_sum(valid.astype(float), period)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = sums / counts
+    result[counts < max(min_periods, 1)] = np.nan
+    return _restore(result, is_1d)
+
+
+def ema(values: ArrayLike, period: Optional[int] = None, *, alpha: Optional[float] = None,
+        com: Optional[float] = None, adjust: bool = False, min_periods: int = 0) -> np.ndarray:
+    """
+    指数移动平均（与 pandas ewm(span=period / alpha / com, adjust, min_periods).mean() 一致）
+
+    adjust=False 时首个值等于首个价格；adjust=True 时为按权重归一化的平均。
+    序列中间的 NaN 按前值填充
+    """
+    x, is_1d = _as_panel(values)
+    a = _resolve_alpha(period, alpha, com)
+    beta = 1.0 - a
+    first = _first_valid(x)
+    x = np.nan_to_num(_ffill(x), nan=0.0)
+    rows = np.arange(len(x))[:, None]
+    started = rows >= first[None, :]
+
+    if adjust:
+        num = _linear_filter(x, beta)
+        den = _linear_filter(started.astype(float), beta)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = num / den
+    else:
+        # 首个有效值直接作为初值，之后 y = beta * y + a * x
+        seed = rows == first[None, :]
+        result = _linear_filter(np.where(seed, x, a * x), beta)
+    result[~started] = np.nan
+    return _restore(_mask_warmup(result, first, min_periods), is_1d)
+
+
+def rsi(close: ArrayLike, period: int = 14, method: str = 'wilder') -> np.ndarray:
+    """
+    相对强弱指标
+
+    Args:
+        close: 收盘价
+        period: 周期
+        method: 'wilder' 为 Wilder 平滑（与 pandas ewm(com=period-1, min_periods=period) 一致），
+                'sma' 为最近 period 个涨跌幅的简单平均
+    """
+    x, is_1d = _as_panel(close)
+    diff = np.diff(x, axis=0)
+    gains = np.where(diff > 0, diff, 0.0)
+    losses = np.where(diff < 0, -diff, 0.0)
+    gains[np.isnan(diff)] = np.nan
+    losses[np.isnan(diff)] = np.nan
+
+    if method == 'sma':
+        avg_gain, avg_loss = ma(gains, period), ma(losses, period)
+    elif method == 'wilder':
+        avg_gain = ema(gains, com=period - 1, adjust=True, min_periods=period)
+        avg_loss = ema(losses, com=period - 1, adjust=True, min_periods=period)
+    else:
+        raise ValueError(f"不支持的 RSI 计算方式: {method}")
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        values = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    # 无下跌时 RSI 为 100
+    values[(avg_loss == 0) & (avg_gain > 0)] = 100.0
+    result = np.full_like(x, np.nan)
+    result[1:] = values
+    return _restore(result, is_1d)
+
+
+def macd(close: ArrayLike, fast: int = 12, slow: int = 26, signal: int = 9
+         ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD
+
+    Returns:
+        (DIF, DEA, DIF - DEA)
+    """
+    dif = ema(close, fast) - ema(close, slow)
+    dea = ema(dif, signal)
+    return dif, dea, dif - dea
+
+
+def rolling_max(values: ArrayLike, period: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """滚动最大值（忽略 NaN）"""
+    return _rolling_extreme(values, period, min_periods, np.fmax, -np.inf)
+
+
+def rolling_min(values: ArrayLike, period: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """滚动最小值（忽略 NaN）"""
+    return _rolling_extreme(values, period, min_periods, np.fmin, np.inf)
+
+
+def _rolling_extreme(values, period, min_periods, ufunc, fill) -> np.ndarray:
+    x, is_1d = _as_panel(values)
+    min_periods = period if min_periods is None else min_periods
+    padded = np.concatenate([np.full((period - 1, x.shape[1]), fill), x])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, period, axis=0)
+    result = ufunc.reduce(windows, axis=-1)
+    counts = _rolling_sum((~np.isnan(x)).astype(float), period)
+    result[counts < max(min_periods, 1)] = np.nan
+    return _restore(result, is_1d)
+
+
+def kdj(high: ArrayLike, low: ArrayLike, close: ArrayLike, n: int = 9, m1: int = 3, m2: int = 3
+        ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    KDJ 随机指标（RSV 取最近 n 根的最高/最低价，不足 n 根时取已有K线；K、D 为 com=m-1 的平滑）
+
+    最高价等于最低价时 RSV 取 50
+
+    Returns:
+        (K, D, J)
+    """
+    hh = rolling_max(high, n, min_periods=1)
+    ll = rolling_min(low, n, min_periods=1)
+    close_arr = np.asarray(close, dtype=float)
+    span = hh - ll
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rsv = np.where(span > 0, (close_arr - ll) / span * 100.0, 50.0)
+    rsv[np.isnan(span) | np.isnan(close_arr)] = np.nan
+    k = ema(rsv, com=m1 - 1, adjust=True)
+    d = ema(k, com=m2 - 1, adjust=True)
+    return k, d, 3.0 * k - 2.0 * d
+
+
+def bollinger(close: ArrayLike, period: int = 20, width: float = 2.0, ddof: int = 0
+              ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    布林带
+
+    Returns:
+        (中轨, 上轨, 下轨)
+    """
+    x, is_1d = _as_panel(close)
+    mid = ma(x, period)
+    sq_mean = ma(x * x, period)
+    var = np.maximum(sq_mean - mid * mid, 0.0)
+    if ddof:
+        var = var * period / (period - ddof)
+    std = np.sqrt(var)
+    return _restore(mid, is_1d), _restore(mid + width * std, is_1d), _restore(mid - width * std, is_1d)
+
+
+def atr(high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 14) -> np.ndarray:
+    """平均真实波幅（真实波幅的 Wilder 平滑）"""
+    h, is_1d = _as_panel(high)
+    l, _ = _as_panel(low)
+    c, _ = _as_panel(close)
+    prev_close = np.vstack([np.full((1, c.shape[1]), np.nan), c[:-1]])
+    tr = np.fmax(h - l, np.fmax(np.abs(h - prev_close), np.abs(l - prev_close)))
+    return _restore(ema(tr, alpha=1.0 / period, min_periods=period), is_1d)
+
+
+def bias(close: ArrayLike, period: int) -> np.ndarray:
+    """乖离率 (收盘价 - 均线) / 均线 * 100"""
+    x = np.asarray(close, dtype=float)
+    avg = ma(x, period)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (x - avg) / avg * 100.0
+
+
+def volume_ratio(volume: ArrayLike, period: int = 5, min_periods: Optional[int] = None) -> np.ndarray:
+    """量比：当期成交量 / 此前 period 期平均成交量（第一期为 NaN）"""
+    x, is_1d = _as_panel(volume)
+    avg = ma(x, period, min_periods)
+    result = np.full_like(x, np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result[1:] = x[1:] / avg[:-1]
+    return _restore(result, is_1d)
+
+
+# ================== 流式指标 ==================
+
+def _nan_like(value):
+    """与输入形状相同的 NaN（单个值时返回 float）"""
+    return np.full(np.shape(value), np.nan) if np.ndim(value) else np.nan
+
+
+class StreamingMA:
+    """流式简单移动平均（与 ma 一致，不足 period 根时为 NaN）"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self._window: deque = deque(maxlen=period)
+        self._sum = 0.0
+
+    def update(self, value):
+        value = np.asarray(value, dtype=float)
+        if len(self._window) == self.period:
+            self._sum = self._sum - self._window[0]
+        self._window.append(value)
+        self._sum = self._sum + value
+        return self.value
+
+    @property
+    def value(self):
+        if len(self._window) < self.period:
+            return _nan_like(self._sum)
+        return self._sum / self.period
+
+
+class StreamingEMA:
+    """流式指数移动平均（参数含义与 ema 相同）"""
+
+    def __init__(self, period: Optional[int] = None, *, alpha: Optional[float] = None,
+                 com: Optional[float] = None, adjust: bool = False, min_periods: int = 0):
+        self.alpha = _resolve_alpha(period, alpha, com)
+        self.adjust = adjust
+        self.min_periods = min_periods
+        self.count = 0
+        self._num = None
+        self._den = 0.0
+
+    def update(self, value):
+        value = np.asarray(value, dtype=float)
+        beta = 1.0 - self.alpha
+        if self._num is None:
+            self._num, self._den = value, 1.0
+        elif self.adjust:
+            self._num = beta * self._num + value
+            self._den = beta * self._den + 1.0
+        else:
+            self._num = beta * self._num + self.alpha * value
+        self.count += 1
+        return self.value
+
+    @property
+    def value(self):
+        if self._num is None:
+            return np.nan
+        if self.count < self.min_periods:
+            return _nan_like(self._num)
+        return self._num / self._den
+
+
+class StreamingRSI:
+    """流式 RSI（Wilder 平滑，与 rsi(method='wilder') 一致）"""
+
+    def __init__(self, period: int = 14):
+        self._prev = None
+        self._gain = StreamingEMA(com=period - 1, adjust=True, min_periods=period)
+        self._loss = StreamingEMA(com=period - 1, adjust=True, min_periods=period)
+
+    def update(self, close):
+        close = np.asarray(close, dtype=float)
+        if self._prev is None:
+            self._prev = close
+            return _nan_like(close)
+        diff = close - self._prev
+        self._prev = close
+        avg_gain = self._gain.update(np.where(diff > 0, diff, 0.0))
+        avg_loss = self._loss.update(np.where(diff < 0, -diff, 0.0))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            value = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        value = np.where((avg_loss == 0) & (avg_gain > 0), 100.0, value)
+        return value if np.ndim(value) else float(value)
+
+
+class StreamingMACD:
+    """流式 MACD，update 返回 (DIF, DEA, DIF - DEA)"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self._fast = StreamingEMA(fast)
+        self._slow = StreamingEMA(slow)
+        self._signal = StreamingEMA(signal)
+
+    def update(self, close):
+        dif = self._fast.update(close) - self._slow.update(close)
+        dea = self._signal.update(dif)
+        return dif, dea, dif - dea
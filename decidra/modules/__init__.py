@@ -1,33 +1,52 @@
-# 导入其他模块
-
-from .futu_market import FutuMarket
-from .ai.claude_ai_client import ClaudeAIClient, AIAnalysisRequest, AIAnalysisResponse, create_claude_client, quick_stock_analysis
-
 #对应https://openapi.futunn.com/futu-api-doc/quote/overview.html
 """
 富途API模块
 提供统一的富途OpenAPI封装和基础功能
+
+包内导出按需加载：富途 SDK、pandas、AI SDK 导入较慢，导入子模块
+（如 decidra.modules.futu_market）或首次访问导出名时才加载对应模块
 """
 
-import time
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+import importlib
+from typing import TYPE_CHECKING
+
+# 导出名 -> 所在模块（相对本包）
+_LAZY_EXPORTS = {
+    'FutuMarket': '.futu_market',
+    'ClaudeAIClient': '.ai.claude_ai_client',
+    'AIAnalysisRequest': '.ai.claude_ai_client',
+    'AIAnalysisResponse': '.ai.claude_ai_client',
+    'create_claude_client': '.ai.claude_ai_client',
+    'quick_stock_analysis': '.ai.claude_ai_client',
+    'create_client': '..api.futu',
+    'FutuException': '..base.futu_class',
+}
+
+if TYPE_CHECKING:
+    from .futu_market import FutuMarket
+    from .ai.claude_ai_client import ClaudeAIClient, AIAnalysisRequest, AIAnalysisResponse, create_claude_client, quick_stock_analysis
+    from ..api.futu import create_client
+    from ..base.futu_class import FutuException
 
-from ..utils import logger
-from ..utils.global_vars import *
 
-# 使用新的API封装
-from ..api.futu import create_client
-from ..base.futu_class import FutuException
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
 
 __all__ = [
-    'FutuMarket', 
-    'ClaudeAIClient', 
-    'AIAnalysisRequest', 
-    'AIAnalysisResponse', 
-    'create_claude_client', 
+    'FutuMarket',
+    'ClaudeAIClient',
+    'AIAnalysisRequest',
+    'AIAnalysisResponse',
+    'create_claude_client',
     'quick_stock_analysis'
 ]
-
-
@@ -0,0 +1,171 @@
+"""
+账户状态内存镜像
+
+供 FutuTrade 风控检查使用，避免每笔买单都同步查询持仓与账户资金：
+1. 启用同步时查询一次持仓、账户资金和当日订单作为初始状态
+2. 之后由订单推送 / 成交推送增量更新持仓与未成交挂单
+3. 超过对账间隔后重新查询对账，修正推送遗漏或资金变化造成的偏差
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# 账户状态默认配置
+ACCOUNT_STATE_CONFIG = {
+    'reconcile_interval': 300,  # 对账间隔（秒），超过后风控检查前重新查询
+}
+
+# 仍占用资金的订单状态
+OPEN_ORDER_STATUSES = {"UNSUBMITTED", "WAITING_SUBMIT", "SUBMITTING", "SUBMITTED", "FILLED_PART"}
+
+
+def _status_name(value: Any) -> str:
+    """订单状态统一为大写字符串（兼容富途枚举与字符串）"""
+    return str(getattr(value, 'name', value) or '').upper()
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class AccountState:
+    """
+    单个 (交易环境, 市场) 的账户状态
+
+    所有方法线程安全，推送回调线程与下单线程可同时访问
+    """
+
+    def __init__(self, trd_env: str, market: str,
+                 reconcile_interval: float = ACCOUNT_STATE_CONFIG['reconcile_interval']):
+        self.trd_env = trd_env
+        self.market = market
+        self.reconcile_interval = reconcile_interval
+
+        self.positions: Dict[str, Dict[str, float]] = {}
+        self.open_orders: Dict[str, Dict[str, Any]] = {}
+        self.total_assets = 0.0
+        self.seeded_at: Optional[float] = None
+        self.push_count = 0
+
+        self._seen_deals: set = set()
+        self._lock = threading.RLock()
+
+    # ================== 初始化与对账 ==================
+
+    def seed(self, positions: List[Dict], account_info: Dict,
+             orders: Optional[List[Dict]] = None) -> None:
+        """用查询结果重置状态"""
+        with self._lock:
+            self.positions = {}
+            for position in positions:
+                code = position.get('code')
+                if code:
+                    self.positions[code] = {
+                        'qty': _to_float(position.get('qty')),
+                        'nominal_price': _to_float(position.get('nominal_price')),
+                    }
+
+            self.total_assets = _to_float((account_info or {}).get('total_assets'))
+
+            if orders is not None:
+                self.open_orders = {}
+                for order in orders:
+                    self._apply_order(order)
+
+            self.seeded_at = time.time()
+
+    def invalidate(self) -> None:
+        """标记状态过期，下次风控检查前重新对账"""
+        with self._lock:
+            self.seeded_at = None
+
+    def is_stale(self, now: Optional[float] = None) -> bool:
+        """是否需要重新对账"""
+        with self._lock:
+            if self.seeded_at is None:
+                return True
+            return (now or time.time()) - self.seeded_at > self.reconcile_interval
+
+    # ================== 推送更新 ==================
+
+    def apply_order(self, order: Dict) -> None:
+        """应用订单推送（或本地下单结果）"""
+        with self._lock:
+            self.push_count += 1
+            self._apply_order(order)
+
+    def _apply_order(self, order: Dict) -> None:
+        order_id = str(order.get('order_id') or '')
+        if not order_id:
+            return
+
+        status = _status_name(order.get('order_status'))
+        if status and status not in OPEN_ORDER_STATUSES:
+            self.open_orders.pop(order_id, None)
+            return
+
+        self.open_orders[order_id] = {
+            'code': order.get('code'),
+            'trd_side': _status_name(order.get('trd_side')),
+            'price': _to_float(order.get('price')),
+            'qty': _to_float(order.get('qty')),
+            'dealt_qty': _to_float(order.get('dealt_qty')),
+        }
+
+    def apply_deal(self, deal: Dict) -> bool:
+        """应用成交推送，按成交方向增减持仓；重复的成交编号忽略"""
+        deal_id = str(deal.get('deal_id') or '')
+        code = deal.get('code')
+        if not deal_id or not code:
+            return False
+
+        with self._lock:
+            if deal_id in self._seen_deals:
+                return False
+            self._seen_deals.add(deal_id)
+            self.push_count += 1
+
+            qty = _to_float(deal.get('qty'))
+            price = _to_float(deal.get('price'))
+            side = _status_name(deal.get('trd_side'))
+            signed_qty = -qty if side.startswith('SELL') else qty
+
+            position = self.positions.setdefault(code, {'qty': 0.0, 'nominal_price': price})
+            position['qty'] += signed_qty
+            if price > 0:
+                position['nominal_price'] = price
+            if position['qty'] <= 0:
+                self.positions.pop(code, None)
+
+            # 对应挂单的已成交数量同步增加（订单推送稍后到达时会覆盖）
+            order = self.open_orders.get(str(deal.get('order_id') or ''))
+            if order is not None:
+                order['dealt_qty'] = min(order['qty'], order['dealt_qty'] + qty)
+            return True
+
+    # ================== 风控数据 ==================
+
+    def total_position_value(self) -> float:
+        """持仓总市值（按最新持仓价/成交价估算）"""
+        with self._lock:
+            return sum(p['qty'] * p['nominal_price'] for p in self.positions.values())
+
+    def pending_buy_amount(self) -> float:
+        """未成交买单占用金额"""
+        with self._lock:
+            return sum(
+                max(o['qty'] - o['dealt_qty'], 0) * o['price']
+                for o in self.open_orders.values() if o['trd_side'] == 'BUY'
+            )
+
+    def risk_snapshot(self) -> Dict[str, float]:
+        """风控检查所需数据（未成交买单计入持仓，避免连续下单绕过持仓比例限制）"""
+        with self._lock:
+            return {
+                'total_value': self.total_position_value() + self.pending_buy_amount(),
+                'total_assets': self.total_assets,
+            }
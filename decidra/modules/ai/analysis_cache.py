@@ -0,0 +1,233 @@
+"""
+AI分析结果持久化缓存
+
+基于 SQLite 的有界缓存，供监控界面 (AIAnalysisManager) 与批量分析器
+(GeminiAnalyzer.batch_analyze) 跨进程共享：
+1. 结果落盘，重启后仍可命中
+2. 按数据指纹失效：K线出现新bar或价格偏离超过阈值时视为过期
+3. 按最近访问时间做 LRU 淘汰，限制总条目数
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from ...utils.global_vars import PATH_DATA, get_logger
+
+# 缓存默认配置
+ANALYSIS_CACHE_CONFIG = {
+    'db_file': 'ai_analysis_cache.db',  # 缓存数据库文件名 (位于 PATH_DATA)
+    'max_entries': 500,                 # 最大缓存条目数，超出按LRU淘汰
+    'max_age_hours': 72,                # 硬性过期时间，跨周末仍可复用
+    'price_tolerance': 0.01,            # 价格相对变化超过该比例视为数据已变化
+    'busy_timeout': 5.0,                # 多进程并发写入时的等待秒数
+}
+
+
+@dataclass
+class DataFingerprint:
+    """分析所依赖数据的指纹"""
+    data_time: str      # 最新K线时间 / 交易日期
+    ref_price: float    # 生成分析时的参考价格
+
+    def matches(self, other: 'DataFingerprint', price_tolerance: float) -> bool:
+        """判断两份数据是否实质相同"""
+        if self.data_time != other.data_time:
+            return False
+        if self.ref_price <= 0 or other.ref_price <= 0:
+            return self.ref_price == other.ref_price
+        return abs(other.ref_price - self.ref_price) / self.ref_price <= price_tolerance
+
+    @classmethod
+    def from_kline(cls, kline_data: List[Any], realtime_quote: Optional[Dict[str, Any]] = None) -> 'DataFingerprint':
+        """由K线列表(KLineData)和实时报价构建指纹"""
+        data_time = ''
+        ref_price = 0.0
+        if kline_data:
+            last_bar = kline_data[-1]
+            data_time = str(getattr(last_bar, 'time_key', '') or '')
+            ref_price = float(getattr(last_bar, 'close', 0) or 0)
+        if realtime_quote:
+            cur_price = realtime_quote.get('cur_price') or realtime_quote.get('last_price')
+            if cur_price:
+                ref_price = float(cur_price)
+        return cls(data_time=data_time, ref_price=ref_price)
+
+
+class AnalysisCache:
+    """
+    AI分析结果缓存
+    键为 (stock_code, analysis_type)，值为可JSON序列化的字典
+    """
+
+    _CREATE_TABLE_SQL = """
+        CREATE TABLE IF NOT EXISTS analysis_cache (
+            stock_code TEXT NOT NULL,
+            analysis_type TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            data_time TEXT NOT NULL,
+            ref_price REAL NOT NULL,
+            created_at REAL NOT NULL,
+            last_access REAL NOT NULL,
+            PRIMARY KEY (stock_code, analysis_type)
+        )
+    """
+
+    _CREATE_INDEX_SQL = """
+        CREATE INDEX IF NOT EXISTS ix_analysis_last_access ON analysis_cache(last_access)
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Union[str, Path]] = None,
+        max_entries: int = ANALYSIS_CACHE_CONFIG['max_entries'],
+        max_age_hours: float = ANALYSIS_CACHE_CONFIG['max_age_hours'],
+        price_tolerance: float = ANALYSIS_CACHE_CONFIG['price_tolerance'],
+    ):
+        self.logger = get_logger(__name__)
+        self._db_path = Path(db_path) if db_path else PATH_DATA / ANALYSIS_CACHE_CONFIG['db_file']
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_hours * 3600
+        self.price_tolerance = price_tolerance
+        # 每个实例只持有一个连接，跨线程使用由 _lock 串行化
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_tables()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """获取数据库连接（首次调用时创建，需在持有 _lock 时调用）"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self._db_path), timeout=ANALYSIS_CACHE_CONFIG['busy_timeout'],
+                                         check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+        return self._conn
+
+    def _init_tables(self) -> None:
+        """初始化数据库表 (WAL模式支持多进程并发读写)"""
+        with self._lock:
+            conn = self._get_connection()
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(self._CREATE_TABLE_SQL)
+            conn.execute(self._CREATE_INDEX_SQL)
+            conn.commit()
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get(self, stock_code: str, analysis_type: str,
+            fingerprint: DataFingerprint) -> Optional[Dict[str, Any]]:
+        """
+        获取缓存结果
+
+        数据指纹不匹配或超过硬性过期时间时删除该条目并返回 None
+        """
+        if not stock_code:
+            return None
+        try:
+            now = time.time()
+            with self._lock, self._get_connection() as conn:
+                row = conn.execute(
+                    "SELECT * FROM analysis_cache WHERE stock_code = ? AND analysis_type = ?",
+                    (stock_code, analysis_type)
+                ).fetchone()
+                if row is None:
+                    return None
+
+                cached = DataFingerprint(data_time=row['data_time'], ref_price=row['ref_price'])
+                expired = now - row['created_at'] > self.max_age_seconds
+                if expired or not cached.matches(fingerprint, self.price_tolerance):
+                    conn.execute(
+                        "DELETE FROM analysis_cache WHERE stock_code = ? AND analysis_type = ?",
+                        (stock_code, analysis_type)
+                    )
+                    self.logger.debug(f"分析缓存失效: {stock_code}/{analysis_type}")
+                    return None
+
+                conn.execute(
+                    "UPDATE analysis_cache SET last_access = ? WHERE stock_code = ? AND analysis_type = ?",
+                    (now, stock_code, analysis_type)
+                )
+                return json.loads(row['payload'])
+        except Exception as e:
+            self.logger.error(f"读取分析缓存失败: {e}")
+            return None
+
+    def put(self, stock_code: str, analysis_type: str, payload: Dict[str, Any],
+            fingerprint: DataFingerprint) -> bool:
+        """写入缓存结果，并按LRU淘汰超出上限的条目"""
+        try:
+            now = time.time()
+            data = json.dumps(payload, ensure_ascii=False, default=str)
+            with self._lock, self._get_connection() as conn:
+                conn.execute(
+                    """INSERT OR REPLACE INTO analysis_cache
+                       (stock_code, analysis_type, payload, data_time, ref_price, created_at, last_access)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    (stock_code, analysis_type, data, fingerprint.data_time,
+                     fingerprint.ref_price, now, now)
+                )
+                conn.execute(
+                    """DELETE FROM analysis_cache WHERE rowid IN (
+                           SELECT rowid FROM analysis_cache
+                           ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                       )""",
+                    (self.max_entries,)
+                )
+            return True
+        except Exception as e:
+            self.logger.error(f"写入分析缓存失败: {e}")
+            return False
+
+    def invalidate(self, stock_code: Optional[str] = None) -> int:
+        """删除指定股票 (为空时删除全部) 的缓存条目，返回删除数量"""
+        try:
+            with self._lock, self._get_connection() as conn:
+                if stock_code is None:
+                    cursor = conn.execute("DELETE FROM analysis_cache")
+                else:
+                    cursor = conn.execute(
+                        "DELETE FROM analysis_cache WHERE stock_code = ?", (stock_code,)
+                    )
+                return cursor.rowcount
+        except Exception as e:
+            self.logger.error(f"清除分析缓存失败: {e}")
+            return 0
+
+    def count(self) -> int:
+        """缓存条目数"""
+        try:
+            with self._lock:
+                return self._get_connection().execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+        except Exception as e:
+            self.logger.error(f"统计分析缓存失败: {e}")
+            return 0
+
+
+# 全局缓存实例
+_analysis_cache: Optional[AnalysisCache] = None
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """获取全局分析缓存实例"""
+    global _analysis_cache
+    if _analysis_cache is None:
+        _analysis_cache = AnalysisCache()
+    return _analysis_cache
+
+
+def reset_analysis_cache() -> None:
+    """重置全局分析缓存实例（用于测试）"""
+    global _analysis_cache
+    if _analysis_cache is not None:
+        _analysis_cache.close()
+    _analysis_cache = None
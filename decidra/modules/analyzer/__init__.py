@@ -11,30 +11,73 @@
 4. 搜索服务 - 新闻和情报搜索
 """
 
-from .analyzer_stock import (
-    StockTrendAnalyzer,
-    TrendAnalysisResult,
-    TrendStatus,
-    VolumeStatus,
-    BuySignal,
-    analyze_stock,
-)
-from .analyzer_result import (
-    GeminiAnalyzer,
-    AnalysisResult,
-    get_analyzer,
-)
-from .analyzer_market import (
-    MarketAnalyzer,
-    MarketOverview,
-    MarketIndex,
-)
-from .search_service import (
-    SearchService,
-    SearchResult,
-    SearchResponse,
-    get_search_service,
-)
+import importlib
+from typing import TYPE_CHECKING
+
+# 导出名 -> 所在子模块。按需加载：大盘分析依赖 akshare，导入较慢，
+# 只用到趋势分析或分析结果时不必加载
+_LAZY_EXPORTS = {
+    'StockTrendAnalyzer': '.analyzer_stock',
+    'TrendAnalysisResult': '.analyzer_stock',
+    'TrendStatus': '.analyzer_stock',
+    'VolumeStatus': '.analyzer_stock',
+    'BuySignal': '.analyzer_stock',
+    'analyze_stock': '.analyzer_stock',
+    'analyze_stock_panel': '.analyzer_stock',
+    'GeminiAnalyzer': '.analyzer_result',
+    'AnalysisResult': '.analyzer_result',
+    'get_analyzer': '.analyzer_result',
+    'MarketAnalyzer': '.analyzer_market',
+    'MarketOverview': '.analyzer_market',
+    'MarketIndex': '.analyzer_market',
+    'SearchService': '.search_service',
+    'SearchResult': '.search_service',
+    'SearchResponse': '.search_service',
+    'SearchCache': '.search_service',
+    'get_search_service': '.search_service',
+}
+
+if TYPE_CHECKING:
+    from .analyzer_stock import (
+        StockTrendAnalyzer,
+        TrendAnalysisResult,
+        TrendStatus,
+        VolumeStatus,
+        BuySignal,
+        analyze_stock,
+        analyze_stock_panel,
+    )
+    from .analyzer_result import (
+        GeminiAnalyzer,
+        AnalysisResult,
+        get_analyzer,
+    )
+    from .analyzer_market import (
+        MarketAnalyzer,
+        MarketOverview,
+        MarketIndex,
+    )
+    from .search_service import (
+        SearchService,
+        SearchResult,
+        SearchResponse,
+        SearchCache,
+        get_search_service,
+    )
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 __all__ = [
     # 趋势分析
@@ -44,6 +87,7 @@ __all__ = [
     'VolumeStatus',
     'BuySignal',
     'analyze_stock',
+    'analyze_stock_panel',
     # AI分析
     'GeminiAnalyzer',
     'AnalysisResult',
@@ -56,5 +100,6 @@ __all__ = [
     'SearchService',
     'SearchResult',
     'SearchResponse',
+    'SearchCache',
     'get_search_service',
 ]
@@ -25,6 +25,7 @@ from tenacity import (
 )
 
 from .config import get_config
+from ..ai.analysis_cache import DataFingerprint, get_analysis_cache
 
 logger = logging.getLogger(__name__)
 
@@ -201,6 +202,9 @@ class GeminiAnalyzer:
         result = analyzer.analyze(context, news_context)
     """
     
+    # 持久化分析缓存中的分析类型键
+    CACHE_ANALYSIS_TYPE = 'gemini_dashboard'
+    
     # ========================================
     # 系统提示词 - 决策仪表盘 v2.0
     # ========================================
@@ -1141,31 +1145,61 @@ class GeminiAnalyzer:
     def batch_analyze(
         self, 
         contexts: List[Dict[str, Any]],
-        delay_between: float = 2.0
+        delay_between: float = 2.0,
+        use_cache: bool = True
     ) -> List[AnalysisResult]:
         """
         批量分析多只股票
         
-        注意：为避免 API 速率限制，每次分析之间会有延迟
+        注意：为避免 API 速率限制，每次分析之间会有延迟；
+        命中持久化分析缓存（与监控界面共享）的股票不调用 API，也不计入延迟
         
         Args:
             contexts: 上下文数据列表
             delay_between: 每次分析之间的延迟（秒）
+            use_cache: 是否使用持久化分析缓存
             
         Returns:
             AnalysisResult 列表
         """
         results = []
+        cache = get_analysis_cache() if use_cache else None
+        api_calls = 0
         
-        for i, context in enumerate(contexts):
-            if i > 0:
+        for context in contexts:
+            code = context.get('code', 'Unknown')
+            fingerprint = self._context_fingerprint(context)
+            
+            if cache is not None:
+                cached = cache.get(code, self.CACHE_ANALYSIS_TYPE, fingerprint)
+                if cached:
+                    logger.info(f"[缓存命中] {code} 数据未变化，复用已有分析结果")
+                    results.append(AnalysisResult(**cached))
+                    continue
+            
+            if api_calls > 0:
                 logger.debug(f"等待 {delay_between} 秒后继续...")
                 time.sleep(delay_between)
             
             result = self.analyze(context)
+            api_calls += 1
             results.append(result)
+            
+            if cache is not None and result.success:
+                cache.put(code, self.CACHE_ANALYSIS_TYPE, result.to_dict(), fingerprint)
         
         return results
+    
+    @staticmethod
+    def _context_fingerprint(context: Dict[str, Any]) -> DataFingerprint:
+        """由分析上下文（交易日期 + 最新价）构建数据指纹"""
+        ref_price = 0.0
+        realtime = context.get('realtime') or {}
+        today = context.get('today') or {}
+        price = realtime.get('price') or today.get('close')
+        if price:
+            ref_price = float(price)
+        return DataFingerprint(data_time=str(context.get('date', '')), ref_price=ref_price)
 
 
 # 便捷函数
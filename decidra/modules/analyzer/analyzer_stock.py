@@ -18,12 +18,14 @@
 
 import logging
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Union
 from enum import Enum
 
 import pandas as pd
 import numpy as np
 
+from ...base import indicators
+
 logger = logging.getLogger(__name__)
 
 
@@ -139,6 +141,54 @@ class StockTrendAnalyzer:
     VOLUME_HEAVY_RATIO = 1.5    # 放量判断阈值
     MA_SUPPORT_TOLERANCE = 0.02  # MA 支撑判断容忍度（2%）
     
+    # 趋势状态 -> (均线排列描述, 趋势强度)
+    TREND_DESCRIPTIONS = {
+        TrendStatus.STRONG_BULL: ("强势多头排列，均线发散上行", 90),
+        TrendStatus.BULL: ("多头排列 MA5>MA10>MA20", 75),
+        TrendStatus.WEAK_BULL: ("弱势多头，MA5>MA10 但 MA10≤MA20", 55),
+        TrendStatus.STRONG_BEAR: ("强势空头排列，均线发散下行", 10),
+        TrendStatus.BEAR: ("空头排列 MA5<MA10<MA20", 25),
+        TrendStatus.WEAK_BEAR: ("弱势空头，MA5<MA10 但 MA10≥MA20", 40),
+        TrendStatus.CONSOLIDATION: ("均线缠绕，趋势不明", 50),
+    }
+    
+    # 量能状态 -> 量能趋势描述
+    VOLUME_DESCRIPTIONS = {
+        VolumeStatus.HEAVY_VOLUME_UP: "放量上涨，多头力量强劲",
+        VolumeStatus.HEAVY_VOLUME_DOWN: "放量下跌，注意风险",
+        VolumeStatus.SHRINK_VOLUME_UP: "缩量上涨，上攻动能不足",
+        VolumeStatus.SHRINK_VOLUME_DOWN: "缩量回调，洗盘特征明显（好）",
+        VolumeStatus.NORMAL: "量能正常",
+    }
+    
+    # analyze_panel 结果表的列
+    PANEL_COLUMNS = [
+        'code', 'trend_status', 'ma_alignment', 'trend_strength', 'ma5', 'ma10', 'ma20', 'ma60',
+        'current_price', 'bias_ma5', 'bias_ma10', 'bias_ma20', 'volume_status', 'volume_ratio_5d',
+        'volume_trend', 'support_ma5', 'support_ma10', 'buy_signal', 'signal_score',
+        'signal_reasons', 'risk_factors', 'bars', 'support_levels', 'resistance_levels',
+    ]
+    
+    # 趋势评分（40分）
+    TREND_SCORES = {
+        TrendStatus.STRONG_BULL: 40,
+        TrendStatus.BULL: 35,
+        TrendStatus.WEAK_BULL: 25,
+        TrendStatus.CONSOLIDATION: 15,
+        TrendStatus.WEAK_BEAR: 10,
+        TrendStatus.BEAR: 5,
+        TrendStatus.STRONG_BEAR: 0,
+    }
+    
+    # 量能评分（20分）
+    VOLUME_SCORES = {
+        VolumeStatus.SHRINK_VOLUME_DOWN: 20,  # 缩量回调最佳
+        VolumeStatus.HEAVY_VOLUME_UP: 15,     # 放量上涨次之
+        VolumeStatus.NORMAL: 12,
+        VolumeStatus.SHRINK_VOLUME_UP: 8,     # 无量上涨较差
+        VolumeStatus.HEAVY_VOLUME_DOWN: 0,    # 放量下跌最差
+    }
+    
     def __init__(self):
         """初始化分析器"""
         pass
@@ -195,11 +245,11 @@ class StockTrendAnalyzer:
     def _calculate_mas(self, df: pd.DataFrame) -> pd.DataFrame:
         """计算均线"""
         df = df.copy()
-        df['MA5'] = df['close'].rolling(window=5).mean()
-        df['MA10'] = df['close'].rolling(window=10).mean()
-        df['MA20'] = df['close'].rolling(window=20).mean()
+        close = df['close'].to_numpy(dtype=float)
+        for period in (5, 10, 20):
+            df[f'MA{period}'] = indicators.ma(close, period)
         if len(df) >= 60:
-            df['MA60'] = df['close'].rolling(window=60).mean()
+            df['MA60'] = indicators.ma(close, 60)
         else:
             df['MA60'] = df['MA20']  # 数据不足时使用 MA20 替代
         return df
@@ -221,17 +271,11 @@ class StockTrendAnalyzer:
             
             if curr_spread > prev_spread and curr_spread > 5:
                 result.trend_status = TrendStatus.STRONG_BULL
-                result.ma_alignment = "强势多头排列，均线发散上行"
-                result.trend_strength = 90
             else:
                 result.trend_status = TrendStatus.BULL
-                result.ma_alignment = "多头排列 MA5>MA10>MA20"
-                result.trend_strength = 75
                 
         elif ma5 > ma10 and ma10 <= ma20:
             result.trend_status = TrendStatus.WEAK_BULL
-            result.ma_alignment = "弱势多头，MA5>MA10 但 MA10≤MA20"
-            result.trend_strength = 55
             
         elif ma5 < ma10 < ma20:
             prev = df.iloc[-5] if len(df) >= 5 else df.iloc[-1]
@@ -240,22 +284,16 @@ class StockTrendAnalyzer:
             
             if curr_spread > prev_spread and curr_spread > 5:
                 result.trend_status = TrendStatus.STRONG_BEAR
-                result.ma_alignment = "强势空头排列，均线发散下行"
-                result.trend_strength = 10
             else:
                 result.trend_status = TrendStatus.BEAR
-                result.ma_alignment = "空头排列 MA5<MA10<MA20"
-                result.trend_strength = 25
                 
         elif ma5 < ma10 and ma10 >= ma20:
             result.trend_status = TrendStatus.WEAK_BEAR
-            result.ma_alignment = "弱势空头，MA5<MA10 但 MA10≥MA20"
-            result.trend_strength = 40
             
         else:
             result.trend_status = TrendStatus.CONSOLIDATION
-            result.ma_alignment = "均线缠绕，趋势不明"
-            result.trend_strength = 50
+        
+        result.ma_alignment, result.trend_strength = self.TREND_DESCRIPTIONS[result.trend_status]
     
     def _calculate_bias(self, result: TrendAnalysisResult) -> None:
         """
@@ -297,20 +335,16 @@ class StockTrendAnalyzer:
         if result.volume_ratio_5d >= self.VOLUME_HEAVY_RATIO:
             if price_change > 0:
                 result.volume_status = VolumeStatus.HEAVY_VOLUME_UP
-                result.volume_trend = "放量上涨，多头力量强劲"
             else:
                 result.volume_status = VolumeStatus.HEAVY_VOLUME_DOWN
-                result.volume_trend = "放量下跌，注意风险"
         elif result.volume_ratio_5d <= self.VOLUME_SHRINK_RATIO:
             if price_change > 0:
                 result.volume_status = VolumeStatus.SHRINK_VOLUME_UP
-                result.volume_trend = "缩量上涨，上攻动能不足"
             else:
                 result.volume_status = VolumeStatus.SHRINK_VOLUME_DOWN
-                result.volume_trend = "缩量回调，洗盘特征明显（好）"
         else:
             result.volume_status = VolumeStatus.NORMAL
-            result.volume_trend = "量能正常"
+        result.volume_trend = self.VOLUME_DESCRIPTIONS[result.volume_status]
     
     def _analyze_support_resistance(self, df: pd.DataFrame, result: TrendAnalysisResult) -> None:
         """
@@ -355,93 +389,252 @@ class StockTrendAnalyzer:
         - 量能（20分）：缩量回调得分高
         - 支撑（10分）：获得均线支撑得分高
         """
-        score = 0
+        score = (self.TREND_SCORES.get(result.trend_status, 15)
+                 + int(self._bias_scores(result.bias_ma5))
+                 + self.VOLUME_SCORES.get(result.volume_status, 10)
+                 + 5 * result.support_ma5 + 5 * result.support_ma10)
+        
+        # === 综合判断 ===
+        result.signal_score = score
+        result.signal_reasons, result.risk_factors = self._signal_messages(
+            result.trend_status, result.bias_ma5, result.volume_status,
+            result.support_ma5, result.support_ma10
+        )
+        result.buy_signal = self._buy_signals(
+            score,
+            result.trend_status in (TrendStatus.STRONG_BULL, TrendStatus.BULL),
+            result.trend_status == TrendStatus.WEAK_BULL,
+            result.trend_status in (TrendStatus.BEAR, TrendStatus.STRONG_BEAR),
+        )
+    
+    def _bias_scores(self, bias) -> np.ndarray:
+        """乖离率评分（30分）：接近 MA5 得分高，支持标量或数组"""
+        bias = np.asarray(bias, dtype=float)
+        return np.select(
+            [bias <= -5, bias <= -3, bias < 0, bias < 2, bias < self.BIAS_THRESHOLD],
+            [10, 25, 30, 28, 20],
+            default=5,
+        )
+    
+    @staticmethod
+    def _buy_signals(score, bull, weak_bull, bear) -> np.ndarray:
+        """
+        按综合评分和趋势生成买入信号，支持标量或数组
+        
+        Args:
+            score: 综合评分
+            bull: 是否（强势）多头排列
+            weak_bull: 是否弱势多头
+            bear: 是否（强势）空头排列
+        """
+        score, bull, weak_bull, bear = np.broadcast_arrays(score, bull, weak_bull, bear)
+        choices = np.array([BuySignal.STRONG_BUY, BuySignal.BUY, BuySignal.HOLD, BuySignal.WAIT,
+                            BuySignal.STRONG_SELL, BuySignal.SELL], dtype=object)
+        index = np.select(
+            [(score >= 80) & bull, (score >= 65) & (bull | weak_bull), score >= 50, score >= 35, bear],
+            range(5),
+            default=5,
+        )
+        return choices[index]
+    
+    def _signal_messages(self, trend_status: TrendStatus, bias: float, volume_status: VolumeStatus,
+                         support_ma5: bool, support_ma10: bool) -> Tuple[List[str], List[str]]:
+        """
+        生成买入理由和风险因素
+        
+        Returns:
+            (买入理由, 风险因素)
+        """
         reasons = []
         risks = []
         
-        # === 趋势评分（40分）===
-        trend_scores = {
-            TrendStatus.STRONG_BULL: 40,
-            TrendStatus.BULL: 35,
-            TrendStatus.WEAK_BULL: 25,
-            TrendStatus.CONSOLIDATION: 15,
-            TrendStatus.WEAK_BEAR: 10,
-            TrendStatus.BEAR: 5,
-            TrendStatus.STRONG_BEAR: 0,
-        }
-        trend_score = trend_scores.get(result.trend_status, 15)
-        score += trend_score
-        
-        if result.trend_status in [TrendStatus.STRONG_BULL, TrendStatus.BULL]:
-            reasons.append(f"✅ {result.trend_status.value}，顺势做多")
-        elif result.trend_status in [TrendStatus.BEAR, TrendStatus.STRONG_BEAR]:
-            risks.append(f"⚠️ {result.trend_status.value}，不宜做多")
+        if trend_status in [TrendStatus.STRONG_BULL, TrendStatus.BULL]:
+            reasons.append(f"✅ {trend_status.value}，顺势做多")
+        elif trend_status in [TrendStatus.BEAR, TrendStatus.STRONG_BEAR]:
+            risks.append(f"⚠️ {trend_status.value}，不宜做多")
         
-        # === 乖离率评分（30分）===
-        bias = result.bias_ma5
         if bias < 0:
             # 价格在 MA5 下方（回调中）
             if bias > -3:
-                score += 30
                 reasons.append(f"✅ 价格略低于MA5({bias:.1f}%)，回踩买点")
             elif bias > -5:
-                score += 25
                 reasons.append(f"✅ 价格回踩MA5({bias:.1f}%)，观察支撑")
             else:
-                score += 10
                 risks.append(f"⚠️ 乖离率过大({bias:.1f}%)，可能破位")
         elif bias < 2:
-            score += 28
             reasons.append(f"✅ 价格贴近MA5({bias:.1f}%)，介入好时机")
         elif bias < self.BIAS_THRESHOLD:
-            score += 20
             reasons.append(f"⚡ 价格略高于MA5({bias:.1f}%)，可小仓介入")
         else:
-            score += 5
             risks.append(f"❌ 乖离率过高({bias:.1f}%>5%)，严禁追高！")
         
-        # === 量能评分（20分）===
-        volume_scores = {
-            VolumeStatus.SHRINK_VOLUME_DOWN: 20,  # 缩量回调最佳
-            VolumeStatus.HEAVY_VOLUME_UP: 15,     # 放量上涨次之
-            VolumeStatus.NORMAL: 12,
-            VolumeStatus.SHRINK_VOLUME_UP: 8,     # 无量上涨较差
-            VolumeStatus.HEAVY_VOLUME_DOWN: 0,    # 放量下跌最差
-        }
-        vol_score = volume_scores.get(result.volume_status, 10)
-        score += vol_score
-        
-        if result.volume_status == VolumeStatus.SHRINK_VOLUME_DOWN:
+        if volume_status == VolumeStatus.SHRINK_VOLUME_DOWN:
             reasons.append("✅ 缩量回调，主力洗盘")
-        elif result.volume_status == VolumeStatus.HEAVY_VOLUME_DOWN:
+        elif volume_status == VolumeStatus.HEAVY_VOLUME_DOWN:
             risks.append("⚠️ 放量下跌，注意风险")
         
-        # === 支撑评分（10分）===
-        if result.support_ma5:
-            score += 5
+        if support_ma5:
             reasons.append("✅ MA5支撑有效")
-        if result.support_ma10:
-            score += 5
+        if support_ma10:
             reasons.append("✅ MA10支撑有效")
         
-        # === 综合判断 ===
-        result.signal_score = score
-        result.signal_reasons = reasons
-        result.risk_factors = risks
-        
-        # 生成买入信号
-        if score >= 80 and result.trend_status in [TrendStatus.STRONG_BULL, TrendStatus.BULL]:
-            result.buy_signal = BuySignal.STRONG_BUY
-        elif score >= 65 and result.trend_status in [TrendStatus.STRONG_BULL, TrendStatus.BULL, TrendStatus.WEAK_BULL]:
-            result.buy_signal = BuySignal.BUY
-        elif score >= 50:
-            result.buy_signal = BuySignal.HOLD
-        elif score >= 35:
-            result.buy_signal = BuySignal.WAIT
-        elif result.trend_status in [TrendStatus.BEAR, TrendStatus.STRONG_BEAR]:
-            result.buy_signal = BuySignal.STRONG_SELL
-        else:
-            result.buy_signal = BuySignal.SELL
+        return reasons, risks
+    
+    def analyze_panel(self, data: Union[pd.DataFrame, Dict[str, pd.DataFrame]],
+                      codes: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        批量分析多只股票趋势（一次向量化计算，用于全市场/自选股筛选）
+        
+        按日期对齐为 (日期 x 股票) 面板后统一计算均线、乖离率、量能、支撑压力和买入信号。
+        每只股票只使用自身有数据的K线（停牌缺失的日期不占位），结果与逐只调用 analyze 一致
+        
+        Args:
+            data: 含 code/date/open/high/low/close/volume 列的长表，或 {股票代码: OHLCV DataFrame}
+            codes: 只分析指定股票（默认全部）
+            
+        Returns:
+            以股票代码为索引的结果表，列与 TrendAnalysisResult.to_dict() 相同，另有 bars（有效K线数）、
+            support_levels、resistance_levels
+        """
+        panel, codes = self._build_panel(data, codes)
+        close, high, volume = panel['close'], panel['high'], panel['volume']
+        bars = (~np.isnan(close)).sum(axis=0)
+        
+        # 均线（数据不足 60 根时 MA60 使用 MA20 替代）
+        mas = {period: indicators.ma(close, period) for period in (5, 10, 20, 60)}
+        ma5, ma10, ma20 = mas[5][-1], mas[10][-1], mas[20][-1]
+        ma60 = np.where(bars >= 60, mas[60][-1], ma20)
+        price = close[-1]
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # 1. 趋势判断（与 5 根K线前的均线间距比较）
+            prev5, prev20 = mas[5][-5], mas[20][-5]
+            bull_spread = np.where(ma20 > 0, (ma5 - ma20) / ma20 * 100, 0)
+            prev_bull_spread = np.where(prev20 > 0, (prev5 - prev20) / prev20 * 100, 0)
+            bear_spread = np.where(ma5 > 0, (ma20 - ma5) / ma5 * 100, 0)
+            prev_bear_spread = np.where(prev5 > 0, (prev20 - prev5) / prev5 * 100, 0)
+            bull = (ma5 > ma10) & (ma10 > ma20)
+            bear = (ma5 < ma10) & (ma10 < ma20)
+            trend_order = np.array([TrendStatus.STRONG_BULL, TrendStatus.BULL, TrendStatus.WEAK_BULL,
+                                    TrendStatus.STRONG_BEAR, TrendStatus.BEAR, TrendStatus.WEAK_BEAR,
+                                    TrendStatus.CONSOLIDATION], dtype=object)
+            trend = trend_order[np.select(
+                [bull & (bull_spread > prev_bull_spread) & (bull_spread > 5),
+                 bull,
+                 (ma5 > ma10) & (ma10 <= ma20),
+                 bear & (bear_spread > prev_bear_spread) & (bear_spread > 5),
+                 bear,
+                 (ma5 < ma10) & (ma10 >= ma20)],
+                range(6),
+                default=6,
+            )]
+            
+            # 2. 乖离率
+            bias = {period: np.where(ma > 0, (price - ma) / ma * 100, 0.0)
+                    for period, ma in ((5, ma5), (10, ma10), (20, ma20))}
+            
+            # 3. 量能（当日量 / 前 5 日均量）
+            prev_volume = volume[-6:-1]
+            valid_volume = ~np.isnan(prev_volume)
+            vol_5d_avg = np.where(valid_volume, prev_volume, 0).sum(axis=0) / valid_volume.sum(axis=0)
+            volume_ratio = np.where(vol_5d_avg > 0, volume[-1] / vol_5d_avg, 0.0)
+            price_up = (price - close[-2]) / close[-2] * 100 > 0
+            heavy = volume_ratio >= self.VOLUME_HEAVY_RATIO
+            shrink = volume_ratio <= self.VOLUME_SHRINK_RATIO
+            volume_order = np.array([VolumeStatus.HEAVY_VOLUME_UP, VolumeStatus.HEAVY_VOLUME_DOWN,
+                                     VolumeStatus.SHRINK_VOLUME_UP, VolumeStatus.SHRINK_VOLUME_DOWN,
+                                     VolumeStatus.NORMAL], dtype=object)
+            volume_status = volume_order[np.select(
+                [heavy & price_up, heavy, shrink & price_up, shrink], range(4), default=4
+            )]
+            
+            # 4. 支撑压力（回踩 MA5/MA10，MA20 支撑，近 20 根最高价压力）
+            tolerance = self.MA_SUPPORT_TOLERANCE
+            support_ma5 = (ma5 > 0) & (np.abs(price - ma5) / ma5 <= tolerance) & (price >= ma5)
+            support_ma10 = (ma10 > 0) & (np.abs(price - ma10) / ma10 <= tolerance) & (price >= ma10)
+            support_ma20 = (ma20 > 0) & (price >= ma20)
+            recent_high = np.fmax.reduce(high[-20:], axis=0)
+        
+        # 5. 买入信号
+        score = (np.array([self.TREND_SCORES[status] for status in trend])
+                 + self._bias_scores(bias[5])
+                 + np.array([self.VOLUME_SCORES[status] for status in volume_status])
+                 + 5 * support_ma5 + 5 * support_ma10)
+        weak_bull = trend == TrendStatus.WEAK_BULL
+        bear_trend = (trend == TrendStatus.BEAR) | (trend == TrendStatus.STRONG_BEAR)
+        buy_signal = self._buy_signals(score, bull, weak_bull, bear_trend)
+        
+        rows = []
+        for i, code in enumerate(codes):
+            if bars[i] < 20:
+                row = TrendAnalysisResult(code=code).to_dict()
+                row['risk_factors'] = ["数据不足，无法完成分析"]
+                row.update(bars=int(bars[i]), support_levels=[], resistance_levels=[])
+                rows.append(row)
+                continue
+            
+            reasons, risks = self._signal_messages(trend[i], bias[5][i], volume_status[i],
+                                                   support_ma5[i], support_ma10[i])
+            support_levels = [float(ma5[i])] if support_ma5[i] else []
+            if support_ma10[i] and ma10[i] not in support_levels:
+                support_levels.append(float(ma10[i]))
+            if support_ma20[i]:
+                support_levels.append(float(ma20[i]))
+            alignment, strength = self.TREND_DESCRIPTIONS[trend[i]]
+            rows.append({
+                'code': code,
+                'trend_status': trend[i].value,
+                'ma_alignment': alignment,
+                'trend_strength': strength,
+                'ma5': float(ma5[i]),
+                'ma10': float(ma10[i]),
+                'ma20': float(ma20[i]),
+                'ma60': float(ma60[i]),
+                'current_price': float(price[i]),
+                'bias_ma5': float(bias[5][i]),
+                'bias_ma10': float(bias[10][i]),
+                'bias_ma20': float(bias[20][i]),
+                'volume_status': volume_status[i].value,
+                'volume_ratio_5d': float(volume_ratio[i]),
+                'volume_trend': self.VOLUME_DESCRIPTIONS[volume_status[i]],
+                'support_ma5': bool(support_ma5[i]),
+                'support_ma10': bool(support_ma10[i]),
+                'buy_signal': buy_signal[i].value,
+                'signal_score': int(score[i]),
+                'signal_reasons': reasons,
+                'risk_factors': risks,
+                'bars': int(bars[i]),
+                'support_levels': support_levels,
+                'resistance_levels': [float(recent_high[i])] if recent_high[i] > price[i] else [],
+            })
+        
+        return pd.DataFrame(rows, columns=self.PANEL_COLUMNS).set_index('code')
+    
+    @staticmethod
+    def _build_panel(data: Union[pd.DataFrame, Dict[str, pd.DataFrame]],
+                     codes: Optional[List[str]]) -> Tuple[Dict[str, np.ndarray], List[str]]:
+        """
+        转换为按日期对齐的 (日期 x 股票) 数组
+        
+        每只股票的有效K线移到末尾（右对齐），最后一行即各股票的最新K线
+        """
+        fields = ['high', 'close', 'volume']
+        if isinstance(data, dict):
+            frames = [df.assign(code=code) for code, df in data.items() if df is not None and not df.empty]
+            data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['code', 'date', *fields])
+        if codes is None:
+            codes = pd.unique(data['code']).tolist()
+        
+        data = data.drop_duplicates(['code', 'date'], keep='last')
+        wide = data.pivot(index='date', columns='code', values=fields)
+        panel = {name: wide[name].reindex(columns=codes).to_numpy(dtype=float) for name in fields}
+        order = np.argsort(~np.isnan(panel['close']), axis=0, kind='stable')
+        # 至少保留 20 行，保证取最近 20 根/前 5 根的切片对数据不足的股票同样有效
+        padding = max(20 - len(order), 0)
+        return {
+            name: np.vstack([np.full((padding, len(codes)), np.nan), np.take_along_axis(values, order, axis=0)])
+            for name, values in panel.items()
+        }, codes
     
     def format_analysis(self, result: TrendAnalysisResult) -> str:
         """
@@ -504,6 +697,20 @@ def analyze_stock(df: pd.DataFrame, code: str) -> TrendAnalysisResult:
     return analyzer.analyze(df, code)
 
 
+def analyze_stock_panel(data: Union[pd.DataFrame, Dict[str, pd.DataFrame]]) -> pd.DataFrame:
+    """
+    便捷函数：批量分析多只股票
+    
+    Args:
+        data: 含 code/date/OHLCV 列的长表，或 {股票代码: OHLCV DataFrame}
+        
+    Returns:
+        以股票代码为索引的分析结果表
+    """
+    analyzer = StockTrendAnalyzer()
+    return analyzer.analyze_panel(data)
+
+
 if __name__ == "__main__":
     # 测试代码
     logging.basicConfig(level=logging.INFO)
@@ -50,6 +50,10 @@ class AnalyzerConfig:
     tavily_api_keys: List[str] = field(default_factory=list)
     serpapi_keys: List[str] = field(default_factory=list)
 
+    # 搜索并发与缓存配置
+    search_max_workers: int = 4
+    search_cache_ttl_hours: float = 6.0
+
     def __post_init__(self):
         """从环境变量和配置文件加载配置"""
         # Anthropic - 环境变量优先，其次配置文件
@@ -122,6 +126,16 @@ class AnalyzerConfig:
         if serpapi_keys_str:
             self.serpapi_keys = [k.strip() for k in serpapi_keys_str.split(",") if k.strip()]
 
+        # 搜索并发与缓存
+        self.search_max_workers = int(os.getenv(
+            "SEARCH_MAX_WORKERS",
+            get_ini_config('Analyzer', 'SearchMaxWorkers', self.search_max_workers)
+        ))
+        self.search_cache_ttl_hours = float(os.getenv(
+            "SEARCH_CACHE_TTL_HOURS",
+            get_ini_config('Analyzer', 'SearchCacheTtlHours', self.search_cache_ttl_hours)
+        ))
+
         # 日志记录配置状态
         if self.anthropic_api_key:
             logger.debug(f"Anthropic API Key 已配置 (长度: {len(self.anthropic_api_key)})")
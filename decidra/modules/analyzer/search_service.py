@@ -11,14 +11,24 @@ A股自选股智能分析系统 - 搜索服务模块
 4. 搜索结果缓存和格式化
 """
 
+import hashlib
+import json
 import logging
 import random
+import re
+import sqlite3
+import threading
 import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Union
 from itertools import cycle
+from urllib.parse import urlparse
+
+from ...utils.global_vars import PATH_DATA
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +68,136 @@ class SearchResponse:
             lines.append(f"\n{i}. {result.to_text()}")
         
         return "\n".join(lines)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SearchResponse':
+        """从字典创建 SearchResponse 对象"""
+        data = dict(data)
+        data['results'] = [SearchResult(**r) for r in data.get('results', [])]
+        return cls(**data)
+
+
+def normalize_query(query: str) -> str:
+    """规范化查询语句（小写、合并空白），作为缓存键"""
+    return re.sub(r'\s+', ' ', query.strip().lower())
+
+
+def normalize_url(url: str) -> str:
+    """规范化 URL（去协议、www、查询参数和末尾斜杠），用于跨引擎去重"""
+    try:
+        parsed = urlparse(url.strip())
+        netloc = parsed.netloc.lower().replace('www.', '')
+        return f"{netloc}{parsed.path.rstrip('/')}"
+    except Exception:
+        return url.strip().lower()
+
+
+def dedupe_results(results: List[SearchResult], seen_urls: Optional[set] = None) -> List[SearchResult]:
+    """
+    按 URL 去重搜索结果
+    
+    Args:
+        results: 搜索结果列表
+        seen_urls: 已出现的规范化 URL 集合（会被就地更新，便于跨多次搜索去重）
+    """
+    if seen_urls is None:
+        seen_urls = set()
+    unique = []
+    for result in results:
+        key = normalize_url(result.url) if result.url else f"title:{result.title}"
+        if key in seen_urls:
+            continue
+        seen_urls.add(key)
+        unique.append(result)
+    return unique
+
+
+class SearchCache:
+    """
+    搜索结果磁盘缓存（SQLite）
+    
+    以规范化查询 + 结果数为键，在 TTL 内重复查询直接返回缓存结果，
+    避免同一天内重复消耗 Tavily/SerpAPI 配额
+    """
+    
+    _CREATE_TABLE_SQL = """
+        CREATE TABLE IF NOT EXISTS search_cache (
+            cache_key TEXT PRIMARY KEY,
+            query TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+    """
+    
+    def __init__(self, db_path: Optional[Union[str, Path]] = None, ttl_hours: float = 6.0):
+        self._db_path = Path(db_path) if db_path else PATH_DATA / 'search_cache.db'
+        self.ttl_seconds = ttl_hours * 3600
+        # 每个实例只持有一个连接，跨线程使用由 _lock 串行化
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            conn = self._get_connection()
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(self._CREATE_TABLE_SQL)
+            conn.commit()
+    
+    def _get_connection(self) -> sqlite3.Connection:
+        """获取数据库连接（首次调用时创建，需在持有 _lock 时调用）"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self._db_path), timeout=5.0, check_same_thread=False)
+        return self._conn
+    
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    @staticmethod
+    def make_key(query: str, max_results: int) -> str:
+        """生成缓存键"""
+        raw = f"{normalize_query(query)}|{max_results}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    
+    def get(self, query: str, max_results: int) -> Optional[SearchResponse]:
+        """读取未过期的缓存结果"""
+        try:
+            with self._lock, self._get_connection() as conn:
+                row = conn.execute(
+                    "SELECT payload, created_at FROM search_cache WHERE cache_key = ?",
+                    (self.make_key(query, max_results),)
+                ).fetchone()
+            if row is None or time.time() - row[1] > self.ttl_seconds:
+                return None
+            return SearchResponse.from_dict(json.loads(row[0]))
+        except Exception as e:
+            logger.warning(f"读取搜索缓存失败: {e}")
+            return None
+    
+    def put(self, query: str, max_results: int, response: SearchResponse) -> None:
+        """写入搜索结果（仅缓存成功且有结果的响应）"""
+        if not response.success or not response.results:
+            return
+        try:
+            now = time.time()
+            with self._lock, self._get_connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO search_cache (cache_key, query, payload, created_at) VALUES (?, ?, ?, ?)",
+                    (self.make_key(query, max_results), normalize_query(query),
+                     json.dumps(response.to_dict(), ensure_ascii=False), now)
+                )
+                conn.execute(
+                    "DELETE FROM search_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+                )
+        except Exception as e:
+            logger.warning(f"写入搜索缓存失败: {e}")
 
 
 class BaseSearchProvider(ABC):
@@ -76,6 +216,14 @@ class BaseSearchProvider(ABC):
         self._key_cycle = cycle(api_keys) if api_keys else None
         self._key_usage: Dict[str, int] = {key: 0 for key in api_keys}
         self._key_errors: Dict[str, int] = {key: 0 for key in api_keys}
+        # 并发控制：每个 key 同一时间最多一个在途请求，轮询保证请求分散到各个 key
+        self._key_lock = threading.Lock()
+        self._inflight = threading.BoundedSemaphore(max(len(api_keys), 1))
+    
+    @property
+    def key_count(self) -> int:
+        """已配置的 API Key 数量"""
+        return len(self._api_keys)
     
     @property
     def name(self) -> str:
@@ -95,28 +243,31 @@ class BaseSearchProvider(ABC):
         if not self._key_cycle:
             return None
         
-        # 最多尝试所有 key
-        for _ in range(len(self._api_keys)):
-            key = next(self._key_cycle)
-            # 跳过错误次数过多的 key（超过 3 次）
-            if self._key_errors.get(key, 0) < 3:
-                return key
-        
-        # 所有 key 都有问题，重置错误计数并返回第一个
-        logger.warning(f"[{self._name}] 所有 API Key 都有错误记录，重置错误计数")
-        self._key_errors = {key: 0 for key in self._api_keys}
-        return self._api_keys[0] if self._api_keys else None
+        with self._key_lock:
+            # 最多尝试所有 key
+            for _ in range(len(self._api_keys)):
+                key = next(self._key_cycle)
+                # 跳过错误次数过多的 key（超过 3 次）
+                if self._key_errors.get(key, 0) < 3:
+                    return key
+            
+            # 所有 key 都有问题，重置错误计数并返回第一个
+            logger.warning(f"[{self._name}] 所有 API Key 都有错误记录，重置错误计数")
+            self._key_errors = {key: 0 for key in self._api_keys}
+            return self._api_keys[0] if self._api_keys else None
     
     def _record_success(self, key: str) -> None:
         """记录成功使用"""
-        self._key_usage[key] = self._key_usage.get(key, 0) + 1
-        # 成功后减少错误计数
-        if key in self._key_errors and self._key_errors[key] > 0:
-            self._key_errors[key] -= 1
+        with self._key_lock:
+            self._key_usage[key] = self._key_usage.get(key, 0) + 1
+            # 成功后减少错误计数
+            if key in self._key_errors and self._key_errors[key] > 0:
+                self._key_errors[key] -= 1
     
     def _record_error(self, key: str) -> None:
         """记录错误"""
-        self._key_errors[key] = self._key_errors.get(key, 0) + 1
+        with self._key_lock:
+            self._key_errors[key] = self._key_errors.get(key, 0) + 1
         logger.warning(f"[{self._name}] API Key {key[:8]}... 错误计数: {self._key_errors[key]}")
     
     @abstractmethod
@@ -135,6 +286,11 @@ class BaseSearchProvider(ABC):
         Returns:
             SearchResponse 对象
         """
+        with self._inflight:
+            return self._search_with_key(query, max_results)
+    
+    def _search_with_key(self, query: str, max_results: int) -> SearchResponse:
+        """选取轮询到的 API Key 执行一次搜索"""
         api_key = self._get_next_key()
         if not api_key:
             return SearchResponse(
@@ -352,12 +508,15 @@ class SearchService:
     1. 管理多个搜索引擎
     2. 自动故障转移
     3. 结果聚合和格式化
+    4. 多查询并发执行、磁盘缓存和跨引擎 URL 去重
     """
     
     def __init__(
         self,
         tavily_keys: Optional[List[str]] = None,
         serpapi_keys: Optional[List[str]] = None,
+        max_workers: int = 4,
+        cache: Optional[SearchCache] = None,
     ):
         """
         初始化搜索服务
@@ -365,8 +524,11 @@ class SearchService:
         Args:
             tavily_keys: Tavily API Key 列表
             serpapi_keys: SerpAPI Key 列表
+            max_workers: 并发搜索线程数上限（实际并发还受各引擎 key 数量限制）
+            cache: 搜索结果缓存（为空时不缓存）
         """
         self._providers: List[BaseSearchProvider] = []
+        self._cache = cache
         
         # 初始化搜索引擎（按优先级排序）
         # Tavily 优先（免费额度更多，每月 1000 次）
@@ -381,12 +543,52 @@ class SearchService:
         
         if not self._providers:
             logger.warning("未配置任何搜索引擎 API Key，新闻搜索功能将不可用")
+        
+        # 并发度不超过所有引擎的 key 总数，避免单个 key 上堆积请求
+        total_keys = sum(p.key_count for p in self._providers)
+        self._max_workers = max(1, min(max_workers, total_keys or 1))
     
     @property
     def is_available(self) -> bool:
         """检查是否有可用的搜索引擎"""
         return any(p.is_available for p in self._providers)
     
+    def _provider_search(self, provider: BaseSearchProvider, query: str, max_results: int) -> SearchResponse:
+        """通过指定引擎搜索，优先读取缓存"""
+        if self._cache is not None:
+            cached = self._cache.get(query, max_results)
+            if cached is not None:
+                logger.info(f"[搜索缓存] 命中 '{query}'（来源：{cached.provider}）")
+                return cached
+        
+        response = provider.search(query, max_results)
+        response.results = dedupe_results(response.results)
+        
+        if self._cache is not None:
+            self._cache.put(query, max_results, response)
+        return response
+    
+    def _search_with_fallback(
+        self,
+        query: str,
+        max_results: int,
+        providers: Optional[List[BaseSearchProvider]] = None,
+        require_results: bool = True
+    ) -> Optional[SearchResponse]:
+        """按顺序尝试各个搜索引擎，返回首个成功的响应"""
+        for provider in providers if providers is not None else self._providers:
+            if not provider.is_available:
+                continue
+            
+            response = self._provider_search(provider, query, max_results)
+            
+            if response.success and (response.results or not require_results):
+                logger.info(f"使用 {response.provider} 搜索成功")
+                return response
+            else:
+                logger.warning(f"{provider.name} 搜索失败: {response.error_message}，尝试下一个引擎")
+        return None
+    
     def search_stock_news(
         self,
         stock_code: str,
@@ -423,17 +625,9 @@ class SearchService:
         logger.info(f"搜索股票新闻: {stock_name}({stock_code})")
         
         # 依次尝试各个搜索引擎
-        for provider in self._providers:
-            if not provider.is_available:
-                continue
-            
-            response = provider.search(query, max_results)
-            
-            if response.success and response.results:
-                logger.info(f"使用 {provider.name} 搜索成功")
-                return response
-            else:
-                logger.warning(f"{provider.name} 搜索失败: {response.error_message}，尝试下一个引擎")
+        response = self._search_with_fallback(query, max_results)
+        if response is not None:
+            return response
         
         # 所有引擎都失败
         return SearchResponse(
@@ -473,14 +667,9 @@ class SearchService:
         logger.info(f"搜索股票事件: {stock_name}({stock_code}) - {event_types}")
         
         # 依次尝试各个搜索引擎
-        for provider in self._providers:
-            if not provider.is_available:
-                continue
-            
-            response = provider.search(query, max_results=5)
-            
-            if response.success:
-                return response
+        response = self._search_with_fallback(query, max_results=5, require_results=False)
+        if response is not None:
+            return response
         
         return SearchResponse(
             query=query,
@@ -513,7 +702,6 @@ class SearchService:
             {维度名称: SearchResponse} 字典
         """
         results = {}
-        search_count = 0
         
         # 定义搜索维度
         search_dimensions = [
@@ -536,34 +724,45 @@ class SearchService:
         
         logger.info(f"开始多维度情报搜索: {stock_name}({stock_code})")
         
-        # 轮流使用不同的搜索引擎
-        provider_index = 0
-        
-        for dim in search_dimensions:
-            if search_count >= max_searches:
-                break
-            
-            # 选择搜索引擎（轮流使用）
-            available_providers = [p for p in self._providers if p.is_available]
-            if not available_providers:
-                break
-            
-            provider = available_providers[provider_index % len(available_providers)]
-            provider_index += 1
-            
-            logger.info(f"[情报搜索] {dim['desc']}: 使用 {provider.name}")
-            
-            response = provider.search(dim['query'], max_results=3)
+        available_providers = [p for p in self._providers if p.is_available]
+        if not available_providers:
+            return results
+        
+        # 轮流分配搜索引擎，失败时回退到其余引擎
+        tasks = []
+        for i, dim in enumerate(search_dimensions[:max_searches]):
+            primary = available_providers[i % len(available_providers)]
+            order = [primary] + [p for p in available_providers if p is not primary]
+            logger.info(f"[情报搜索] {dim['desc']}: 使用 {primary.name}")
+            tasks.append((dim, order))
+        
+        def run(task):
+            dim, order = task
+            response = self._search_with_fallback(dim['query'], 3, providers=order, require_results=False)
+            if response is None:
+                response = SearchResponse(
+                    query=dim['query'],
+                    results=[],
+                    provider=order[0].name,
+                    success=False,
+                    error_message="所有搜索引擎都不可用或搜索失败"
+                )
+            return dim, response
+        
+        # 各维度并发搜索，按维度顺序汇总
+        with ThreadPoolExecutor(max_workers=min(self._max_workers, len(tasks))) as executor:
+            completed = list(executor.map(run, tasks))
+        
+        # 跨维度、跨引擎按 URL 去重（先出现的维度优先保留）
+        seen_urls: set = set()
+        for dim, response in completed:
+            response.results = dedupe_results(response.results, seen_urls)
             results[dim['name']] = response
-            search_count += 1
             
             if response.success:
                 logger.info(f"[情报搜索] {dim['desc']}: 获取 {len(response.results)} 条结果")
             else:
                 logger.warning(f"[情报搜索] {dim['desc']}: 搜索失败 - {response.error_message}")
-            
-            # 短暂延迟避免请求过快
-            time.sleep(0.5)
         
         return results
     
@@ -620,32 +819,41 @@ class SearchService:
         self,
         stocks: List[Dict[str, str]],
         max_results_per_stock: int = 3,
-        delay_between: float = 1.0
+        delay_between: float = 0.0
     ) -> Dict[str, SearchResponse]:
         """
         批量搜索多只股票新闻
         
+        多只股票并发搜索，并发度受 API Key 数量限制（每个 key 同时只有一个在途请求）
+        
         Args:
             stocks: 股票列表 [{"code": "300389", "name": "艾比森"}, ...]
             max_results_per_stock: 每只股票的最大结果数
-            delay_between: 每次搜索之间的延迟（秒）
+            delay_between: 相邻两次搜索的最小发起间隔（秒），0 表示不限制
             
         Returns:
             {股票代码: SearchResponse} 字典
         """
-        results = {}
+        pace_lock = threading.Lock()
+        next_start = [0.0]
         
-        for i, stock in enumerate(stocks):
-            if i > 0:
-                time.sleep(delay_between)
+        def run(stock):
+            if delay_between > 0:
+                with pace_lock:
+                    wait = next_start[0] - time.time()
+                    next_start[0] = max(next_start[0], time.time()) + delay_between
+                if wait > 0:
+                    time.sleep(wait)
             
             code = stock.get('code', '')
             name = stock.get('name', '')
-            
-            response = self.search_stock_news(code, name, max_results_per_stock)
-            results[code] = response
+            return code, self.search_stock_news(code, name, max_results_per_stock)
         
-        return results
+        if not stocks:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(self._max_workers, len(stocks))) as executor:
+            return dict(executor.map(run, stocks))
 
 
 # === 便捷函数 ===
@@ -660,9 +868,15 @@ def get_search_service() -> SearchService:
         from .config import get_config
         config = get_config()
         
+        cache = None
+        if config.search_cache_ttl_hours > 0:
+            cache = SearchCache(ttl_hours=config.search_cache_ttl_hours)
+        
         _search_service = SearchService(
             tavily_keys=config.tavily_api_keys,
             serpapi_keys=config.serpapi_keys,
+            max_workers=config.search_max_workers,
+            cache=cache,
         )
     
     return _search_service
@@ -671,6 +885,8 @@ def get_search_service() -> SearchService:
 def reset_search_service() -> None:
     """重置搜索服务（用于测试）"""
     global _search_service
+    if _search_service is not None and _search_service._cache is not None:
+        _search_service._cache.close()
     _search_service = None
 
 
@@ -0,0 +1,125 @@
+"""
+成交统计
+
+供 FutuTrade 的盈亏、绩效与健康检查接口使用：
+1. 成交按 deal_id 只入库一次（查询结果与成交推送可重复喂入）
+2. 入库时累加到按日期、按股票的汇总桶
+3. 查询直接读取汇总桶，不再重复下载和遍历全部成交
+"""
+
+import threading
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+@dataclass
+class DealStats:
+    """成交汇总"""
+    deal_count: int = 0
+    total_pnl: float = 0.0
+    total_fee: float = 0.0
+    total_amount: float = 0.0
+    win_deals: int = 0
+    lose_deals: int = 0
+
+    def add(self, pnl: float, fee: float, amount: float) -> None:
+        self.deal_count += 1
+        self.total_pnl += pnl
+        self.total_fee += fee
+        self.total_amount += amount
+        if pnl > 0:
+            self.win_deals += 1
+        elif pnl < 0:
+            self.lose_deals += 1
+
+    def merge(self, other: 'DealStats') -> None:
+        self.deal_count += other.deal_count
+        self.total_pnl += other.total_pnl
+        self.total_fee += other.total_fee
+        self.total_amount += other.total_amount
+        self.win_deals += other.win_deals
+        self.lose_deals += other.lose_deals
+
+    @property
+    def net_pnl(self) -> float:
+        return self.total_pnl - self.total_fee
+
+    @property
+    def win_rate(self) -> float:
+        return self.win_deals / self.deal_count if self.deal_count else 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['net_pnl'] = self.net_pnl
+        data['win_rate'] = self.win_rate
+        return data
+
+
+class DealAnalytics:
+    """
+    增量成交统计（线程安全，成交推送线程与查询线程可同时访问）
+
+    盈亏与费用取成交记录中的 pnl / fee 字段（缺省为 0），成交额为 price * qty
+    """
+
+    def __init__(self):
+        self.total = DealStats()
+        self.by_day: Dict[str, DealStats] = {}
+        self.by_code: Dict[str, DealStats] = {}
+        self._seen: set = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _deal_date(deal: Dict[str, Any]) -> str:
+        """成交日期 (YYYY-MM-DD)，缺少时间字段时按当天计"""
+        create_time = str(deal.get('create_time') or deal.get('timestamp') or '')
+        return create_time[:10] if len(create_time) >= 10 else datetime.now().strftime('%Y-%m-%d')
+
+    def ingest(self, deals: Iterable[Dict[str, Any]]) -> int:
+        """入库成交记录，返回新增条数"""
+        added = 0
+        with self._lock:
+            for deal in deals:
+                deal_id = str(deal.get('deal_id') or '')
+                if not deal_id or deal_id in self._seen:
+                    continue
+                self._seen.add(deal_id)
+
+                pnl = _to_float(deal.get('pnl'))
+                fee = _to_float(deal.get('fee'))
+                amount = _to_float(deal.get('price')) * _to_float(deal.get('qty'))
+
+                self.total.add(pnl, fee, amount)
+                self.by_day.setdefault(self._deal_date(deal), DealStats()).add(pnl, fee, amount)
+                self.by_code.setdefault(str(deal.get('code', '')), DealStats()).add(pnl, fee, amount)
+                added += 1
+        return added
+
+    def day(self, date: str) -> DealStats:
+        """指定日期的汇总"""
+        with self._lock:
+            stats = self.by_day.get(date)
+            return DealStats(**asdict(stats)) if stats else DealStats()
+
+    def code(self, code: str) -> DealStats:
+        """指定股票的汇总"""
+        with self._lock:
+            stats = self.by_code.get(code)
+            return DealStats(**asdict(stats)) if stats else DealStats()
+
+    def period(self, start: str, end: Optional[str] = None) -> DealStats:
+        """日期区间 [start, end] 的汇总（按日汇总桶合并，与成交笔数无关）"""
+        result = DealStats()
+        with self._lock:
+            for date, stats in self.by_day.items():
+                if date >= start and (end is None or date <= end):
+                    result.merge(stats)
+        return result
@@ -21,6 +21,7 @@ from ..base.futu_class import FutuException
 
 
 from ..base.futu_module import FutuModuleBase
+from .subscription_manager import SubscriptionManager
 
 """
 from decidra.modules.futu_market import FutuMarket
@@ -39,9 +40,14 @@ class FutuMarket(FutuModuleBase):
     使用时需先调用open方法, 务必close
     """
     
-    def __init__(self):
-        """初始化富途行情管理器"""
-        super().__init__()
+    def __init__(self, client=None):
+        """
+        初始化富途行情管理器
+
+        Args:
+            client: 可选的客户端实例（如 SimQuoteClient 模拟行情），为空时按配置创建 FutuClient
+        """
+        super().__init__(client)
         self.logger = get_logger("futu_market")
         
         # 业务数据缓存
@@ -51,20 +57,10 @@ class FutuMarket(FutuModuleBase):
         
         # 订阅管理
         self.subscribed_stocks: Dict[str, Set[str]] = {}  # {股票代码: {订阅类型集合}}
-        self.subscription_limits = {
-            'quote': 200,           # 报价订阅限制
-            'order_book': 200,      # 五档订阅限制  
-            'ticker': 200,          # 逐笔订阅限制
-            'kline_1m': 200,        # 1分钟K线订阅限制
-            'kline_5m': 200,        # 5分钟K线订阅限制
-            'kline_15m': 200,       # 15分钟K线订阅限制
-            'kline_30m': 200,       # 30分钟K线订阅限制
-            'kline_60m': 200,       # 60分钟K线订阅限制
-            'kline_day': 200,       # 日K订阅限制
-            'kline_week': 200,      # 周K订阅限制
-            'kline_month': 200,     # 月K订阅限制
-            'broker': 200           # 经纪队列订阅限制
-        }
+        # 订阅额度管理（账户真实额度、固定高优先级股票、LRU 淘汰）
+        self.subscription_manager = SubscriptionManager(
+            self.subscribe, self.unsubscribe, self._query_subscription_quota
+        )
         
         self.logger.info("FutuMarket initialized successfully")
     
@@ -180,6 +176,7 @@ class FutuMarket(FutuModuleBase):
                     if code not in self.subscribed_stocks:
                         self.subscribed_stocks[code] = set()
                     self.subscribed_stocks[code].update(sub_types)
+                self.subscription_manager.on_subscribed(codes, sub_types)
                 
                 self.logger.info(f"Successfully subscribed to {sub_types} for {len(codes)} stocks")
             else:
@@ -202,6 +199,7 @@ class FutuMarket(FutuModuleBase):
                         # 如果该股票没有任何订阅，移除记录
                         if not self.subscribed_stocks[code]:
                             del self.subscribed_stocks[code]
+                self.subscription_manager.on_unsubscribed(codes, sub_types)
                 
                 self.logger.info(f"Successfully unsubscribed from {sub_types} for {len(codes)} stocks")
             return success
@@ -210,18 +208,38 @@ class FutuMarket(FutuModuleBase):
             return False
 
     def unsubscribe_all(self) -> bool:
-        """取消所有订阅"""
+        """
+        取消所有订阅
+
+        共享客户端只取消本模块记录的订阅，其他模块的订阅由注册表在最后一个使用者释放时统一取消
+        """
         try:
-            success = self.client.quote.unsubscribe_all()
+            if getattr(self, '_shared_client', False):
+                success = self._unsubscribe_own()
+            else:
+                success = self.client.quote.unsubscribe_all()
             if success:
                 # 清空本地订阅状态
                 self.subscribed_stocks.clear()
+                self.subscription_manager.clear()
                 self.logger.info("Successfully unsubscribed from all")
             return success
         except Exception as e:
             self.logger.error(f"Unsubscribe all error: {e}")
             return False
 
+    def _unsubscribe_own(self) -> bool:
+        """按订阅类型组合批量取消本模块订阅的股票"""
+        groups: Dict[frozenset, List[str]] = {}
+        for code, types in self.subscribed_stocks.items():
+            if types:
+                groups.setdefault(frozenset(types), []).append(code)
+
+        success = True
+        for types, codes in groups.items():
+            success = self.unsubscribe(codes, sorted(types)) and success
+        return success
+
     def get_subscriptions(self) -> List:
         """获取当前订阅信息"""
         try:
@@ -246,41 +264,41 @@ class FutuMarket(FutuModuleBase):
         try:
             if isinstance(sub_types, str):
                 sub_types = [sub_types]
-                
-            need_subscribe_codes = []
-            need_subscribe_types = []
             
-            for code in codes:
-                for sub_type in sub_types:
-                    if not self.is_subscribed(code, sub_type):
-                        if code not in need_subscribe_codes:
-                            need_subscribe_codes.append(code)
-                        if sub_type not in need_subscribe_types:
-                            need_subscribe_types.append(sub_type)
-            
-            if need_subscribe_codes and need_subscribe_types:
-                # 检查订阅限制
-                if not self._check_subscription_limits(need_subscribe_codes, need_subscribe_types):
-                    self.logger.warning(f"订阅数量超出限制，无法订阅 {len(need_subscribe_codes)} 只股票的 {need_subscribe_types} 数据")
-                    return False
-                
-                # 执行订阅
-                success = self.subscribe(need_subscribe_codes, need_subscribe_types)
-                if success:
-                    self.logger.info(f"成功确保 {len(need_subscribe_codes)} 只股票的 {need_subscribe_types} 数据订阅")
-                    return True
-                else:
-                    self.logger.error(f"确保订阅失败")
-                    return False
-            
-            # 所有数据都已订阅
-            self.logger.debug(f"所有指定股票和数据类型都已订阅")
-            return True
+            # 已订阅的只更新最近使用顺序；额度不足时淘汰最久未使用的非固定订阅
+            success = self.subscription_manager.ensure(codes, sub_types)
+            if not success:
+                self.logger.warning(f"无法确保 {len(codes)} 只股票的 {sub_types} 数据订阅")
+            return success
             
         except Exception as e:
             self.logger.error(f"确保订阅异常: {e}")
             return False
     
+    # ================== 订阅优先级 ==================
+    
+    def pin_subscription(self, codes: List[str], reason: str) -> None:
+        """
+        固定股票订阅（持仓、监控列表、打开的分析标签页等），固定的订阅不会被淘汰
+        
+        Args:
+            codes: 股票代码列表
+            reason: 固定原因，同一股票可有多个原因，全部取消后才可被淘汰
+        """
+        self.subscription_manager.pin(codes, reason)
+    
+    def unpin_subscription(self, codes: List[str], reason: str) -> None:
+        """取消固定（订阅保留，额度不足时可被淘汰）"""
+        self.subscription_manager.unpin(codes, reason)
+    
+    def set_pinned_subscriptions(self, codes: List[str], reason: str) -> None:
+        """把某个原因固定的股票整体替换为 codes（如持仓列表刷新后）"""
+        self.subscription_manager.set_pinned(codes, reason)
+    
+    def _query_subscription_quota(self) -> Dict:
+        """查询账户订阅额度（供订阅额度管理器使用）"""
+        return self.client.quote.query_subscription_quota()
+    
     def is_subscribed(self, code: str, sub_type: str) -> bool:
         """
         检查股票是否已订阅指定类型
@@ -402,42 +420,22 @@ class FutuMarket(FutuModuleBase):
                         if code not in self.subscribed_stocks:
                             self.subscribed_stocks[code] = set()
                         self.subscribed_stocks[code].add(sub_type)
+                self.subscription_manager.sync(
+                    (code, sub_type) for code, types in self.subscribed_stocks.items() for sub_type in types
+                )
                 
                 self.logger.info(f"订阅状态同步成功，共同步 {len(self.subscribed_stocks)} 只股票的订阅状态")
                 return True
             else:
                 self.logger.info("无订阅数据，清空本地状态")
                 self.subscribed_stocks.clear()
+                self.subscription_manager.clear()
                 return True
                 
         except Exception as e:
             self.logger.error(f"同步订阅状态异常: {e}")
             return False
     
-    def _check_subscription_limits(self, codes: List[str], sub_types: List[str]) -> bool:
-        """
-        检查订阅限制
-        
-        Args:
-            codes: 要订阅的股票代码列表
-            sub_types: 要订阅的类型列表
-            
-        Returns:
-            bool: 是否在限制范围内
-        """
-        for sub_type in sub_types:
-            if sub_type in self.subscription_limits:
-                current_count = self.get_subscription_count(sub_type)
-                new_count = len(codes)
-                
-                if current_count + new_count > self.subscription_limits[sub_type]:
-                    self.logger.warning(
-                        f"订阅类型 {sub_type} 超出限制：当前 {current_count}，"
-                        f"新增 {new_count}，限制 {self.subscription_limits[sub_type]}"
-                    )
-                    return False
-        return True
-    
     def get_subscription_summary(self) -> Dict[str, Any]:
         """
         获取订阅摘要信息
@@ -445,23 +443,18 @@ class FutuMarket(FutuModuleBase):
         Returns:
             Dict[str, Any]: 订阅摘要
         """
+        quota = self.subscription_manager.summary()
         summary = {
             'total_stocks': len(self.subscribed_stocks),
             'subscription_counts': {},
-            'limits': self.subscription_limits.copy(),
-            'usage_rates': {}
+            'quota': quota,
+            'usage_rate': round(quota['used'] / quota['quota'] * 100, 2) if quota['quota'] else 0.0
         }
         
         # 统计各类型订阅数量
-        for sub_type in self.subscription_limits.keys():
-            count = self.get_subscription_count(sub_type)
-            summary['subscription_counts'][sub_type] = count
-            
-            # 计算使用率
-            limit = self.subscription_limits[sub_type]
-            if limit > 0:
-                usage_rate = (count / limit) * 100
-                summary['usage_rates'][sub_type] = round(usage_rate, 2)
+        for types in self.subscribed_stocks.values():
+            for sub_type in types:
+                summary['subscription_counts'][sub_type] = summary['subscription_counts'].get(sub_type, 0) + 1
         
         return summary
 
@@ -654,6 +647,14 @@ class FutuMarket(FutuModuleBase):
         except Exception as e:
             self.logger.error(f"Get stock basicinfo error: {e}")
             return []
+
+    def get_stock_basicinfo_by_codes(self, codes: List[str]) -> List:
+        """只获取指定股票的基本信息（用于补充本地缓存中缺失或过期的股票）"""
+        try:
+            return self.client.quote.get_stock_info("HK", "STOCK", list(codes))
+        except Exception as e:
+            self.logger.error(f"Get stock basicinfo by codes error: {e}")
+            return []
     
     def get_stock_basicinfo_multi_types(self, market: str = "HK", stock_types: List[str] = None) -> List:
         """获取多种类型证券的基本信息并合并结果
@@ -894,23 +895,15 @@ class FutuMarket(FutuModuleBase):
             else:
                 code_list = codes
             
-            # 检查是否需要订阅
-            need_subscribe = []
-            for code in code_list:
-                if not self.is_subscribed(code, sub_type):
-                    need_subscribe.append(code)
-            
-            # 如果有需要订阅的股票，执行自动订阅
+            # 已订阅的股票也经过订阅额度管理器，以更新最近使用顺序
+            need_subscribe = [code for code in code_list if not self.is_subscribed(code, sub_type)]
+            success = self.ensure_subscription(code_list, [sub_type])
             if need_subscribe:
-                success = self.ensure_subscription(need_subscribe, [sub_type])
                 if success:
                     self.logger.info(f"自动订阅成功: {len(need_subscribe)} 只股票的 {sub_type} 数据")
                 else:
                     self.logger.warning(f"自动订阅失败: {need_subscribe} 的 {sub_type} 数据")
-                return success
-            else:
-                # 所有股票都已订阅
-                return True
+            return success
                 
         except Exception as e:
             self.logger.error(f"智能订阅检测异常: {e}")
@@ -953,7 +946,7 @@ class FutuMarket(FutuModuleBase):
         在关闭连接前调用此方法进行清理
         """
         try:
-            # 取消所有订阅
+            # 取消订阅（共享客户端只取消本模块的订阅）
             self.unsubscribe_all()
             
             # 清理本地状态
@@ -1,5 +1,7 @@
 #对应https://openapi.futunn.com/futu-api-doc/trade/overview.html
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Callable
 
@@ -10,6 +12,66 @@ from ..utils.global_vars import *
 
 # 使用新的API封装
 from ..base.futu_module import FutuModuleBase
+from .account_state import AccountState, ACCOUNT_STATE_CONFIG
+from .deal_analytics import DealAnalytics
+
+# 交易接口频率限制 (FutuOpenD: 下单每30秒最多15次且连续两次间隔不小于0.02秒；改单/撤单每30秒最多20次)
+TRADE_RATE_LIMITS = {
+    "place_order": {"capacity": 15, "period": 30.0, "min_interval": 0.02},
+    "modify_order": {"capacity": 20, "period": 30.0, "min_interval": 0.02},
+}
+
+# 批量交易并发线程数
+BATCH_MAX_WORKERS = 4
+
+# 未启用成交推送时，当日成交的最短重新查询间隔（秒）
+DEAL_SYNC_INTERVAL = 30
+
+
+class TokenBucket:
+    """
+    令牌桶限流器（线程安全）
+
+    桶容量即周期内允许的突发请求数，令牌按 capacity/period 的速率匀速补充，
+    同时保证相邻两次请求不小于 min_interval
+    """
+
+    def __init__(self, capacity: int, period: float, min_interval: float = 0.0):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.min_interval = min_interval
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._last_acquire = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self, now: float) -> float:
+        """尝试取出一个令牌，返回需要等待的秒数（0 表示已取得）"""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        wait = max(0.0, self._last_acquire + self.min_interval - now)
+        if self._tokens < 1:
+            wait = max(wait, (1 - self._tokens) / self.rate)
+        if wait > 0:
+            return wait
+
+        self._tokens -= 1
+        self._last_acquire = now
+        return 0.0
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """阻塞直到取得令牌；超过 timeout 秒仍未取得返回 False"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._reserve(now)
+            if wait == 0:
+                return True
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
 
 
 class FutuTrade(FutuModuleBase):
@@ -21,9 +83,15 @@ class FutuTrade(FutuModuleBase):
     使用时需先调用open方法, 务必close
     """
     
-    def __init__(self, default_trd_env: str = "SIMULATE", default_market: str = "HK", default_currency: str = "HKD"):
-        """初始化富途交易管理器"""
-        super().__init__()
+    def __init__(self, default_trd_env: str = "SIMULATE", default_market: str = "HK", default_currency: str = "HKD",
+                 client=None):
+        """
+        初始化富途交易管理器
+
+        Args:
+            client: 可选的客户端实例，传入 PaperClient 时使用进程内模拟撮合，无需 FutuOpenD
+        """
+        super().__init__(client)
         self.logger = get_logger("futu_trade")
         
         # 默认交易配置
@@ -42,6 +110,18 @@ class FutuTrade(FutuModuleBase):
         self.order_callbacks = {}
         self.deal_callbacks = {}
         
+        # 推送维护的账户状态 {(trd_env, market): AccountState}，风控检查直接读取
+        self.account_states: Dict[tuple, AccountState] = {}
+        self._push_markets = set()
+        
+        # 增量成交统计 {(trd_env, market): DealAnalytics}
+        self.deal_analytics: Dict[tuple, DealAnalytics] = {}
+        self._deal_synced_at: Dict[tuple, float] = {}
+        self._history_synced_from: Dict[tuple, str] = {}
+        self._order_count_by_day: Dict[str, int] = {}
+        # 批量下单在线程池中并发执行，订单历史和当日计数需要加锁
+        self._order_stats_lock = threading.Lock()
+        
         # 风险控制参数
         self.risk_config = {
             "max_single_order_amount": 100000,  # 单笔最大下单金额
@@ -49,6 +129,11 @@ class FutuTrade(FutuModuleBase):
             "enable_risk_control": False  # 是否启用风险控制
         }
         
+        # 交易接口限流（单笔与批量下单共用，保证不超过 FutuOpenD 的频率限制；模拟撮合客户端不限流）
+        self._rate_limiters = {} if getattr(self.client, 'is_simulated', False) else {
+            name: TokenBucket(**limit) for name, limit in TRADE_RATE_LIMITS.items()
+        }
+        
         self.logger.info(f"FutuTrade initialized with {default_trd_env} environment")
 
         self.check()
@@ -269,6 +354,7 @@ class FutuTrade(FutuModuleBase):
                 if not self.unlock_trading():
                     return {"success": False, "message": "Trading not unlocked"}
             
+            self._acquire_rate_limit("place_order")
             result = self.client.trade.place_order(
                 code=code, price=price, qty=qty,
                 order_type=order_type, trd_side=trd_side,
@@ -290,7 +376,19 @@ class FutuTrade(FutuModuleBase):
                 order_info['timestamp'] = datetime.now().isoformat()
 
                 # 记录订单历史
-                self.order_history.append(order_info)
+                today = order_info['timestamp'][:10]
+                with self._order_stats_lock:
+                    self.order_history.append(order_info)
+                    self._order_count_by_day[today] = self._order_count_by_day.get(today, 0) + 1
+                
+                # 挂单先计入账户状态，后续由订单推送更新
+                state = self.account_states.get((trd_env, market))
+                if state is not None:
+                    state.apply_order({
+                        'order_id': order_info.get('order_id'), 'code': code,
+                        'trd_side': trd_side, 'price': price, 'qty': qty,
+                        'dealt_qty': 0, 'order_status': order_info.get('order_status'),
+                    })
 
                 self.logger.info(f"Order placed successfully: {code} {trd_side} {qty}@{price}")
                 return order_info
@@ -307,6 +405,7 @@ class FutuTrade(FutuModuleBase):
             trd_env = trd_env or self.default_trd_env
             market = market or self.default_market
             
+            self._acquire_rate_limit("modify_order")
             result = self.client.trade.cancel_order(order_id, trd_env, market)
             
             if isinstance(result, (pd.DataFrame, dict)):
@@ -338,6 +437,7 @@ class FutuTrade(FutuModuleBase):
             trd_env = trd_env or self.default_trd_env
             market = market or self.default_market
             
+            self._acquire_rate_limit("modify_order")
             result = self.client.trade.modify_order(order_id, price, qty, trd_env, market)
             
             if isinstance(result, (pd.DataFrame, dict)):
@@ -392,12 +492,14 @@ class FutuTrade(FutuModuleBase):
 
             if isinstance(result, pd.DataFrame):
                 self.deal_history = result.to_dict('records')
-                return self.deal_history
-            if isinstance(result, dict):
+            elif isinstance(result, dict):
                 self.deal_history = [result]
-                return self.deal_history
+            else:
+                return []
 
-            return []
+            self._get_deal_analytics(trd_env, market).ingest(self.deal_history)
+            self._deal_synced_at[(trd_env, market)] = time.time()
+            return self.deal_history
 
         except Exception as e:
             self.logger.error(f"Get deal list error: {e}")
@@ -433,11 +535,14 @@ class FutuTrade(FutuModuleBase):
             result = self.client.trade.get_history_deal_list(trd_env, market, start, end)
 
             if isinstance(result, pd.DataFrame):
-                return result.to_dict('records')
-            if isinstance(result, dict):
-                return [result]
+                deals = result.to_dict('records')
+            elif isinstance(result, dict):
+                deals = [result]
+            else:
+                return []
 
-            return []
+            self._get_deal_analytics(trd_env, market).ingest(deals)
+            return deals
 
         except Exception as e:
             self.logger.error(f"Get history deal list error: {e}")
@@ -553,50 +658,130 @@ class FutuTrade(FutuModuleBase):
             self.logger.error(f"Market sell error: {e}")
             return {"success": False, "message": str(e)}
     
-    def batch_place_orders(self, orders: List[Dict], trd_env: str = None, market: str = None) -> List[Dict]:
-        """批量下单"""
-        results = []
+    def batch_place_orders(self, orders: List[Dict], trd_env: str = None, market: str = None,
+                           max_workers: int = BATCH_MAX_WORKERS) -> List[Dict]:
+        """
+        批量下单
+        
+        风控所需的持仓与账户数据只查询一次，逐笔累计本批买入金额做检查；
+        通过检查的订单并发提交，由令牌桶保证不超过下单频率限制。
+        返回结果与 orders 一一对应，每笔附带 latency_ms（提交耗时，含限流等待）
+        """
+        if not orders:
+            return []
         
-        for order in orders:
+        trd_env = trd_env or self.default_trd_env
+        market = market or self.default_market
+        start_time = time.time()
+        results: List[Optional[Dict]] = [None] * len(orders)
+        
+        # 1. 统一风控检查（仅查询一次持仓与账户）
+        risk_state = None
+        if self.risk_config.get('enable_risk_control', True) and any(
+                order.get('enable_risk_check', True) for order in orders):
+            risk_state = self._get_risk_state(trd_env, market)
+        
+        pending = []
+        for index, order in enumerate(orders):
             try:
-                result = self.place_order(
-                    code=order['code'],
-                    price=order['price'],
-                    qty=order['qty'],
-                    order_type=order.get('order_type', 'NORMAL'),
-                    trd_side=order.get('trd_side', 'BUY'),
-                    trd_env=trd_env,
-                    market=market,
-                    enable_risk_check=order.get('enable_risk_check', True)
-                )
-                results.append(result)
-                
-                # 添加延时避免频繁请求
-                time.sleep(0.5)
-                
+                if order.get('enable_risk_check', True) and not self._risk_check_order(
+                        order['code'], order['price'], order['qty'], order.get('trd_side', 'BUY'),
+                        trd_env, market, risk_state=risk_state):
+                    results[index] = {"success": False, "message": "Risk check failed", "latency_ms": 0.0}
+                    continue
+                pending.append(index)
             except Exception as e:
                 self.logger.error(f"Batch order error: {e}")
-                results.append({"success": False, "message": str(e)})
+                results[index] = {"success": False, "message": str(e), "latency_ms": 0.0}
+        
+        # 2. 提交前统一解锁，避免并发线程重复解锁
+        if pending and not self.is_trade_unlocked and trd_env != "SIMULATE":
+            if not self.unlock_trading():
+                for index in pending:
+                    results[index] = {"success": False, "message": "Trading not unlocked", "latency_ms": 0.0}
+                return results
+        
+        # 3. 并发提交
+        def submit(index: int) -> Dict:
+            order = orders[index]
+            return self.place_order(
+                code=order['code'],
+                price=order['price'],
+                qty=order['qty'],
+                order_type=order.get('order_type', 'NORMAL'),
+                trd_side=order.get('trd_side', 'BUY'),
+                aux_price=order.get('aux_price'),
+                trd_env=trd_env,
+                market=market,
+                enable_risk_check=False
+            )
         
+        self._run_batch(pending, submit, results, max_workers, "Batch order")
+        
+        success_count = sum(1 for r in results if r.get('success'))
+        self.logger.info(
+            f"Batch order finished: {success_count}/{len(orders)} succeeded in "
+            f"{(time.time() - start_time) * 1000:.0f}ms"
+        )
         return results
     
-    def batch_cancel_orders(self, order_ids: List[str], trd_env: str = None, market: str = None) -> List[Dict]:
-        """批量撤单"""
-        results = []
+    def batch_cancel_orders(self, order_ids: List[str], trd_env: str = None, market: str = None,
+                            max_workers: int = BATCH_MAX_WORKERS) -> List[Dict]:
+        """
+        批量撤单
         
-        for order_id in order_ids:
+        并发提交，由令牌桶保证不超过改单/撤单频率限制；
+        返回结果与 order_ids 一一对应，每笔附带 latency_ms
+        """
+        if not order_ids:
+            return []
+        
+        start_time = time.time()
+        results: List[Optional[Dict]] = [None] * len(order_ids)
+        
+        def submit(index: int) -> Dict:
+            return self.cancel_order(order_ids[index], trd_env, market)
+        
+        self._run_batch(list(range(len(order_ids))), submit, results, max_workers, "Batch cancel")
+        
+        success_count = sum(1 for r in results if r.get('success'))
+        self.logger.info(
+            f"Batch cancel finished: {success_count}/{len(order_ids)} succeeded in "
+            f"{(time.time() - start_time) * 1000:.0f}ms"
+        )
+        return results
+    
+    def _acquire_rate_limit(self, operation: str):
+        """等待交易接口频率限制令牌"""
+        limiter = self._rate_limiters.get(operation)
+        if limiter is not None:
+            limiter.acquire()
+    
+    def _run_batch(self, indexes: List[int], submit: Callable[[int], Dict],
+                   results: List[Optional[Dict]], max_workers: int, operation: str) -> None:
+        """并发执行批量交易请求，结果按下标写回 results 并记录每笔耗时"""
+        def timed_submit(index: int) -> Dict:
+            start = time.perf_counter()
             try:
-                result = self.cancel_order(order_id, trd_env, market)
-                results.append(result)
-                
-                # 添加延时避免频繁请求
-                time.sleep(0.5)
-                
+                result = submit(index)
             except Exception as e:
-                self.logger.error(f"Batch cancel error: {e}")
-                results.append({"success": False, "message": str(e)})
+                self.logger.error(f"{operation} error: {e}")
+                result = {"success": False, "message": str(e)}
+            result['latency_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            return result
         
-        return results
+        if not indexes:
+            return
+        
+        workers = max(1, min(max_workers, len(indexes)))
+        if workers == 1:
+            for index in indexes:
+                results[index] = timed_submit(index)
+            return
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="futu_batch") as executor:
+            for index, result in zip(indexes, executor.map(timed_submit, indexes)):
+                results[index] = result
 
     # ================== 风险控制接口 ==================
     
@@ -614,9 +799,33 @@ class FutuTrade(FutuModuleBase):
         """获取风险控制配置"""
         return self.risk_config.copy()
     
+    def _get_risk_state(self, trd_env: str, market: str) -> Dict:
+        """
+        获取风控所需的持仓市值与账户总资产
+        
+        已启用账户同步时直接读取推送维护的内存状态（超过对账间隔才重新查询），
+        否则实时查询
+        """
+        state = self.account_states.get((trd_env, market))
+        if state is not None:
+            if state.is_stale():
+                self.reconcile_account_state(trd_env, market)
+            return state.risk_snapshot()
+        
+        account_info = self.get_account_info(trd_env, market)
+        return {
+            "total_value": self.get_total_position_value(trd_env, market),
+            "total_assets": account_info.get('total_assets', 0) if account_info else 0,
+        }
+    
     def _risk_check_order(self, code: str, price: float, qty: int, trd_side: str, 
-                         trd_env: str, market: str) -> bool:
-        """订单风险检查"""
+                         trd_env: str, market: str, risk_state: Optional[Dict] = None) -> bool:
+        """
+        订单风险检查
+        
+        risk_state 为 _get_risk_state() 的结果，批量下单时复用同一份数据；
+        检查通过的买单金额会累加到 risk_state['total_value']，使同批后续订单按累计持仓检查
+        """
         try:
             if not self.risk_config.get('enable_risk_control', True):
                 return True
@@ -631,18 +840,20 @@ class FutuTrade(FutuModuleBase):
             
             # 检查持仓比例（买入时）
             if trd_side.upper() == "BUY":
-                total_value = self.get_total_position_value(trd_env, market)
-                account_info = self.get_account_info(trd_env, market)
+                if risk_state is None:
+                    risk_state = self._get_risk_state(trd_env, market)
                 
-                if account_info:
-                    total_assets = account_info.get('total_assets', 0)
-                    if total_assets > 0:
-                        max_ratio = self.risk_config.get('max_position_ratio', 0.3)
-                        new_position_ratio = (total_value + order_amount) / total_assets
-                        
-                        if new_position_ratio > max_ratio:
-                            self.logger.warning(f"Position ratio {new_position_ratio} exceeds max {max_ratio}")
-                            return False
+                total_value = risk_state.get('total_value', 0.0)
+                total_assets = risk_state.get('total_assets', 0)
+                if total_assets > 0:
+                    max_ratio = self.risk_config.get('max_position_ratio', 0.3)
+                    new_position_ratio = (total_value + order_amount) / total_assets
+                    
+                    if new_position_ratio > max_ratio:
+                        self.logger.warning(f"Position ratio {new_position_ratio} exceeds max {max_ratio}")
+                        return False
+                
+                risk_state['total_value'] = total_value + order_amount
             
             return True
             
@@ -651,50 +862,77 @@ class FutuTrade(FutuModuleBase):
             return False
     
     def get_daily_pnl(self, trd_env: str = None, market: str = None) -> Dict:
-        """获取当日盈亏"""
+        """获取当日盈亏（读取增量成交统计）"""
         try:
+            trd_env = trd_env or self.default_trd_env
+            market = market or self.default_market
             today = datetime.now().strftime('%Y-%m-%d')
-            deals = self.get_deal_list(trd_env, market, today, today)
-            
-            total_pnl = 0.0
-            total_fee = 0.0
             
-            for deal in deals:
-                pnl = deal.get('pnl', 0)
-                fee = deal.get('fee', 0)
-                total_pnl += pnl
-                total_fee += fee
+            self._sync_today_deals(trd_env, market)
+            stats = self._get_deal_analytics(trd_env, market).day(today)
             
             return {
                 'date': today,
-                'total_pnl': total_pnl,
-                'total_fee': total_fee,
-                'net_pnl': total_pnl - total_fee,
-                'deal_count': len(deals)
+                'total_pnl': stats.total_pnl,
+                'total_fee': stats.total_fee,
+                'net_pnl': stats.net_pnl,
+                'deal_count': stats.deal_count
             }
             
         except Exception as e:
             self.logger.error(f"Get daily PnL error: {e}")
             return {}
+    
+    def _get_deal_analytics(self, trd_env: str, market: str) -> DealAnalytics:
+        """获取 (交易环境, 市场) 的成交统计"""
+        key = (trd_env, market)
+        analytics = self.deal_analytics.get(key)
+        if analytics is None:
+            analytics = self.deal_analytics.setdefault(key, DealAnalytics())
+        return analytics
+    
+    def _sync_today_deals(self, trd_env: str, market: str):
+        """
+        同步当日成交到统计
+        
+        已启用成交推送时只需首次查询，之后由推送增量入库；
+        否则距上次查询超过 DEAL_SYNC_INTERVAL 秒才重新查询
+        """
+        synced_at = self._deal_synced_at.get((trd_env, market))
+        if synced_at is not None:
+            if market in self._push_markets or time.time() - synced_at < DEAL_SYNC_INTERVAL:
+                return
+        self.get_deal_list(trd_env, market)
+    
+    def _sync_history_deals(self, trd_env: str, market: str, start: str):
+        """同步 start 之后的历史成交到统计（已同步过的日期区间不再重复下载）"""
+        key = (trd_env, market)
+        synced_from = self._history_synced_from.get(key)
+        if synced_from is not None and synced_from <= start:
+            return
+        
+        end = synced_from or datetime.now().strftime('%Y-%m-%d')
+        self.get_history_deal_list(trd_env, market, start, end)
+        self._history_synced_from[key] = start
 
     # ================== 事件处理接口 ==================
     
     def set_order_callback(self, callback: Callable, market: str = None):
-        """设置订单回调"""
+        """设置订单回调（回调参数为订单推送 DataFrame）"""
         try:
             market = market or self.default_market
             self.order_callbacks[market] = callback
-            self.client.trade.set_order_callback(callback, market)
+            self._install_push_handlers(market)
             self.logger.info(f"Order callback set for {market}")
         except Exception as e:
             self.logger.error(f"Set order callback error: {e}")
     
     def set_deal_callback(self, callback: Callable, market: str = None):
-        """设置成交回调"""
+        """设置成交回调（回调参数为成交推送 DataFrame）"""
         try:
             market = market or self.default_market
             self.deal_callbacks[market] = callback
-            self.client.trade.set_deal_callback(callback, market)
+            self._install_push_handlers(market)
             self.logger.info(f"Deal callback set for {market}")
         except Exception as e:
             self.logger.error(f"Set deal callback error: {e}")
@@ -716,6 +954,88 @@ class FutuTrade(FutuModuleBase):
             self.logger.info(f"Deal push enabled for {market}")
         except Exception as e:
             self.logger.error(f"Enable deal push error: {e}")
+    
+    def enable_account_sync(self, trd_env: str = None, market: str = None,
+                            reconcile_interval: float = ACCOUNT_STATE_CONFIG['reconcile_interval']) -> bool:
+        """
+        启用账户状态同步
+        
+        查询一次持仓、资金与当日订单作为初始状态，之后由订单/成交推送增量更新，
+        风控检查不再同步查询账户；超过 reconcile_interval 秒后重新对账
+        """
+        try:
+            trd_env = trd_env or self.default_trd_env
+            market = market or self.default_market
+            
+            self.account_states[(trd_env, market)] = AccountState(trd_env, market, reconcile_interval)
+            self._install_push_handlers(market)
+            self.enable_order_push(market)
+            self.enable_deal_push(market)
+            
+            return self.reconcile_account_state(trd_env, market)
+        except Exception as e:
+            self.logger.error(f"Enable account sync error: {e}")
+            return False
+    
+    def reconcile_account_state(self, trd_env: str = None, market: str = None) -> bool:
+        """重新查询持仓、资金与当日订单，修正账户状态"""
+        trd_env = trd_env or self.default_trd_env
+        market = market or self.default_market
+        state = self.account_states.get((trd_env, market))
+        if state is None:
+            return False
+        
+        try:
+            positions = self.get_position_list(trd_env, market)
+            account_info = self.get_account_info(trd_env, market)
+            orders = self.get_order_list(trd_env=trd_env, market=market)
+            state.seed(positions, account_info, orders)
+            self.logger.debug(f"Account state reconciled for {trd_env}/{market}: "
+                              f"{len(state.positions)} positions, {len(state.open_orders)} open orders")
+            return True
+        except Exception as e:
+            self.logger.error(f"Reconcile account state error: {e}")
+            return False
+    
+    def _install_push_handlers(self, market: str):
+        """为市场注册内部推送分发器（每个市场只注册一次）"""
+        if market in self._push_markets:
+            return
+        self.client.trade.set_order_callback(lambda data: self._on_order_push(market, data), market)
+        self.client.trade.set_deal_callback(lambda data: self._on_deal_push(market, data), market)
+        self._push_markets.add(market)
+    
+    def _on_order_push(self, market: str, data):
+        """订单推送：更新账户状态后转交用户回调"""
+        try:
+            records = data.to_dict('records') if isinstance(data, pd.DataFrame) else [data]
+            for record in records:
+                state = self.account_states.get((str(record.get('trd_env', self.default_trd_env)), market))
+                if state is not None:
+                    state.apply_order(record)
+        except Exception as e:
+            self.logger.error(f"Apply order push error: {e}")
+        
+        callback = self.order_callbacks.get(market)
+        if callback:
+            callback(data)
+    
+    def _on_deal_push(self, market: str, data):
+        """成交推送：更新账户状态后转交用户回调"""
+        try:
+            records = data.to_dict('records') if isinstance(data, pd.DataFrame) else [data]
+            for record in records:
+                trd_env = str(record.get('trd_env', self.default_trd_env))
+                self._get_deal_analytics(trd_env, market).ingest([record])
+                state = self.account_states.get((trd_env, market))
+                if state is not None:
+                    state.apply_deal(record)
+        except Exception as e:
+            self.logger.error(f"Apply deal push error: {e}")
+        
+        callback = self.deal_callbacks.get(market)
+        if callback:
+            callback(data)
 
     # ================== 辅助方法 ==================
     
@@ -742,6 +1062,7 @@ class FutuTrade(FutuModuleBase):
                 'risk_control_enabled': self.risk_config.get('enable_risk_control', True),
                 'order_callback_set': bool(self.order_callbacks),
                 'deal_callback_set': bool(self.deal_callbacks),
+                'account_sync_enabled': [f"{env}/{mkt}" for env, mkt in self.account_states],
                 'order_history_count': len(self.order_history),
                 'deal_history_count': len(self.deal_history)
             }
@@ -756,42 +1077,47 @@ class FutuTrade(FutuModuleBase):
             self.position_list = None
             self.order_history = []
             self.deal_history = []
+            self.deal_analytics = {}
+            self._deal_synced_at = {}
+            self._history_synced_from = {}
+            with self._order_stats_lock:
+                self._order_count_by_day = {}
+            for state in self.account_states.values():
+                state.invalidate()
             self.logger.info("Cache cleared")
         except Exception as e:
             self.logger.error(f"Clear cache error: {e}")
     
-    def get_performance_summary(self, days: int = 7) -> Dict:
-        """获取绩效总结"""
+    def get_performance_summary(self, days: int = 7, trd_env: str = None, market: str = None) -> Dict:
+        """获取绩效总结（读取增量成交统计，历史成交只下载一次）"""
         try:
+            trd_env = trd_env or self.default_trd_env
+            market = market or self.default_market
+            
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
             
             start_str = start_date.strftime('%Y-%m-%d')
             end_str = end_date.strftime('%Y-%m-%d')
             
-            deals = self.get_deal_list(start=start_str, end=end_str)
+            self._sync_history_deals(trd_env, market, start_str)
+            self._sync_today_deals(trd_env, market)
+            stats = self._get_deal_analytics(trd_env, market).period(start_str, end_str)
             
-            if not deals:
+            if not stats.deal_count:
                 return {}
             
-            total_pnl = sum(deal.get('pnl', 0) for deal in deals)
-            total_fee = sum(deal.get('fee', 0) for deal in deals)
-            total_amount = sum(deal.get('price', 0) * deal.get('qty', 0) for deal in deals)
-            
-            win_deals = [d for d in deals if d.get('pnl', 0) > 0]
-            lose_deals = [d for d in deals if d.get('pnl', 0) < 0]
-            
             return {
                 'period': f"{start_str} to {end_str}",
-                'total_deals': len(deals),
-                'total_pnl': total_pnl,
-                'total_fee': total_fee,
-                'net_pnl': total_pnl - total_fee,
-                'total_amount': total_amount,
-                'win_deals': len(win_deals),
-                'lose_deals': len(lose_deals),
-                'win_rate': len(win_deals) / len(deals) if deals else 0,
-                'avg_pnl_per_deal': total_pnl / len(deals) if deals else 0
+                'total_deals': stats.deal_count,
+                'total_pnl': stats.total_pnl,
+                'total_fee': stats.total_fee,
+                'net_pnl': stats.net_pnl,
+                'total_amount': stats.total_amount,
+                'win_deals': stats.win_deals,
+                'lose_deals': stats.lose_deals,
+                'win_rate': stats.win_rate,
+                'avg_pnl_per_deal': stats.total_pnl / stats.deal_count
             }
             
         except Exception as e:
@@ -802,6 +1128,7 @@ class FutuTrade(FutuModuleBase):
         """交易系统健康检查"""
         try:
             base_health = super().health_check()
+            today = datetime.now().strftime('%Y-%m-%d')
             
             # 添加交易相关检查
             trade_health = {
@@ -809,10 +1136,9 @@ class FutuTrade(FutuModuleBase):
                 'risk_control_enabled': self.risk_config.get('enable_risk_control', True),
                 'order_callbacks_active': len(self.order_callbacks) > 0,
                 'deal_callbacks_active': len(self.deal_callbacks) > 0,
-                'recent_order_count': len([o for o in self.order_history if 
-                                          datetime.fromisoformat(o.get('timestamp', '1970-01-01')).date() == datetime.now().date()]),
-                'recent_deal_count': len([d for d in self.deal_history if 
-                                         datetime.fromisoformat(d.get('timestamp', '1970-01-01')).date() == datetime.now().date()])
+                'recent_order_count': self._order_count_by_day.get(today, 0),
+                'recent_deal_count': self._get_deal_analytics(
+                    self.default_trd_env, self.default_market).day(today).deal_count
             }
             
             base_health.update(trade_health)
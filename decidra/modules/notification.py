@@ -14,20 +14,27 @@ A股自选股智能分析系统 - 通知层
    - 邮件 SMTP
 """
 
+import asyncio
 import logging
 import smtplib
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.header import Header
 from enum import Enum
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from decidra.utils.global_vars import get_config
 from .analyzer import AnalysisResult
+from .report_renderer import RenderedReport, ReportBuilder, truncate_to_bytes
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +49,9 @@ class NotificationChannel(Enum):
     UNKNOWN = "unknown"    # 未知
 
 
+# Telegram 单条消息最大长度（字符），超长消息按段落分批发送
+TELEGRAM_MAX_LENGTH = 4096
+
 # SMTP 服务器配置（自动识别）
 SMTP_CONFIGS = {
     # QQ邮箱
@@ -66,6 +76,20 @@ SMTP_CONFIGS = {
 }
 
 
+@dataclass
+class ChannelDeliveryResult:
+    """单个渠道的投递结果"""
+    channel: NotificationChannel
+    success: bool
+    elapsed: float = 0.0              # 投递耗时（秒），包含分批间隔
+    error_message: Optional[str] = None
+    requests: int = 0                 # 实际发出的请求数（分批发送时每批一次）
+    
+    @property
+    def channel_name(self) -> str:
+        return ChannelDetector.get_channel_name(self.channel)
+
+
 class ChannelDetector:
     """
     渠道检测器 - 简化版
@@ -151,6 +175,15 @@ class NotificationService:
         # 检测所有已配置的渠道
         self._available_channels = self._detect_all_channels()
         
+        # 每个渠道独立的 HTTP 连接池（渠道内分批消息串行发送，保证顺序）
+        self._sessions: Dict[NotificationChannel, requests.Session] = {}
+        # 渠道并发投递线程池（延迟创建）
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # 多个线程同时发送时保证会话和线程池只创建一次
+        self._init_lock = threading.Lock()
+        # 当前线程 send_channel 调用内的请求计数
+        self._request_counter = threading.local()
+        
         if not self._available_channels:
             logger.warning("未配置有效的通知渠道，将不发送推送通知")
         else:
@@ -208,6 +241,50 @@ class NotificationService:
         """获取所有已配置渠道的名称"""
         return ', '.join([ChannelDetector.get_channel_name(ch) for ch in self._available_channels])
     
+    def _get_session(self, channel: NotificationChannel) -> requests.Session:
+        """获取渠道的 HTTP 会话（复用 TCP/TLS 连接）"""
+        session = self._sessions.get(channel)
+        if session is None:
+            with self._init_lock:
+                session = self._sessions.get(channel)
+                if session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._sessions[channel] = session
+        return session
+    
+    def _count_request(self) -> None:
+        """记录一次实际发出的请求（HTTP 或 SMTP），供发件箱按请求数限速"""
+        self._request_counter.count = getattr(self._request_counter, 'count', 0) + 1
+    
+    def _post(self, channel: NotificationChannel, url: str, **kwargs) -> requests.Response:
+        """通过渠道会话发送 POST 请求并计数"""
+        self._count_request()
+        return self._get_session(channel).post(url, **kwargs)
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """获取渠道投递线程池（每个已配置渠道一个线程）"""
+        if self._executor is None:
+            with self._init_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=max(len(self._available_channels), 1),
+                        thread_name_prefix="notify"
+                    )
+        return self._executor
+    
+    def close(self) -> None:
+        """释放连接池和线程池"""
+        with self._init_lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+    
     def generate_daily_report(
         self, 
         results: List[AnalysisResult],
@@ -443,6 +520,25 @@ class NotificationService:
         Returns:
             Markdown 格式的决策仪表盘日报
         """
+        return self.render_dashboard_report(results, report_date).text
+    
+    def render_dashboard_report(
+        self, 
+        results: List[AnalysisResult],
+        report_date: Optional[str] = None
+    ) -> RenderedReport:
+        """
+        渲染决策仪表盘日报为分段报告（每只股票一段）
+        
+        分段报告可直接传给 send()，各渠道按自身字节上限分批时无需重新分割和编码
+        
+        Args:
+            results: 分析结果列表
+            report_date: 报告日期（默认今天）
+            
+        Returns:
+            RenderedReport 分段报告
+        """
         if report_date is None:
             report_date = datetime.now().strftime('%Y-%m-%d')
         
@@ -454,14 +550,14 @@ class NotificationService:
         sell_count = sum(1 for r in results if r.operation_advice in ['卖出', '减仓', '强烈卖出'])
         hold_count = sum(1 for r in results if r.operation_advice in ['持有', '观望'])
         
-        report_lines = [
+        report = ReportBuilder()
+        report.extend([
             f"# 🎯 {report_date} 决策仪表盘",
             "",
             f"> 共分析 **{len(results)}** 只股票 | 🟢买入:{buy_count} 🟡观望:{hold_count} 🔴卖出:{sell_count}",
             "",
-            "---",
-            "",
-        ]
+        ])
+        report.section_break()
         
         # 逐个股票的决策仪表盘
         for result in sorted_results:
@@ -471,7 +567,7 @@ class NotificationService:
             # 股票名称（优先使用 dashboard 或 result 中的名称）
             stock_name = result.name if result.name and not result.name.startswith('股票') else f'股票{result.code}'
             
-            report_lines.extend([
+            report.extend([
                 f"## {signal_emoji} {stock_name} ({result.code})",
                 "",
             ])
@@ -479,41 +575,41 @@ class NotificationService:
             # ========== 舆情与基本面概览（放在最前面）==========
             intel = dashboard.get('intelligence', {}) if dashboard else {}
             if intel:
-                report_lines.extend([
+                report.extend([
                     "### 📰 重要信息速览",
                     "",
                 ])
                 
                 # 舆情情绪总结
                 if intel.get('sentiment_summary'):
-                    report_lines.append(f"**💭 舆情情绪**: {intel['sentiment_summary']}")
+                    report.append(f"**💭 舆情情绪**: {intel['sentiment_summary']}")
                 
                 # 业绩预期
                 if intel.get('earnings_outlook'):
-                    report_lines.append(f"**📊 业绩预期**: {intel['earnings_outlook']}")
+                    report.append(f"**📊 业绩预期**: {intel['earnings_outlook']}")
                 
                 # 风险警报（醒目显示）
                 risk_alerts = intel.get('risk_alerts', [])
                 if risk_alerts:
-                    report_lines.append("")
-                    report_lines.append("**🚨 风险警报**:")
+                    report.append("")
+                    report.append("**🚨 风险警报**:")
                     for alert in risk_alerts:
-                        report_lines.append(f"- {alert}")
+                        report.append(f"- {alert}")
                 
                 # 利好催化
                 catalysts = intel.get('positive_catalysts', [])
                 if catalysts:
-                    report_lines.append("")
-                    report_lines.append("**✨ 利好催化**:")
+                    report.append("")
+                    report.append("**✨ 利好催化**:")
                     for cat in catalysts:
-                        report_lines.append(f"- {cat}")
+                        report.append(f"- {cat}")
                 
                 # 最新消息
                 if intel.get('latest_news'):
-                    report_lines.append("")
-                    report_lines.append(f"**📢 最新动态**: {intel['latest_news']}")
+                    report.append("")
+                    report.append(f"**📢 最新动态**: {intel['latest_news']}")
                 
-                report_lines.append("")
+                report.append("")
             
             # ========== 核心结论 ==========
             core = dashboard.get('core_conclusion', {}) if dashboard else {}
@@ -521,7 +617,7 @@ class NotificationService:
             time_sense = core.get('time_sensitivity', '本周内')
             pos_advice = core.get('position_advice', {})
             
-            report_lines.extend([
+            report.extend([
                 "### 📌 核心结论",
                 "",
                 f"**{signal_emoji} {signal_text}** | {result.trend_prediction}",
@@ -534,7 +630,7 @@ class NotificationService:
             
             # 持仓分类建议
             if pos_advice:
-                report_lines.extend([
+                report.extend([
                     "| 持仓情况 | 操作建议 |",
                     "|---------|---------|",
                     f"| 🆕 **空仓者** | {pos_advice.get('no_position', result.operation_advice)} |",
@@ -550,7 +646,7 @@ class NotificationService:
                 vol_data = data_persp.get('volume_analysis', {})
                 chip_data = data_persp.get('chip_structure', {})
                 
-                report_lines.extend([
+                report.extend([
                     "### 📊 数据透视",
                     "",
                 ])
@@ -558,7 +654,7 @@ class NotificationService:
                 # 趋势状态
                 if trend_data:
                     is_bullish = "✅ 是" if trend_data.get('is_bullish', False) else "❌ 否"
-                    report_lines.extend([
+                    report.extend([
                         f"**均线排列**: {trend_data.get('ma_alignment', 'N/A')} | 多头排列: {is_bullish} | 趋势强度: {trend_data.get('trend_score', 'N/A')}/100",
                         "",
                     ])
@@ -567,7 +663,7 @@ class NotificationService:
                 if price_data:
                     bias_status = price_data.get('bias_status', 'N/A')
                     bias_emoji = "✅" if bias_status == "安全" else ("⚠️" if bias_status == "警戒" else "🚨")
-                    report_lines.extend([
+                    report.extend([
                         "| 价格指标 | 数值 |",
                         "|---------|------|",
                         f"| 当前价 | {price_data.get('current_price', 'N/A')} |",
@@ -582,7 +678,7 @@ class NotificationService:
                 
                 # 量能分析
                 if vol_data:
-                    report_lines.extend([
+                    report.extend([
                         f"**量能**: 量比 {vol_data.get('volume_ratio', 'N/A')} ({vol_data.get('volume_status', '')}) | 换手率 {vol_data.get('turnover_rate', 'N/A')}%",
                         f"💡 *{vol_data.get('volume_meaning', '')}*",
                         "",
@@ -592,7 +688,7 @@ class NotificationService:
                 if chip_data:
                     chip_health = chip_data.get('chip_health', 'N/A')
                     chip_emoji = "✅" if chip_health == "健康" else ("⚠️" if chip_health == "一般" else "🚨")
-                    report_lines.extend([
+                    report.extend([
                         f"**筹码**: 获利比例 {chip_data.get('profit_ratio', 'N/A')} | 平均成本 {chip_data.get('avg_cost', 'N/A')} | 集中度 {chip_data.get('concentration', 'N/A')} {chip_emoji}{chip_health}",
                         "",
                     ])
@@ -602,7 +698,7 @@ class NotificationService:
             # ========== 作战计划 ==========
             battle = dashboard.get('battle_plan', {}) if dashboard else {}
             if battle:
-                report_lines.extend([
+                report.extend([
                     "### 🎯 作战计划",
                     "",
                 ])
@@ -610,7 +706,7 @@ class NotificationService:
                 # 狙击点位
                 sniper = battle.get('sniper_points', {})
                 if sniper:
-                    report_lines.extend([
+                    report.extend([
                         "**📍 狙击点位**",
                         "",
                         "| 点位类型 | 价格 |",
@@ -625,7 +721,7 @@ class NotificationService:
                 # 仓位策略
                 position = battle.get('position_strategy', {})
                 if position:
-                    report_lines.extend([
+                    report.extend([
                         f"**💰 仓位建议**: {position.get('suggested_position', 'N/A')}",
                         f"- 建仓策略: {position.get('entry_plan', 'N/A')}",
                         f"- 风控策略: {position.get('risk_control', 'N/A')}",
@@ -635,62 +731,59 @@ class NotificationService:
                 # 检查清单
                 checklist = battle.get('action_checklist', [])
                 if checklist:
-                    report_lines.extend([
+                    report.extend([
                         "**✅ 检查清单**",
                         "",
                     ])
                     for item in checklist:
-                        report_lines.append(f"- {item}")
-                    report_lines.append("")
+                        report.append(f"- {item}")
+                    report.append("")
             
             # 如果没有 dashboard，显示传统格式
             if not dashboard:
                 # 操作理由
                 if result.buy_reason:
-                    report_lines.extend([
+                    report.extend([
                         f"**💡 操作理由**: {result.buy_reason}",
                         "",
                     ])
                 
                 # 风险提示
                 if result.risk_warning:
-                    report_lines.extend([
+                    report.extend([
                         f"**⚠️ 风险提示**: {result.risk_warning}",
                         "",
                     ])
                 
                 # 技术面分析
                 if result.ma_analysis or result.volume_analysis:
-                    report_lines.extend([
+                    report.extend([
                         "### 📊 技术面",
                         "",
                     ])
                     if result.ma_analysis:
-                        report_lines.append(f"**均线**: {result.ma_analysis}")
+                        report.append(f"**均线**: {result.ma_analysis}")
                     if result.volume_analysis:
-                        report_lines.append(f"**量能**: {result.volume_analysis}")
-                    report_lines.append("")
+                        report.append(f"**量能**: {result.volume_analysis}")
+                    report.append("")
                 
                 # 消息面
                 if result.news_summary:
-                    report_lines.extend([
+                    report.extend([
                         "### 📰 消息面",
                         f"{result.news_summary}",
                         "",
                     ])
             
-            report_lines.extend([
-                "---",
-                "",
-            ])
+            report.section_break()
         
         # 底部（去除免责声明）
-        report_lines.extend([
+        report.extend([
             "",
             f"*报告生成时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*",
         ])
         
-        return "\n".join(report_lines)
+        return report.build()
     
     def generate_wechat_dashboard(self, results: List[AnalysisResult]) -> str:
         """
@@ -704,6 +797,18 @@ class NotificationService:
         Returns:
             精简版决策仪表盘
         """
+        return self.render_wechat_dashboard(results).text
+    
+    def render_wechat_dashboard(self, results: List[AnalysisResult]) -> RenderedReport:
+        """
+        渲染企业微信决策仪表盘精简版为分段报告（控制在4000字符内）
+        
+        Args:
+            results: 分析结果列表
+            
+        Returns:
+            RenderedReport 分段报告
+        """
         report_date = datetime.now().strftime('%Y-%m-%d')
         
         # 按评分排序
@@ -714,12 +819,13 @@ class NotificationService:
         sell_count = sum(1 for r in results if r.operation_advice in ['卖出', '减仓', '强烈卖出'])
         hold_count = sum(1 for r in results if r.operation_advice in ['持有', '观望'])
         
-        lines = [
+        lines = ReportBuilder()
+        lines.extend([
             f"## 🎯 {report_date} 决策仪表盘",
             "",
             f"> {len(results)}只股票 | 🟢买入:{buy_count} 🟡观望:{hold_count} 🔴卖出:{sell_count}",
             "",
-        ]
+        ])
         
         for result in sorted_results:
             signal_text, signal_emoji, _ = self._get_signal_level(result)
@@ -817,20 +923,19 @@ class NotificationService:
                         lines.append(f"   {check[:40]}")
                     lines.append("")
             
-            lines.append("---")
-            lines.append("")
+            lines.section_break()
         
         # 底部
         lines.append(f"*生成时间: {datetime.now().strftime('%H:%M')}*")
         
-        content = "\n".join(lines)
+        report = lines.build()
         
         # 检查长度
-        if len(content) > 3800:
-            logger.warning(f"仪表盘超长({len(content)}字符)，截断")
-            content = content[:3800] + "\n...(已截断)"
+        if len(report) > 3800:
+            logger.warning(f"仪表盘超长({len(report)}字符)，截断")
+            report = report.truncate_chars(3800, "\n...(已截断)")
         
-        return content
+        return report
     
     def generate_wechat_summary(self, results: List[AnalysisResult]) -> str:
         """
@@ -901,7 +1006,7 @@ class NotificationService:
         
         return content
     
-    def send_to_wechat(self, content: str) -> bool:
+    def send_to_wechat(self, content: Union[str, RenderedReport]) -> bool:
         """
         推送消息到企业微信机器人
         
@@ -917,7 +1022,7 @@ class NotificationService:
         可通过环境变量 WECHAT_MAX_BYTES 调整限制值
         
         Args:
-            content: Markdown 格式的消息内容
+            content: Markdown 格式的消息内容或已渲染的分段报告
             
         Returns:
             是否发送成功
@@ -929,115 +1034,36 @@ class NotificationService:
         max_bytes = self._wechat_max_bytes  # 从配置读取，默认 4000 字节
         
         # 检查字节长度，超长则分批发送
-        content_bytes = len(content.encode('utf-8'))
+        report = content if isinstance(content, RenderedReport) else RenderedReport.from_markdown(content)
+        content_bytes = report.total_bytes
         if content_bytes > max_bytes:
-            logger.info(f"消息内容超长({content_bytes}字节/{len(content)}字符)，将分批发送")
-            return self._send_wechat_chunked(content, max_bytes)
+            logger.info(f"消息内容超长({content_bytes}字节/{len(report)}字符)，将分批发送")
+            return self._send_wechat_chunked(report, max_bytes)
         
         try:
-            return self._send_wechat_message(content)
+            return self._send_wechat_message(report.text)
         except Exception as e:
             logger.error(f"发送企业微信消息失败: {e}")
             return False
     
-    def _send_wechat_chunked(self, content: str, max_bytes: int) -> bool:
+    def _send_wechat_chunked(self, content: Union[str, RenderedReport], max_bytes: int) -> bool:
         """
         分批发送长消息到企业微信
         
-        按股票分析块（以 --- 或 ### 分隔）智能分割，确保每批不超过限制
+        按股票分析块（以 --- 或 ### 分隔）智能分割，确保每批不超过限制；
+        无法智能分割时按行分割
         
         Args:
-            content: 完整消息内容
+            content: 完整消息内容或已渲染的分段报告
             max_bytes: 单条消息最大字节数
             
         Returns:
             是否全部发送成功
         """
-        import time
-        
-        def get_bytes(s: str) -> int:
-            """获取字符串的 UTF-8 字节数"""
-            return len(s.encode('utf-8'))
-        
-        # 智能分割：优先按 "---" 分隔（股票之间的分隔线）
-        # 如果没有分隔线，按 "### " 标题分割（每只股票的标题）
-        if "\n---\n" in content:
-            sections = content.split("\n---\n")
-            separator = "\n---\n"
-        elif "\n### " in content:
-            # 按 ### 分割，但保留 ### 前缀
-            parts = content.split("\n### ")
-            sections = [parts[0]] + [f"### {p}" for p in parts[1:]]
-            separator = "\n"
-        else:
-            # 无法智能分割，按字符强制分割
-            return self._send_wechat_force_chunked(content, max_bytes)
-        
-        chunks = []
-        current_chunk = []
-        current_bytes = 0
-        separator_bytes = get_bytes(separator)
-        
-        for section in sections:
-            section_bytes = get_bytes(section) + separator_bytes
-            
-            # 如果单个 section 就超长，需要强制截断
-            if section_bytes > max_bytes:
-                # 先发送当前积累的内容
-                if current_chunk:
-                    chunks.append(separator.join(current_chunk))
-                    current_chunk = []
-                    current_bytes = 0
-                
-                # 强制截断这个超长 section（按字节截断）
-                truncated = self._truncate_to_bytes(section, max_bytes - 200)
-                truncated += "\n\n...(本段内容过长已截断)"
-                chunks.append(truncated)
-                continue
-            
-            # 检查加入后是否超长
-            if current_bytes + section_bytes > max_bytes:
-                # 保存当前块，开始新块
-                if current_chunk:
-                    chunks.append(separator.join(current_chunk))
-                current_chunk = [section]
-                current_bytes = section_bytes
-            else:
-                current_chunk.append(section)
-                current_bytes += section_bytes
-        
-        # 添加最后一块
-        if current_chunk:
-            chunks.append(separator.join(current_chunk))
-        
-        # 分批发送
-        total_chunks = len(chunks)
-        success_count = 0
-        
-        logger.info(f"企业微信分批发送：共 {total_chunks} 批")
-        
-        for i, chunk in enumerate(chunks):
-            # 添加分页标记
-            if total_chunks > 1:
-                page_marker = f"\n\n📄 *({i+1}/{total_chunks})*"
-                chunk_with_marker = chunk + page_marker
-            else:
-                chunk_with_marker = chunk
-            
-            try:
-                if self._send_wechat_message(chunk_with_marker):
-                    success_count += 1
-                    logger.info(f"企业微信第 {i+1}/{total_chunks} 批发送成功")
-                else:
-                    logger.error(f"企业微信第 {i+1}/{total_chunks} 批发送失败")
-            except Exception as e:
-                logger.error(f"企业微信第 {i+1}/{total_chunks} 批发送异常: {e}")
-            
-            # 批次间隔，避免触发频率限制
-            if i < total_chunks - 1:
-                time.sleep(1)
-        
-        return success_count == total_chunks
+        report = content if isinstance(content, RenderedReport) else RenderedReport.from_markdown(content)
+        return self._send_chunks(
+            "企业微信", report.chunks(max_bytes), self._send_wechat_message, "\n\n📄 *({index}/{total})*"
+        )
     
     def _send_wechat_force_chunked(self, content: str, max_bytes: int) -> bool:
         """
@@ -1047,40 +1073,41 @@ class NotificationService:
             content: 完整消息内容
             max_bytes: 单条消息最大字节数
         """
-        import time
-        
-        chunks = []
-        current_chunk = ""
-        
-        # 按行分割，确保不会在多字节字符中间截断
-        lines = content.split('\n')
-        
-        for line in lines:
-            test_chunk = current_chunk + ('\n' if current_chunk else '') + line
-            if len(test_chunk.encode('utf-8')) > max_bytes - 100:  # 预留空间给分页标记
-                if current_chunk:
-                    chunks.append(current_chunk)
-                current_chunk = line
-            else:
-                current_chunk = test_chunk
-        
-        if current_chunk:
-            chunks.append(current_chunk)
+        return self._send_wechat_chunked(RenderedReport([content], None), max_bytes)
+    
+    def _send_chunks(self, channel_name: str, chunks: List[str], send_func, marker_template: str) -> bool:
+        """
+        按顺序发送分批消息，批次之间间隔 1 秒以避免触发频率限制
         
+        Args:
+            channel_name: 渠道名称（用于日志）
+            chunks: 分批后的消息
+            send_func: 发送单条消息的方法
+            marker_template: 分页标记模板（含 {index} 和 {total}）
+            
+        Returns:
+            是否全部发送成功
+        """
         total_chunks = len(chunks)
         success_count = 0
         
-        logger.info(f"企业微信强制分批发送：共 {total_chunks} 批")
+        logger.info(f"{channel_name}分批发送：共 {total_chunks} 批")
         
         for i, chunk in enumerate(chunks):
-            page_marker = f"\n\n📄 *({i+1}/{total_chunks})*" if total_chunks > 1 else ""
+            # 添加分页标记
+            if total_chunks > 1:
+                chunk = chunk + marker_template.format(index=i + 1, total=total_chunks)
             
             try:
-                if self._send_wechat_message(chunk + page_marker):
+                if send_func(chunk):
                     success_count += 1
+                    logger.info(f"{channel_name}第 {i+1}/{total_chunks} 批发送成功")
+                else:
+                    logger.error(f"{channel_name}第 {i+1}/{total_chunks} 批发送失败")
             except Exception as e:
-                logger.error(f"企业微信第 {i+1}/{total_chunks} 批发送异常: {e}")
+                logger.error(f"{channel_name}第 {i+1}/{total_chunks} 批发送异常: {e}")
             
+            # 批次间隔，避免触发频率限制
             if i < total_chunks - 1:
                 time.sleep(1)
         
@@ -1097,19 +1124,7 @@ class NotificationService:
         Returns:
             截断后的字符串
         """
-        encoded = text.encode('utf-8')
-        if len(encoded) <= max_bytes:
-            return text
-        
-        # 从 max_bytes 位置往前找，确保不截断多字节字符
-        truncated = encoded[:max_bytes]
-        # 尝试解码，如果失败则继续往前
-        while truncated:
-            try:
-                return truncated.decode('utf-8')
-            except UnicodeDecodeError:
-                truncated = truncated[:-1]
-        return ""
+        return truncate_to_bytes(text, max_bytes)
     
     def _send_wechat_message(self, content: str) -> bool:
         """发送企业微信消息"""
@@ -1120,7 +1135,8 @@ class NotificationService:
             }
         }
         
-        response = requests.post(
+        response = self._post(
+            NotificationChannel.WECHAT,
             self._wechat_url,
             json=payload,
             timeout=10
@@ -1138,7 +1154,7 @@ class NotificationService:
             logger.error(f"企业微信请求失败: {response.status_code}")
             return False
     
-    def send_to_feishu(self, content: str) -> bool:
+    def send_to_feishu(self, content: Union[str, RenderedReport]) -> bool:
         """
         推送消息到飞书机器人
         
@@ -1154,7 +1170,7 @@ class NotificationService:
         可通过环境变量 FEISHU_MAX_BYTES 调整限制值
         
         Args:
-            content: 消息内容（Markdown 会转为纯文本）
+            content: 消息内容（Markdown 会转为纯文本）或已渲染的分段报告
             
         Returns:
             是否发送成功
@@ -1166,115 +1182,36 @@ class NotificationService:
         max_bytes = self._feishu_max_bytes  # 从配置读取，默认 20000 字节
         
         # 检查字节长度，超长则分批发送
-        content_bytes = len(content.encode('utf-8'))
+        report = content if isinstance(content, RenderedReport) else RenderedReport.from_markdown(content)
+        content_bytes = report.total_bytes
         if content_bytes > max_bytes:
-            logger.info(f"飞书消息内容超长({content_bytes}字节/{len(content)}字符)，将分批发送")
-            return self._send_feishu_chunked(content, max_bytes)
+            logger.info(f"飞书消息内容超长({content_bytes}字节/{len(report)}字符)，将分批发送")
+            return self._send_feishu_chunked(report, max_bytes)
         
         try:
-            return self._send_feishu_message(content)
+            return self._send_feishu_message(report.text)
         except Exception as e:
             logger.error(f"发送飞书消息失败: {e}")
             return False
     
-    def _send_feishu_chunked(self, content: str, max_bytes: int) -> bool:
+    def _send_feishu_chunked(self, content: Union[str, RenderedReport], max_bytes: int) -> bool:
         """
         分批发送长消息到飞书
         
-        按股票分析块（以 --- 或 ### 分隔）智能分割，确保每批不超过限制
+        按股票分析块（以 --- 或 ### 分隔）智能分割，确保每批不超过限制；
+        无法智能分割时按行分割
         
         Args:
-            content: 完整消息内容
+            content: 完整消息内容或已渲染的分段报告
             max_bytes: 单条消息最大字节数
             
         Returns:
             是否全部发送成功
         """
-        import time
-        
-        def get_bytes(s: str) -> int:
-            """获取字符串的 UTF-8 字节数"""
-            return len(s.encode('utf-8'))
-        
-        # 智能分割：优先按 "---" 分隔（股票之间的分隔线）
-        # 如果没有分隔线，按 "### " 标题分割（每只股票的标题）
-        if "\n---\n" in content:
-            sections = content.split("\n---\n")
-            separator = "\n---\n"
-        elif "\n### " in content:
-            # 按 ### 分割，但保留 ### 前缀
-            parts = content.split("\n### ")
-            sections = [parts[0]] + [f"### {p}" for p in parts[1:]]
-            separator = "\n"
-        else:
-            # 无法智能分割，按行强制分割
-            return self._send_feishu_force_chunked(content, max_bytes)
-        
-        chunks = []
-        current_chunk = []
-        current_bytes = 0
-        separator_bytes = get_bytes(separator)
-        
-        for section in sections:
-            section_bytes = get_bytes(section) + separator_bytes
-            
-            # 如果单个 section 就超长，需要强制截断
-            if section_bytes > max_bytes:
-                # 先发送当前积累的内容
-                if current_chunk:
-                    chunks.append(separator.join(current_chunk))
-                    current_chunk = []
-                    current_bytes = 0
-                
-                # 强制截断这个超长 section（按字节截断）
-                truncated = self._truncate_to_bytes(section, max_bytes - 200)
-                truncated += "\n\n...(本段内容过长已截断)"
-                chunks.append(truncated)
-                continue
-            
-            # 检查加入后是否超长
-            if current_bytes + section_bytes > max_bytes:
-                # 保存当前块，开始新块
-                if current_chunk:
-                    chunks.append(separator.join(current_chunk))
-                current_chunk = [section]
-                current_bytes = section_bytes
-            else:
-                current_chunk.append(section)
-                current_bytes += section_bytes
-        
-        # 添加最后一块
-        if current_chunk:
-            chunks.append(separator.join(current_chunk))
-        
-        # 分批发送
-        total_chunks = len(chunks)
-        success_count = 0
-        
-        logger.info(f"飞书分批发送：共 {total_chunks} 批")
-        
-        for i, chunk in enumerate(chunks):
-            # 添加分页标记
-            if total_chunks > 1:
-                page_marker = f"\n\n📄 ({i+1}/{total_chunks})"
-                chunk_with_marker = chunk + page_marker
-            else:
-                chunk_with_marker = chunk
-            
-            try:
-                if self._send_feishu_message(chunk_with_marker):
-                    success_count += 1
-                    logger.info(f"飞书第 {i+1}/{total_chunks} 批发送成功")
-                else:
-                    logger.error(f"飞书第 {i+1}/{total_chunks} 批发送失败")
-            except Exception as e:
-                logger.error(f"飞书第 {i+1}/{total_chunks} 批发送异常: {e}")
-            
-            # 批次间隔，避免触发频率限制
-            if i < total_chunks - 1:
-                time.sleep(1)
-        
-        return success_count == total_chunks
+        report = content if isinstance(content, RenderedReport) else RenderedReport.from_markdown(content)
+        return self._send_chunks(
+            "飞书", report.chunks(max_bytes), self._send_feishu_message, "\n\n📄 ({index}/{total})"
+        )
     
     def _send_feishu_force_chunked(self, content: str, max_bytes: int) -> bool:
         """
@@ -1284,44 +1221,7 @@ class NotificationService:
             content: 完整消息内容
             max_bytes: 单条消息最大字节数
         """
-        import time
-        
-        chunks = []
-        current_chunk = ""
-        
-        # 按行分割，确保不会在多字节字符中间截断
-        lines = content.split('\n')
-        
-        for line in lines:
-            test_chunk = current_chunk + ('\n' if current_chunk else '') + line
-            if len(test_chunk.encode('utf-8')) > max_bytes - 100:  # 预留空间给分页标记
-                if current_chunk:
-                    chunks.append(current_chunk)
-                current_chunk = line
-            else:
-                current_chunk = test_chunk
-        
-        if current_chunk:
-            chunks.append(current_chunk)
-        
-        total_chunks = len(chunks)
-        success_count = 0
-        
-        logger.info(f"飞书强制分批发送：共 {total_chunks} 批")
-        
-        for i, chunk in enumerate(chunks):
-            page_marker = f"\n\n📄 ({i+1}/{total_chunks})" if total_chunks > 1 else ""
-            
-            try:
-                if self._send_feishu_message(chunk + page_marker):
-                    success_count += 1
-            except Exception as e:
-                logger.error(f"飞书第 {i+1}/{total_chunks} 批发送异常: {e}")
-            
-            if i < total_chunks - 1:
-                time.sleep(1)
-        
-        return success_count == total_chunks
+        return self._send_feishu_chunked(RenderedReport([content], None), max_bytes)
     
     def _send_feishu_message(self, content: str) -> bool:
         """发送单条飞书消息"""
@@ -1335,7 +1235,8 @@ class NotificationService:
         logger.debug(f"飞书请求 URL: {self._feishu_url}")
         logger.debug(f"飞书请求 payload 长度: {len(content)} 字符")
         
-        response = requests.post(
+        response = self._post(
+            NotificationChannel.FEISHU,
             self._feishu_url,
             json=payload,
             timeout=30
@@ -1427,6 +1328,7 @@ class NotificationService:
                 server.starttls()
             
             server.login(sender, password)
+            self._count_request()
             server.send_message(msg)
             server.quit()
             
@@ -1528,8 +1430,7 @@ class NotificationService:
             # Telegram API 端点
             api_url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
             
-            # Telegram 消息最大长度 4096 字符
-            max_length = 4096
+            max_length = TELEGRAM_MAX_LENGTH
             
             if len(content) <= max_length:
                 # 单条消息发送
@@ -1557,7 +1458,7 @@ class NotificationService:
             "disable_web_page_preview": True
         }
         
-        response = requests.post(api_url, json=payload, timeout=10)
+        response = self._post(NotificationChannel.TELEGRAM, api_url, json=payload, timeout=10)
         
         if response.status_code == 200:
             result = response.json()
@@ -1575,7 +1476,7 @@ class NotificationService:
                     payload['text'] = text  # 使用原始文本
                     del payload['parse_mode']
                     
-                    response = requests.post(api_url, json=payload, timeout=10)
+                    response = self._post(NotificationChannel.TELEGRAM, api_url, json=payload, timeout=10)
                     if response.status_code == 200 and response.json().get('ok'):
                         logger.info("Telegram 消息发送成功（纯文本）")
                         return True
@@ -1588,41 +1489,41 @@ class NotificationService:
     
     def _send_telegram_chunked(self, api_url: str, chat_id: str, content: str, max_length: int) -> bool:
         """分段发送长 Telegram 消息"""
-        # 按段落分割
+        chunks = self._split_telegram_chunks(content, max_length)
+        all_success = True
+        
+        for i, chunk_content in enumerate(chunks):
+            suffix = "（最后）" if i == len(chunks) - 1 else ""
+            logger.info(f"发送 Telegram 消息块 {i + 1}{suffix}...")
+            if not self._send_telegram_message(api_url, chat_id, chunk_content):
+                all_success = False
+        
+        return all_success
+    
+    @staticmethod
+    def _split_telegram_chunks(content: str, max_length: int) -> List[str]:
+        """按段落（--- 分隔）把长 Telegram 消息分为不超过 max_length 的多段"""
         sections = content.split("\n---\n")
         
+        chunks = []
         current_chunk = []
         current_length = 0
-        all_success = True
-        chunk_index = 1
         
         for section in sections:
             section_length = len(section) + 5  # +5 for "\n---\n"
             
             if current_length + section_length > max_length:
-                # 发送当前块
                 if current_chunk:
-                    chunk_content = "\n---\n".join(current_chunk)
-                    logger.info(f"发送 Telegram 消息块 {chunk_index}...")
-                    if not self._send_telegram_message(api_url, chat_id, chunk_content):
-                        all_success = False
-                    chunk_index += 1
-                
-                # 重置
+                    chunks.append("\n---\n".join(current_chunk))
                 current_chunk = [section]
                 current_length = section_length
             else:
                 current_chunk.append(section)
                 current_length += section_length
         
-        # 发送最后一块
         if current_chunk:
-            chunk_content = "\n---\n".join(current_chunk)
-            logger.info(f"发送 Telegram 消息块 {chunk_index}（最后）...")
-            if not self._send_telegram_message(api_url, chat_id, chunk_content):
-                all_success = False
-        
-        return all_success
+            chunks.append("\n---\n".join(current_chunk))
+        return chunks
     
     def _convert_to_telegram_markdown(self, text: str) -> str:
         """
@@ -1689,7 +1590,8 @@ class NotificationService:
                     'User-Agent': 'StockAnalysis/1.0'
                 }
                 
-                response = requests.post(
+                response = self._post(
+                    NotificationChannel.CUSTOM,
                     url,
                     json=payload,
                     headers=headers,
@@ -1758,56 +1660,162 @@ class NotificationService:
             "body": content
         }
     
-    def send(self, content: str) -> bool:
+    def estimate_requests(self, channel: NotificationChannel,
+                          content: Union[str, RenderedReport]) -> int:
         """
-        统一发送接口 - 向所有已配置的渠道发送
+        估算向单个渠道发送消息需要的请求数（与 send_channel 的分批规则一致）
+        
+        供发件箱在发送前按请求数检查限速
+        
+        Args:
+            channel: 目标渠道
+            content: 消息内容（Markdown 格式）或已渲染的分段报告
+            
+        Returns:
+            预计的 HTTP/SMTP 请求数，至少为 1
+        """
+        if channel in (NotificationChannel.WECHAT, NotificationChannel.FEISHU):
+            max_bytes = self._wechat_max_bytes if channel == NotificationChannel.WECHAT else self._feishu_max_bytes
+            report = content if isinstance(content, RenderedReport) else RenderedReport.from_markdown(content)
+            if report.total_bytes <= max_bytes:
+                return 1
+            return max(len(report.chunks(max_bytes)), 1)
+        
+        text = content.text if isinstance(content, RenderedReport) else content
+        if channel == NotificationChannel.TELEGRAM:
+            if len(text) <= TELEGRAM_MAX_LENGTH:
+                return 1
+            return max(len(self._split_telegram_chunks(text, TELEGRAM_MAX_LENGTH)), 1)
+        if channel == NotificationChannel.CUSTOM:
+            # 每个 Webhook 地址各发一次
+            return max(len(self._custom_webhook_urls), 1)
+        return 1
+    
+    def send_channel(self, channel: NotificationChannel,
+                     content: Union[str, RenderedReport]) -> ChannelDeliveryResult:
+        """
+        向单个渠道发送消息并记录耗时和请求数（渠道内分批消息按顺序串行发送）
+        
+        Args:
+            channel: 目标渠道
+            content: 消息内容（Markdown 格式）或已渲染的分段报告
+            
+        Returns:
+            该渠道的投递结果，异常不会抛出而是记录在 error_message 中
+        """
+        channel_name = ChannelDetector.get_channel_name(channel)
+        text = content.text if isinstance(content, RenderedReport) else content
+        start_time = time.time()
+        self._request_counter.count = 0
+        try:
+            if channel == NotificationChannel.WECHAT:
+                result = self.send_to_wechat(content)
+            elif channel == NotificationChannel.FEISHU:
+                result = self.send_to_feishu(content)
+            elif channel == NotificationChannel.TELEGRAM:
+                result = self.send_to_telegram(text)
+            elif channel == NotificationChannel.EMAIL:
+                result = self.send_to_email(text)
+            elif channel == NotificationChannel.CUSTOM:
+                result = self.send_to_custom(text)
+            else:
+                logger.warning(f"不支持的通知渠道: {channel}")
+                result = False
+            
+            return ChannelDeliveryResult(
+                channel=channel,
+                success=result,
+                elapsed=time.time() - start_time,
+                error_message=None if result else f"{channel_name} 发送失败",
+                requests=self._request_counter.count
+            )
+        
+        except Exception as e:
+            logger.error(f"{channel_name} 发送失败: {e}")
+            return ChannelDeliveryResult(
+                channel=channel,
+                success=False,
+                elapsed=time.time() - start_time,
+                error_message=str(e),
+                requests=self._request_counter.count
+            )
+    
+    def _log_delivery(self, results: List[ChannelDeliveryResult]) -> None:
+        """记录各渠道投递结果"""
+        for r in results:
+            status = "成功" if r.success else f"失败({r.error_message})"
+            logger.info(f"[{r.channel_name}] 投递{status}，耗时 {r.elapsed:.2f}s")
+        success_count = sum(1 for r in results if r.success)
+        logger.info(f"通知发送完成：成功 {success_count} 个，失败 {len(results) - success_count} 个")
+    
+    async def send_async(self, content: Union[str, RenderedReport]) -> List[ChannelDeliveryResult]:
+        """
+        异步并发投递 - 同时向所有已配置的渠道发送
         
-        遍历所有已配置的渠道，逐一发送消息
+        各渠道在独立线程中使用各自的连接池发送，慢渠道（如 SMTP）不会阻塞其他渠道；
+        同一渠道的分批消息仍按顺序发送
         
         Args:
             content: 消息内容（Markdown 格式）
             
         Returns:
-            是否至少有一个渠道发送成功
+            各渠道的投递结果（含耗时）
         """
         if not self.is_available():
             logger.warning("通知服务不可用，跳过推送")
-            return False
+            return []
         
-        channel_names = self.get_channel_names()
-        logger.info(f"正在向 {len(self._available_channels)} 个渠道发送通知：{channel_names}")
+        logger.info(f"正在向 {len(self._available_channels)} 个渠道并发发送通知：{self.get_channel_names()}")
         
-        success_count = 0
-        fail_count = 0
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        results = await asyncio.gather(*[
+            loop.run_in_executor(executor, self.send_channel, channel, content)
+            for channel in self._available_channels
+        ])
         
-        for channel in self._available_channels:
-            channel_name = ChannelDetector.get_channel_name(channel)
-            try:
-                if channel == NotificationChannel.WECHAT:
-                    result = self.send_to_wechat(content)
-                elif channel == NotificationChannel.FEISHU:
-                    result = self.send_to_feishu(content)
-                elif channel == NotificationChannel.TELEGRAM:
-                    result = self.send_to_telegram(content)
-                elif channel == NotificationChannel.EMAIL:
-                    result = self.send_to_email(content)
-                elif channel == NotificationChannel.CUSTOM:
-                    result = self.send_to_custom(content)
-                else:
-                    logger.warning(f"不支持的通知渠道: {channel}")
-                    result = False
-                
-                if result:
-                    success_count += 1
-                else:
-                    fail_count += 1
-                    
-            except Exception as e:
-                logger.error(f"{channel_name} 发送失败: {e}")
-                fail_count += 1
+        self._log_delivery(results)
+        return list(results)
+    
+    def deliver(self, content: Union[str, RenderedReport]) -> List[ChannelDeliveryResult]:
+        """
+        同步并发投递 - 供非异步调用方使用，语义同 send_async
         
-        logger.info(f"通知发送完成：成功 {success_count} 个，失败 {fail_count} 个")
-        return success_count > 0
+        Args:
+            content: 消息内容（Markdown 格式）
+            
+        Returns:
+            各渠道的投递结果（含耗时）
+        """
+        if not self.is_available():
+            logger.warning("通知服务不可用，跳过推送")
+            return []
+        
+        logger.info(f"正在向 {len(self._available_channels)} 个渠道并发发送通知：{self.get_channel_names()}")
+        
+        executor = self._get_executor()
+        futures = [
+            executor.submit(self.send_channel, channel, content)
+            for channel in self._available_channels
+        ]
+        results = [future.result() for future in futures]
+        
+        self._log_delivery(results)
+        return results
+    
+    def send(self, content: Union[str, RenderedReport]) -> bool:
+        """
+        统一发送接口 - 向所有已配置的渠道发送
+        
+        所有渠道并发发送，详细的逐渠道结果见 deliver() / send_async()
+        
+        Args:
+            content: 消息内容（Markdown 格式），或 render_* 生成的分段报告（分批时免去重复分割）
+            
+        Returns:
+            是否至少有一个渠道发送成功
+        """
+        return any(r.success for r in self.deliver(content))
     
     def _send_chunked_messages(self, content: str, max_length: int) -> bool:
         """
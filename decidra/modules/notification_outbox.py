@@ -0,0 +1,428 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+A股自选股智能分析系统 - 通知发件箱
+===================================
+
+职责：
+1. 持久化待发送通知（SQLite），进程崩溃或推送失败后不丢消息
+2. 后台线程按渠道在时间窗口内合并消息后批量发送
+3. 失败指数退避重试，超过次数后标记为死信
+4. 按渠道限速，避免触发 Webhook 频率限制
+
+调用方只做一次本地写入即可返回，不再阻塞在 HTTP 请求上：
+    outbox = get_notification_outbox()
+    outbox.enqueue("📈 信号触发 ...")
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Union
+
+from decidra.utils.global_vars import PATH_DATA
+from .notification import (
+    ChannelDeliveryResult,
+    NotificationChannel,
+    NotificationService,
+    get_notification_service,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# 发件箱配置
+OUTBOX_CONFIG = {
+    'db_file': 'notification_outbox.db',  # 发件箱数据库文件名 (位于 PATH_DATA)
+    'batch_window': 2.0,        # 合并窗口（秒）：最早一条消息等待该时间后与同渠道后续消息合并发送
+    'max_batch_size': 20,       # 单批最多合并的消息数
+    'max_attempts': 5,          # 最大投递次数，超过后标记为死信
+    'retry_base_delay': 5.0,    # 重试基础延迟（秒），按 2^n 指数增长
+    'retry_max_delay': 600.0,   # 重试最大延迟（秒）
+    'poll_interval': 0.5,       # 后台线程空闲轮询间隔（秒）
+    'batch_separator': "\n\n---\n\n",
+}
+
+# 各渠道限速：(时间窗口内最大请求数, 时间窗口秒数)，分批发送的每一批都计为一次请求
+CHANNEL_RATE_LIMITS = {
+    NotificationChannel.WECHAT: (20, 60.0),     # 企业微信机器人 20 条/分钟
+    NotificationChannel.FEISHU: (5, 1.0),       # 飞书自定义机器人 5 条/秒
+    NotificationChannel.TELEGRAM: (1, 1.0),     # Telegram 同一会话约 1 条/秒
+    NotificationChannel.EMAIL: (6, 60.0),       # 邮件避免触发 SMTP 风控
+    NotificationChannel.CUSTOM: (10, 60.0),
+}
+
+# 消息状态
+STATUS_PENDING = 'pending'
+STATUS_SENT = 'sent'
+STATUS_DEAD = 'dead'
+
+
+class ChannelRateLimiter:
+    """滑动窗口限速器（按渠道，线程安全）"""
+
+    def __init__(self, max_calls: int, period: float):
+        self.max_calls = max_calls
+        self.period = period
+        self._calls: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        """移除时间窗口外的请求记录（调用方持有锁）"""
+        while self._calls and now - self._calls[0] >= self.period:
+            self._calls.popleft()
+
+    def available(self, now: Optional[float] = None) -> int:
+        """当前时间窗口内剩余的请求额度"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._expire(now)
+            return max(self.max_calls - len(self._calls), 0)
+
+    def wait_time(self, now: Optional[float] = None, count: int = 1) -> float:
+        """
+        距离可连续发出 count 次请求还需等待的秒数，0 表示可立即发送
+
+        count 超过窗口上限时按上限计算，即等到窗口内没有请求记录
+        """
+        now = time.time() if now is None else now
+        count = min(max(count, 1), self.max_calls)
+        with self._lock:
+            self._expire(now)
+            excess = len(self._calls) + count - self.max_calls
+            if excess <= 0:
+                return 0.0
+            return self.period - (now - self._calls[excess - 1])
+
+    def record(self, now: Optional[float] = None, count: int = 1) -> None:
+        """记录 count 次请求"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._calls.extend([now] * count)
+
+
+class NotificationOutbox:
+    """
+    持久化通知发件箱
+
+    每条消息按渠道拆分为独立记录，各渠道独立合并、限速和重试
+    """
+
+    _CREATE_TABLE_SQL = """
+        CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            channel TEXT NOT NULL,
+            content TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            created_at REAL NOT NULL,
+            next_attempt_at REAL NOT NULL,
+            sent_at REAL,
+            last_error TEXT
+        )
+    """
+
+    _CREATE_INDEX_SQL = """
+        CREATE INDEX IF NOT EXISTS ix_outbox_due ON outbox(status, channel, next_attempt_at)
+    """
+
+    def __init__(
+        self,
+        service: Optional[NotificationService] = None,
+        db_path: Optional[Union[str, Path]] = None,
+        batch_window: float = OUTBOX_CONFIG['batch_window'],
+        max_batch_size: int = OUTBOX_CONFIG['max_batch_size'],
+        max_attempts: int = OUTBOX_CONFIG['max_attempts'],
+    ):
+        """
+        初始化发件箱
+
+        Args:
+            service: 实际执行投递的通知服务
+            db_path: 数据库文件路径（默认 PATH_DATA/notification_outbox.db）
+            batch_window: 合并窗口（秒）
+            max_batch_size: 单批最多合并的消息数
+            max_attempts: 最大投递次数
+        """
+        self._service = service or get_notification_service()
+        self._db_path = Path(db_path) if db_path else PATH_DATA / OUTBOX_CONFIG['db_file']
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.max_attempts = max_attempts
+
+        self._rate_limiters: Dict[NotificationChannel, ChannelRateLimiter] = {
+            channel: ChannelRateLimiter(*limit) for channel, limit in CHANNEL_RATE_LIMITS.items()
+        }
+
+        # 单连接 + 锁：入队只是一次本地写入，不经过 fsync（WAL + synchronous=NORMAL）
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self._db_path), timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(self._CREATE_TABLE_SQL)
+        self._conn.execute(self._CREATE_INDEX_SQL)
+        self._conn.commit()
+        self._lock = threading.Lock()
+        # 后台线程和 flush 可能同时处理，串行化以免同一批消息被重复发送
+        self._process_lock = threading.Lock()
+
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # 入队
+    # ------------------------------------------------------------------
+
+    def enqueue(self, content: str, channels: Optional[List[NotificationChannel]] = None) -> int:
+        """
+        将消息写入发件箱，立即返回
+
+        Args:
+            content: 消息内容（Markdown 格式）
+            channels: 目标渠道，默认全部已配置渠道
+
+        Returns:
+            写入的记录数（每个渠道一条）
+        """
+        if channels is None:
+            channels = self._service.get_available_channels()
+        if not channels or not content:
+            return 0
+
+        now = time.time()
+        rows = [(channel.value, content, now, now) for channel in channels]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO outbox (channel, content, created_at, next_attempt_at) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+        self._wakeup.set()
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # 后台投递
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """启动后台投递线程"""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._stop_event.clear()
+        self._worker = threading.Thread(target=self._run, name="notification-outbox", daemon=True)
+        self._worker.start()
+        logger.info("通知发件箱后台线程已启动")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """停止后台投递线程（未发送消息保留在发件箱中，下次启动继续发送）"""
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            self._worker = None
+        logger.info("通知发件箱后台线程已停止")
+
+    def _run(self) -> None:
+        """后台线程主循环"""
+        while not self._stop_event.is_set():
+            try:
+                next_wait = self.process_due()
+            except Exception as e:
+                logger.error(f"通知发件箱处理失败: {e}")
+                next_wait = OUTBOX_CONFIG['poll_interval']
+            self._wakeup.wait(timeout=max(min(next_wait, OUTBOX_CONFIG['poll_interval']), 0.05))
+            self._wakeup.clear()
+
+    def process_due(self, now: Optional[float] = None, force: bool = False) -> float:
+        """
+        处理所有到期的渠道批次
+
+        Args:
+            now: 当前时间（测试用）
+            force: 忽略合并窗口，立即发送（用于 flush）
+
+        Returns:
+            距离下一次需要处理的建议等待秒数
+        """
+        with self._process_lock:
+            return self._process_due(time.time() if now is None else now, force)
+
+    def _process_due(self, now: float, force: bool) -> float:
+        next_wait = OUTBOX_CONFIG['poll_interval']
+
+        for channel in self._pending_channels(now):
+            batch = self._load_batch(channel, now)
+            if not batch:
+                continue
+
+            # 合并窗口：最早的一条等满窗口后再发，让突发信号合并为一次推送
+            oldest_created = batch[0][2]
+            window_left = oldest_created + self.batch_window - now
+            if not force and window_left > 0 and len(batch) < self.max_batch_size:
+                next_wait = min(next_wait, window_left)
+                continue
+
+            limiter = self._rate_limiters.get(channel)
+            if limiter is not None:
+                wait = limiter.wait_time(now)
+                if wait > 0:
+                    next_wait = min(next_wait, wait)
+                    continue
+
+                # 发送前估算合并后的请求数（超长消息会分批），剩余额度不够时减少本批条数，其余留到下一轮
+                free = limiter.available(now)
+                requests = self._service.estimate_requests(channel, self._batch_content(batch))
+                while requests > free and len(batch) > 1:
+                    batch = batch[:-1]
+                    requests = self._service.estimate_requests(channel, self._batch_content(batch))
+                wait = limiter.wait_time(now, count=requests)
+                if wait > 0:
+                    next_wait = min(next_wait, wait)
+                    continue
+
+            result = self._deliver_batch(channel, batch)
+            if limiter is not None:
+                # 按实际请求数计入限速（超长消息分批发送时为多次请求）
+                limiter.record(now, count=max(result.requests, 1))
+
+        return next_wait
+
+    def _pending_channels(self, now: float) -> List[NotificationChannel]:
+        """获取有到期消息的渠道"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT channel FROM outbox WHERE status = ? AND next_attempt_at <= ?",
+                (STATUS_PENDING, now)
+            ).fetchall()
+        channels = []
+        for (value,) in rows:
+            try:
+                channels.append(NotificationChannel(value))
+            except ValueError:
+                logger.warning(f"发件箱中存在未知渠道: {value}")
+        return channels
+
+    def _load_batch(self, channel: NotificationChannel, now: float) -> List[tuple]:
+        """按入队顺序取出渠道的一批到期消息 (id, content, created_at, attempts)"""
+        with self._lock:
+            return self._conn.execute(
+                """SELECT id, content, created_at, attempts FROM outbox
+                   WHERE status = ? AND channel = ? AND next_attempt_at <= ?
+                   ORDER BY id LIMIT ?""",
+                (STATUS_PENDING, channel.value, now, self.max_batch_size)
+            ).fetchall()
+
+    @staticmethod
+    def _batch_content(batch: List[tuple]) -> str:
+        """合并一批消息的内容"""
+        return OUTBOX_CONFIG['batch_separator'].join(row[1] for row in batch)
+
+    def _deliver_batch(self, channel: NotificationChannel, batch: List[tuple]) -> ChannelDeliveryResult:
+        """合并一批消息并投递，根据结果更新状态"""
+        content = self._batch_content(batch)
+        ids = [row[0] for row in batch]
+
+        result = self._service.send_channel(channel, content)
+        now = time.time()
+
+        with self._lock:
+            if result.success:
+                self._conn.executemany(
+                    "UPDATE outbox SET status = ?, sent_at = ?, attempts = attempts + 1 WHERE id = ?",
+                    [(STATUS_SENT, now, msg_id) for msg_id in ids]
+                )
+            else:
+                updates = []
+                for msg_id, _, _, attempts in batch:
+                    attempts += 1
+                    if attempts >= self.max_attempts:
+                        updates.append((STATUS_DEAD, attempts, now, result.error_message, msg_id))
+                    else:
+                        delay = min(
+                            OUTBOX_CONFIG['retry_base_delay'] * (2 ** (attempts - 1)),
+                            OUTBOX_CONFIG['retry_max_delay']
+                        )
+                        updates.append((STATUS_PENDING, attempts, now + delay, result.error_message, msg_id))
+                self._conn.executemany(
+                    "UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                    updates
+                )
+            self._conn.commit()
+
+        if result.success:
+            logger.info(f"[发件箱] {result.channel_name} 合并发送 {len(ids)} 条消息，耗时 {result.elapsed:.2f}s")
+        else:
+            logger.warning(f"[发件箱] {result.channel_name} 发送 {len(ids)} 条消息失败，将重试: {result.error_message}")
+        return result
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """
+        立即发送所有到期消息（忽略合并窗口，仍遵守限速）
+
+        Returns:
+            超时前是否已无到期待发消息
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            self.process_due(force=True)
+            if not self._pending_channels(time.time()):
+                return True
+            time.sleep(0.1)
+        return False
+
+    # ------------------------------------------------------------------
+    # 维护
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, int]:
+        """各状态的消息数量"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        stats = {STATUS_PENDING: 0, STATUS_SENT: 0, STATUS_DEAD: 0}
+        stats.update(dict(rows))
+        return stats
+
+    def purge_sent(self, older_than_hours: float = 24.0) -> int:
+        """清理已发送的历史记录"""
+        cutoff = time.time() - older_than_hours * 3600
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM outbox WHERE status = ? AND sent_at < ?", (STATUS_SENT, cutoff)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def requeue_dead(self) -> int:
+        """将死信重新放回待发送队列"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE outbox SET status = ?, attempts = 0, next_attempt_at = ? WHERE status = ?",
+                (STATUS_PENDING, time.time(), STATUS_DEAD)
+            )
+            self._conn.commit()
+        self._wakeup.set()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """停止后台线程并关闭数据库连接"""
+        self.stop()
+        with self._lock:
+            self._conn.close()
+
+
+# 全局发件箱实例
+_outbox: Optional[NotificationOutbox] = None
+
+
+def get_notification_outbox(auto_start: bool = True) -> NotificationOutbox:
+    """获取全局通知发件箱（默认自动启动后台投递线程）"""
+    global _outbox
+    if _outbox is None:
+        _outbox = NotificationOutbox()
+        if auto_start:
+            _outbox.start()
+    return _outbox
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+A股自选股智能分析系统 - 报告渲染
+===================================
+
+职责：
+1. 以"段"为单位构建 Markdown 报告（每只股票一段），渲染时一次性记录每段的字节数
+2. 按渠道字节上限单次线性扫描完成分批，不再反复拼接字符串并重新 UTF-8 编码测长
+
+段之间以 "\\n---\\n" 分隔，与 NotificationService 原有的按分隔线智能分割规则一致：
+    RenderedReport.text == SECTION_SEPARATOR.join(segments)
+"""
+
+from typing import List, Optional
+
+# 股票之间的分隔线
+SECTION_SEPARATOR = "\n---\n"
+# 超长单段截断提示
+SECTION_TRUNCATED_SUFFIX = "\n\n...(本段内容过长已截断)"
+
+
+def utf8_len(text: str) -> int:
+    """UTF-8 字节数"""
+    return len(text.encode('utf-8'))
+
+
+def truncate_to_bytes(text: str, max_bytes: int) -> str:
+    """按字节数截断字符串，确保不会在多字节字符中间截断"""
+    encoded = text.encode('utf-8')
+    if len(encoded) <= max_bytes:
+        return text
+    return encoded[:max(max_bytes, 0)].decode('utf-8', errors='ignore')
+
+
+class RenderedReport:
+    """
+    已渲染的分段报告
+
+    segments 与预先计算好的字节数一一对应，text 在首次访问时拼接并缓存
+    """
+
+    def __init__(self, segments: List[str], separator: Optional[str] = SECTION_SEPARATOR):
+        """
+        Args:
+            segments: 报告分段
+            separator: 段分隔符；为 None 表示内容无法按段分割，只能按行分批
+        """
+        self.segments = segments
+        self.separator = separator
+        self.segment_bytes = [utf8_len(s) for s in segments]
+        self._separator_bytes = utf8_len(separator) if separator else 0
+        self._text: Optional[str] = None
+
+    @classmethod
+    def from_markdown(cls, content: str) -> 'RenderedReport':
+        """
+        从已有 Markdown 文本构建（单次分割）
+
+        优先按 "---" 分隔线分段，其次按 "### " 标题分段
+        """
+        if SECTION_SEPARATOR in content:
+            return cls(content.split(SECTION_SEPARATOR), SECTION_SEPARATOR)
+        if "\n### " in content:
+            parts = content.split("\n### ")
+            return cls([parts[0]] + [f"### {p}" for p in parts[1:]], "\n")
+        return cls([content], None)
+
+    @property
+    def text(self) -> str:
+        """完整报告文本"""
+        if self._text is None:
+            if self.separator is None:
+                self._text = "".join(self.segments)
+            else:
+                self._text = self.separator.join(self.segments)
+        return self._text
+
+    @property
+    def total_bytes(self) -> int:
+        """完整报告的 UTF-8 字节数"""
+        if not self.segments:
+            return 0
+        return sum(self.segment_bytes) + self._separator_bytes * (len(self.segments) - 1)
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __str__(self) -> str:
+        return self.text
+
+    def truncate_chars(self, max_chars: int, suffix: str) -> 'RenderedReport':
+        """按字符数截断，超出时追加 suffix 并重新分段"""
+        if len(self.text) <= max_chars:
+            return self
+        return RenderedReport.from_markdown(self.text[:max_chars] + suffix)
+
+    def chunks(self, max_bytes: int) -> List[str]:
+        """
+        按字节上限分批（单次线性扫描）
+
+        - 可分段时：尽量把多段合并到一批；单段超长时截断该段
+        - 不可分段时：按行分批，每批预留 100 字节给分页标记
+
+        Args:
+            max_bytes: 单条消息最大字节数
+
+        Returns:
+            分批后的消息列表
+        """
+        if self.separator is None:
+            return self._chunk_lines(self.text, max_bytes - 100)
+
+        chunks = []
+        current: List[str] = []
+        current_bytes = 0
+
+        for section, size in zip(self.segments, self.segment_bytes):
+            section_bytes = size + self._separator_bytes
+
+            # 单个 section 就超长，强制截断
+            if section_bytes > max_bytes:
+                if current:
+                    chunks.append(self.separator.join(current))
+                    current = []
+                    current_bytes = 0
+                chunks.append(truncate_to_bytes(section, max_bytes - 200) + SECTION_TRUNCATED_SUFFIX)
+                continue
+
+            if current_bytes + section_bytes > max_bytes:
+                if current:
+                    chunks.append(self.separator.join(current))
+                current = [section]
+                current_bytes = section_bytes
+            else:
+                current.append(section)
+                current_bytes += section_bytes
+
+        if current:
+            chunks.append(self.separator.join(current))
+        return chunks
+
+    @staticmethod
+    def _chunk_lines(content: str, limit: int) -> List[str]:
+        """按行分批，每行字节数只计算一次"""
+        chunks = []
+        current: List[str] = []
+        current_bytes = 0
+
+        for line in content.split('\n'):
+            line_bytes = utf8_len(line)
+            added = line_bytes + (1 if current else 0)
+            if current and current_bytes + added > limit:
+                chunks.append('\n'.join(current))
+                current = [line]
+                current_bytes = line_bytes
+            else:
+                current.append(line)
+                current_bytes += added
+
+        if current:
+            chunks.append('\n'.join(current))
+        return chunks
+
+
+class ReportBuilder:
+    """
+    分段报告构建器
+
+    用法与逐行 append 到列表后 "\\n".join 相同，section_break() 相当于追加
+    "---" 和 "" 两行，但直接产出分段结果，后续分批无需再次分割文本
+    """
+
+    def __init__(self):
+        self._groups: List[List[str]] = [[]]
+
+    def append(self, line: str) -> None:
+        self._groups[-1].append(line)
+
+    def extend(self, lines: List[str]) -> None:
+        self._groups[-1].extend(lines)
+
+    def section_break(self) -> None:
+        """开始新的一段（在文本中渲染为 --- 分隔线）"""
+        self._groups.append([])
+
+    def build(self) -> RenderedReport:
+        """生成分段报告，文本与逐行拼接的结果完全一致"""
+        segments = []
+        for i, group in enumerate(self._groups):
+            body = "\n".join(group)
+            segments.append(body if i == 0 or not group else "\n" + body)
+        return RenderedReport(segments, SECTION_SEPARATOR)
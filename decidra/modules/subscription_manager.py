@@ -0,0 +1,246 @@
+"""
+行情订阅额度管理
+
+FutuOpenD 的订阅额度按账户计算（每个 股票 x 订阅类型 占 1 个额度，总额度随账户等级变化），
+且订阅至少保持 1 分钟后才能反订阅。本模块为 FutuMarket 管理额度：
+1. 从 query_subscription 获取账户真实额度（查询失败时使用默认值），定期刷新
+2. 持仓、监控列表、打开的分析标签页等高优先级股票可以固定（pin），固定的订阅不会被淘汰
+3. 额度不足时按最近最少使用（LRU）淘汰未固定且已满最短持有时间的订阅，只淘汰所需数量
+4. 订阅/反订阅按相同订阅类型合并为批量调用
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..utils.global_vars import get_logger
+
+# 订阅额度管理默认配置
+SUBSCRIPTION_CONFIG = {
+    'default_quota': 100,           # 无法查询账户额度时使用的总额度
+    'min_hold_seconds': 60,         # FutuOpenD 要求订阅至少保持 1 分钟才能反订阅
+    'quota_refresh_interval': 300,  # 账户额度刷新间隔（秒）
+    'reserve': 0,                   # 预留额度（留给其他客户端或手动操作）
+}
+
+
+class SubscriptionManager:
+    """
+    订阅额度管理器
+
+    subscribe_func / unsubscribe_func 与 FutuMarket.subscribe / unsubscribe 签名一致，
+    query_func 返回 query_subscription 的结果（total_used / remain / own_used）
+    """
+
+    def __init__(self, subscribe_func: Callable[[List[str], List[str]], bool],
+                 unsubscribe_func: Callable[[List[str], List[str]], bool],
+                 query_func: Optional[Callable[[], Dict[str, Any]]] = None,
+                 config: Optional[Dict[str, Any]] = None):
+        self.config = {**SUBSCRIPTION_CONFIG, **(config or {})}
+        self.logger = get_logger(__name__)
+        self._subscribe = subscribe_func
+        self._unsubscribe = unsubscribe_func
+        self._query = query_func
+
+        # {(股票代码, 订阅类型): 订阅时间}，按最近使用顺序排列（末尾为最近使用）
+        self._entries: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._pins: Dict[str, Set[str]] = {}          # {股票代码: {固定原因}}
+        self._lock = threading.RLock()
+
+        self.quota = self.config['default_quota']
+        self.external_used = 0                        # 其他连接占用的额度
+        self._quota_checked_at = 0.0
+        self.evicted_count = 0
+
+    # ================== 额度 ==================
+
+    def refresh_quota(self, force: bool = False) -> int:
+        """从 FutuOpenD 查询账户总额度（按刷新间隔缓存）"""
+        now = time.time()
+        if self._query is None or (not force and now - self._quota_checked_at < self.config['quota_refresh_interval']):
+            return self.quota
+
+        self._quota_checked_at = now
+        try:
+            result = self._query() or {}
+            total_used = int(result.get('total_used', 0))
+            remain = int(result.get('remain', 0))
+            own_used = int(result.get('own_used', total_used))
+            if total_used + remain > 0:
+                with self._lock:
+                    self.quota = total_used + remain
+                    self.external_used = max(total_used - own_used, 0)
+                self.logger.debug(f"订阅额度: 总额度 {self.quota}, 其他连接占用 {self.external_used}")
+        except Exception as e:
+            self.logger.warning(f"查询订阅额度失败，使用 {self.quota}: {e}")
+        return self.quota
+
+    @property
+    def used(self) -> int:
+        return len(self._entries)
+
+    @property
+    def free(self) -> int:
+        return self.quota - self.external_used - self.config['reserve'] - len(self._entries)
+
+    # ================== 固定 ==================
+
+    def pin(self, codes: Iterable[str], reason: str) -> None:
+        """固定股票，其订阅不会被淘汰"""
+        with self._lock:
+            for code in codes:
+                self._pins.setdefault(code, set()).add(reason)
+
+    def unpin(self, codes: Iterable[str], reason: str) -> None:
+        """取消固定（订阅保留，之后可被淘汰）"""
+        with self._lock:
+            for code in codes:
+                reasons = self._pins.get(code)
+                if reasons is not None:
+                    reasons.discard(reason)
+                    if not reasons:
+                        del self._pins[code]
+
+    def set_pinned(self, codes: Iterable[str], reason: str) -> None:
+        """把某个原因固定的股票整体替换为 codes（如持仓变化后）"""
+        codes = set(codes)
+        with self._lock:
+            stale = [code for code, reasons in self._pins.items() if reason in reasons and code not in codes]
+            self.unpin(stale, reason)
+            self.pin(codes, reason)
+
+    def is_pinned(self, code: str) -> bool:
+        return code in self._pins
+
+    # ================== 订阅记录 ==================
+
+    def touch(self, code: str, sub_type: str) -> bool:
+        """标记订阅被使用，返回是否已订阅"""
+        with self._lock:
+            key = (code, sub_type)
+            if key not in self._entries:
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def on_subscribed(self, codes: Iterable[str], sub_types: Iterable[str],
+                      subscribed_at: Optional[float] = None) -> None:
+        """记录订阅成功（已存在的记录只更新使用顺序）"""
+        now = time.time() if subscribed_at is None else subscribed_at
+        with self._lock:
+            for code in codes:
+                for sub_type in sub_types:
+                    key = (code, sub_type)
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+                    else:
+                        self._entries[key] = now
+
+    def on_unsubscribed(self, codes: Iterable[str], sub_types: Iterable[str]) -> None:
+        with self._lock:
+            for code in codes:
+                for sub_type in sub_types:
+                    self._entries.pop((code, sub_type), None)
+
+    def sync(self, pairs: Iterable[Tuple[str, str]]) -> None:
+        """按实际订阅状态对齐记录：移除已不存在的订阅，新出现的订阅按当前时间计"""
+        pairs = set(pairs)
+        now = time.time()
+        with self._lock:
+            for key in [key for key in self._entries if key not in pairs]:
+                del self._entries[key]
+            for key in pairs:
+                self._entries.setdefault(key, now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    # ================== 确保订阅 ==================
+
+    @staticmethod
+    def _group_by_types(pairs: Iterable[Tuple[str, str]]) -> List[Tuple[List[str], List[str]]]:
+        """
+        把 (股票, 类型) 合并为批量调用：订阅类型集合相同的股票合并为一次调用
+
+        Returns:
+            [(股票列表, 类型列表)]
+        """
+        types_by_code: Dict[str, Set[str]] = {}
+        for code, sub_type in pairs:
+            types_by_code.setdefault(code, set()).add(sub_type)
+
+        batches: Dict[Tuple[str, ...], List[str]] = {}
+        for code, sub_types in types_by_code.items():
+            batches.setdefault(tuple(sorted(sub_types)), []).append(code)
+        return [(codes, list(sub_types)) for sub_types, codes in batches.items()]
+
+    def _eviction_candidates(self, needed: int, keep: Set[str], now: float) -> List[Tuple[str, str]]:
+        """按 LRU 顺序选出需要淘汰的订阅（跳过固定股票、本次请求的股票和未满最短持有时间的订阅）"""
+        victims = []
+        min_hold = self.config['min_hold_seconds']
+        for (code, sub_type), subscribed_at in self._entries.items():
+            if len(victims) >= needed:
+                break
+            if code in keep or code in self._pins or now - subscribed_at < min_hold:
+                continue
+            victims.append((code, sub_type))
+        return victims
+
+    def ensure(self, codes: Iterable[str], sub_types: Iterable[str]) -> bool:
+        """
+        确保订阅，额度不足时淘汰最久未使用的订阅
+
+        Returns:
+            是否全部订阅成功
+        """
+        codes = list(dict.fromkeys(codes))
+        sub_types = list(dict.fromkeys(sub_types))
+        self.refresh_quota()
+
+        with self._lock:
+            missing = [(code, sub_type) for code in codes for sub_type in sub_types
+                       if not self.touch(code, sub_type)]
+            if not missing:
+                return True
+
+            shortage = len(missing) - self.free
+            victims = []
+            if shortage > 0:
+                victims = self._eviction_candidates(shortage, set(codes), time.time())
+                if len(victims) < shortage:
+                    self.logger.warning(
+                        f"订阅额度不足：需要 {len(missing)}，剩余 {self.free}，"
+                        f"可淘汰 {len(victims)}（其余订阅已固定或未满最短持有时间）"
+                    )
+                    return False
+
+        for victim_codes, victim_types in self._group_by_types(victims):
+            if self._unsubscribe(victim_codes, victim_types):
+                self.on_unsubscribed(victim_codes, victim_types)
+                self.evicted_count += len(victim_codes) * len(victim_types)
+                self.logger.info(f"淘汰订阅: {victim_codes} -> {victim_types}")
+            else:
+                self.logger.warning(f"淘汰订阅失败: {victim_codes} -> {victim_types}")
+                return False
+
+        success = True
+        for batch_codes, batch_types in self._group_by_types(missing):
+            if self._subscribe(batch_codes, batch_types):
+                self.on_subscribed(batch_codes, batch_types)
+            else:
+                success = False
+        return success
+
+    def summary(self) -> Dict[str, Any]:
+        """额度使用概况"""
+        with self._lock:
+            return {
+                'quota': self.quota,
+                'used': len(self._entries),
+                'external_used': self.external_used,
+                'free': self.free,
+                'pinned_codes': len(self._pins),
+                'evicted': self.evicted_count,
+            }
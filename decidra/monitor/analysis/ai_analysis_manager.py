@@ -14,13 +14,14 @@ from pathlib import Path
 
 from ...base.monitor import StockData, MarketStatus
 from ...base.futu_class import KLineData
+from ...modules.ai.analysis_cache import AnalysisCache, DataFingerprint, get_analysis_cache
 from ...utils.global_vars import get_logger
 from ...utils.global_vars import PATH_DATA
 
 # AI分析配置
 AI_ANALYSIS_CONFIG = {
     'max_dialog_history': 50,      # 最大对话历史记录数
-    'analysis_cache_hours': 2,     # 分析结果缓存小时数
+    'analysis_cache_hours': 72,    # 分析结果缓存硬性过期小时数（数据变化时提前失效）
     'confidence_threshold': 0.6,   # 置信度阈值
     'max_recommendation_days': 7,  # 最大推荐持有天数
 }
@@ -58,6 +59,38 @@ class AIAnalysisResult:
     holding_period: Optional[int]
     generated_time: datetime
 
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可JSON序列化的字典"""
+        return {
+            'stock_code': self.stock_code,
+            'analysis_type': self.analysis_type,
+            'analysis_content': self.analysis_content,
+            'key_points': list(self.key_points),
+            'recommendation': self.recommendation,
+            'confidence_level': self.confidence_level,
+            'risk_level': self.risk_level,
+            'target_price_range': list(self.target_price_range) if self.target_price_range else None,
+            'holding_period': self.holding_period,
+            'generated_time': self.generated_time.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'AIAnalysisResult':
+        """从字典创建AIAnalysisResult对象"""
+        target_price_range = data.get('target_price_range')
+        return cls(
+            stock_code=data['stock_code'],
+            analysis_type=data['analysis_type'],
+            analysis_content=data.get('analysis_content', ''),
+            key_points=data.get('key_points', []),
+            recommendation=data.get('recommendation', ''),
+            confidence_level=float(data.get('confidence_level', 0)),
+            risk_level=data.get('risk_level', ''),
+            target_price_range=tuple(target_price_range) if target_price_range else None,
+            holding_period=data.get('holding_period'),
+            generated_time=datetime.fromisoformat(data['generated_time'])
+        )
+
 
 @dataclass
 class AIRecommendation:
@@ -76,7 +109,7 @@ class AIAnalysisManager:
     负责AI智能分析和投资建议生成
     """
     
-    def __init__(self, analysis_data_manager):
+    def __init__(self, analysis_data_manager, analysis_cache: Optional[AnalysisCache] = None):
         """初始化AI分析管理器"""
         self.analysis_data_manager = analysis_data_manager
         self.logger = get_logger(__name__)
@@ -84,8 +117,8 @@ class AIAnalysisManager:
         # 对话历史管理
         self.dialog_history: List[DialogMessage] = []
         
-        # 分析结果缓存
-        self.analysis_cache: Dict[str, Dict[str, AIAnalysisResult]] = {}  # {stock_code: {analysis_type: result}}
+        # 分析结果缓存（持久化，与批量分析器跨进程共享）
+        self.analysis_cache: AnalysisCache = analysis_cache or get_analysis_cache()
         
         # AI分析状态
         self.current_stock_code: Optional[str] = None
@@ -789,16 +822,21 @@ class AIAnalysisManager:
         
         return "\n".join(responses)
     
+    def _get_data_fingerprint(self) -> DataFingerprint:
+        """获取当前分析数据的指纹，用于判断缓存是否仍然有效"""
+        analysis_data = self.analysis_data_manager.get_current_analysis_data()
+        if not analysis_data:
+            return DataFingerprint(data_time='', ref_price=0.0)
+        return DataFingerprint.from_kline(analysis_data.kline_data, analysis_data.realtime_quote)
+
     def _get_cached_analysis(self, stock_code: str, analysis_type: str) -> Optional[AIAnalysisResult]:
         """获取缓存的分析结果"""
         try:
-            if stock_code not in self.analysis_cache:
-                return None
-            
-            if analysis_type not in self.analysis_cache[stock_code]:
+            cached = self.analysis_cache.get(stock_code, analysis_type, self._get_data_fingerprint())
+            if not cached:
                 return None
             
-            cached_result = self.analysis_cache[stock_code][analysis_type]
+            cached_result = AIAnalysisResult.from_dict(cached)
             
             # 检查缓存是否过期
             cache_age = (datetime.now() - cached_result.generated_time).total_seconds() / 3600
@@ -814,10 +852,12 @@ class AIAnalysisManager:
     def _cache_analysis_result(self, result: AIAnalysisResult):
         """缓存分析结果"""
         try:
-            if result.stock_code not in self.analysis_cache:
-                self.analysis_cache[result.stock_code] = {}
-            
-            self.analysis_cache[result.stock_code][result.analysis_type] = result
+            self.analysis_cache.put(
+                result.stock_code,
+                result.analysis_type,
+                result.to_dict(),
+                self._get_data_fingerprint()
+            )
             
         except Exception as e:
             self.logger.error(f"缓存分析结果失败: {e}")
@@ -858,7 +898,7 @@ class AIAnalysisManager:
             'is_analyzing': self.is_analyzing,
             'last_analysis_time': self.last_analysis_time,
             'dialog_count': len(self.dialog_history),
-            'cached_analysis_count': sum(len(analyses) for analyses in self.analysis_cache.values())
+            'cached_analysis_count': self.analysis_cache.count()
         }
     
     async def clear_dialog_history(self):
@@ -873,8 +913,8 @@ class AIAnalysisManager:
     async def cleanup(self):
         """清理AI分析管理器"""
         try:
+            # 分析缓存为持久化缓存，清理时保留以便下次启动复用
             self.dialog_history.clear()
-            self.analysis_cache.clear()
             self.current_stock_code = None
             self.is_analyzing = False
             self.last_analysis_time = None
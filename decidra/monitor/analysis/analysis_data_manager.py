@@ -10,9 +10,12 @@ import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
+
+import numpy as np
 from textual import work
 from ...base.monitor import StockData, MarketStatus, ConnectionStatus
 from ...base.futu_class import KLineData, OrderBookData, BrokerQueueData
+from ...base import indicators
 from ...modules.futu_market import FutuMarket
 from ...utils.global_vars import get_logger
 from ...utils.global_vars import PATH_DATA
@@ -107,6 +110,8 @@ class AnalysisDataManager:
             
             # 将股票加入活跃股票集合
             self.active_stocks.add(stock_code)
+            # 打开的分析标签页固定其订阅，关闭时取消
+            self.futu_market.pin_subscription([stock_code], "analysis_tab")
             
             self.logger.info(f"切换到股票分析: {stock_code}")
             
@@ -492,92 +497,36 @@ class AnalysisDataManager:
             return {}
     
     def _calculate_ma(self, prices: List[float], period: int) -> List[float]:
-        """计算移动平均线"""
+        """计算移动平均线（返回第 period 根起的有效值）"""
         if len(prices) < period:
             return []
-        
-        ma_values = []
-        for i in range(period - 1, len(prices)):
-            ma = sum(prices[i - period + 1:i + 1]) / period
-            ma_values.append(ma)
-        
-        return ma_values
+        return indicators.ma(prices, period)[period - 1:].tolist()
     
     def _calculate_rsi(self, prices: List[float], period: int = 14) -> List[float]:
-        """计算RSI指标"""
+        """计算RSI指标（最近 period 个涨跌幅的简单平均）"""
         if len(prices) < period + 1:
             return []
-        
-        gains = []
-        losses = []
-        
-        for i in range(1, len(prices)):
-            change = prices[i] - prices[i - 1]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
-        
-        rsi_values = []
-        for i in range(period - 1, len(gains)):
-            avg_gain = sum(gains[i - period + 1:i + 1]) / period
-            avg_loss = sum(losses[i - period + 1:i + 1]) / period
-            
-            if avg_loss == 0:
-                rsi = 100
-            else:
-                rs = avg_gain / avg_loss
-                rsi = 100 - (100 / (1 + rs))
-            
-            rsi_values.append(rsi)
-        
-        return rsi_values
+        values = indicators.rsi(prices, period, method='sma')[period:]
+        # 区间内无下跌（含无涨跌）时 RSI 记为 100
+        return np.nan_to_num(values, nan=100.0).tolist()
     
     def _calculate_macd(self, prices: List[float]) -> Dict[str, Any]:
         """计算MACD指标"""
         if len(prices) < 26:
             return {'dif': 0, 'dea': 0, 'histogram': 0}
         
-        # 计算EMA
-        ema12 = self._calculate_ema(prices, 12)
-        ema26 = self._calculate_ema(prices, 26)
-        
-        if not ema12 or not ema26:
-            return {'dif': 0, 'dea': 0, 'histogram': 0}
-        
-        # 计算DIF
-        dif = [ema12[i] - ema26[i] for i in range(len(ema26))]
-        
-        # 计算DEA (DIF的9日EMA)
-        dea = self._calculate_ema(dif, 9)
-        
-        if not dea:
-            return {'dif': dif[-1] if dif else 0, 'dea': 0, 'histogram': 0}
-        
-        # 计算MACD柱状图
-        histogram = dif[-1] - dea[-1] if dea else 0
-        
+        dif, dea, histogram = indicators.macd(prices)
         return {
-            'dif': dif[-1] if dif else 0,
-            'dea': dea[-1] if dea else 0,
-            'histogram': histogram
+            'dif': float(dif[-1]),
+            'dea': float(dea[-1]),
+            'histogram': float(histogram[-1])
         }
     
     def _calculate_ema(self, prices: List[float], period: int) -> List[float]:
-        """计算指数移动平均线"""
+        """计算指数移动平均线（第一个EMA值等于第一个价格）"""
         if len(prices) < period:
             return []
-        
-        multiplier = 2 / (period + 1)
-        ema_values = [prices[0]]  # 第一个EMA值等于第一个价格
-        
-        for i in range(1, len(prices)):
-            ema = (prices[i] * multiplier) + (ema_values[-1] * (1 - multiplier))
-            ema_values.append(ema)
-        
-        return ema_values
+        return indicators.ema(prices, period).tolist()
     
     def _analyze_price_trend(self, prices: List[float], ma20: List[float]) -> str:
         """分析价格趋势"""
@@ -841,6 +790,7 @@ class AnalysisDataManager:
         try:
             # 从活跃股票集合中移除
             self.active_stocks.discard(stock_code)
+            self.futu_market.unpin_subscription([stock_code], "analysis_tab")
             
             # 停止该股票的实时更新任务
             await self._stop_stock_update_tasks(stock_code)
@@ -9,6 +9,9 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
+from ...base import indicators
 from ...base.futu_class import KLineData
 from ...utils.global_vars import get_logger
 
@@ -19,6 +22,8 @@ CHART_DISPLAY_CONFIG = {
     'max_display_bars': 100,       # 最大显示K线数量
     'min_display_bars': 20,        # 最小显示K线数量
     'scroll_step': 5,              # 滚动步长
+    'ring_capacity': 2000,         # 每个 (股票, 周期) 保留的K线数量
+    'ma_periods': (5, 10, 20, 60), # 增量维护的均线周期
 }
 
 # 图表样式配置
@@ -53,6 +58,149 @@ class ChartData:
     time_period: str
 
 
+class KLineRingBuffer:
+    """
+    固定容量的K线列式环形缓冲区
+
+    按列保存 OHLCV 和增量维护的均线。底层数组长度为容量的两倍，写满后把最近 capacity 根
+    整体移到前半部分（均摊 O(1)），因此任意显示窗口都是连续切片，滚动/缩放不复制数据
+    """
+
+    COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, capacity: int = None, ma_periods: Tuple[int, ...] = None):
+        self.capacity = capacity or CHART_DISPLAY_CONFIG['ring_capacity']
+        self.ma_periods = tuple(ma_periods or CHART_DISPLAY_CONFIG['ma_periods'])
+        # 压缩后只保留 capacity - 1 根，追加时要读取 period 根之前的收盘价
+        if self.capacity <= max(self.ma_periods, default=0):
+            raise ValueError(f"K线缓冲区容量 {self.capacity} 必须大于最长均线周期 {max(self.ma_periods)}")
+        size = self.capacity * 2
+        self._columns = {name: np.zeros(size) for name in self.COLUMNS}
+        self._ma = {period: np.full(size, np.nan) for period in self.ma_periods}
+        self._klines = np.empty(size, dtype=object)
+        self._sums = {period: 0.0 for period in self.ma_periods}   # 最近 period 根收盘价之和
+        self._total = 0          # 加载以来的K线总数（含已移出缓冲区的），决定均线是否有效
+        self.dropped = 0         # 因容量限制从头部移出的K线数（用于调整显示窗口）
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def last_time_key(self) -> Optional[str]:
+        return self._klines[self._end - 1].time_key if self._end > self._start else None
+
+    def clear(self) -> None:
+        self._start = self._end = self._total = 0
+        self._sums = {period: 0.0 for period in self.ma_periods}
+
+    def _compact(self) -> None:
+        """把最近 capacity - 1 根K线移到数组前部，为追加腾出空间（容量大于最长均线周期，滚动和所需的收盘价都保留）"""
+        keep = self.capacity - 1
+        src = slice(self._end - keep, self._end)
+        for arr in (*self._columns.values(), *self._ma.values(), self._klines):
+            arr[:keep] = arr[src]
+        self._start, self._end = 0, keep
+
+    def _recompute_ma(self, index: int) -> None:
+        """用滚动和计算 index 处的均线"""
+        for period in self.ma_periods:
+            self._ma[period][index] = self._sums[period] / period if self._total >= period else np.nan
+
+    def append(self, kline: KLineData) -> None:
+        """
+        追加一根K线（O(1)）：时间与最后一根相同时视为最新K线的更新，早于最后一根的忽略
+        """
+        last_key = self.last_time_key
+        if last_key is not None and kline.time_key <= last_key:
+            if kline.time_key == last_key:
+                self._update_last(kline)
+            return
+
+        if self._end == len(self._klines):
+            self._compact()
+            self.dropped += 1
+        elif len(self) == self.capacity:
+            self._start += 1
+            self.dropped += 1
+
+        index = self._end
+        close = float(kline.close)
+        for period in self.ma_periods:
+            self._sums[period] += close
+            if self._total >= period:
+                self._sums[period] -= self._columns['close'][index - period]
+        self._end += 1
+        self._total += 1
+        self._write(index, kline)
+        self._recompute_ma(index)
+
+    def _write(self, index: int, kline: KLineData) -> None:
+        self._klines[index] = kline
+        for name in self.COLUMNS:
+            self._columns[name][index] = float(getattr(kline, name))
+
+    def _update_last(self, kline: KLineData) -> None:
+        index = self._end - 1
+        delta = float(kline.close) - self._columns['close'][index]
+        for period in self.ma_periods:
+            self._sums[period] += delta
+        self._write(index, kline)
+        self._recompute_ma(index)
+
+    def load(self, kline_data: List[KLineData]) -> None:
+        """整体加载（保留最近 capacity 根），均线一次性向量化计算"""
+        kline_data = kline_data[-self.capacity:]
+        count = len(kline_data)
+        self._start, self._end, self._total = 0, count, count
+        if not count:
+            self.clear()
+            return
+
+        self._klines[:count] = kline_data
+        values = np.array([[getattr(k, name) for name in self.COLUMNS] for k in kline_data], dtype=float)
+        for i, name in enumerate(self.COLUMNS):
+            self._columns[name][:count] = values[:, i]
+
+        closes = values[:, 3]
+        for period in self.ma_periods:
+            self._ma[period][:count] = indicators.ma(closes, period)
+            self._sums[period] = float(closes[-period:].sum())
+
+    def extend(self, kline_data: List[KLineData]) -> int:
+        """
+        与完整K线列表同步：缓冲区为空或数据不连续时整体加载，否则只追加比最后一根新的K线
+
+        Returns:
+            int: 追加/更新的K线数量
+        """
+        last_key = self.last_time_key
+        if last_key is None or not kline_data or kline_data[0].time_key > last_key:
+            self.load(kline_data)
+            return len(kline_data)
+
+        # 从后往前找到第一根不晚于最后一根的K线
+        pos = len(kline_data)
+        while pos > 0 and kline_data[pos - 1].time_key > last_key:
+            pos -= 1
+        new_bars = kline_data[max(pos - 1, 0):]
+        for kline in new_bars:
+            self.append(kline)
+        return len(new_bars)
+
+    def column(self, name: str, start: int, end: int) -> np.ndarray:
+        """获取 [start, end) 区间的列数据视图（open/high/low/close/volume）"""
+        return self._columns[name][self._start + start:self._start + end]
+
+    def ma(self, period: int, start: int, end: int) -> np.ndarray:
+        """获取 [start, end) 区间的均线视图（数据不足的位置为 NaN）"""
+        return self._ma[period][self._start + start:self._start + end]
+
+    def klines(self, start: int, end: int) -> List[KLineData]:
+        return list(self._klines[self._start + start:self._start + end])
+
+
 class ChartManager:
     """
     图表管理器
@@ -68,6 +216,11 @@ class ChartManager:
         self.current_chart_data: Optional[ChartData] = None
         self.display_range: ChartRange = ChartRange(0, 50, 0)
         
+        # 每个 (股票, 周期) 的K线环形缓冲区，切换周期时复用已加载的数据
+        self._buffers: Dict[Tuple[str, str], KLineRingBuffer] = {}
+        self.current_buffer: Optional[KLineRingBuffer] = None
+        self._current_key: Optional[Tuple[str, str]] = None
+        
         # 图表交互状态
         self.is_dragging: bool = False
         self.zoom_level: float = 1.0
@@ -102,8 +255,17 @@ class ChartManager:
                 self.logger.warning(f"股票 {stock_code} 没有K线数据")
                 return False
             
+            # 同步到环形缓冲区（已有数据时只追加新K线）
+            key = (stock_code, time_period)
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = self._buffers[key] = KLineRingBuffer()
+            buffer.extend(kline_data)
+            self.current_buffer = buffer
+            self._current_key = key
+            
             # 计算显示范围
-            total_bars = len(kline_data)
+            total_bars = len(buffer)
             display_bars = min(CHART_DISPLAY_CONFIG['max_display_bars'], total_bars)
             
             # 默认显示最新的数据
@@ -129,42 +291,68 @@ class ChartManager:
             self.logger.error(f"更新图表数据失败: {e}")
             return False
     
+    def append_kline(self, stock_code: str, time_period: str, kline: KLineData) -> bool:
+        """
+        追加实时K线（与最后一根时间相同则更新最后一根），显示最新数据时窗口随之右移
+        
+        Returns:
+            bool: 是否为当前显示的图表
+        """
+        key = (stock_code, time_period)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            return False
+        
+        dropped = buffer.dropped
+        buffer.append(kline)
+        if key != self._current_key:
+            return False
+        
+        current_range = self.display_range
+        total_bars = len(buffer)
+        if current_range.end_index >= current_range.total_bars:
+            display_bars = current_range.end_index - current_range.start_index
+            self.display_range = ChartRange(max(0, total_bars - display_bars), total_bars, total_bars)
+        else:
+            # 缓冲区已满时最早的K线被移出，窗口索引随之左移
+            shift = buffer.dropped - dropped
+            self.display_range = ChartRange(max(0, current_range.start_index - shift),
+                                            max(0, current_range.end_index - shift), total_bars)
+        return True
+    
+    def _display_slice(self) -> Tuple[int, int]:
+        return self.display_range.start_index, self.display_range.end_index
+    
     def get_display_kline_data(self) -> List[KLineData]:
         """获取当前显示范围的K线数据"""
-        if not self.current_chart_data:
+        if not self.current_chart_data or self.current_buffer is None:
             return []
         
-        start = self.display_range.start_index
-        end = self.display_range.end_index
-        
-        return self.current_chart_data.kline_data[start:end]
+        return self.current_buffer.klines(*self._display_slice())
     
     def get_chart_display_info(self) -> Dict[str, Any]:
         """获取图表显示信息"""
         if not self.current_chart_data:
             return {}
         
-        display_data = self.get_display_kline_data()
-        if not display_data:
+        buffer = self.current_buffer
+        start, end = self._display_slice()
+        if buffer is None or end <= start:
             return {}
         
         # 计算价格范围
-        high_prices = [k.high for k in display_data]
-        low_prices = [k.low for k in display_data]
-        
-        price_high = max(high_prices) if high_prices else 0
-        price_low = min(low_prices) if low_prices else 0
+        price_high = float(buffer.column('high', start, end).max())
+        price_low = float(buffer.column('low', start, end).min())
         price_range = price_high - price_low
         
         # 计算成交量范围
-        volumes = [k.volume for k in display_data]
-        volume_max = max(volumes) if volumes else 0
+        volume_max = int(buffer.column('volume', start, end).max())
         
         # 获取最新数据
-        latest_kline = display_data[-1] if display_data else None
+        latest_kline = buffer.klines(end - 1, end)[0]
         
         return {
-            'data_count': len(display_data),
+            'data_count': end - start,
             'price_high': price_high,
             'price_low': price_low,
             'price_range': price_range,
@@ -345,10 +533,11 @@ class ChartManager:
             if not self.show_ma_lines[ma_type]:
                 return []
             
-            # 这里应该从技术指标数据中获取均线数据
-            # 由于当前的technical_indicators只有最新值，这里返回空列表
-            # 实际实现中需要扩展analysis_data_manager来计算历史均线数据
-            return []
+            # 均线由环形缓冲区增量维护，数据不足的位置为 NaN
+            period = int(ma_type[2:])
+            if self.current_buffer is None or period not in self.current_buffer.ma_periods:
+                return []
+            return self.current_buffer.ma(period, *self._display_slice()).tolist()
             
         except Exception as e:
             self.logger.error(f"获取均线数据失败: {e}")
@@ -357,11 +546,10 @@ class ChartManager:
     def get_volume_data(self) -> List[int]:
         """获取成交量数据"""
         try:
-            if not self.current_chart_data or not self.show_volume:
+            if not self.current_chart_data or not self.show_volume or self.current_buffer is None:
                 return []
             
-            display_data = self.get_display_kline_data()
-            return [k.volume for k in display_data]
+            return self.current_buffer.column('volume', *self._display_slice()).astype(int).tolist()
             
         except Exception as e:
             self.logger.error(f"获取成交量数据失败: {e}")
@@ -478,6 +666,9 @@ class ChartManager:
         try:
             self.current_chart_data = None
             self.display_range = ChartRange(0, 50, 0)
+            self._buffers.clear()
+            self.current_buffer = None
+            self._current_key = None
             self.is_dragging = False
             self.zoom_level = 1.0
             self.scroll_position = 0
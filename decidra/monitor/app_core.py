@@ -42,7 +42,9 @@ class AppCore:
         self.monitored_stocks: List[str] = []
         self.stock_data: Dict[str, Any] = {}
         self.technical_indicators: Dict[str, Any] = {}
-        self.stock_basicinfo_cache: Dict[str, Any] = {}
+        # 股票基本信息缓存（SQLite 按股票代码保存，按需加载）
+        from .main.basicinfo_cache import BasicinfoCache
+        self.stock_basicinfo_cache: BasicinfoCache = BasicinfoCache()
         
         # 重连控制
         self._reconnect_attempts = 0
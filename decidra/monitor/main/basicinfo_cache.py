@@ -0,0 +1,199 @@
+"""
+BasicinfoCache - 股票基本信息本地缓存
+
+以股票代码为主键保存在 SQLite 中，按需加载：
+1. 读取单只股票时才从磁盘取出并缓存在内存
+2. 每条记录单独记录获取时间，按条判断是否过期，只需补充缺失或过期的股票
+3. 新增或更新的记录批量写回，不再整体重写缓存文件
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from ...utils.global_vars import PATH_DATA, get_logger
+
+# 基本信息缓存默认配置
+BASICINFO_CACHE_CONFIG = {
+    'db_file': 'stock_basicinfo_cache.db',
+    'legacy_json_file': 'stock_basicinfo_cache.json',   # 旧版 JSON 缓存，首次打开时导入
+    'expiry_hours': 8,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS basicinfo (
+    code TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    data TEXT NOT NULL
+) WITHOUT ROWID
+"""
+
+# SQLite 单条语句的参数数量上限较低，IN 查询分批执行
+_QUERY_BATCH = 500
+
+
+class BasicinfoCache(MutableMapping):
+    """
+    股票基本信息缓存（股票代码 -> 基本信息字典）
+
+    可直接替代原来的字典使用；读写都先经过内存，未命中时再查询 SQLite
+    """
+
+    def __init__(self, path: Optional[Path] = None, expiry_hours: Optional[float] = None):
+        self.path = Path(path) if path else PATH_DATA / BASICINFO_CACHE_CONFIG['db_file']
+        self.expiry_hours = BASICINFO_CACHE_CONFIG['expiry_hours'] if expiry_hours is None else expiry_hours
+        self.logger = get_logger(__name__)
+
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at: Dict[str, float] = {}
+        self._dirty: set = set()
+        self._conn: Optional[sqlite3.Connection] = None
+        # 加载和保存在线程池中执行，连接和内存数据需要加锁
+        self._lock = threading.RLock()
+
+    # ================== 数据库连接 ==================
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.path.parent, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+            self._import_legacy_json()
+        return self._conn
+
+    def _import_legacy_json(self) -> None:
+        """首次使用时导入旧版 JSON 缓存，获取时间取原文件修改时间"""
+        legacy_path = self.path.parent / BASICINFO_CACHE_CONFIG['legacy_json_file']
+        if not legacy_path.exists() or self._conn.execute("SELECT 1 FROM basicinfo LIMIT 1").fetchone():
+            return
+        try:
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                data = json.load(f).get('data', {})
+            fetched_at = os.path.getmtime(legacy_path)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO basicinfo (code, fetched_at, data) VALUES (?, ?, ?)",
+                [(code, fetched_at, _dumps(info)) for code, info in data.items()],
+            )
+            self._conn.commit()
+            self.logger.info(f"已导入旧版股票基本信息缓存 {len(data)} 条")
+        except Exception as e:
+            self.logger.warning(f"导入旧版股票基本信息缓存失败: {e}")
+
+    def _select(self, columns: str, codes: List[str]) -> List[tuple]:
+        rows = []
+        conn = self._connection()
+        for start in range(0, len(codes), _QUERY_BATCH):
+            batch = codes[start:start + _QUERY_BATCH]
+            placeholders = ','.join('?' * len(batch))
+            rows.extend(conn.execute(f"SELECT {columns} FROM basicinfo WHERE code IN ({placeholders})", batch))
+        return rows
+
+    # ================== 按股票加载与保存 ==================
+
+    def missing(self, codes: Iterable[str]) -> List[str]:
+        """
+        返回缺失或已过期的股票代码，其余股票的基本信息一并加载到内存
+
+        Args:
+            codes: 需要的股票代码
+        """
+        codes = list(dict.fromkeys(codes))
+        deadline = time.time() - self.expiry_hours * 3600
+        with self._lock:
+            unloaded = [code for code in codes if code not in self._rows]
+            for code, fetched_at, data in self._select('code, fetched_at, data', unloaded):
+                self._rows[code] = json.loads(data)
+                self._fetched_at[code] = fetched_at
+            return [code for code in codes if self._fetched_at.get(code, 0) < deadline]
+
+    def update_entries(self, entries: Dict[str, Dict[str, Any]], fetched_at: Optional[float] = None) -> None:
+        """批量更新基本信息并记录获取时间，需调用 flush 写入磁盘"""
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._lock:
+            for code, info in entries.items():
+                self._rows[code] = info
+                self._fetched_at[code] = fetched_at
+                self._dirty.add(code)
+
+    def flush(self) -> int:
+        """将新增或更新的记录写入磁盘，返回写入条数"""
+        with self._lock:
+            if not self._dirty:
+                return 0
+            records = [(code, self._fetched_at.get(code, time.time()), _dumps(self._rows[code]))
+                       for code in self._dirty if code in self._rows]
+            conn = self._connection()
+            conn.executemany("INSERT OR REPLACE INTO basicinfo (code, fetched_at, data) VALUES (?, ?, ?)", records)
+            conn.commit()
+            self._dirty.clear()
+            return len(records)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ================== MutableMapping 接口 ==================
+
+    def __getitem__(self, code: str) -> Dict[str, Any]:
+        with self._lock:
+            info = self._rows.get(code)
+            if info is None:
+                rows = self._select('fetched_at, data', [code])
+                if not rows:
+                    raise KeyError(code)
+                self._fetched_at[code], data = rows[0]
+                info = self._rows[code] = json.loads(data)
+            return info
+
+    def __setitem__(self, code: str, info: Dict[str, Any]) -> None:
+        self.update_entries({code: info})
+
+    def __delitem__(self, code: str) -> None:
+        with self._lock:
+            in_memory = self._rows.pop(code, None) is not None
+            self._fetched_at.pop(code, None)
+            self._dirty.discard(code)
+            deleted = self._connection().execute("DELETE FROM basicinfo WHERE code = ?", (code,)).rowcount
+            self._connection().commit()
+            if not (in_memory or deleted):
+                raise KeyError(code)
+
+    def __contains__(self, code: object) -> bool:
+        if not isinstance(code, str):
+            return False
+        with self._lock:
+            return code in self._rows or bool(self._select('1', [code]))
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            codes = [row[0] for row in self._connection().execute("SELECT code FROM basicinfo")]
+            pending = [code for code in self._rows if code in self._dirty]
+        return iter(dict.fromkeys(codes + pending))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __bool__(self) -> bool:
+        with self._lock:
+            return bool(self._rows) or self._connection().execute("SELECT 1 FROM basicinfo LIMIT 1").fetchone() is not None
+
+    def clear(self) -> None:
+        """清空内存和磁盘中的全部缓存"""
+        with self._lock:
+            self._rows.clear()
+            self._fetched_at.clear()
+            self._dirty.clear()
+            self._connection().execute("DELETE FROM basicinfo")
+            self._connection().commit()
+
+
+def _dumps(info: Dict[str, Any]) -> str:
+    return json.dumps(info, ensure_ascii=False, separators=(',', ':'), default=str)
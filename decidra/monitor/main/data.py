@@ -5,8 +5,6 @@ DataManager - 股票数据和API管理模块
 """
 
 import asyncio
-import json
-import os
 import time
 from datetime import datetime
 from typing import Dict, Optional, Any
@@ -15,13 +13,11 @@ from ...base.monitor import StockData, MarketStatus, ConnectionStatus
 from ...modules.futu_market import FutuMarket
 from ...base.futu_class import MarketSnapshot
 from ...utils.global_vars import get_logger
-from ...utils.global_vars import PATH_DATA
 
 SNAPSHOT_REFRESH_INTERVAL = 300
 REALTIME_REFRESH_INTERVAL = 1
 ORDER_REFRESH_INTERVAL = 5  # 订单数据刷新间隔（秒）
-CACHE_EXPIRY_HOURS = 8
-BASICINFO_CACHE_FILE = "stock_basicinfo_cache.json"
+ORDER_RESYNC_INTERVAL = 60  # 订单推送启用后的全量对账间隔（秒）
 
 # 全局交易模式配置
 TRADING_MODE_SIMULATION = "模拟交易"
@@ -51,6 +47,10 @@ class DataManager:
         self.market_status_poller: Optional[asyncio.Task] = None
         self.user_refresh_timer: Optional[asyncio.Task] = None
 
+        # 订单推送状态（推送在富途回调线程到达，需切换到事件循环处理）
+        self._order_push_enabled = False
+        self._event_loop: Optional[asyncio.AbstractEventLoop] = None
+
         # 全局市场状态缓存
         self._global_market_state_cache = None
         self._market_status_cache_timestamp = 0.0
@@ -108,41 +108,47 @@ class DataManager:
         """初始化数据管理器"""
         try:
             # 主动建立富途连接
-            try:
-                self.logger.info("正在连接富途API...")
-                loop = asyncio.get_event_loop()
-                
-                # 在线程池中执行连接操作
-                connect_success = await loop.run_in_executor(
-                    None, 
-                    self.futu_market.client.connect
-                )
-                
-                if connect_success:
-                    self.app_core.connection_status = ConnectionStatus.CONNECTED
-                    self.logger.info("富途API连接成功")
-                    # 向信息面板显示连接状态
-                    if hasattr(self.app_core, 'app') and hasattr(self.app_core.app, 'ui_manager') and self.app_core.app.ui_manager.info_panel:
-                        await self.app_core.app.ui_manager.info_panel.log_info("富途API连接成功", "连接状态")
-                    
-                    # 连接成功后立即加载股票基本信息
-                    await self.load_stock_basicinfo()
-                    
-                    # 启动市场状态轮询任务
-                    await self.start_market_status_poller()
-                else:
-                    self.app_core.connection_status = ConnectionStatus.DISCONNECTED
-                    self.logger.warning("富途API连接失败")
-                    
-            except Exception as e:
-                self.app_core.connection_status = ConnectionStatus.ERROR
-                self.logger.error(f"富途API连接失败: {e}")
-            
-            
+            if await self.connect_futu():
+                # 连接成功后并行加载股票基本信息和启动市场状态轮询任务
+                await asyncio.gather(self.load_stock_basicinfo(), self.start_market_status_poller())
+
         except Exception as e:
             self.logger.error(f"数据管理器初始化失败: {e}")
             self.app_core.connection_status = ConnectionStatus.ERROR
-    
+
+    async def connect_futu(self) -> bool:
+        """建立富途API连接并更新连接状态
+
+        Returns:
+            bool: 连接成功返回True
+        """
+        try:
+            self.logger.info("正在连接富途API...")
+            loop = asyncio.get_event_loop()
+
+            # 在线程池中执行连接操作
+            connect_success = await loop.run_in_executor(
+                None,
+                self.futu_market.client.connect
+            )
+
+            if connect_success:
+                self.app_core.connection_status = ConnectionStatus.CONNECTED
+                self.logger.info("富途API连接成功")
+                # 向信息面板显示连接状态
+                if hasattr(self.app_core, 'app') and hasattr(self.app_core.app, 'ui_manager') and self.app_core.app.ui_manager.info_panel:
+                    await self.app_core.app.ui_manager.info_panel.log_info("富途API连接成功", "连接状态")
+                return True
+
+            self.app_core.connection_status = ConnectionStatus.DISCONNECTED
+            self.logger.warning("富途API连接失败")
+            return False
+
+        except Exception as e:
+            self.app_core.connection_status = ConnectionStatus.ERROR
+            self.logger.error(f"富途API连接失败: {e}")
+            return False
+
     async def attempt_reconnect(self) -> bool:
         """尝试重新连接富途API"""
         if self.app_core._reconnect_attempts >= self.app_core._max_reconnect_attempts:
@@ -153,19 +159,13 @@ class DataManager:
         self.logger.info(f"尝试重连富途API (第 {self.app_core._reconnect_attempts} 次)")
         
         try:
-            # 关闭旧连接
-            if hasattr(self.futu_market, 'close'):
-                self.futu_market.close()
-            
-            # 等待一段时间后重新创建连接
+            # 等待一段时间后在共享客户端上重建连接（推送回调与订阅自动恢复，交易等模块同时恢复）
             await asyncio.sleep(2.0)
             
-            # 重新创建富途市场实例
-            self.futu_market = FutuMarket()
-            self.futu_market._is_shared_instance = True
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, self.futu_market.reconnect)
             
             # 检查新连接状态
-            loop = asyncio.get_event_loop()
             connection_state = await loop.run_in_executor(
                 None, 
                 self.futu_market.get_connection_state
@@ -407,8 +407,12 @@ class DataManager:
             self.logger.error(f"备用市场状态检测失败: {e}")
             return MarketStatus.CLOSE
     
-    async def start_data_refresh(self) -> None:
-        """启动数据刷新"""
+    async def start_data_refresh(self, with_user_refresh: bool = True) -> None:
+        """启动数据刷新
+
+        Args:
+            with_user_refresh: 是否同时启动订单和持仓刷新（分阶段启动时由调用方单独启动）
+        """
         try:
             # 判断市场状态并设置刷新模式
             market_status = await self.detect_market_status()
@@ -435,7 +439,8 @@ class DataManager:
             await self.app_core.update_status_display()
 
             # 启动用户数据刷新
-            await self.start_user_refresh()
+            if with_user_refresh:
+                await self.start_user_refresh()
             
         except Exception as e:
             self.logger.error(f"启动数据刷新失败: {e}")
@@ -451,6 +456,8 @@ class DataManager:
                     self.futu_market.unsubscribe_all
                 )
                 self.logger.info("已取消所有之前的订阅")
+                # 监控列表的报价订阅固定，不因额度不足被淘汰
+                self.futu_market.set_pinned_subscriptions(self.app_core.monitored_stocks, "monitored")
                 # 订阅实时数据
                 loop = asyncio.get_event_loop()
                 success = await loop.run_in_executor(
@@ -493,7 +500,7 @@ class DataManager:
             if not self.app_core.monitored_stocks:
                 return
             
-            self.logger.debug(f"获取 {len(self.app_core.monitored_stocks)} 只股票的实时报价")
+            self.logger.debug("获取 %d 只股票的实时报价", len(self.app_core.monitored_stocks))
             
             # 调用get_stock_quote获取实时报价
             loop = asyncio.get_event_loop()
@@ -515,11 +522,11 @@ class DataManager:
                         if stock_info is not None:
                             self.app_core.stock_data[stock_code] = stock_info
                             updated_count += 1
-                            self.logger.debug(f"更新实时数据: {stock_code} - {stock_info.current_price}")
+                            self.logger.debug("更新实时数据: %s - %s", stock_code, stock_info.current_price)
                 
                 # 更新UI
                 await self.app_core.app.ui_manager.update_stock_table()
-                self.logger.debug(f"实时数据更新成功，共更新 {updated_count} 只股票")
+                self.logger.debug("实时数据更新成功，共更新 %d 只股票", updated_count)
             else:
                 self.logger.warning("获取实时报价返回空数据")
                 
@@ -608,7 +615,7 @@ class DataManager:
                 self.logger.warning("没有监控的股票，跳过数据刷新")
                 return
             
-            self.logger.info(f"开始刷新 {len(self.app_core.monitored_stocks)} 只股票的数据")
+            self.logger.info("开始刷新 %d 只股票的数据", len(self.app_core.monitored_stocks))
             
             # 直接调用API获取实时行情数据
             loop = asyncio.get_event_loop()
@@ -625,7 +632,7 @@ class DataManager:
                 
                 updated_count = 0
                 for snapshot in market_snapshots:
-                    self.logger.debug(f'股票数据: {snapshot.code} {snapshot}')
+                    self.logger.debug('股票数据: %s %s', snapshot.code, snapshot)
                     # 修复：snapshot现在是MarketSnapshot对象，不是字典
                     if hasattr(snapshot, 'code'):
                         stock_code = snapshot.code
@@ -634,13 +641,13 @@ class DataManager:
                         if stock_info is not None:
                             self.app_core.stock_data[stock_code] = stock_info
                             updated_count += 1
-                            self.logger.debug(f"更新股票数据: {stock_code} - {stock_info.current_price}")
+                            self.logger.debug("更新股票数据: %s - %s", stock_code, stock_info.current_price)
                         else:
                             self.logger.warning(f"股票 {stock_code} 数据转换失败")
                 
                 await self.app_core.app.ui_manager.update_stock_table()
                 
-                self.logger.info(f"股票数据刷新成功，共更新 {updated_count} 只股票")
+                self.logger.info("股票数据刷新成功，共更新 %d 只股票", updated_count)
                 # 向信息面板显示数据刷新信息
                 if hasattr(self.app_core, 'app') and hasattr(self.app_core.app, 'ui_manager') and self.app_core.app.ui_manager.info_panel:
                     await self.app_core.app.ui_manager.info_panel.log_info(f"股票数据已更新: {updated_count} 只股票", "数据刷新")
@@ -690,9 +697,9 @@ class DataManager:
             # 计算涨跌额
             change_amount = current_price - prev_close
             
-            # 从snapshot获取股票名称，如果没有则使用股票代码
+            # 从基本信息缓存获取股票名称；缓存尚未加载（启动时与行情并行）或缺少该股票时使用股票代码
             basic_info = self.get_stock_basicinfo_from_cache(snapshot.code)
-            stock_name = basic_info.get('name', snapshot.code)
+            stock_name = (basic_info or {}).get('name', snapshot.code)
             
             return StockData(
                 code=snapshot.code,
@@ -773,8 +780,9 @@ class DataManager:
             # 清理缓存
             self._global_market_state_cache = None
             self._market_status_cache_timestamp = 0.0
-            
 
+            # 关闭股票基本信息缓存数据库
+            self.app_core.stock_basicinfo_cache.close()
                 
             self.logger.debug("DataManager 清理完成")
 
@@ -782,22 +790,23 @@ class DataManager:
             self.logger.error(f"DataManager 清理失败: {e}")
 
     async def refresh_order_data(self) -> None:
-        """刷新订单数据并更新UI"""
+        """全量查询订单并与本地订单簿对账，只刷新变化的订单行"""
         try:
             self.logger.debug("开始刷新订单数据")
 
-            # 先通过 UserDataManager 加载订单数据到 app_core.order_data
+            # 先通过 UserDataManager 对账订单数据到 app_core.order_data
             group_manager = getattr(self.app_core.app, 'group_manager', None)
             if group_manager:
-                await group_manager.load_user_orders()
+                changed_orders = await group_manager.load_user_orders()
             else:
                 self.logger.warning("UserDataManager 未初始化，无法刷新订单数据")
                 return
 
-            # 然后委托给 UIManager 更新表格UI
+            # 然后委托给 UIManager 更新表格UI（None 表示需要全量重建）
             ui_manager = getattr(self.app_core.app, 'ui_manager', None)
             if ui_manager:
-                await ui_manager.update_orders_table()
+                if changed_orders is None or changed_orders:
+                    await ui_manager.update_orders_table(changed_orders)
             else:
                 self.logger.warning("UIManager 未初始化，跳过更新订单表格UI")
 
@@ -806,6 +815,66 @@ class DataManager:
         except Exception as e:
             self.logger.error(f"刷新订单数据失败: {e}")
 
+    async def enable_order_push(self) -> bool:
+        """启用订单推送，订单状态变化直接更新本地订单簿"""
+        futu_trade = self.futu_trade or getattr(self.app_core.app, 'futu_trade', None)
+        if not futu_trade:
+            return False
+
+        try:
+            self._event_loop = asyncio.get_running_loop()
+            await self._event_loop.run_in_executor(None, futu_trade.set_order_callback, self._on_order_push)
+            await self._event_loop.run_in_executor(None, futu_trade.enable_order_push)
+            self._order_push_enabled = True
+            self.logger.info(f"订单推送已启用，全量对账间隔: {ORDER_RESYNC_INTERVAL}秒")
+            return True
+        except Exception as e:
+            self.logger.error(f"启用订单推送失败，继续使用定时刷新: {e}")
+            return False
+
+    def _on_order_push(self, data) -> None:
+        """订单推送回调（富途回调线程），转交事件循环处理"""
+        if self._event_loop is None or self._event_loop.is_closed():
+            return
+        records = data.to_dict('records') if hasattr(data, 'to_dict') else [data]
+        self._event_loop.call_soon_threadsafe(
+            lambda: asyncio.ensure_future(self.apply_order_push(records))
+        )
+
+    async def apply_order_push(self, records) -> None:
+        """将订单推送应用到本地订单簿，并只刷新变化的行"""
+        try:
+            group_manager = getattr(self.app_core.app, 'group_manager', None)
+            if not group_manager:
+                return
+
+            # 只处理当前交易环境的订单
+            futu_trade = self.futu_trade or getattr(self.app_core.app, 'futu_trade', None)
+            trd_env = getattr(futu_trade, 'default_trd_env', None)
+            if trd_env:
+                records = [r for r in records if str(r.get('trd_env', trd_env)) == trd_env]
+
+            changed_orders = group_manager.order_store.apply_push(records)
+            if not changed_orders:
+                return
+
+            ui_manager = getattr(self.app_core.app, 'ui_manager', None)
+            if ui_manager:
+                await ui_manager.update_orders_table(changed_orders)
+            self.logger.debug(f"订单推送更新 {len(changed_orders)} 条订单")
+
+        except Exception as e:
+            self.logger.error(f"处理订单推送失败: {e}")
+
+    def _order_resync_due(self) -> bool:
+        """是否需要全量查询订单（未启用推送时每个刷新周期都查询）"""
+        if not self._order_push_enabled:
+            return True
+        group_manager = getattr(self.app_core.app, 'group_manager', None)
+        if not group_manager:
+            return True
+        return time.time() - group_manager.order_store.last_resync >= ORDER_RESYNC_INTERVAL
+
     async def refresh_position_data(self) -> None:
         """刷新持仓数据并更新UI"""
         try:
@@ -850,11 +919,11 @@ class DataManager:
             # 立即执行一次用户数据刷新，避免等待第一个刷新周期
             self.logger.info("启动时立即加载订单和持仓数据")
 
-            # 加载订单数据
-            await self.refresh_order_data()
+            # 启用订单推送（失败时退回定时全量刷新）
+            await self.enable_order_push()
 
-            # 加载持仓数据
-            await self.refresh_position_data()
+            # 订单和持仓互不依赖，并行加载
+            await asyncio.gather(self.refresh_order_data(), self.refresh_position_data())
 
             # 创建定时刷新任务
             self.user_refresh_timer = asyncio.create_task(self.user_data_refresh_loop())
@@ -875,8 +944,9 @@ class DataManager:
                     # 先等待刷新间隔，避免重复立即刷新
                     await asyncio.sleep(ORDER_REFRESH_INTERVAL)
 
-                    # 刷新订单数据
-                    await self.refresh_order_data()
+                    # 刷新订单数据（启用推送后仅定期全量对账）
+                    if self._order_resync_due():
+                        await self.refresh_order_data()
 
                     # 刷新持仓数据
                     await self.refresh_position_data()
@@ -923,45 +993,19 @@ class DataManager:
             self.logger.warning(f"清理富途市场连接时出错: {e}")
     
     def _load_basicinfo_cache_from_file(self) -> bool:
-        """从本地文件加载股票基本信息缓存
+        """从本地缓存加载监控股票的基本信息
         
         Returns:
-            bool: 如果成功加载有效缓存返回True，否则返回False
+            bool: 如果所有监控股票都有未过期的缓存返回True，否则返回False
         """
         try:
-            cache_file_path = PATH_DATA / BASICINFO_CACHE_FILE
-            
-            if not cache_file_path.exists():
-                self.logger.info("本地股票基本信息缓存文件不存在")
-                return False
-            
-            file_mtime = os.path.getmtime(cache_file_path)
-            current_time = time.time()
-            cache_age_hours = (current_time - file_mtime) / 3600
-            
-            if cache_age_hours > CACHE_EXPIRY_HOURS:
-                self.logger.info(f"股票基本信息缓存已过期 ({cache_age_hours:.1f}小时 > {CACHE_EXPIRY_HOURS}小时)")
-                return False
-            
-            with open(cache_file_path, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+            missing_stocks = self.app_core.stock_basicinfo_cache.missing(self.app_core.monitored_stocks)
             
-            if not isinstance(cache_data, dict) or 'data' not in cache_data:
-                self.logger.warning("缓存文件格式无效")
+            if missing_stocks:
+                self.logger.info(f"缓存中缺少或已过期的股票信息: {missing_stocks}")
                 return False
             
-            cached_stocks = set(cache_data['data'].keys())
-            monitored_stocks = set(self.app_core.monitored_stocks)
-            
-            if not monitored_stocks.issubset(cached_stocks):
-                missing_stocks = monitored_stocks - cached_stocks
-                self.logger.info(f"缓存中缺少部分股票信息: {missing_stocks}")
-                return False
-            
-            self.app_core.stock_basicinfo_cache.clear()
-            self.app_core.stock_basicinfo_cache.update(cache_data['data'])
-            
-            self.logger.info(f"成功从本地缓存加载 {len(cache_data['data'])} 只股票基本信息")
+            self.logger.info(f"成功从本地缓存加载 {len(self.app_core.monitored_stocks)} 只监控股票基本信息")
             return True
             
         except Exception as e:
@@ -969,32 +1013,27 @@ class DataManager:
             return False
     
     def _save_basicinfo_cache_to_file(self) -> None:
-        """将股票基本信息缓存保存到本地文件"""
+        """将新增或更新的股票基本信息写入本地缓存"""
         try:
-            if not self.app_core.stock_basicinfo_cache:
-                self.logger.warning("没有可保存的股票基本信息缓存")
-                return
-            
-            os.makedirs(PATH_DATA, exist_ok=True)
-            
-            cache_data = {
-                'timestamp': datetime.now().isoformat(),
-                'cache_expiry_hours': CACHE_EXPIRY_HOURS,
-                'data': self.app_core.stock_basicinfo_cache
-            }
-            
-            cache_file_path = PATH_DATA / BASICINFO_CACHE_FILE
-            
-            with open(cache_file_path, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
-            
-            self.logger.info(f"成功保存 {len(cache_data['data'])} 只股票基本信息到本地缓存")
+            saved = self.app_core.stock_basicinfo_cache.flush()
+            self.logger.info(f"成功保存 {saved} 只股票基本信息到本地缓存")
             
         except Exception as e:
             self.logger.error(f"保存股票基本信息缓存失败: {e}")
     
-    async def load_stock_basicinfo(self) -> None:
-        """加载股票基本信息并缓存"""
+    async def load_basicinfo_cache(self) -> bool:
+        """在线程池中读取本地股票基本信息缓存，不阻塞界面渲染"""
+        if not self.app_core.monitored_stocks:
+            return False
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._load_basicinfo_cache_from_file)
+
+    async def load_stock_basicinfo(self, use_file_cache: bool = True) -> None:
+        """加载股票基本信息并缓存
+
+        Args:
+            use_file_cache: 是否先尝试本地缓存（调用方已确认缓存无效时传 False）
+        """
         try:
             # 为监控的股票加载基本信息
             if not self.app_core.monitored_stocks:
@@ -1002,7 +1041,7 @@ class DataManager:
                 return
             
             # 首先尝试从本地缓存加载
-            if self._load_basicinfo_cache_from_file():
+            if use_file_cache and await self.load_basicinfo_cache():
                 self.logger.info("使用本地缓存的股票基本信息")
                 return
             
@@ -1011,89 +1050,94 @@ class DataManager:
                 self.logger.warning("富途API未连接且本地缓存无效，无法加载股票基本信息")
                 return
             
-            self.logger.info(f"开始从API加载 {len(self.app_core.monitored_stocks)} 只股票的基本信息...")
-            
             # 在线程池中执行同步的富途API调用
             loop = asyncio.get_event_loop()
             
-            # 根据股票代码确定市场
-            hk_stocks = [code for code in self.app_core.monitored_stocks if code.startswith('HK.')]
-            us_stocks = [code for code in self.app_core.monitored_stocks if code.startswith('US.')]
-            sh_stocks = [code for code in self.app_core.monitored_stocks if code.startswith('SH.')]
-            sz_stocks = [code for code in self.app_core.monitored_stocks if code.startswith('SZ.')]
-            
-            # 分别获取不同市场的股票基本信息
-            market_groups = [
-                ("HK", hk_stocks),
-                ("US", us_stocks),
-                ("SH", sh_stocks),
-                ("SZ", sz_stocks)
-            ]
+            cache = self.app_core.stock_basicinfo_cache
+            missing_stocks = await loop.run_in_executor(None, cache.missing, self.app_core.monitored_stocks)
+            if not missing_stocks:
+                return
             
-            total_loaded = 0
-            for market, stocks in market_groups:
-                if not stocks:
-                    continue
-                    
-                try:
-                    # 使用新的合并方法获取STOCK、IDX、ETF三种类型的证券信息
-                    basicinfo_list = await loop.run_in_executor(
-                        None,
-                        self.futu_market.get_stock_basicinfo_multi_types,
-                        market,
-                        ["STOCK", "IDX", "ETF"]
-                    )
-                    
-                    if basicinfo_list:
-                        for basicinfo in basicinfo_list:
-                            if hasattr(basicinfo, 'code'):
-                                stock_code = basicinfo.code
-                                # 缓存所有获取到的证券信息
-                                self.app_core.stock_basicinfo_cache[stock_code] = {
-                                    'code': basicinfo.code,
-                                    'name': getattr(basicinfo, 'name', ''),
-                                    'lot_size': getattr(basicinfo, 'lot_size', 0),
-                                    'stock_type': getattr(basicinfo, 'stock_type', ''),
-                                    'main_contract': getattr(basicinfo, 'main_contract', False),
-                                    'stock_child_type': getattr(basicinfo, 'stock_child_type', ''),
-                                    'listing_date': getattr(basicinfo, 'listing_date', None),
-                                    'delisting_date': getattr(basicinfo, 'delisting_date', None),
-                                    'last_update': datetime.now().isoformat()
-                                }
-                                total_loaded += 1
-                            elif isinstance(basicinfo, dict):
-                                stock_code = basicinfo.get('code', '')
-                                if stock_code:
-                                    # 缓存所有获取到的证券信息
-                                    self.app_core.stock_basicinfo_cache[stock_code] = {
-                                        'code': stock_code,
-                                        'name': basicinfo.get('name', ''),
-                                        'lot_size': basicinfo.get('lot_size', 0),
-                                        'stock_type': basicinfo.get('stock_type', ''),
-                                        'main_contract': basicinfo.get('main_contract', False),
-                                        'stock_child_type': basicinfo.get('stock_child_type', ''),
-                                        'listing_date': basicinfo.get('listing_date', None),
-                                        'delisting_date': basicinfo.get('delisting_date', None),
-                                        'last_update': datetime.now().isoformat()
-                                    }
-                                    total_loaded += 1
-                    
-                    self.logger.info(f"加载 {market} 市场证券基本信息完成，共缓存 {len(basicinfo_list) if basicinfo_list else 0} 只证券（支持STOCK/IDX/ETF类型）")
-                    
-                except Exception as e:
-                    self.logger.error(f"加载 {market} 市场股票基本信息失败: {e}")
-                    continue
+            # 已有缓存时只补充缺失或过期的股票，缓存为空时按市场全量加载（供股票代码补全使用）
+            cache_is_empty = not await loop.run_in_executor(None, bool, cache)
+            if cache_is_empty:
+                entries = await self._fetch_market_basicinfo(self.app_core.monitored_stocks)
+            else:
+                self.logger.info(f"开始从API补充 {len(missing_stocks)} 只股票的基本信息...")
+                basicinfo_list = await loop.run_in_executor(
+                    None,
+                    self.futu_market.get_stock_basicinfo_by_codes,
+                    missing_stocks
+                )
+                entries = self._basicinfo_entries(basicinfo_list)
             
-            if total_loaded > 0:
+            if entries:
+                cache.update_entries(entries)
                 # API调用成功，保存到本地缓存
-                self._save_basicinfo_cache_to_file()
-                self.logger.info(f"股票基本信息加载完成，共缓存 {total_loaded} 只股票并保存到本地")
+                await loop.run_in_executor(None, self._save_basicinfo_cache_to_file)
+                self.logger.info(f"股票基本信息加载完成，共缓存 {len(entries)} 只股票并保存到本地")
             else:
                 self.logger.warning("未能从API获取到任何股票基本信息")
             
         except Exception as e:
             self.logger.error(f"加载股票基本信息失败: {e}")
     
+    async def _fetch_market_basicinfo(self, stock_codes) -> Dict[str, Dict[str, Any]]:
+        """按市场获取所有证券（STOCK/IDX/ETF）的基本信息"""
+        self.logger.info(f"开始从API加载 {len(stock_codes)} 只股票所在市场的基本信息...")
+        loop = asyncio.get_event_loop()
+        entries = {}
+        
+        # 根据股票代码确定市场
+        markets = dict.fromkeys(code.split('.')[0] for code in stock_codes)
+        for market in ("HK", "US", "SH", "SZ"):
+            if market not in markets:
+                continue
+                
+            try:
+                # 使用新的合并方法获取STOCK、IDX、ETF三种类型的证券信息
+                basicinfo_list = await loop.run_in_executor(
+                    None,
+                    self.futu_market.get_stock_basicinfo_multi_types,
+                    market,
+                    ["STOCK", "IDX", "ETF"]
+                )
+                entries.update(self._basicinfo_entries(basicinfo_list))
+                
+                self.logger.info(f"加载 {market} 市场证券基本信息完成，共缓存 {len(basicinfo_list) if basicinfo_list else 0} 只证券（支持STOCK/IDX/ETF类型）")
+                
+            except Exception as e:
+                self.logger.error(f"加载 {market} 市场股票基本信息失败: {e}")
+                continue
+        
+        return entries
+    
+    @staticmethod
+    def _basicinfo_entries(basicinfo_list) -> Dict[str, Dict[str, Any]]:
+        """将API返回的证券信息（StockInfo 对象或字典）转换为缓存记录"""
+        entries = {}
+        last_update = datetime.now().isoformat()
+        for basicinfo in basicinfo_list or []:
+            if hasattr(basicinfo, 'code'):
+                get = lambda key, default: getattr(basicinfo, key, default)
+            elif isinstance(basicinfo, dict) and basicinfo.get('code'):
+                get = basicinfo.get
+            else:
+                continue
+            
+            entries[get('code', '')] = {
+                'code': get('code', ''),
+                'name': get('name', ''),
+                'lot_size': get('lot_size', 0),
+                'stock_type': get('stock_type', ''),
+                'main_contract': get('main_contract', False),
+                'stock_child_type': get('stock_child_type', ''),
+                'listing_date': get('listing_date', None),
+                'delisting_date': get('delisting_date', None),
+                'last_update': last_update
+            }
+        return entries
+    
     async def refresh_stock_basicinfo(self) -> None:
         """刷新股票基本信息缓存"""
         try:
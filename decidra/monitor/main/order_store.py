@@ -0,0 +1,132 @@
+"""
+OrderStore - 本地订单簿
+
+维护 app_core.order_data，由订单推送增量更新，并定期全量对账：
+1. 推送与全量查询都按 updated_time 比较版本，旧数据不会覆盖新数据
+2. 每次更新返回发生变化的订单，订单表只刷新这些行
+3. 新订单追加到末尾，保证 order_data 下标与订单表行号一致
+"""
+
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from ...utils.global_vars import get_logger
+
+
+def normalize_order(order: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    标准化订单数据结构
+
+    注意：富途API返回的字段是 stock_name，不是 name
+    """
+    return {
+        'order_id': str(order.get('order_id', '')),
+        'code': order.get('code', ''),
+        'name': order.get('stock_name', ''),
+        'trd_side': order.get('trd_side', ''),
+        'order_status': order.get('order_status', ''),
+        'qty': order.get('qty', 0),
+        'price': order.get('price', 0),
+        'dealt_qty': order.get('dealt_qty', 0),
+        'dealt_avg_price': order.get('dealt_avg_price', 0),
+        'create_time': order.get('create_time', ''),
+        'updated_time': order.get('updated_time', ''),
+        'currency': order.get('currency', ''),
+        'order_type': order.get('order_type', '')
+    }
+
+
+class OrderStore:
+    """
+    本地订单簿
+    所有方法都应在事件循环线程中调用（推送回调需先切换到事件循环）
+    """
+
+    def __init__(self, order_data: List[Dict[str, Any]]):
+        """
+        Args:
+            order_data: app_core.order_data，原地更新以保持引用不变
+        """
+        self.logger = get_logger(__name__)
+        self.order_data = order_data
+        self._index: Dict[str, int] = {}
+        self.last_resync = 0.0
+        self.push_count = 0
+        self._reindex()
+
+    def _reindex(self) -> None:
+        self._index = {order['order_id']: i for i, order in enumerate(self.order_data)}
+
+    def get(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """按订单号获取订单"""
+        index = self._index.get(str(order_id))
+        return self.order_data[index] if index is not None else None
+
+    def _upsert(self, order: Dict[str, Any]) -> bool:
+        """写入单个订单，返回是否有变化"""
+        order_id = order['order_id']
+        if not order_id:
+            return False
+
+        index = self._index.get(order_id)
+        if index is None:
+            self._index[order_id] = len(self.order_data)
+            self.order_data.append(order)
+            return True
+
+        current = self.order_data[index]
+        # 版本检查：旧的推送或查询结果不覆盖新状态
+        if order['updated_time'] and current['updated_time'] and \
+                str(order['updated_time']) < str(current['updated_time']):
+            return False
+        if order == current:
+            return False
+
+        current.update(order)
+        return True
+
+    def apply_push(self, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        应用订单推送
+
+        Returns:
+            发生变化的订单
+        """
+        changed = []
+        for record in records:
+            self.push_count += 1
+            order = normalize_order(record)
+            if self._upsert(order):
+                changed.append(self.get(order['order_id']))
+        return changed
+
+    def resync(self, orders: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        用全量查询结果对账
+
+        Returns:
+            发生变化的订单；有订单被移除（行号变化）时返回 None，需全量重建订单表
+        """
+        snapshot = [normalize_order(order) for order in orders if isinstance(order, dict)]
+        self.last_resync = time.time()
+
+        snapshot_ids = {order['order_id'] for order in snapshot}
+        if any(order_id not in snapshot_ids for order_id in self._index):
+            # 保留已有的较新版本，再按查询结果的顺序重建
+            rebuilt = []
+            for order in snapshot:
+                current = self.get(order['order_id'])
+                if current and current['updated_time'] and order['updated_time'] and \
+                        str(order['updated_time']) < str(current['updated_time']):
+                    order = current
+                rebuilt.append(order)
+            self.order_data[:] = rebuilt
+            self._reindex()
+            self.logger.debug(f"订单簿全量重建，共 {len(self.order_data)} 条订单")
+            return None
+
+        changed = []
+        for order in snapshot:
+            if self._upsert(order):
+                changed.append(self.get(order['order_id']))
+        return changed
@@ -11,6 +11,7 @@ import os
 from typing import Optional, Dict, Any
 
 from ...utils.global_vars import get_logger
+from .startup import StartupProfiler, WarmSnapshot
 
 
 class LifecycleManager:
@@ -30,6 +31,10 @@ class LifecycleManager:
         
         # 标签页状态管理器 - 延迟初始化
         self._tab_state_manager: Optional['TabStateManager'] = None
+
+        # 分阶段启动：上次运行的行情和分组快照，以及本次启动各阶段耗时
+        self._warm_snapshot = WarmSnapshot()
+        self.startup_profiler: Optional[StartupProfiler] = None
         
         self.logger.info("LifecycleManager 初始化完成")
     
@@ -41,39 +46,53 @@ class LifecycleManager:
         return self._tab_state_manager
     
     async def on_mount(self) -> None:
-        """应用启动时的初始化"""
+        """应用启动时的初始化
+
+        分阶段启动：先用上次保存的快照渲染表格，再并行执行连接、基本信息、
+        行情、订单持仓和分组等相互独立的步骤，各步骤完成后即刷新对应界面
+        """
         self.logger.info("MonitorApp 正在启动...")
-        
-        # 加载配置
-        await self.app_core.load_configuration()
-        
-        # 初始化数据管理器
+        profiler = StartupProfiler(self.logger)
+        self.startup_profiler = profiler
+
         data_manager = getattr(self.app_core.app, 'data_manager', None)
-        if data_manager:
-            await data_manager.initialize_data_managers()
-        
-        # 获取新UI组件的引用
         ui_manager = getattr(self.app_core.app, 'ui_manager', None)
-        if ui_manager:
-            await ui_manager.setup_ui_references()
-        
-        # 加载默认股票列表
-        if ui_manager:
-            await ui_manager.load_default_stocks()
-        
-        # 加载用户分组数据
         group_manager = getattr(self.app_core.app, 'group_manager', None)
-        if group_manager:
-            await group_manager.load_user_groups()
-        
-        # 启动数据刷新
+
+        # 1. 本地阶段：配置、界面、上次快照
+        await profiler.run("配置", self.app_core.load_configuration())
+        if ui_manager:
+            await profiler.run("界面", self._setup_ui(ui_manager))
+            await profiler.run("快照", self.restore_warm_snapshot())
+
+        # 2. 富途连接与本地基本信息缓存互不依赖
+        connected, basicinfo_cached = False, False
         if data_manager:
-            await data_manager.start_data_refresh()
-        
+            connected, basicinfo_cached = await profiler.run_parallel(
+                ("连接", data_manager.connect_futu()),
+                ("基本信息缓存", data_manager.load_basicinfo_cache()),
+            )
+
         # 初始化info
         if ui_manager:
             await ui_manager.initialize_info()
-        
+
+        # 3. 网络阶段并行执行，各自完成后刷新对应界面
+        stages = []
+        if data_manager:
+            if connected and not basicinfo_cached:
+                stages.append(("基本信息", data_manager.load_stock_basicinfo(use_file_cache=False)))
+            if connected:
+                stages.append(("市场状态轮询", data_manager.start_market_status_poller()))
+            # 行情不等待基本信息，缺少名称的股票先显示代码，下次刷新时补上
+            stages.append(("行情", data_manager.start_data_refresh(with_user_refresh=False)))
+            stages.append(("订单持仓", data_manager.start_user_refresh()))
+        # 未连接时保留快照中的分组，避免被"加载失败"覆盖
+        if group_manager and (connected or not self.app_core.group_data):
+            stages.append(("用户分组", group_manager.load_user_groups()))
+        if stages:
+            await profiler.run_parallel(*stages)
+
         # 初始化AnalysisPanel InfoPanel
         await self.initialize_analysis_info_panel()
         
@@ -83,16 +102,58 @@ class LifecycleManager:
         # 恢复标签页状态（在所有初始化完成后）临时关闭
         #await self.restore_tab_state()
         
-        self.logger.info("MonitorApp 启动完成")
+        self.logger.info(f"MonitorApp 启动完成: {profiler.summary()}")
         # 向信息面板显示启动完成信息
         if hasattr(self.app_core, 'app') and hasattr(self.app_core.app, 'ui_manager') and self.app_core.app.ui_manager.info_panel:
             await self.app_core.app.ui_manager.info_panel.log_info("应用程序启动完成", "系统")
+            await self.app_core.app.ui_manager.info_panel.log_info(f"启动耗时: {profiler.summary()}", "系统")
         
         # 向AnalysisPanel InfoPanel显示启动完成信息（如果存在的话）
         await self.log_to_analysis_info_panel("分析模块启动完成，可以开始股票分析", "系统")
         
         # 更新状态显示
         await self.app_core.update_status_display()
+
+        # 保存本次启动获取到的数据，供下次启动时先行显示
+        if connected:
+            await self.save_warm_snapshot()
+
+    async def _setup_ui(self, ui_manager) -> None:
+        """获取UI组件引用并加载默认股票列表"""
+        await ui_manager.setup_ui_references()
+        await ui_manager.load_default_stocks()
+
+    async def restore_warm_snapshot(self) -> bool:
+        """用上次保存的行情和分组快照填充界面（不含订单和持仓）"""
+        loop = asyncio.get_event_loop()
+        snapshot = await loop.run_in_executor(None, self._warm_snapshot.load)
+        if not snapshot:
+            return False
+
+        monitored = set(self.app_core.monitored_stocks)
+        stocks = {code: stock for code, stock in snapshot['stocks'].items() if code in monitored}
+        ui_manager = getattr(self.app_core.app, 'ui_manager', None)
+        if stocks and ui_manager:
+            self.app_core.stock_data.update(stocks)
+            await ui_manager.update_stock_table()
+
+        group_manager = getattr(self.app_core.app, 'group_manager', None)
+        if group_manager and snapshot['groups']:
+            await group_manager.restore_groups(snapshot['groups'])
+
+        saved_at = snapshot['saved_at'].strftime('%m-%d %H:%M')
+        self.logger.info(f"已显示 {saved_at} 的启动快照: {len(stocks)} 只股票, {len(snapshot['groups'])} 个分组")
+        if ui_manager and ui_manager.info_panel:
+            await ui_manager.info_panel.log_info(f"显示 {saved_at} 保存的行情，正在获取最新数据", "系统")
+        return True
+
+    async def save_warm_snapshot(self) -> bool:
+        """保存当前行情和分组快照"""
+        # 出错或提示性质的分组行不保存
+        groups = [group for group in self.app_core.group_data if group.get('type') not in ('ERROR', '-')]
+        stock_data = dict(self.app_core.stock_data)
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._warm_snapshot.save, stock_data, groups)
     
     async def start_task_monitoring(self) -> None:
         """启动任务监控"""
@@ -196,6 +257,10 @@ class LifecycleManager:
         
         # 保存标签页状态
         await self.save_tab_state()
+
+        # 保存行情和分组快照，下次启动时先行显示
+        if self.app_core.stock_data:
+            await self.save_warm_snapshot()
         
         # 设置优雅退出标志
         self.app_core._is_quitting = True
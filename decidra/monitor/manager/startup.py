@@ -0,0 +1,135 @@
+"""
+Startup - 监控界面分阶段启动支持
+
+1. StartupProfiler：按阶段记录启动耗时，相互独立的阶段并行执行，单个阶段失败不影响其他阶段
+2. WarmSnapshot：保存上次运行时的行情和用户分组，启动时在连接富途API之前先显示
+"""
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+
+from ...base.monitor import MarketStatus, StockData
+from ...utils.global_vars import PATH_DATA, get_logger
+
+# 启动快照默认配置
+STARTUP_CONFIG = {
+    'snapshot_file': 'monitor_warm_snapshot.json',
+    'snapshot_max_age_hours': 24 * 7,   # 超过此时间的快照不再使用
+}
+
+
+class StartupProfiler:
+    """启动阶段计时"""
+
+    def __init__(self, logger=None):
+        self.logger = logger or get_logger(__name__)
+        self.started_at = time.perf_counter()
+        # [{'name': 阶段名, 'seconds': 耗时, 'ok': 是否成功}]，按完成顺序排列
+        self.stages: List[Dict[str, Any]] = []
+
+    async def run(self, name: str, awaitable: Awaitable) -> Any:
+        """执行一个阶段并计时，异常只记录日志，返回 None"""
+        start = time.perf_counter()
+        ok = True
+        try:
+            return await awaitable
+        except Exception as e:
+            ok = False
+            self.logger.error(f"启动阶段 [{name}] 失败: {e}")
+            return None
+        finally:
+            seconds = time.perf_counter() - start
+            self.stages.append({'name': name, 'seconds': seconds, 'ok': ok})
+            self.logger.debug(f"启动阶段 [{name}] 完成，耗时 {seconds * 1000:.0f}ms")
+
+    async def run_parallel(self, *stages: Tuple[str, Awaitable]) -> List[Any]:
+        """并行执行多个阶段，按传入顺序返回结果"""
+        return list(await asyncio.gather(*(self.run(name, awaitable) for name, awaitable in stages)))
+
+    @property
+    def total_seconds(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def summary(self) -> str:
+        """耗时摘要，如 "配置 12ms | 连接 820ms | ... | 总计 1.35s" """
+        parts = [f"{stage['name']} {stage['seconds'] * 1000:.0f}ms{'' if stage['ok'] else '(失败)'}"
+                 for stage in self.stages]
+        parts.append(f"总计 {self.total_seconds:.2f}s")
+        return " | ".join(parts)
+
+
+class WarmSnapshot:
+    """上次运行的行情和分组快照（JSON 文件）"""
+
+    def __init__(self, path: Optional[Path] = None, max_age_hours: Optional[float] = None):
+        self.path = Path(path) if path else PATH_DATA / STARTUP_CONFIG['snapshot_file']
+        self.max_age_hours = STARTUP_CONFIG['snapshot_max_age_hours'] if max_age_hours is None else max_age_hours
+        self.logger = get_logger(__name__)
+
+    def save(self, stock_data: Dict[str, StockData], group_data: List[Dict[str, Any]]) -> bool:
+        """保存快照（先写临时文件再替换，避免中途退出留下损坏的文件）"""
+        try:
+            stocks = {}
+            for code, stock in stock_data.items():
+                if isinstance(stock, StockData):
+                    record = asdict(stock)
+                    record['update_time'] = stock.update_time.isoformat()
+                    record['market_status'] = stock.market_status.value
+                    stocks[code] = record
+
+            snapshot = {
+                'saved_at': datetime.now().isoformat(),
+                'stocks': stocks,
+                'groups': group_data,
+            }
+            os.makedirs(self.path.parent, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, self.path)
+            return True
+        except Exception as e:
+            self.logger.warning(f"保存启动快照失败: {e}")
+            return False
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        读取快照
+
+        Returns:
+            {'saved_at': datetime, 'stocks': {股票代码: StockData}, 'groups': [分组]}，
+            文件不存在、过期或格式无效时返回 None
+        """
+        try:
+            if not self.path.exists():
+                return None
+            with open(self.path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+
+            saved_at = datetime.fromisoformat(snapshot['saved_at'])
+            age_hours = (datetime.now() - saved_at).total_seconds() / 3600
+            if age_hours > self.max_age_hours:
+                self.logger.info(f"启动快照已过期 ({age_hours:.1f}小时)")
+                return None
+
+            stocks = {}
+            for code, record in snapshot.get('stocks', {}).items():
+                try:
+                    record = dict(record)
+                    record['update_time'] = datetime.fromisoformat(record['update_time'])
+                    record['market_status'] = MarketStatus(record['market_status'])
+                    stocks[code] = StockData(**record)
+                except (KeyError, TypeError, ValueError) as e:
+                    self.logger.debug(f"跳过无效的快照行情 {code}: {e}")
+
+            groups = snapshot.get('groups') or []
+            return {'saved_at': saved_at, 'stocks': stocks, 'groups': groups if isinstance(groups, list) else []}
+        except Exception as e:
+            self.logger.warning(f"读取启动快照失败: {e}")
+            return None
@@ -5,7 +5,7 @@ UIManager - UI组件和界面状态管理模块
 """
 
 import asyncio
-from typing import Optional, Any
+from typing import List, Optional, Any
 
 from textual.widgets import DataTable, Static
 from ...utils.global_vars import get_logger
@@ -230,7 +230,7 @@ class UIManager:
             # 更新表格数据
             for stock_code in self.app_core.monitored_stocks:
                 stock_info = self.app_core.stock_data.get(stock_code)
-                self.logger.debug(f'UI股票数据: {stock_code} {stock_info}')
+                self.logger.debug('UI股票数据: %s %s', stock_code, stock_info)
                 if stock_info:
                     # 格式化数据
                     price_str = f"{stock_info.current_price:.2f}"
@@ -238,7 +238,7 @@ class UIManager:
                     volume_str = f"{stock_info.volume:,}"
                     time_str = stock_info.update_time.strftime("%H:%M:%S")
                     
-                    self.logger.debug(f'UI更新股票数据: {stock_code} - {stock_info.name} {price_str} {change_str}')
+                    self.logger.debug('UI更新股票数据: %s - %s %s %s', stock_code, stock_info.name, price_str, change_str)
                     
                     
                     self.stock_table.update_cell(stock_code,'name', stock_info.name)
@@ -257,7 +257,7 @@ class UIManager:
             
             # 强制刷新表格显示
             #self.stock_table.refresh()
-            self.logger.debug(f"股票表格更新完成，共更新 {updated_count} 只股票")
+            self.logger.debug("股票表格更新完成，共更新 %d 只股票", updated_count)
                     
         except Exception as e:
             self.logger.error(f"更新股票表格失败: {e}")
@@ -478,19 +478,87 @@ class UIManager:
         except Exception as e:
             self.logger.error(f"更新交易模式显示失败: {e}")
 
-    async def update_orders_table(self) -> None:
-        """从 app_core.order_data 直接更新订单表格UI"""
+    def _format_order_row(self, order: dict) -> tuple:
+        """将订单数据格式化为订单表的一行（订单号、股票、类型、状态、价格、数量）"""
+        # 提取订单信息
+        order_id = order.get('order_id', '')
+        stock_code = order.get('code', '')
+        trd_side = order.get('trd_side', '')
+        order_status = order.get('order_status', '')
+        price = order.get('price', 0)
+        qty = order.get('qty', 0)
+
+        # 格式化价格显示
+        if isinstance(price, (int, float)):
+            price_display = f"{price:.2f}"
+        else:
+            price_display = str(price)
+
+        # 格式化数量显示
+        qty_display = str(int(float(qty))) if qty else "0"
+
+        # 转换交易方向并设置颜色
+        if trd_side == 'BUY':
+            type_display = "[green]买入[/green]"
+        elif trd_side == 'SELL':
+            type_display = "[red]卖出[/red]"
+        else:
+            type_display = trd_side
+
+        # 转换订单状态并设置颜色
+        status_map = {
+            'WAITING_SUBMIT': '待提交',
+            'SUBMITTING': '提交中',
+            'SUBMITTED': '已提交',
+            'FILLED_PART': '部分成交',
+            'FILLED_ALL': '全部成交',
+            'CANCELLED_PART': '部分撤销',
+            'CANCELLED_ALL': '全部撤销',
+            'FAILED': '失败',
+            'DISABLED': '已失效',
+            'ERROR': '错误'
+        }
+
+        status_display_text = status_map.get(order_status, order_status)
+
+        # 根据状态设置不同颜色
+        if order_status in ['FILLED_ALL', 'FILLED_PART']:
+            status_display = f"[green]{status_display_text}[/green]"
+        elif order_status in ['SUBMITTED', 'WAITING_SUBMIT', 'SUBMITTING']:
+            status_display = f"[yellow]{status_display_text}[/yellow]"
+        elif order_status in ['CANCELLED_PART', 'CANCELLED_ALL', 'FAILED', 'DISABLED', 'ERROR']:
+            status_display = f"[red]{status_display_text}[/red]"
+        else:
+            status_display = status_display_text
+
+        display_order_id = order_id[-8:] if len(order_id) > 8 else order_id
+        return (
+            display_order_id,  # 显示订单号后8位
+            stock_code,
+            type_display,
+            status_display,
+            price_display,  # 价格
+            qty_display,    # 数量
+        )
+
+    async def update_orders_table(self, changed_orders: Optional[List[dict]] = None) -> None:
+        """
+        从 app_core.order_data 更新订单表格UI
+
+        Args:
+            changed_orders: 仅更新这些订单对应的行（已有行原地更新，新订单追加）；
+                            为 None 时清空并全量重建表格
+        """
         try:
             if not self.orders_table:
                 self.logger.warning("orders_table 未初始化，跳过更新")
                 return
 
-            self.logger.info(f"开始更新订单表格，当前有 {len(self.app_core.order_data)} 条订单")
+            if changed_orders is not None:
+                self._update_order_rows(changed_orders)
+                return
 
-            # 调试：打印order_data的前2条数据
-            if self.app_core.order_data:
-                for i, order in enumerate(self.app_core.order_data[:2]):
-                    self.logger.debug(f"订单数据[{i}]: {order}")
+            self.logger.info(f"开始更新订单表格，当前有 {len(self.app_core.order_data)} 条订单")
 
             # 清空现有表格数据，但保留列定义
             self.orders_table.clear(columns=False)
@@ -499,76 +567,7 @@ class UIManager:
             # 从 app_core.order_data 读取并更新表格
             for order in self.app_core.order_data:
                 try:
-                    # 提取订单信息
-                    order_id = order.get('order_id', '')
-                    stock_code = order.get('code', '')
-                    trd_side = order.get('trd_side', '')
-                    order_status = order.get('order_status', '')
-                    price = order.get('price', 0)
-                    qty = order.get('qty', 0)
-
-                    # 格式化价格显示
-                    if isinstance(price, (int, float)):
-                        price_display = f"{price:.2f}"
-                    else:
-                        price_display = str(price)
-
-                    # 格式化数量显示
-                    qty_display = str(int(float(qty))) if qty else "0"
-
-                    # 转换交易方向并设置颜色
-                    if trd_side == 'BUY':
-                        order_type = "买入"
-                        type_display = f"[green]{order_type}[/green]"
-                    elif trd_side == 'SELL':
-                        order_type = "卖出"
-                        type_display = f"[red]{order_type}[/red]"
-                    else:
-                        order_type = trd_side
-                        type_display = order_type
-
-                    # 转换订单状态并设置颜色
-                    status_map = {
-                        'WAITING_SUBMIT': '待提交',
-                        'SUBMITTING': '提交中',
-                        'SUBMITTED': '已提交',
-                        'FILLED_PART': '部分成交',
-                        'FILLED_ALL': '全部成交',
-                        'CANCELLED_PART': '部分撤销',
-                        'CANCELLED_ALL': '全部撤销',
-                        'FAILED': '失败',
-                        'DISABLED': '已失效',
-                        'ERROR': '错误'
-                    }
-
-                    status_display_text = status_map.get(order_status, order_status)
-
-                    # 根据状态设置不同颜色
-                    if order_status in ['FILLED_ALL', 'FILLED_PART']:
-                        status_display = f"[green]{status_display_text}[/green]"
-                    elif order_status in ['SUBMITTED', 'WAITING_SUBMIT', 'SUBMITTING']:
-                        status_display = f"[yellow]{status_display_text}[/yellow]"
-                    elif order_status in ['CANCELLED_PART', 'CANCELLED_ALL', 'FAILED', 'DISABLED', 'ERROR']:
-                        status_display = f"[red]{status_display_text}[/red]"
-                    else:
-                        status_display = status_display_text
-
-                    # 添加到表格
-                    display_order_id = order_id[-8:] if len(order_id) > 8 else order_id
-                    self.logger.debug(f"添加订单行: {display_order_id} {stock_code} {order_type} {status_display_text} {price_display} {qty_display}")
-
-                    self.orders_table.add_row(
-                        display_order_id,  # 显示订单号后8位
-                        stock_code,
-                        type_display,
-                        status_display,
-                        price_display,  # 价格
-                        qty_display,    # 数量
-                        key=order_id
-                    )
-
-                    self.logger.debug(f"订单行添加成功: {order_id}")
-
+                    self.orders_table.add_row(*self._format_order_row(order), key=order.get('order_id', ''))
                 except Exception as e:
                     self.logger.error(f"处理订单UI显示失败: {e}, 订单数据: {order}")
                     import traceback
@@ -588,6 +587,24 @@ class UIManager:
             import traceback
             self.logger.error(f"详细错误: {traceback.format_exc()}")
 
+    def _update_order_rows(self, changed_orders: List[dict]) -> None:
+        """增量更新订单表：已有行逐列更新，新订单追加到末尾"""
+        columns = [column.key for column in self.orders_table.ordered_columns]
+        for order in changed_orders:
+            try:
+                order_id = order.get('order_id', '')
+                row = self._format_order_row(order)
+                if order_id in self.orders_table.rows:
+                    for column_key, value in zip(columns, row):
+                        if self.orders_table.get_cell(order_id, column_key) != value:
+                            self.orders_table.update_cell(order_id, column_key, value)
+                else:
+                    self.orders_table.add_row(*row, key=order_id)
+            except Exception as e:
+                self.logger.error(f"增量更新订单行失败: {e}, 订单数据: {order}")
+
+        self.logger.debug(f"订单表格增量更新 {len(changed_orders)} 行")
+
     async def update_position_table(self) -> None:
         """从 app_core.position_data 直接更新持仓表格UI"""
         try:
@@ -605,7 +622,7 @@ class UIManager:
             for position in self.app_core.position_data:
                 try:
                     # 打印完整的持仓数据以便调试
-                    self.logger.debug(f"持仓原始数据: {position}")
+                    self.logger.debug("持仓原始数据: %s", position)
 
                     # 提取持仓信息
                     stock_code = position.get('stock_code', '')
@@ -766,7 +783,7 @@ class UIManager:
             
             if has_changed:
                 # 值发生变化，应用闪烁效果
-                self.logger.debug(f"数据变化检测: {cell_key} '{last_value}' -> '{value}'")
+                self.logger.debug("数据变化检测: %s '%s' -> '%s'", cell_key, last_value, value)
                 
                 # 根据列类型选择闪烁颜色
                 if column in ['price', 'change']:
@@ -785,7 +802,7 @@ class UIManager:
                 )
             else:
                 # 值未变化，直接更新为正常样式（不闪烁）
-                self.logger.debug(f"数据无变化: {cell_key} 保持值 '{value}'")
+                self.logger.debug("数据无变化: %s 保持值 '%s'", cell_key, value)
                 
                 # 直接应用正常样式
                 if column in ['price', 'change'] and change_rate is not None:
@@ -9,6 +9,7 @@ from typing import List, Dict, Optional, Any
 
 from ...modules.futu_market import FutuMarket
 from ...utils.global_vars import get_logger
+from ..main.order_store import OrderStore
 
 
 class UserDataManager:
@@ -23,6 +24,9 @@ class UserDataManager:
         self.futu_market = futu_market
         self.logger = get_logger(__name__)
         
+        # 本地订单簿（维护 app_core.order_data）
+        self.order_store = OrderStore(self.app_core.order_data)
+        
         self.logger.info("UserDataManager 初始化完成")
     
     async def load_user_groups(self) -> None:
@@ -203,7 +207,32 @@ class UserDataManager:
                 )
                 self.app_core.current_group_cursor = 0
                 await ui_manager.update_group_cursor()
-    
+
+    async def restore_groups(self, groups: List[Dict[str, Any]]) -> None:
+        """用上次保存的分组快照填充分组表，富途API返回后由 load_user_groups 覆盖"""
+        ui_manager = getattr(self.app_core.app, 'ui_manager', None)
+        if not ui_manager or not ui_manager.group_table or not groups:
+            return
+
+        ui_manager.group_table.clear()
+        self.app_core.group_data.clear()
+        for group in groups:
+            if not isinstance(group, dict) or 'name' not in group:
+                continue
+            stock_list = group.get('stock_list') or []
+            group_data = {
+                'name': group['name'],
+                'stock_list': stock_list,
+                'stock_count': group.get('stock_count', len(stock_list)),
+                'type': group.get('type', 'CUSTOM')
+            }
+            self.app_core.group_data.append(group_data)
+            ui_manager.group_table.add_row(group_data['name'], str(group_data['stock_count']), group_data['type'])
+
+        self.app_core.current_group_cursor = 0
+        await ui_manager.update_group_cursor()
+        self.logger.info(f"从启动快照恢复 {len(self.app_core.group_data)} 个分组")
+
     async def refresh_user_groups(self) -> None:
         """刷新用户分组数据，用于添加/删除股票后更新stock_list"""
         try:
@@ -433,6 +462,11 @@ class UserDataManager:
                         }
                         self.app_core.position_data.append(position_data)
             
+            # 持仓股票的行情订阅固定，不因额度不足被淘汰
+            self.futu_market.set_pinned_subscriptions(
+                [p['stock_code'] for p in self.app_core.position_data if p['stock_code']], "position"
+            )
+            
             self.logger.info(f"加载用户持仓完成，共 {len(self.app_core.position_data)} 只股票")
             
         except Exception as e:
@@ -452,8 +486,13 @@ class UserDataManager:
                 'currency': 'HKD'
             })
 
-    async def load_user_orders(self) -> None:
-        """加载用户订单数据到 app_core.order_data"""
+    async def load_user_orders(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        加载用户订单数据到 app_core.order_data（经由本地订单簿对账）
+
+        Returns:
+            发生变化的订单；返回 None 表示需要全量重建订单表
+        """
         self.logger.info("开始加载用户订单数据")
 
         try:
@@ -461,7 +500,7 @@ class UserDataManager:
             futu_trade = getattr(self.app_core.app, 'futu_trade', None)
             if not futu_trade:
                 self.logger.error("FutuTrade实例未找到")
-                return
+                return []
 
             # 在线程池中执行同步的富途API调用
             loop = asyncio.get_event_loop()
@@ -470,48 +509,23 @@ class UserDataManager:
                 futu_trade.get_order_list
             )
 
-            # 处理订单数据并保存到 app_core.order_data
+            # 对账到本地订单簿 - 只在确认有有效数据时才更新
             if user_orders:
-                # 清空现有订单数据 - 只在确认有有效数据时才清空
-                self.app_core.order_data.clear()
+                changed = self.order_store.resync(user_orders)
+                changed_desc = "全量重建" if changed is None else f"{len(changed)} 条变化"
+                self.logger.info(f"加载用户订单完成，共 {len(user_orders)} 条订单（{changed_desc}）")
+                return changed
 
-                for order in user_orders:
-                    try:
-                        if isinstance(order, dict):
-                            # 标准化订单数据结构
-                            # 注意：富途API返回的字段是 stock_name，不是 name
-                            order_data = {
-                                'order_id': str(order.get('order_id', '')),
-                                'code': order.get('code', ''),
-                                'name': order.get('stock_name', ''),  # 修正：使用 stock_name
-                                'trd_side': order.get('trd_side', ''),
-                                'order_status': order.get('order_status', ''),
-                                'qty': order.get('qty', 0),
-                                'price': order.get('price', 0),
-                                'dealt_qty': order.get('dealt_qty', 0),
-                                'dealt_avg_price': order.get('dealt_avg_price', 0),
-                                'create_time': order.get('create_time', ''),
-                                'updated_time': order.get('updated_time', ''),
-                                'currency': order.get('currency', ''),
-                                'order_type': order.get('order_type', '')
-                            }
-                            self.app_core.order_data.append(order_data)
-                            self.logger.debug(f"添加订单到order_data: {order_data['order_id']} {order_data['code']} {order_data['name']}")
-
-                    except Exception as e:
-                        self.logger.error(f"处理订单数据失败: {e}, 订单数据: {order}")
-                        continue
-
-                self.logger.info(f"加载用户订单完成，共 {len(user_orders)} 条订单保存到 app_core.order_data")
-            else:
-                # API返回None或空列表时，保留现有数据不清空
-                self.logger.info(f"API返回空订单列表，保留现有数据({len(self.app_core.order_data)}条)")
+            # API返回None或空列表时，保留现有数据不清空
+            self.logger.info(f"API返回空订单列表，保留现有数据({len(self.app_core.order_data)}条)")
+            return []
 
         except Exception as e:
             self.logger.error(f"加载用户订单失败: {e}")
             # API调用失败时保留现有数据，只在日志中记录错误
             # 不再清空和添加错误提示数据，避免覆盖正常数据
             self.logger.warning(f"订单数据刷新失败，保留现有数据({len(self.app_core.order_data)}条)")
+            return []
 
     async def refresh_user_positions(self) -> None:
         """刷新用户持仓数据"""
@@ -561,13 +575,13 @@ class UserDataManager:
         try:
             self.logger.info("开始刷新用户订单数据...")
 
-            # 重新加载用户订单数据
-            await self.load_user_orders()
+            # 重新加载用户订单数据（经由本地订单簿对账）
+            changed_orders = await self.load_user_orders()
 
-            # 更新UI显示
+            # 只刷新变化的订单行，None 表示需要全量重建
             ui_manager = getattr(self.app_core.app, 'ui_manager', None)
-            if ui_manager:
-                await ui_manager.update_orders_table()
+            if ui_manager and (changed_orders is None or changed_orders):
+                await ui_manager.update_orders_table(changed_orders)
 
             self.logger.info("用户订单数据刷新完成")
             if ui_manager and ui_manager.info_panel:
@@ -3,9 +3,11 @@ K线图和成交量图表组件
 基于 textual_plotext 实现专业的股票K线图和成交量显示
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
 from textual.app import ComposeResult
 from textual.containers import Container
 from textual.widgets import Static
@@ -26,6 +28,85 @@ class ChartConfig:
     title_color: str = "bright_blue"
     up_color: str = "green"
     down_color: str = "red"
+    axis_columns: int = 12          # 纵轴刻度等占用的列数，其余列数决定最多绘制多少根K线
+
+
+class KLineSeries:
+    """
+    K线图数据模型
+
+    KLineData 预先转换为 NumPy 数组；数据更新时如果只是最新K线变化或追加了新K线，
+    只转换尾部，滚动和缩放时不再逐个对象取值
+    """
+
+    def __init__(self):
+        self.time_keys: List[str] = []
+        self.labels: List[str] = []          # X轴日期标签（只保留日期部分）
+        self.open = np.empty(0)
+        self.high = np.empty(0)
+        self.low = np.empty(0)
+        self.close = np.empty(0)
+        self.volume = np.empty(0)
+        self.revision = 0                    # 历史K线整体替换时递增
+
+    def __len__(self) -> int:
+        return len(self.time_keys)
+
+    def update(self, kline_data: List[KLineData]) -> None:
+        """更新数据（前面的K线未变时只重新转换最后一根及新增的K线）"""
+        n_old = len(self.time_keys)
+        keep = 0
+        if (2 <= n_old <= len(kline_data)
+                and kline_data[0].time_key == self.time_keys[0]
+                and kline_data[n_old - 2].time_key == self.time_keys[n_old - 2]):
+            keep = n_old - 1
+        else:
+            self.revision += 1
+
+        tail = kline_data[keep:]
+        values = np.array(
+            [(item.open, item.high, item.low, item.close, item.volume) for item in tail],
+            dtype=float
+        ).reshape(-1, 5)
+        self.open = np.concatenate([self.open[:keep], values[:, 0]])
+        self.high = np.concatenate([self.high[:keep], values[:, 1]])
+        self.low = np.concatenate([self.low[:keep], values[:, 2]])
+        self.close = np.concatenate([self.close[:keep], values[:, 3]])
+        self.volume = np.concatenate([self.volume[:keep], values[:, 4]])
+
+        time_keys = [item.time_key for item in tail]
+        self.time_keys = self.time_keys[:keep] + time_keys
+        self.labels = self.labels[:keep] + [time_key.split(' ')[0] for time_key in time_keys]
+
+    def last_bar(self) -> Tuple:
+        if not self.time_keys:
+            return ()
+        return (self.time_keys[-1], self.open[-1], self.high[-1], self.low[-1], self.close[-1], self.volume[-1])
+
+    def window(self, start: int, end: int, max_bars: int = 0) -> Tuple[np.ndarray, ...]:
+        """
+        获取 [start, end) 区间的数据，K线数超过 max_bars 时把相邻K线合并为一根：
+        开盘取第一根、收盘取最后一根、最高/最低取区间极值、成交量求和，保留价格极值
+
+        Returns:
+            (open, high, low, close, volume, labels)
+        """
+        o, h, l, c, v = (arr[start:end] for arr in (self.open, self.high, self.low, self.close, self.volume))
+        labels = self.labels[start:end]
+        count = end - start
+        if max_bars <= 0 or count <= max_bars:
+            return o, h, l, c, v, labels
+
+        starts = np.unique(np.linspace(0, count, max_bars, endpoint=False).astype(int))
+        ends = np.append(starts[1:], count) - 1
+        return (
+            o[starts],
+            np.maximum.reduceat(h, starts),
+            np.minimum.reduceat(l, starts),
+            c[ends],
+            np.add.reduceat(v, starts),
+            [labels[i] for i in starts],
+        )
 
 
 class KLineChartWidget(Container):
@@ -90,6 +171,8 @@ class KLineChartWidget(Container):
         # 数据缓存
         self.kline_data: List[KLineData] = []
         self.data_length = 0
+        self.series = KLineSeries()
+        self._drawn_key = None   # 上次绘制的窗口，窗口和最新K线都未变化时跳过重绘
         
         # 图表状态
         self.display_start = 0
@@ -122,6 +205,7 @@ class KLineChartWidget(Container):
         """更新K线数据"""
         self.kline_data = kline_data
         self.data_length = len(kline_data)
+        self.series.update(kline_data)
         
         # 调整显示范围
         if self.data_length > 0:
@@ -138,10 +222,22 @@ class KLineChartWidget(Container):
         
         # 获取显示数据范围
         end_idx = min(self.display_start + self.display_count, self.data_length)
-        display_data = self.kline_data[self.display_start:end_idx]
+        if end_idx <= self.display_start:
+            return
         
-        if not display_data:
+        # 窗口、宽度和（窗口包含最新K线时）最新K线都未变化则无需重绘
+        max_bars = self._plot_columns()
+        draw_key = (
+            self.series.revision, self.display_start, end_idx, max_bars, self.config.show_volume,
+            self.stock_code, self.time_period,
+            self.series.last_bar() if end_idx == len(self.series) else None,
+        )
+        if draw_key == self._drawn_key:
             return
+        self._drawn_key = draw_key
+        
+        # 按图表宽度降采样
+        display_data = self.series.window(self.display_start, end_idx, max_bars)
         
         # 准备K线数据
         self._draw_kline_chart(display_data)
@@ -158,7 +254,30 @@ class KLineChartWidget(Container):
                 self.logger.error(f"[DEBUG] 成交量图组件查询或绘制失败: {e}")
                 pass  # 成交量图组件不存在时忽略
     
-    def _draw_kline_chart(self, data: List[KLineData]) -> None:
+    def _plot_columns(self) -> int:
+        """K线图可用于绘制K线的列数（组件尚未布局时返回 0，不降采样）"""
+        try:
+            width = self.query_one("#kline_plot", PlotextPlot).size.width
+        except Exception:
+            return 0
+        return max(width - self.config.axis_columns, 0)
+    
+    def on_resize(self, event) -> None:
+        """尺寸变化后按新的宽度重新降采样"""
+        self._update_chart()
+    
+    @staticmethod
+    def _x_ticks(labels: List[str]) -> Tuple[List[int], List[str]]:
+        """选择性显示日期标签，避免过密（最多 8 个，并确保显示最后一个日期）"""
+        if len(labels) <= 10:
+            return list(range(len(labels))), labels
+        step = max(1, len(labels) // 8)
+        label_indices = list(range(0, len(labels), step))
+        if label_indices[-1] != len(labels) - 1:
+            label_indices.append(len(labels) - 1)
+        return label_indices, [labels[i] for i in label_indices]
+    
+    def _draw_kline_chart(self, data: Tuple) -> None:
         """绘制K线图"""
         
         kline_plot = self.query_one("#kline_plot", PlotextPlot)
@@ -175,40 +294,20 @@ class KLineChartWidget(Container):
         plt.theme(self.config.theme)
         
         # 使用连续索引而不是真实日期，避免非交易日产生空隙
-        x_indices = list(range(len(data)))
-        dates = [item.time_key for item in data]
+        opens, highs, lows, closes, _, labels = data
+        x_indices = list(range(len(labels)))
         ohlc_data = {
-            'Open': [float(item.open) for item in data],
-            'High': [float(item.high) for item in data],
-            'Low': [float(item.low) for item in data],
-            'Close': [float(item.close) for item in data]
+            'Open': opens.tolist(),
+            'High': highs.tolist(),
+            'Low': lows.tolist(),
+            'Close': closes.tolist()
         }
-        
-        #self.logger.debug(f"[DEBUG] 绘制{len(data)}根K线, 第一条OHLC: O={ohlc_data['Open'][0] if ohlc_data['Open'] else 'None'}, "
-        #      f"H={ohlc_data['High'][0] if ohlc_data['High'] else 'None'}, "
-        #      f"L={ohlc_data['Low'][0] if ohlc_data['Low'] else 'None'}, "
-        #      f"C={ohlc_data['Close'][0] if ohlc_data['Close'] else 'None'}")
+        tick_indices, tick_labels = self._x_ticks(labels)
         
         try:
             # 绘制K线图 - 使用连续索引作为X轴
             plt.candlestick(x_indices, ohlc_data, colors = ['red', 'green'])
-            
-            # 设置X轴标签 - 选择性显示日期，避免过密
-            if len(data) > 10:
-                # 选择显示的日期标签索引，确保不会太密集
-                step = max(1, len(data) // 8)  # 最多显示8个标签
-                label_indices = list(range(0, len(data), step))
-                if label_indices[-1] != len(data) - 1:
-                    label_indices.append(len(data) - 1)  # 确保显示最后一个日期
-                
-                x_labels = [dates[i] for i in label_indices]
-                # 简化日期显示格式
-                x_labels_short = [date.split(' ')[0] for date in x_labels]  # 只显示日期部分
-                plt.xticks(label_indices, x_labels_short)
-            else:
-                # 数据少时显示所有日期
-                x_labels_short = [date.split(' ')[0] for date in dates]
-                plt.xticks(x_indices, x_labels_short)
+            plt.xticks(tick_indices, tick_labels)
             
             # 设置图表标题和标签
             plt.title(f"{self.stock_code} K线图 ({self.time_period})")
@@ -226,15 +325,7 @@ class KLineChartWidget(Container):
                 plt.title(f"{self.stock_code} 价格走势 ({self.time_period})")
                 plt.xlabel("时间")
                 plt.ylabel("价格")
-                # 设置X轴标签
-                if len(data) > 10:
-                    step = max(1, len(data) // 8)
-                    label_indices = list(range(0, len(data), step))
-                    x_labels_short = [dates[i].split(' ')[0] for i in label_indices]
-                    plt.xticks(label_indices, x_labels_short)
-                else:
-                    x_labels_short = [date.split(' ')[0] for date in dates]
-                    plt.xticks(x_indices, x_labels_short)
+                plt.xticks(tick_indices, tick_labels)
             except Exception as fallback_error:
                 self.logger.error(f"[DEBUG] 后备线图绘制也失败: {fallback_error}")
         
@@ -244,7 +335,7 @@ class KLineChartWidget(Container):
         except Exception as e:
             self.logger.error(f"[DEBUG] 强制刷新K线图失败: {e}")
             
-    def _draw_volume_chart(self, data: List[KLineData]) -> None:
+    def _draw_volume_chart(self, data: Tuple) -> None:
         """绘制成交量图"""
         
         volume_plot = self.query_one("#volume_plot", PlotextPlot)
@@ -261,46 +352,25 @@ class KLineChartWidget(Container):
         plt.theme(self.config.theme)
         
         # 使用连续索引而不是真实日期，与K线图保持一致
-        x_indices = list(range(len(data)))
-        dates = [item.time_key for item in data]
-        volumes = [int(item.volume) for item in data]
-        colors = []
-        
-        # 根据涨跌确定颜色
-        for item in data:
-            if item.close > item.open:  # 涨日
-                colors.append("red")
-            elif item.close < item.open:  # 跌日
-                colors.append("green")
-            else:  # 平盘
-                colors.append("yellow")
+        opens, _, _, closes, volumes, labels = data
+        x_indices = np.arange(len(labels))
+        
+        # 根据涨跌确定颜色：涨日红色、跌日绿色、平盘黄色
+        color_masks = {
+            "red": closes > opens,
+            "green": closes < opens,
+            "yellow": closes == opens,
+        }
         
         try:
-            # 再分别绘制不同颜色的成交量条（使用连续索引）
-            for color_type in ["red", "green", "yellow"]:
-                filtered_indices = []
-                filtered_volumes = []
-                
-                for i, color in enumerate(colors):
-                    if color == color_type:
-                        filtered_indices.append(x_indices[i])
-                        filtered_volumes.append(volumes[i])
-                
-                if filtered_indices and filtered_volumes:
-                    plt.bar(filtered_indices, filtered_volumes, color=color_type, width=0.2)
+            # 分别绘制不同颜色的成交量条（使用连续索引）
+            for color_type, mask in color_masks.items():
+                if mask.any():
+                    plt.bar(x_indices[mask].tolist(), volumes[mask].astype(np.int64).tolist(),
+                            color=color_type, width=0.2)
             
             # 设置X轴标签与K线图一致
-            if len(data) > 10:
-                step = max(1, len(data) // 8)  # 最多显示8个标签
-                label_indices = list(range(0, len(data), step))
-                if label_indices[-1] != len(data) - 1:
-                    label_indices.append(len(data) - 1)
-                
-                x_labels_short = [dates[i].split(' ')[0] for i in label_indices]
-                plt.xticks(label_indices, x_labels_short)
-            else:
-                x_labels_short = [date.split(' ')[0] for date in dates]
-                plt.xticks(x_indices, x_labels_short)
+            plt.xticks(*self._x_ticks(labels))
             
         except Exception as e:
             self.logger.error(f"成交量图绘制失败: {e}")
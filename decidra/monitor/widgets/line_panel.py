@@ -15,8 +15,8 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Dict, List, Optional, Callable, Any
 from enum import Enum
-from dataclasses import dataclass
-from collections import deque
+from dataclasses import dataclass, field
+from collections import defaultdict, deque
 
 from rich.json import JSON
 from rich.text import Text
@@ -30,16 +30,15 @@ from textual.message import Message
 
 from ...utils.global_vars import get_logger
 
-# 导入AI相关模块
+# 导入AI相关模块（AI客户端及其 SDK 在首次提问时才导入）
 try:
-    from ...modules.ai.claude_ai_client import create_claude_client, TradingAdvice, TradingOrder
+    from ...base.trading import TradingAdvice, TradingOrder
     from ...monitor.widgets.window_dialog import WindowInputDialog
     from ...monitor.widgets.thinking_animation import ThinkingAnimation
     from ...monitor.widgets.order_dialog import PlaceOrderDialog, OrderData
     from ...base.ai import AIAnalysisRequest, AITradingAdviceRequest
     AI_MODULES_AVAILABLE = True
 except ImportError:
-    create_claude_client = None
     TradingAdvice = None
     TradingOrder = None
     WindowInputDialog = None
@@ -83,11 +82,13 @@ class InfoMessage:
     source: str = ""
     data: Optional[Dict[str, Any]] = None
     formatted_text: Optional[Text] = None
+    search_key: str = field(default="", repr=False, compare=False)  # 小写的内容和来源，用于文本搜索
     
     def __post_init__(self):
         """初始化后处理"""
         if self.formatted_text is None:
             self.formatted_text = self._format_message()
+        self.search_key = f"{self.content.lower()}\x00{self.source.lower()}"
     
     def _format_message(self) -> Text:
         """格式化消息文本"""
@@ -135,7 +136,12 @@ class InfoMessage:
 
 
 class InfoBuffer:
-    """信息缓冲区管理器"""
+    """
+    信息缓冲区管理器
+    
+    维护按类型/级别的消息索引，并缓存当前过滤条件的结果：新消息到达时增量追加，
+    最旧消息被挤出时从索引和结果头部移除，刷新时不再对整个缓冲区重新过滤
+    """
     
     def __init__(self, max_size: int = 1000):
         """
@@ -148,12 +154,81 @@ class InfoBuffer:
         self.messages: deque[InfoMessage] = deque(maxlen=max_size)
         self.filters: Dict[str, Callable[[InfoMessage], bool]] = {}
         self.logger = get_logger(__name__)
+        
+        # 按类型/级别的消息索引（保持时间顺序），长度即计数
+        self._by_type: Dict[InfoType, deque[InfoMessage]] = defaultdict(deque)
+        self._by_level: Dict[InfoLevel, deque[InfoMessage]] = defaultdict(deque)
+        
+        # 当前过滤条件及其结果
+        self._filter_key: Optional[tuple] = None
+        self._filter_result: deque[InfoMessage] = deque()
     
     def add_message(self, message: InfoMessage) -> None:
         """添加新消息"""
+        if len(self.messages) == self.max_size:
+            self._evict_oldest()
+        
         self.messages.append(message)
+        self._by_type[message.info_type].append(message)
+        self._by_level[message.level].append(message)
+        if self._filter_key is not None and self._matches(message, *self._filter_key):
+            self._filter_result.append(message)
         self.logger.debug(f"Added message: {message.info_type.value} - {message.content[:50]}...")
     
+    def _evict_oldest(self) -> None:
+        """移除最旧的消息（它同时也是所在索引和过滤结果中最旧的一条）"""
+        oldest = self.messages.popleft()
+        self._by_type[oldest.info_type].popleft()
+        self._by_level[oldest.level].popleft()
+        if self._filter_result and self._filter_result[0] is oldest:
+            self._filter_result.popleft()
+    
+    @staticmethod
+    def _make_filter_key(info_types: Optional[List[InfoType]],
+                         levels: Optional[List[InfoLevel]],
+                         time_range: Optional[tuple[datetime, datetime]],
+                         search_text: Optional[str]) -> tuple:
+        return (
+            frozenset(info_types) if info_types else None,
+            frozenset(levels) if levels else None,
+            tuple(time_range) if time_range else None,
+            search_text.lower() if search_text else None,
+        )
+    
+    @staticmethod
+    def _matches(message: InfoMessage, info_types, levels, time_range, search_lower) -> bool:
+        """判断消息是否满足过滤条件"""
+        if info_types is not None and message.info_type not in info_types:
+            return False
+        if levels is not None and message.level not in levels:
+            return False
+        if time_range is not None and not (time_range[0] <= message.timestamp <= time_range[1]):
+            return False
+        if search_lower is not None and search_lower not in message.search_key:
+            return False
+        return True
+    
+    def _candidates(self, info_types, levels) -> deque[InfoMessage]:
+        """选择需要逐条检查的最小消息集合（单一类型或级别过滤时直接使用索引）"""
+        candidates = self.messages
+        if info_types is not None and len(info_types) == 1:
+            candidates = self._by_type.get(next(iter(info_types)), deque())
+        if levels is not None and len(levels) == 1:
+            by_level = self._by_level.get(next(iter(levels)), deque())
+            if len(by_level) < len(candidates):
+                candidates = by_level
+        return candidates
+    
+    def _apply_filters(self, *args) -> deque[InfoMessage]:
+        """返回过滤结果（过滤条件不变时直接使用已增量维护的结果）"""
+        key = self._make_filter_key(*args)
+        if key != self._filter_key:
+            self._filter_key = key
+            self._filter_result = deque(
+                msg for msg in self._candidates(key[0], key[1]) if self._matches(msg, *key)
+            )
+        return self._filter_result
+    
     def get_filtered_messages(self, 
                             info_types: Optional[List[InfoType]] = None,
                             levels: Optional[List[InfoLevel]] = None,
@@ -168,33 +243,22 @@ class InfoBuffer:
             time_range: 时间范围过滤 (start, end)
             search_text: 搜索文本
         """
-        filtered = list(self.messages)
-        
-        # 类型过滤
-        if info_types:
-            filtered = [msg for msg in filtered if msg.info_type in info_types]
-        
-        # 级别过滤
-        if levels:
-            filtered = [msg for msg in filtered if msg.level in levels]
-        
-        # 时间范围过滤
-        if time_range:
-            start_time, end_time = time_range
-            filtered = [msg for msg in filtered if start_time <= msg.timestamp <= end_time]
-        
-        # 文本搜索
-        if search_text:
-            search_lower = search_text.lower()
-            filtered = [msg for msg in filtered 
-                       if search_lower in msg.content.lower() or 
-                          search_lower in msg.source.lower()]
-        
-        return filtered
+        return list(self._apply_filters(info_types, levels, time_range, search_text))
+    
+    def get_filtered_count(self, 
+                           info_types: Optional[List[InfoType]] = None,
+                           levels: Optional[List[InfoLevel]] = None,
+                           time_range: Optional[tuple[datetime, datetime]] = None,
+                           search_text: Optional[str] = None) -> int:
+        """获取过滤后的消息数量（不复制消息列表）"""
+        return len(self._apply_filters(info_types, levels, time_range, search_text))
     
     def clear(self) -> None:
         """清空缓冲区"""
         self.messages.clear()
+        self._by_type.clear()
+        self._by_level.clear()
+        self._filter_result.clear()
         self.logger.info("Info buffer cleared")
 
     def remove_message_by_advice_id(self, advice_id: str) -> bool:
@@ -214,6 +278,11 @@ class InfoBuffer:
         if messages_to_remove:
             for msg in messages_to_remove:
                 self.messages.remove(msg)
+                self._by_type[msg.info_type].remove(msg)
+                self._by_level[msg.level].remove(msg)
+            # 删除很少发生，直接让过滤结果在下次查询时重建
+            self._filter_key = None
+            self._filter_result = deque()
             self.logger.info(f"Removed {len(messages_to_remove)} message(s) with advice_id: {advice_id[:8]}")
             return True
 
@@ -222,22 +291,11 @@ class InfoBuffer:
 
     def get_stats(self) -> Dict[str, int]:
         """获取缓冲区统计信息"""
-        stats = {
+        return {
             "total": len(self.messages),
-            "by_type": {},
-            "by_level": {}
+            "by_type": {info_type.value: len(msgs) for info_type, msgs in self._by_type.items() if msgs},
+            "by_level": {level.value: len(msgs) for level, msgs in self._by_level.items() if msgs},
         }
-        
-        for msg in self.messages:
-            # 按类型统计
-            type_name = msg.info_type.value
-            stats["by_type"][type_name] = stats["by_type"].get(type_name, 0) + 1
-            
-            # 按级别统计
-            level_name = msg.level.value
-            stats["by_level"][level_name] = stats["by_level"].get(level_name, 0) + 1
-        
-        return stats
 
 
 class InfoDisplay(Widget):
@@ -502,6 +560,7 @@ class InfoPanel(Widget):
         self.ai_display_widget = None
         self.ai_suggestions = []  # AI建议缓存
         self.thinking_animation = None  # 思考动画组件
+        self._ai_client = None  # AI客户端（首次提问时创建，之后复用）
 
         # 交易建议管理
         self.pending_trading_advice = {}  # 待确认的交易建议 {advice_id: TradingAdvice}
@@ -619,7 +678,7 @@ class InfoPanel(Widget):
             await message_list.refresh_messages(filtered_messages)
 
             # 更新统计信息
-            await self._update_stats()
+            await self._update_stats(len(filtered_messages))
 
         except Exception as e:
             self.logger.error(f"刷新显示失败: {e}")
@@ -628,6 +687,10 @@ class InfoPanel(Widget):
     
     def _get_filtered_messages(self) -> List[InfoMessage]:
         """获取过滤后的消息"""
+        return self.buffer.get_filtered_messages(**self._get_filter_args())
+    
+    def _get_filter_args(self) -> Dict[str, Any]:
+        """把过滤栏条件转换为缓冲区过滤参数"""
         # 转换过滤条件
         info_types = None
         if self.current_filters.get("type"):
@@ -645,16 +708,17 @@ class InfoPanel(Widget):
         
         search_text = self.current_filters.get("search")
         
-        return self.buffer.get_filtered_messages(
-            info_types=info_types,
-            levels=levels,
-            search_text=search_text
-        )
+        return {
+            "info_types": info_types,
+            "levels": levels,
+            "search_text": search_text,
+        }
     
-    async def _update_stats(self) -> None:
+    async def _update_stats(self, filtered_count: Optional[int] = None) -> None:
         """更新统计信息"""
         stats = self.buffer.get_stats()
-        filtered_count = len(self._get_filtered_messages())
+        if filtered_count is None:
+            filtered_count = self.buffer.get_filtered_count(**self._get_filter_args())
         
         stats_text = f"总计: {stats['total']} | 显示: {filtered_count}"
         
@@ -858,6 +922,17 @@ class InfoPanel(Widget):
                 source="AI助手"
             )
 
+    async def _get_ai_client(self):
+        """获取AI客户端：首次使用时才导入 AI SDK 并创建，可用时缓存复用"""
+        if self._ai_client is not None:
+            return self._ai_client
+
+        from ...modules.ai.claude_ai_client import create_claude_client
+        client = await create_claude_client()
+        if client.is_available():
+            self._ai_client = client
+        return client
+
     async def _process_ai_request(self, user_input: str) -> None:
         """处理AI请求并显示响应"""
         self.logger.info(f"开始处理AI请求: {user_input}")
@@ -878,8 +953,8 @@ class InfoPanel(Widget):
             # 显示思考动画
             await self._start_thinking_animation()
 
-            # 创建AI客户端并获取响应
-            ai_client = await create_claude_client()
+            # 获取AI客户端并获取响应
+            ai_client = await self._get_ai_client()
             if not ai_client.is_available():
                 await self.add_info(
                     content="AI服务暂不可用，请稍后重试。",
@@ -2023,30 +2098,46 @@ class InfoPanel(Widget):
 
 
 class MessageItem(Vertical):
-    """单条消息组件"""
+    """单条消息组件（虚拟列表中循环复用，通过 set_message 切换显示的消息）"""
 
-    def __init__(self, message: InfoMessage, **kwargs):
-        message_id = f"msg_{id(message)}"
-        super().__init__(id=message_id, classes=f"message-item {message.level.value}", **kwargs)
-        self.message = message
+    def __init__(self, message: Optional[InfoMessage] = None, **kwargs):
+        super().__init__(classes="message-item", **kwargs)
+        self.message: Optional[InfoMessage] = None
+        self._header = Static("", classes="message-header")
+        self._content = Static("", classes="message-content")
+        if message is not None:
+            self.set_message(message)
 
     def compose(self) -> ComposeResult:
         """组合消息组件"""
+        yield self._header
+        yield self._content
+
+    def set_message(self, message: InfoMessage) -> None:
+        """显示指定消息"""
+        if message is self.message:
+            return
+        # 级别相同时不改动样式类（样式类变化会触发样式重算）
+        old_level = self.message.level.value if self.message is not None else None
+        if old_level != message.level.value:
+            if old_level is not None:
+                self.remove_class(old_level)
+            self.add_class(message.level.value)
+        self.message = message
+
         # 消息头部
-        time_str = self.message.timestamp.strftime("%H:%M:%S")
-        type_str = self.message.info_type.value.upper()
+        time_str = message.timestamp.strftime("%H:%M:%S")
+        type_str = message.info_type.value.upper()
         header_text = f"[{time_str}] {type_str}"
-        if self.message.source:
-            header_text += f" ({self.message.source})"
-
-        yield Static(header_text, classes="message-header")
+        if message.source:
+            header_text += f" ({message.source})"
+        self._header.update(header_text)
 
         # 消息内容（截断长消息）
-        content = self.message.content
+        content = message.content
         if len(content) > 100:
             content = content[:97] + "..."
-
-        yield Static(content, classes="message-content")
+        self._content.update(content)
 
 
 class InfoMessageList(ScrollableContainer):
@@ -2064,8 +2155,7 @@ class InfoMessageList(ScrollableContainer):
 
 
     InfoMessageList .message-item {
-        height: auto;
-        min-height: 3;
+        height: 4;
         width: 1fr;
         padding: 0 1;
         margin: 0;
@@ -2109,8 +2199,15 @@ class InfoMessageList(ScrollableContainer):
         color: $text-muted;
         text-wrap: wrap;
     }
+
+    InfoMessageList .list-spacer {
+        height: 0;
+    }
     """
 
+    ITEM_HEIGHT = 4   # 每条消息占用的行数（与 .message-item 的高度一致）
+    OVERSCAN = 5      # 可视区域上下额外渲染的消息条数
+
     class MessageSelected(Message):
         """消息选择事件"""
         def __init__(self, message: InfoMessage):
@@ -2118,75 +2215,108 @@ class InfoMessageList(ScrollableContainer):
             self.message = message
 
     def __init__(self, buffer: InfoBuffer, **kwargs):
-        """初始化消息列表"""
+        """
+        初始化消息列表
+
+        列表是虚拟化的：只为可视区域及上下少量消息挂载 MessageItem，组件循环复用，
+        其余消息由上下两个占位组件撑开滚动高度
+        """
         super().__init__(**kwargs)
         self.buffer = buffer
         self.selected_message: Optional[InfoMessage] = None
         self.message_widgets: Dict[str, Widget] = {}
+        self.messages: List[InfoMessage] = []
+        self._pool: List[MessageItem] = []
+        self._window = (0, 0)
         self.logger = get_logger("info_message_list")
 
     def compose(self) -> ComposeResult:
         """组合消息列表"""
-        with Vertical():
-            yield Static("暂无消息", classes="empty-state", id="empty_state")
+        yield Static("暂无消息", classes="empty-state", id="empty_state")
+        yield Static("", classes="list-spacer", id="top_spacer")
+        yield Static("", classes="list-spacer", id="bottom_spacer")
 
     async def refresh_messages(self, filtered_messages: List[InfoMessage]) -> None:
-        """刷新消息列表"""
+        """刷新消息列表（只更新可视窗口内复用的组件，不重新挂载）"""
         try:
-            # 清空现有消息组件
-            await self.query(".message-item").remove()
-            self.message_widgets.clear()
+            # 停留在底部时跟随最新消息，向上翻看时保持位置
+            follow = not self.messages or self.scroll_y >= self.max_scroll_y - self.ITEM_HEIGHT
+            self.messages = filtered_messages
 
             empty_state = self.query_one("#empty_state")
+            empty_state.display = not filtered_messages
 
-            if filtered_messages:
-                empty_state.display = False
+            self._render_window(at_end=follow)
+            if follow:
+                self.scroll_end(animate=False)
 
-                # 只显示最新的消息（限制数量避免性能问题）
-                display_messages = filtered_messages[-100:]  # 最多显示100条
+            self.logger.debug(f"刷新消息列表: {len(filtered_messages)} 条消息，渲染 {self._window}")
 
-                for message in display_messages:
-                    message_id = f"msg_{id(message)}"
-                    message_widget = MessageItem(message)
-                    self.message_widgets[message_id] = message_widget
-                    await self.mount(message_widget)
+        except Exception as e:
+            self.logger.error(f"刷新消息列表失败: {e}")
 
-                self.logger.debug(f"刷新消息列表: {len(display_messages)} 条消息")
+    def _render_window(self, at_end: bool = False) -> None:
+        """把复用组件绑定到可视窗口内的消息，并设置上下占位高度"""
+        total = len(self.messages)
+        visible = max(self.size.height, 40) // self.ITEM_HEIGHT + 1
+        if at_end:
+            first = max(total - visible - self.OVERSCAN, 0)
+        else:
+            first = max(int(self.scroll_y) // self.ITEM_HEIGHT - self.OVERSCAN, 0)
+        last = min(first + visible + 2 * self.OVERSCAN, total)
+        first = min(first, last)
+
+        bottom_spacer = self.query_one("#bottom_spacer")
+        while len(self._pool) < last - first:
+            item = MessageItem(id=f"msg_slot_{len(self._pool)}")
+            self._pool.append(item)
+            self.mount(item, before=bottom_spacer)
+
+        self.message_widgets.clear()
+        for slot, item in enumerate(self._pool):
+            index = first + slot
+            if index < last:
+                message = self.messages[index]
+                item.set_message(message)
+                selected = message is self.selected_message
+                if item.has_class("selected") != selected:
+                    item.set_class(selected, "selected")
+                item.display = True
+                self.message_widgets[f"msg_{id(message)}"] = item
             else:
-                empty_state.display = True
+                item.display = False
 
-            # 滚动到底部显示最新消息
-            self.scroll_end(animate=True)
+        self.query_one("#top_spacer").styles.height = first * self.ITEM_HEIGHT
+        bottom_spacer.styles.height = (total - last) * self.ITEM_HEIGHT
+        self._window = (first, last)
 
-        except Exception as e:
-            self.logger.error(f"刷新消息列表失败: {e}")
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        """滚动时按需切换窗口内的消息"""
+        super().watch_scroll_y(old_value, new_value)
+        if self.messages and int(old_value) // self.ITEM_HEIGHT != int(new_value) // self.ITEM_HEIGHT:
+            self._render_window()
 
+    def on_resize(self, event) -> None:
+        """可视区域变化时重新计算窗口"""
+        if self.messages:
+            self._render_window()
 
     async def on_click(self, event) -> None:
         """处理点击事件"""
         # 寻找被点击的消息项
         clicked_widget = event.widget
-        while clicked_widget and not clicked_widget.classes or "message-item" not in clicked_widget.classes:
+        while clicked_widget is not None and not isinstance(clicked_widget, MessageItem):
             clicked_widget = clicked_widget.parent
-            if not clicked_widget:
-                return
 
-        # 找到对应的消息
-        message_id = clicked_widget.id
-        if message_id in self.message_widgets:
-            widget = self.message_widgets[message_id]
-            # 获取对应的消息对象
-            for message in self.buffer.messages:
-                if f"msg_{id(message)}" == message_id:
-                    await self.select_message(message, widget)
-                    break
+        if clicked_widget is not None and clicked_widget.message is not None:
+            await self.select_message(clicked_widget.message, clicked_widget)
 
     async def select_message(self, message: InfoMessage, widget: Widget) -> None:
         """选择消息"""
         # 更新选中状态
         if self.selected_message:
             # 移除之前选中项的选中样式
-            for msg_widget in self.message_widgets.values():
+            for msg_widget in self._pool:
                 msg_widget.remove_class("selected")
 
         # 添加新选中项的样式
@@ -2214,6 +2344,7 @@ class InfoMessageList(ScrollableContainer):
 
             last_message = self.buffer.messages[-1]
             message_id = f"msg_{id(last_message)}"
+            self._render_window(at_end=True)
 
             if message_id in self.message_widgets:
                 widget = self.message_widgets[message_id]
@@ -166,6 +166,8 @@ LogToFile = true
 LogToConsole = false
 LogFileMaxSize = 1024
 LogFileBackupCount = 2
+LogRateLimitBurst = 20
+LogRateLimitInterval = 1
 DebugMode = false
 PerformanceMonitoring = false
 DataCacheTTL = 300
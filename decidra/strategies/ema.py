@@ -3,6 +3,7 @@
 
 import pandas as pd
 
+from ..base import indicators
 from ..strategies import Strategies
 from ..utils import logger
 from ..utils.global_vars import get_logger
@@ -50,12 +51,10 @@ class EMARibbon(Strategies):
             self.input_data[stock_code][['open', 'close', 'high', 'low']] = self.input_data[stock_code][
                 ['open', 'close', 'high', 'low']].apply(pd.to_numeric)
 
-            self.input_data[stock_code]['EMA_fast'] = self.input_data[stock_code]['close'].ewm(span=self.EMA_FAST,
-                                                                                               adjust=False).mean()
-            self.input_data[stock_code]['EMA_slow'] = self.input_data[stock_code]['close'].ewm(span=self.EMA_SLOW,
-                                                                                               adjust=False).mean()
-            self.input_data[stock_code]['EMA_supp'] = self.input_data[stock_code]['close'].ewm(span=self.EMA_SUPP,
-                                                                                               adjust=False).mean()
+            close = self.input_data[stock_code]['close'].to_numpy(dtype=float)
+            self.input_data[stock_code]['EMA_fast'] = indicators.ema(close, self.EMA_FAST)
+            self.input_data[stock_code]['EMA_slow'] = indicators.ema(close, self.EMA_SLOW)
+            self.input_data[stock_code]['EMA_supp'] = indicators.ema(close, self.EMA_SUPP)
 
             self.input_data[stock_code].reset_index(drop=True, inplace=True)
 
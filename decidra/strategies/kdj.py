@@ -2,6 +2,7 @@
 
 import pandas as pd
 
+from ..base import indicators
 from ..strategies import Strategies
 from ..utils import logger
 from ..utils.global_vars import get_logger
@@ -60,17 +61,15 @@ class KDJCross(Strategies):
             self.input_data[stock_code][['open', 'close', 'high', 'low']] = self.input_data[stock_code][
                 ['open', 'close', 'high', 'low']].apply(pd.to_numeric)
 
-            low = self.input_data[stock_code]['low'].rolling(self.FAST_K, min_periods=self.FAST_K).min()
-            low.fillna(value=self.input_data[stock_code]['low'].expanding().min(), inplace=True)
-            high = self.input_data[stock_code]['high'].rolling(self.FAST_K, min_periods=self.FAST_K).max()
-            high.fillna(value=self.input_data[stock_code]['high'].expanding().max(), inplace=True)
-            rsv = (self.input_data[stock_code]['close'] - low) / (high - low) * 100
-            # Com = Specify decay in terms of center of mass, α=1/(1+com), for com≥0.
-            # For common KDJ 9-3-3, the com option should be set as 3 - 1 = 2
-            self.input_data[stock_code]['%k'] = pd.DataFrame(rsv).ewm(com=self.SLOW_K - 1).mean()
-            self.input_data[stock_code]['%d'] = self.input_data[stock_code]['%k'].ewm(com=self.SLOW_D - 1).mean()
-            self.input_data[stock_code]['%j'] = 3 * self.input_data[stock_code]['%k'] - \
-                                                2 * self.input_data[stock_code]['%d']
+            # RSV over the last FAST_K bars (expanding window at the head); K and D use com=SLOW-1,
+            # e.g. com=2 for the common KDJ 9-3-3
+            k, d, j = indicators.kdj(self.input_data[stock_code]['high'].to_numpy(dtype=float),
+                                     self.input_data[stock_code]['low'].to_numpy(dtype=float),
+                                     self.input_data[stock_code]['close'].to_numpy(dtype=float),
+                                     n=self.FAST_K, m1=self.SLOW_K, m2=self.SLOW_D)
+            self.input_data[stock_code]['%k'] = k
+            self.input_data[stock_code]['%d'] = d
+            self.input_data[stock_code]['%j'] = j
 
             self.input_data[stock_code].reset_index(drop=True, inplace=True)
 
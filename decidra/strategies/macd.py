@@ -3,6 +3,7 @@
 
 import pandas as pd
 
+from ..base import indicators
 from ..strategies import Strategies
 from ..utils import logger
 from ..utils.global_vars import get_logger
@@ -51,14 +52,12 @@ class MACDCross(Strategies):
                 ['open', 'close', 'high', 'low']].apply(pd.to_numeric)
 
             # MACD = EMA-Fast - EMA-Slow. Signal = EMA(MACD, Smooth-period)
-            ema_fast = self.input_data[stock_code]['close'].ewm(span=self.MACD_FAST, adjust=False).mean()
-            ema_slow = self.input_data[stock_code]['close'].ewm(span=self.MACD_SLOW, adjust=False).mean()
-            self.input_data[stock_code]['MACD'] = ema_fast - ema_slow
-            self.input_data[stock_code]['MACD_signal'] = self.input_data[stock_code]['MACD'].ewm(span=self.MACD_SIGNAL,
-                                                                                                 adjust=False).mean()
+            macd, signal, hist = indicators.macd(self.input_data[stock_code]['close'].to_numpy(dtype=float),
+                                                 self.MACD_FAST, self.MACD_SLOW, self.MACD_SIGNAL)
+            self.input_data[stock_code]['MACD'] = macd
+            self.input_data[stock_code]['MACD_signal'] = signal
             # MACD_hist = (MACD - MACD_signal) * 2
-            self.input_data[stock_code]['MACD_hist'] = (self.input_data[stock_code]['MACD'] -
-                                                        self.input_data[stock_code]['MACD_signal']) * 2
+            self.input_data[stock_code]['MACD_hist'] = hist * 2
 
             self.input_data[stock_code].reset_index(drop=True, inplace=True)
 
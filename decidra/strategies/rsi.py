@@ -3,8 +3,9 @@
 
 import pandas as pd
 
-from strategies import Strategies
-from utils import logger
+from ..base import indicators
+from ..strategies import Strategies
+from ..utils import logger
 from ..utils.global_vars import get_logger
 pd.options.mode.chained_assignment = None  # default='warn'
 
@@ -33,28 +34,9 @@ class RSIThreshold(Strategies):
         self.parse_data()
 
     def __compute_RSI(self, stock_code, time_window):
-        diff = self.input_data[stock_code]['close'].diff(1).dropna()  # diff in one field(one day)
-
-        # this preservers dimensions off diff values
-        up_chg = 0 * diff
-        down_chg = 0 * diff
-
-        # up change is equal to the positive difference, otherwise equal to zero
-        up_chg[diff > 0] = diff[diff > 0]
-
-        # down change is equal to negative difference, otherwise equal to zero
-        down_chg[diff < 0] = diff[diff < 0]
-
-        # check pandas documentation for ewm
-        # https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.ewm.html
-        # values are related to exponential decay
-        # we set com=time_window-1 so we get decay alpha=1/time_window
-        up_chg_avg = up_chg.ewm(com=time_window - 1, min_periods=time_window).mean()
-        down_chg_avg = down_chg.ewm(com=time_window - 1, min_periods=time_window).mean()
-
-        rs = abs(up_chg_avg / down_chg_avg)
-        rsi = 100 - 100 / (1 + rs)
-        return rsi
+        # Wilder smoothing: ewm(com=time_window-1, min_periods=time_window) of up/down changes,
+        # first row has no change and stays NaN
+        return indicators.rsi(self.input_data[stock_code]['close'].to_numpy(dtype=float), time_window)
 
     def parse_data(self, stock_list: list = None, latest_data: pd.DataFrame = None, backtesting: bool = False):
         # Received New Data => Parse it Now to input_data
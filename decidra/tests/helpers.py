@@ -0,0 +1,26 @@
+"""
+测试辅助工具
+
+多个测试模块共用的对象构造方法
+"""
+from unittest.mock import Mock, patch
+
+from ..base.futu_module import FutuModuleBase
+from ..modules.futu_trade import FutuTrade
+
+
+def make_futu_trade(**kwargs) -> FutuTrade:
+    """
+    创建不连接 FutuOpenD 的 FutuTrade
+
+    跳过基类的客户端初始化和连接检查，client 替换为 Mock，
+    由各测试按需设置返回值
+
+    Args:
+        kwargs: 传给 FutuTrade 的参数
+    """
+    with patch.object(FutuModuleBase, '__init__', lambda self, client=None: setattr(self, 'client', client)), \
+            patch.object(FutuTrade, 'check', lambda self: True):
+        trade = FutuTrade(**kwargs)
+    trade.client = Mock()
+    return trade
@@ -0,0 +1,75 @@
+"""
+账户状态内存镜像测试
+
+测试内容：
+1. 成交推送增减持仓，重复推送不重复计算
+2. 未成交买单计入风控持仓，撤单/成交后释放
+3. 启用同步后风控检查不再查询账户
+"""
+import unittest
+
+import pandas as pd
+
+from ..modules.account_state import AccountState
+from .helpers import make_futu_trade
+
+
+class TestAccountState(unittest.TestCase):
+    """测试账户状态增量更新"""
+
+    def setUp(self):
+        self.state = AccountState("SIMULATE", "HK")
+        self.state.seed([{"code": "HK.00700", "qty": 100, "nominal_price": 300.0}],
+                        {"total_assets": 100000}, [])
+
+    def test_deal_push_updates_position(self):
+        """测试成交推送更新持仓且按成交编号去重"""
+        deal = {"deal_id": "d1", "order_id": "o1", "code": "HK.00700",
+                "qty": 100, "price": 310.0, "trd_side": "BUY"}
+        self.assertTrue(self.state.apply_deal(deal))
+        self.assertFalse(self.state.apply_deal(deal))
+        self.assertAlmostEqual(self.state.total_position_value(), 200 * 310.0)
+
+        self.state.apply_deal({"deal_id": "d2", "code": "HK.00700",
+                               "qty": 200, "price": 320.0, "trd_side": "SELL"})
+        self.assertNotIn("HK.00700", self.state.positions)
+
+    def test_open_buy_orders_reserve_exposure(self):
+        """测试未成交买单计入风控数据，终态后释放"""
+        order = {"order_id": "o1", "code": "HK.00005", "trd_side": "BUY",
+                 "price": 50.0, "qty": 400, "dealt_qty": 0, "order_status": "SUBMITTED"}
+        self.state.apply_order(order)
+        self.assertAlmostEqual(self.state.risk_snapshot()["total_value"], 30000 + 20000)
+
+        self.state.apply_order(dict(order, order_status="CANCELLED_ALL"))
+        self.assertAlmostEqual(self.state.risk_snapshot()["total_value"], 30000)
+
+
+class TestRiskCheckWithAccountSync(unittest.TestCase):
+    """测试启用账户同步后的风控检查"""
+
+    def setUp(self):
+        self.trade = make_futu_trade()
+        self.trade.client.trade.get_position_list.return_value = pd.DataFrame(
+            [{"code": "HK.00700", "qty": 100, "nominal_price": 100.0}])
+        self.trade.client.trade.get_account_info.return_value = {"total_assets": 100000}
+        self.trade.client.trade.get_order_list.return_value = pd.DataFrame()
+        self.trade.set_risk_config({"enable_risk_control": True, "max_position_ratio": 0.3})
+        self.assertTrue(self.trade.enable_account_sync())
+        self.trade.client.trade.reset_mock()
+
+    def test_risk_check_is_in_memory(self):
+        """测试风控检查不再查询账户，成交推送即时生效"""
+        self.assertTrue(self.trade._risk_check_order("HK.00005", 10.0, 1000, "BUY", "SIMULATE", "HK"))
+        self.trade.client.trade.get_position_list.assert_not_called()
+        self.trade.client.trade.get_account_info.assert_not_called()
+
+        self.trade._on_deal_push("HK", pd.DataFrame([{
+            "trd_env": "SIMULATE", "deal_id": "d1", "code": "HK.00005",
+            "qty": 1500, "price": 10.0, "trd_side": "BUY"}]))
+        # 持仓 1 万 + 1.5 万，再买 1 万超过 30%
+        self.assertFalse(self.trade._risk_check_order("HK.00005", 10.0, 1000, "BUY", "SIMULATE", "HK"))
+
+
+if __name__ == '__main__':
+    unittest.main()
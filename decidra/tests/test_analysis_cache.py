@@ -0,0 +1,84 @@
+"""
+AI分析持久化缓存测试
+
+测试内容：
+1. 写入后可跨实例读取（模拟重启/多进程共享）
+2. K线出现新bar或价格大幅变化时缓存失效
+3. 超出容量时按最近访问时间淘汰
+4. 同一实例复用一个数据库连接
+"""
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from ..modules.ai.analysis_cache import AnalysisCache, DataFingerprint
+
+
+class TestAnalysisCache(unittest.TestCase):
+    """测试AI分析持久化缓存"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmp_dir.name) / "cache.db"
+        self.fingerprint = DataFingerprint(data_time="2026-01-09 00:00:00", ref_price=100.0)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_persist_across_instances(self):
+        """测试缓存结果可被新实例读取"""
+        AnalysisCache(self.db_path).put("HK.00700", "technical", {"content": "ok"}, self.fingerprint)
+
+        cache = AnalysisCache(self.db_path)
+        self.assertEqual(cache.get("HK.00700", "technical", self.fingerprint), {"content": "ok"})
+
+    def test_small_price_move_keeps_entry(self):
+        """测试价格小幅波动不影响缓存"""
+        cache = AnalysisCache(self.db_path, price_tolerance=0.01)
+        cache.put("HK.00700", "technical", {"content": "ok"}, self.fingerprint)
+
+        moved = DataFingerprint(data_time=self.fingerprint.data_time, ref_price=100.5)
+        self.assertIsNotNone(cache.get("HK.00700", "technical", moved))
+
+    def test_material_change_invalidates(self):
+        """测试新K线或价格大幅变化时缓存失效"""
+        cache = AnalysisCache(self.db_path, price_tolerance=0.01)
+        cache.put("HK.00700", "technical", {"content": "ok"}, self.fingerprint)
+
+        moved = DataFingerprint(data_time=self.fingerprint.data_time, ref_price=103.0)
+        self.assertIsNone(cache.get("HK.00700", "technical", moved))
+
+        cache.put("HK.00700", "technical", {"content": "ok"}, self.fingerprint)
+        new_bar = DataFingerprint(data_time="2026-01-10 00:00:00", ref_price=100.0)
+        self.assertIsNone(cache.get("HK.00700", "technical", new_bar))
+        self.assertEqual(cache.count(), 0)
+
+    def test_lru_eviction(self):
+        """测试超出容量时淘汰最久未访问的条目"""
+        cache = AnalysisCache(self.db_path, max_entries=2)
+        cache.put("HK.00001", "technical", {"n": 1}, self.fingerprint)
+        cache.put("HK.00002", "technical", {"n": 2}, self.fingerprint)
+        cache.get("HK.00001", "technical", self.fingerprint)
+        cache.put("HK.00003", "technical", {"n": 3}, self.fingerprint)
+
+        self.assertEqual(cache.count(), 2)
+        self.assertIsNotNone(cache.get("HK.00001", "technical", self.fingerprint))
+        self.assertIsNone(cache.get("HK.00002", "technical", self.fingerprint))
+
+    def test_single_connection(self):
+        """测试读写不会反复打开数据库连接"""
+        with mock.patch.object(sqlite3, 'connect', wraps=sqlite3.connect) as connect:
+            cache = AnalysisCache(self.db_path)
+            for i in range(5):
+                cache.put(f"HK.0000{i}", "technical", {"n": i}, self.fingerprint)
+                cache.get(f"HK.0000{i}", "technical", self.fingerprint)
+            cache.invalidate("HK.00000")
+            self.assertEqual(cache.count(), 4)
+            self.assertEqual(connect.call_count, 1)
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+股票基本信息缓存测试
+
+测试内容：
+1. 写入后重新打开可读取，读取单只股票时才加载到内存
+2. 按条判断过期，只返回缺失或过期的股票
+3. 首次打开时导入旧版 JSON 缓存
+"""
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from ..monitor.main.basicinfo_cache import BasicinfoCache
+
+
+def _info(code, name):
+    return {'code': code, 'name': name, 'lot_size': 100, 'stock_type': 'STOCK'}
+
+
+class TestBasicinfoCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / 'basicinfo.db'
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_lazy_roundtrip(self):
+        cache = BasicinfoCache(self.path)
+        cache.update_entries({'HK.00700': _info('HK.00700', '腾讯控股'), 'US.AAPL': _info('US.AAPL', '苹果')})
+        self.assertEqual(cache.flush(), 2)
+        cache.close()
+
+        cache = BasicinfoCache(self.path)
+        self.assertEqual(cache._rows, {})
+        self.assertIn('US.AAPL', cache)
+        self.assertNotIn('HK.09988', cache)
+        self.assertEqual(cache.get('HK.00700')['name'], '腾讯控股')
+        self.assertEqual(set(cache._rows), {'HK.00700'})
+        self.assertEqual(sorted(cache.keys()), ['HK.00700', 'US.AAPL'])
+        cache.close()
+
+    def test_missing_by_entry_age(self):
+        cache = BasicinfoCache(self.path, expiry_hours=8)
+        cache.update_entries({'HK.00700': _info('HK.00700', '腾讯控股')})
+        cache.update_entries({'HK.00388': _info('HK.00388', '香港交易所')}, fetched_at=time.time() - 9 * 3600)
+        cache.flush()
+        cache.close()
+
+        cache = BasicinfoCache(self.path, expiry_hours=8)
+        self.assertEqual(cache.missing(['HK.00700', 'HK.00388', 'HK.09988']), ['HK.00388', 'HK.09988'])
+        # 过期的记录仍可读取，直到被新数据替换
+        self.assertEqual(cache['HK.00388']['name'], '香港交易所')
+
+        cache.update_entries({'HK.00388': _info('HK.00388', '港交所'), 'HK.09988': _info('HK.09988', '阿里巴巴')})
+        self.assertEqual(cache.flush(), 2)
+        self.assertEqual(cache.missing(['HK.00700', 'HK.00388', 'HK.09988']), [])
+        cache.close()
+
+    def test_import_legacy_json(self):
+        legacy = {'timestamp': '2025-01-01T00:00:00', 'data': {'HK.00700': _info('HK.00700', '腾讯控股')}}
+        (self.path.parent / 'stock_basicinfo_cache.json').write_text(json.dumps(legacy), encoding='utf-8')
+
+        cache = BasicinfoCache(self.path)
+        self.assertEqual(cache['HK.00700']['name'], '腾讯控股')
+        self.assertEqual(cache.missing(['HK.00700']), [])
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
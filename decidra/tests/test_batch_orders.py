@@ -0,0 +1,78 @@
+"""
+批量下单测试
+
+测试内容：
+1. 令牌桶在突发请求后按速率限流
+2. 批量下单只查询一次风控数据，并按本批累计买入金额检查持仓比例
+3. 结果顺序与请求一致且附带每笔耗时
+4. 并发下单时订单历史和当日计数不丢失
+"""
+import time
+import unittest
+
+import pandas as pd
+
+from ..modules.futu_trade import TokenBucket
+from .helpers import make_futu_trade
+
+
+class TestTokenBucket(unittest.TestCase):
+    """测试令牌桶限流"""
+
+    def test_burst_then_throttle(self):
+        """测试桶内令牌耗尽后按补充速率等待"""
+        bucket = TokenBucket(capacity=3, period=0.3)
+        start = time.monotonic()
+        for _ in range(3):
+            self.assertTrue(bucket.acquire())
+        self.assertLess(time.monotonic() - start, 0.05)
+
+        self.assertTrue(bucket.acquire())
+        self.assertGreaterEqual(time.monotonic() - start, 0.08)
+
+    def test_timeout(self):
+        """测试超时未取得令牌返回 False"""
+        bucket = TokenBucket(capacity=1, period=10)
+        self.assertTrue(bucket.acquire())
+        self.assertFalse(bucket.acquire(timeout=0.01))
+
+
+class TestBatchPlaceOrders(unittest.TestCase):
+    """测试批量下单"""
+
+    def setUp(self):
+        self.trade = make_futu_trade()
+        self.trade.client.trade.place_order.side_effect = \
+            lambda code, **kwargs: {"order_id": code}
+        self.trade.client.trade.get_position_list.return_value = pd.DataFrame(
+            [{"code": "HK.00001", "qty": 100, "nominal_price": 100.0}])
+        self.trade.client.trade.get_account_info.return_value = {"total_assets": 100000}
+        self.trade.set_risk_config({"enable_risk_control": True, "max_position_ratio": 0.3})
+
+    def test_risk_state_fetched_once(self):
+        """测试风控数据只查询一次且累计买入超限的订单被拒绝"""
+        orders = [{"code": f"HK.0000{i}", "price": 100.0, "qty": 100} for i in range(5)]
+        results = self.trade.batch_place_orders(orders)
+
+        self.assertEqual(self.trade.client.trade.get_account_info.call_count, 1)
+        self.assertEqual(self.trade.client.trade.get_position_list.call_count, 1)
+        # 已有持仓 1 万，每笔 1 万，上限 3 万 -> 前两笔后持仓达到 3 万，之后超限
+        self.assertEqual([r["success"] for r in results], [True, True, False, False, False])
+        self.assertEqual([r.get("order_id") for r in results[:2]], ["HK.00000", "HK.00001"])
+        self.assertEqual(self.trade.client.trade.place_order.call_count, 2)
+        self.assertTrue(all("latency_ms" in r for r in results))
+
+    def test_concurrent_order_stats(self):
+        """测试并发下单时订单历史和当日计数不丢失"""
+        self.trade.set_risk_config({"enable_risk_control": False})
+        self.trade._rate_limiters = {}
+        orders = [{"code": f"HK.{i:05d}", "price": 10.0, "qty": 100} for i in range(40)]
+        results = self.trade.batch_place_orders(orders, max_workers=8)
+
+        self.assertTrue(all(r["success"] for r in results))
+        self.assertEqual(len(self.trade.order_history), 40)
+        self.assertEqual(self.trade.health_check()['recent_order_count'], 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
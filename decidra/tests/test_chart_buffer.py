@@ -0,0 +1,108 @@
+"""
+K线环形缓冲区测试
+
+测试内容：
+1. 逐根追加维护的均线与整体计算一致（含容量淘汰和数组压缩）
+2. 同步完整K线列表时只追加新K线，实时K线更新最后一根
+3. 图表管理器显示窗口跟随最新K线
+4. 缓冲区容量必须大于最长均线周期
+"""
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from ..base.futu_class import KLineData
+from ..monitor.analysis.chart_manager import ChartManager, KLineRingBuffer
+
+
+def _klines(count, start=0):
+    rng = np.random.default_rng(7)
+    closes = 100 + np.cumsum(rng.normal(0, 1, start + count))
+    return [
+        KLineData(code="HK.00700", time_key=f"2026-01-01 {i // 60:02d}:{i % 60:02d}:00",
+                  open=closes[i] - 0.5, close=closes[i], high=closes[i] + 1, low=closes[i] - 1,
+                  volume=100 + i, turnover=0)
+        for i in range(start, start + count)
+    ]
+
+
+def _rolling_mean(closes, period):
+    result = np.full(len(closes), np.nan)
+    result[period - 1:] = np.convolve(closes, np.ones(period) / period, mode='valid')
+    return result
+
+
+class TestKLineRingBuffer(unittest.TestCase):
+    """测试K线环形缓冲区"""
+
+    def test_incremental_ma_matches_full(self):
+        """测试增量均线与整体计算一致"""
+        klines = _klines(500)
+        buffer = KLineRingBuffer(capacity=100)
+        for kline in klines:
+            buffer.append(kline)
+
+        self.assertEqual(len(buffer), 100)
+        self.assertEqual(buffer.dropped, 400)
+        closes = np.array([k.close for k in klines])
+        for period in buffer.ma_periods:
+            expected = np.convolve(closes, np.ones(period) / period, mode='valid')[-100:]
+            np.testing.assert_allclose(buffer.ma(period, 0, 100), expected, rtol=1e-9)
+        self.assertEqual(buffer.klines(99, 100)[0].time_key, klines[-1].time_key)
+
+        loaded = KLineRingBuffer(capacity=100)
+        loaded.load(klines[:30])
+        self.assertTrue(np.isnan(loaded.ma(60, 0, 30)).all())
+        np.testing.assert_allclose(loaded.ma(20, 19, 30), _rolling_mean(closes[:30], 20)[19:])
+
+    def test_capacity_must_exceed_ma_period(self):
+        """测试容量不大于最长均线周期时拒绝创建，刚好大于时压缩后均线仍正确"""
+        with self.assertRaises(ValueError):
+            KLineRingBuffer(capacity=60)
+        with self.assertRaises(ValueError):
+            KLineRingBuffer(capacity=10, ma_periods=(5, 20))
+
+        klines = _klines(100)
+        buffer = KLineRingBuffer(capacity=21, ma_periods=(5, 20))
+        for kline in klines:
+            buffer.append(kline)
+        closes = np.array([k.close for k in klines])
+        np.testing.assert_allclose(buffer.ma(20, 0, 21), _rolling_mean(closes, 20)[-21:], rtol=1e-9)
+
+    def test_extend_and_update_last(self):
+        """测试同步K线列表与更新最后一根"""
+        klines = _klines(80)
+        buffer = KLineRingBuffer(capacity=200)
+        self.assertEqual(buffer.extend(klines[:70]), 70)
+        # 重叠部分忽略，最后一根重新写入，新K线追加
+        self.assertEqual(buffer.extend(klines), 11)
+        self.assertEqual(len(buffer), 80)
+
+        last = klines[-1]
+        updated = KLineData(code=last.code, time_key=last.time_key, open=last.open, close=last.close + 10,
+                            high=last.high + 10, low=last.low, volume=last.volume, turnover=0)
+        buffer.append(updated)
+        self.assertEqual(len(buffer), 80)
+        closes = [k.close for k in klines[-5:-1]] + [updated.close]
+        self.assertAlmostEqual(buffer.ma(5, 79, 80)[0], sum(closes) / 5)
+
+    def test_chart_manager_follows_latest(self):
+        """测试图表窗口跟随实时K线"""
+        klines = _klines(150)
+        analysis = SimpleNamespace(stock_code="HK.00700", kline_data=klines[:120], technical_indicators={})
+        manager = ChartManager(SimpleNamespace(get_current_analysis_data=lambda: analysis))
+        self.assertTrue(asyncio.run(manager.update_chart_data("HK.00700", "K_1M")))
+        self.assertEqual((manager.display_range.start_index, manager.display_range.end_index), (20, 120))
+
+        for kline in klines[120:]:
+            manager.append_kline("HK.00700", "K_1M", kline)
+        self.assertEqual((manager.display_range.start_index, manager.display_range.end_index), (50, 150))
+        self.assertEqual(manager.get_chart_display_info()['latest_time'], klines[-1].time_key)
+        self.assertEqual(manager.get_volume_data()[-1], klines[-1].volume)
+        self.assertEqual(len(manager.get_ma_data('ma20')), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+共享客户端注册表测试
+
+测试内容：
+1. 相同 FutuOpenD 地址复用同一客户端，最后一个使用者释放时才断开
+2. 重连后推送回调和订阅在新的行情上下文上恢复
+3. 共享客户端的模块清理时只取消自己的订阅
+"""
+import unittest
+
+from ..api.futu_registry import ClientRegistry
+from ..api.futu_sim_quote import SimQuoteClient, SimQuoteContext
+from ..modules.futu_market import FutuMarket
+from .test_sim_quote import _QuoteHandler
+
+
+class TestClientRegistry(unittest.TestCase):
+    """测试共享客户端注册表"""
+
+    def setUp(self):
+        self.created = []
+
+        def factory(**kwargs):
+            client = SimQuoteClient()
+            self.created.append(client)
+            return client
+
+        self.registry = ClientRegistry(factory=factory)
+
+    def test_refcount_and_release(self):
+        """测试按地址复用客户端与引用计数"""
+        first = self.registry.acquire("127.0.0.1", 11111)
+        second = self.registry.acquire("127.0.0.1", "11111")
+        other = self.registry.acquire("127.0.0.1", 22222)
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(len(self.created), 2)
+        self.assertEqual(self.registry.refcount(first), 2)
+
+        first.quote.subscribe(["HK.00700"], ["quote"])
+        self.assertFalse(self.registry.release(first))
+        self.assertTrue(first.is_connected)
+        self.assertTrue(self.registry.release(second))
+        self.assertFalse(first.is_connected)
+        self.assertEqual(self.registry.refcount(first), 0)
+
+        health = self.registry.health()
+        self.assertEqual([(item['port'], item['refs']) for item in health], [(22222, 1)])
+
+    def test_restore_after_reconnect(self):
+        """测试重建行情上下文后恢复回调与订阅"""
+        client = self.registry.acquire()
+        handler = _QuoteHandler()
+        client.quote.register_stock_quote_handler(handler)
+        client.quote.subscribe(["HK.00700", "HK.00005"], ["quote", "ticker"], is_first_push=False)
+
+        # 模拟断线后新建的上下文：没有回调也没有订阅
+        client.context = client._quote_ctx = SimQuoteContext()
+        self.assertTrue(client.quote.restore_after_reconnect())
+
+        subscriptions = client.context.query_subscription()[1]['sub_list']
+        self.assertEqual(sorted(subscriptions['QUOTE']), ["HK.00005", "HK.00700"])
+        self.assertEqual(sorted(subscriptions['TICKER']), ["HK.00005", "HK.00700"])
+        client.context.step(["HK.00700"])
+        self.assertEqual(len(handler.frames), 1)
+
+    def test_shared_module_unsubscribes_own_codes(self):
+        """测试共享客户端上一个模块清理订阅不影响其他模块"""
+        client = self.registry.acquire()
+        first, second = FutuMarket(client=client), FutuMarket(client=client)
+        for market in (first, second):
+            # 与从注册表获取客户端时一致
+            market._shared_client = True
+
+        self.assertTrue(first.subscribe(["HK.00700", "HK.00005"], ["quote", "ticker"]))
+        self.assertTrue(second.subscribe(["HK.09988"], ["quote"]))
+
+        first.cleanup_subscription_manager()
+        self.assertEqual(first.get_all_subscribed_stocks(), {})
+        subscriptions = client.context.query_subscription()[1]['sub_list']
+        self.assertEqual(subscriptions, {'QUOTE': ["HK.09988"]})
+        self.assertTrue(second.is_subscribed("HK.09988", "quote"))
+
+        # 最后一个使用者释放时取消全部订阅
+        self.assertTrue(self.registry.release(client))
+        self.assertEqual(client.context.query_subscription()[1]['sub_list'], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+增量成交统计测试
+
+测试内容：
+1. 成交按 deal_id 去重入库，按日期/股票累计
+2. FutuTrade 盈亏接口读取统计，短时间内重复查询不再下载成交
+"""
+import unittest
+from datetime import datetime
+
+import pandas as pd
+
+from ..modules.deal_analytics import DealAnalytics
+from .helpers import make_futu_trade
+
+
+class TestDealAnalytics(unittest.TestCase):
+    """测试成交统计"""
+
+    def test_ingest_is_idempotent(self):
+        """测试重复成交只计一次，并按日期与股票汇总"""
+        analytics = DealAnalytics()
+        deals = [
+            {"deal_id": "1", "code": "HK.00700", "price": 300.0, "qty": 100,
+             "pnl": 500.0, "fee": 10.0, "create_time": "2026-01-08 10:00:00"},
+            {"deal_id": "2", "code": "HK.00005", "price": 50.0, "qty": 200,
+             "pnl": -100.0, "fee": 5.0, "create_time": "2026-01-09 10:00:00"},
+        ]
+        self.assertEqual(analytics.ingest(deals), 2)
+        self.assertEqual(analytics.ingest(deals), 0)
+
+        self.assertEqual(analytics.day("2026-01-09").deal_count, 1)
+        self.assertAlmostEqual(analytics.code("HK.00700").net_pnl, 490.0)
+
+        period = analytics.period("2026-01-08", "2026-01-09")
+        self.assertEqual(period.deal_count, 2)
+        self.assertAlmostEqual(period.total_amount, 40000.0)
+        self.assertAlmostEqual(period.win_rate, 0.5)
+
+
+class TestDailyPnl(unittest.TestCase):
+    """测试当日盈亏接口"""
+
+    def test_daily_pnl_uses_cached_stats(self):
+        """测试当日盈亏读取统计，间隔内重复调用不重新查询"""
+        trade = make_futu_trade()
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        trade.client.trade.get_deal_list.return_value = pd.DataFrame([
+            {"deal_id": "1", "code": "HK.00700", "price": 300.0, "qty": 100,
+             "pnl": 200.0, "fee": 20.0, "create_time": now},
+        ])
+
+        first = trade.get_daily_pnl()
+        second = trade.get_daily_pnl()
+
+        self.assertEqual(first, second)
+        self.assertEqual(first["deal_count"], 1)
+        self.assertAlmostEqual(first["net_pnl"], 180.0)
+        self.assertEqual(trade.client.trade.get_deal_list.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
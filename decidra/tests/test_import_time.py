@@ -0,0 +1,66 @@
+"""
+导入开销回归测试
+
+用 python -X importtime 在独立进程中导入轻量入口，检查：
+1. 没有加载富途 SDK、pandas、AI SDK、akshare 等重量级依赖
+2. 累计导入耗时不超过预算
+"""
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# 入口累计导入耗时预算（微秒），留有较大余量避免机器负载造成误报
+IMPORT_BUDGET_US = 300_000
+
+HEAVY_MODULES = {'futu', 'pandas', 'numpy', 'anthropic', 'claude_agent_sdk', 'claude_code_sdk',
+                 'akshare', 'textual'}
+
+
+def _importtime(statement: str):
+    """在子进程中执行导入语句，返回 {模块名: 累计耗时(微秒)}"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60,
+    )
+    if result.returncode != 0:
+        raise AssertionError(f"导入失败: {statement}\n{result.stderr[-2000:]}")
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line.split('|')
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            modules[parts[2].strip()] = int(parts[1])
+    return modules
+
+
+class TestImportTime(unittest.TestCase):
+
+    def assertLightweight(self, statement: str, entry: str):
+        modules = _importtime(statement)
+        heavy = sorted(HEAVY_MODULES & set(modules))
+        self.assertFalse(heavy, f"{statement} 加载了 {heavy}")
+        self.assertLess(modules.get(entry, 0), IMPORT_BUDGET_US, f"{entry} 导入耗时超出预算")
+
+    def test_config_entry(self):
+        self.assertLightweight('import decidra.utils.global_vars', 'decidra.utils.global_vars')
+
+    def test_modules_package(self):
+        self.assertLightweight('import decidra.modules', 'decidra.modules')
+
+    def test_analysis_result_without_market_analyzer(self):
+        modules = _importtime('from decidra.modules.analyzer import AnalysisResult')
+        self.assertNotIn('akshare', modules)
+        self.assertNotIn('decidra.modules.analyzer.analyzer_market', modules)
+
+    def test_cli(self):
+        # click 是声明的依赖，缺失时应报错而不是跳过
+        self.assertLightweight('import cli', 'cli')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+技术指标库测试
+
+测试内容：
+1. 批量指标与 pandas rolling/ewm 的计算结果一致
+2. 二维面板按列计算，列开头的缺失数据不影响其他股票
+3. 流式指标逐根更新的结果与批量计算一致
+"""
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ..base import indicators
+
+
+def _series(count=500, seed=3):
+    rng = np.random.default_rng(seed)
+    return 100 + np.cumsum(rng.normal(0, 1, count))
+
+
+class TestBatchIndicators(unittest.TestCase):
+
+    def setUp(self):
+        self.close = _series()
+        self.series = pd.Series(self.close)
+
+    def assertSame(self, actual, expected):
+        np.testing.assert_allclose(actual, np.asarray(expected, dtype=float), rtol=1e-9, atol=1e-9)
+
+    def test_matches_pandas(self):
+        s = self.series
+        self.assertSame(indicators.ma(self.close, 20), s.rolling(20).mean())
+        self.assertSame(indicators.ma(self.close, 20, min_periods=1), s.rolling(20, min_periods=1).mean())
+        self.assertSame(indicators.ema(self.close, 26), s.ewm(span=26, adjust=False).mean())
+        self.assertSame(indicators.ema(self.close, com=2, adjust=True), s.ewm(com=2).mean())
+
+        dif = s.ewm(span=12, adjust=False).mean() - s.ewm(span=26, adjust=False).mean()
+        _, dea, hist = indicators.macd(self.close)
+        self.assertSame(dea, dif.ewm(span=9, adjust=False).mean())
+        self.assertSame(hist, dif - dif.ewm(span=9, adjust=False).mean())
+
+        diff = s.diff()
+        gain = diff.clip(lower=0).ewm(com=13, min_periods=14).mean()
+        loss = (-diff.clip(upper=0)).ewm(com=13, min_periods=14).mean()
+        self.assertSame(indicators.rsi(self.close, 14), 100 - 100 / (1 + gain / loss))
+
+        _, upper, _ = indicators.bollinger(self.close, 20)
+        self.assertSame(upper, s.rolling(20).mean() + 2 * s.rolling(20).std(ddof=0))
+
+    def test_kdj(self):
+        high, low = self.close + 1, self.close - 1
+        hh = pd.Series(high).rolling(9, min_periods=1).max()
+        ll = pd.Series(low).rolling(9, min_periods=1).min()
+        k = ((self.series - ll) / (hh - ll) * 100).ewm(com=2).mean()
+        d = k.ewm(com=2).mean()
+        actual_k, actual_d, actual_j = indicators.kdj(high, low, self.close)
+        self.assertSame(actual_k, k)
+        self.assertSame(actual_j, 3 * k - 2 * d)
+
+    def test_panel(self):
+        late = np.concatenate([np.full(50, np.nan), _series(450, seed=5)])
+        panel = np.column_stack([self.close, late])
+
+        for func in (lambda x: indicators.ma(x, 20), lambda x: indicators.ema(x, 12),
+                     lambda x: indicators.rsi(x, 14), lambda x: indicators.macd(x)[1]):
+            result = func(panel)
+            self.assertEqual(result.shape, panel.shape)
+            self.assertSame(result[:, 0], func(self.close))
+            self.assertTrue(np.isnan(result[:50, 1]).all())
+            self.assertSame(result[50:, 1], func(late[50:]))
+
+
+class TestStreamingIndicators(unittest.TestCase):
+
+    def test_streaming_matches_batch(self):
+        close = _series()
+        panel = np.column_stack([close, close[::-1]])
+        cases = [
+            (indicators.StreamingMA(20), indicators.ma(panel, 20)),
+            (indicators.StreamingEMA(26), indicators.ema(panel, 26)),
+            (indicators.StreamingRSI(14), indicators.rsi(panel, 14)),
+        ]
+        for stream, expected in cases:
+            actual = np.array([stream.update(row) for row in panel])
+            np.testing.assert_allclose(actual, expected, rtol=1e-9)
+
+        stream = indicators.StreamingMACD()
+        last = [stream.update(price) for price in close][-1]
+        for actual, expected in zip(last, indicators.macd(close)):
+            self.assertAlmostEqual(float(actual), expected[-1], places=9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+信息缓冲区过滤测试
+
+测试内容：
+1. 增量维护的过滤结果与逐条过滤一致（含环形缓冲区淘汰）
+2. 按类型/级别的计数随淘汰和删除更新
+"""
+import unittest
+from datetime import datetime
+
+from ..monitor.widgets.line_panel import InfoBuffer, InfoLevel, InfoMessage, InfoType
+
+
+def _message(i, info_type=InfoType.LOG, level=InfoLevel.INFO, data=None):
+    return InfoMessage(content=f"Message {i}", info_type=info_type, level=level,
+                       timestamp=datetime.now(), source="Quote" if i % 3 else "Trade", data=data)
+
+
+class TestInfoBuffer(unittest.TestCase):
+    """测试信息缓冲区"""
+
+    def test_incremental_filter_matches_full_scan(self):
+        """测试增量过滤结果与全量过滤一致"""
+        buffer = InfoBuffer(max_size=50)
+        types = [InfoType.LOG, InfoType.TRADE_INFO, InfoType.STOCK_DATA]
+        levels = [InfoLevel.INFO, InfoLevel.WARNING, InfoLevel.ERROR]
+        filters = [
+            {"info_types": [InfoType.TRADE_INFO]},
+            {"levels": [InfoLevel.ERROR], "search_text": "TRADE"},
+            {"info_types": [InfoType.LOG, InfoType.STOCK_DATA], "levels": [InfoLevel.WARNING]},
+        ]
+
+        for i in range(200):
+            buffer.add_message(_message(i, types[i % 3], levels[i % 5 % 3]))
+            criteria = filters[(i // 40) % len(filters)]
+            expected = [
+                msg for msg in buffer.messages
+                if msg.info_type in criteria.get("info_types", types)
+                and msg.level in criteria.get("levels", levels)
+                and criteria.get("search_text", "").lower() in (msg.content + "\x00" + msg.source).lower()
+            ]
+            result = buffer.get_filtered_messages(**criteria)
+            self.assertEqual([id(msg) for msg in result], [id(msg) for msg in expected])
+            self.assertEqual(buffer.get_filtered_count(**criteria), len(expected))
+
+        self.assertEqual(len(buffer.messages), 50)
+
+    def test_stats_after_eviction_and_removal(self):
+        """测试淘汰和删除后的统计"""
+        buffer = InfoBuffer(max_size=4)
+        buffer.add_message(_message(0, level=InfoLevel.ERROR))
+        for i in range(1, 5):
+            buffer.add_message(_message(i, InfoType.TRADE_ADVICE, data={"advice_id": f"advice-{i % 2}"}))
+
+        stats = buffer.get_stats()
+        self.assertEqual(stats, {"total": 4, "by_type": {"trade_advice": 4}, "by_level": {"info": 4}})
+
+        self.assertEqual(buffer.get_filtered_count(info_types=[InfoType.TRADE_ADVICE]), 4)
+        self.assertTrue(buffer.remove_message_by_advice_id("advice-1"))
+        self.assertEqual(buffer.get_stats()["by_type"], {"trade_advice": 2})
+        self.assertEqual(buffer.get_filtered_count(info_types=[InfoType.TRADE_ADVICE]), 2)
+
+        buffer.clear()
+        self.assertEqual(buffer.get_stats(), {"total": 0, "by_type": {}, "by_level": {}})
+
+
+if __name__ == '__main__':
+    unittest.main()
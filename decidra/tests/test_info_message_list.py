@@ -0,0 +1,91 @@
+"""
+虚拟化消息列表测试（无界面运行 Textual App）
+
+测试内容：
+1. 1000 条消息时挂载的 MessageItem 数量只与可视区域有关
+2. 上下占位高度等于窗口外消息数 × ITEM_HEIGHT，滚动后窗口跟随
+3. 滚动导致组件重新绑定后，选中样式跟随选中的消息
+"""
+import unittest
+from datetime import datetime
+
+from textual.app import App, ComposeResult
+
+from ..monitor.widgets.line_panel import InfoBuffer, InfoLevel, InfoMessage, InfoMessageList, InfoType, MessageItem
+
+
+class _ListApp(App):
+
+    def __init__(self, buffer: InfoBuffer):
+        super().__init__()
+        self.buffer = buffer
+
+    def compose(self) -> ComposeResult:
+        yield InfoMessageList(self.buffer)
+
+
+class TestInfoMessageList(unittest.IsolatedAsyncioTestCase):
+    """测试虚拟化消息列表"""
+
+    async def asyncSetUp(self):
+        self.buffer = InfoBuffer(max_size=1000)
+        levels = [InfoLevel.INFO, InfoLevel.WARNING, InfoLevel.ERROR]
+        for i in range(1000):
+            self.buffer.add_message(InfoMessage(content=f"Message {i}", info_type=InfoType.LOG,
+                                                level=levels[i % 3], timestamp=datetime.now()))
+
+    def _assert_window(self, message_list: InfoMessageList):
+        first, last = message_list._window
+        total = len(message_list.messages)
+        height = InfoMessageList.ITEM_HEIGHT
+        self.assertEqual(message_list.query_one("#top_spacer").styles.height.value, first * height)
+        self.assertEqual(message_list.query_one("#bottom_spacer").styles.height.value, (total - last) * height)
+        shown = [item.message for item in message_list._pool if item.display]
+        self.assertEqual([id(m) for m in shown], [id(m) for m in message_list.messages[first:last]])
+
+    async def test_window_bounded_and_selection_follows_scroll(self):
+        app = _ListApp(self.buffer)
+        async with app.run_test(size=(80, 40)) as pilot:
+            message_list = app.query_one(InfoMessageList)
+            await message_list.refresh_messages(list(self.buffer.messages))
+            await pilot.pause()
+
+            # 挂载数量由可视区域决定，与消息总数无关
+            visible = max(message_list.size.height, 40) // InfoMessageList.ITEM_HEIGHT + 1
+            max_items = visible + 2 * InfoMessageList.OVERSCAN
+            self.assertLessEqual(len(message_list.query(MessageItem)), max_items)
+            self.assertEqual(message_list._window[1], 1000)
+            self._assert_window(message_list)
+
+            # 选中窗口中部的一条消息
+            item = message_list._pool[len(message_list._pool) // 2]
+            selected = item.message
+            await message_list.select_message(selected, item)
+
+            # 向上滚动 3 条后组件重新绑定，选中样式跟随消息
+            first = message_list._window[0]
+            message_list.scroll_to(y=message_list.scroll_y - 3 * InfoMessageList.ITEM_HEIGHT, animate=False)
+            await pilot.pause()
+            self.assertLess(message_list._window[0], first)
+            self._assert_window(message_list)
+            selected_items = [w for w in message_list._pool if w.has_class("selected")]
+            self.assertEqual(len(selected_items), 1)
+            self.assertIs(selected_items[0].message, selected)
+            self.assertIsNot(selected_items[0], item)
+
+            # 滚动到中间再回来，挂载数量不变，选中状态仍保留
+            message_list.scroll_to(y=500 * InfoMessageList.ITEM_HEIGHT, animate=False)
+            await pilot.pause()
+            self._assert_window(message_list)
+            self.assertFalse(any(w.has_class("selected") for w in message_list._pool if w.display))
+            self.assertLessEqual(len(message_list.query(MessageItem)), max_items)
+
+            message_list.scroll_end(animate=False)
+            await pilot.pause()
+            self._assert_window(message_list)
+            self.assertIs(message_list.message_widgets[f"msg_{id(selected)}"].message, selected)
+            self.assertTrue(message_list.message_widgets[f"msg_{id(selected)}"].has_class("selected"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+K线图数据模型测试
+
+测试内容：
+1. 降采样窗口保留价格极值，开收盘和成交量按合并规则计算
+2. 替换最后一根K线和追加新K线时只转换尾部，revision 不变
+3. 历史K线变化（切换股票或窗口前移）时 revision 递增
+4. 显示窗口不含最新K线时，最新K线变化不触发重绘
+"""
+import unittest
+from dataclasses import replace
+from unittest import mock
+
+import numpy as np
+
+from ..base.futu_class import KLineData
+from ..monitor.widgets.kline_chart import KLineChartWidget, KLineSeries
+
+
+def _klines(count, start=0, code="HK.00700"):
+    rng = np.random.default_rng(11)
+    closes = 100 + np.cumsum(rng.normal(0, 1, start + count))
+    return [
+        KLineData(code=code, time_key=f"2026-01-{1 + i // 240:02d} {i // 60 % 4 + 9:02d}:{i % 60:02d}:00",
+                  open=closes[i] - 0.5, close=closes[i], high=closes[i] + 1, low=closes[i] - 1,
+                  volume=100 + i, turnover=0)
+        for i in range(start, start + count)
+    ]
+
+
+class TestKLineSeries(unittest.TestCase):
+    """测试K线图数据模型"""
+
+    def test_window_keeps_extremes(self):
+        """测试降采样后价格极值、首尾价格和总成交量不变"""
+        klines = _klines(100)
+        klines[37] = replace(klines[37], high=999.0)
+        klines[61] = replace(klines[61], low=1.0)
+        series = KLineSeries()
+        series.update(klines)
+
+        o, h, l, c, v, labels = series.window(0, 100, max_bars=10)
+        self.assertLessEqual(len(o), 10)
+        self.assertEqual(len(labels), len(o))
+        self.assertEqual(h.max(), 999.0)
+        self.assertEqual(l.min(), 1.0)
+        self.assertEqual(o[0], klines[0].open)
+        self.assertEqual(c[-1], klines[-1].close)
+        self.assertEqual(v.sum(), sum(k.volume for k in klines))
+
+        # 未超过 max_bars 时原样返回
+        o, h, *_ = series.window(10, 20, max_bars=10)
+        np.testing.assert_array_equal(h, [k.high for k in klines[10:20]])
+
+    def test_tail_updates_keep_revision(self):
+        """测试替换最后一根和追加K线时 revision 不变"""
+        klines = _klines(50)
+        series = KLineSeries()
+        series.update(klines)
+        revision = series.revision
+
+        klines[-1] = replace(klines[-1], close=123.0, high=130.0)
+        series.update(klines)
+        self.assertEqual(series.revision, revision)
+        self.assertEqual(series.last_bar()[4], 123.0)
+        self.assertEqual(len(series), 50)
+
+        klines = klines + _klines(3, start=50)
+        series.update(klines)
+        self.assertEqual(series.revision, revision)
+        self.assertEqual(len(series), 53)
+        np.testing.assert_array_equal(series.close, [k.close for k in klines])
+        self.assertEqual(series.labels[-1], klines[-1].time_key.split(' ')[0])
+
+    def test_history_change_bumps_revision(self):
+        """测试历史K线变化时 revision 递增并整体替换"""
+        klines = _klines(50)
+        series = KLineSeries()
+        series.update(klines)
+        revision = series.revision
+
+        # 窗口前移：第一根K线不同
+        series.update(klines[1:])
+        self.assertEqual(series.revision, revision + 1)
+        np.testing.assert_array_equal(series.close, [k.close for k in klines[1:]])
+
+        # 中间K线变化（倒数第二根不同）
+        changed = _klines(49, start=1)
+        changed[-2] = replace(changed[-2], time_key="2026-02-01 09:00:00")
+        series.update(changed)
+        self.assertEqual(series.revision, revision + 2)
+
+        # 数据变少（切换股票）
+        series.update(_klines(10, code="HK.00005"))
+        self.assertEqual(series.revision, revision + 3)
+        self.assertEqual(len(series), 10)
+
+
+class TestKLineChartRedraw(unittest.TestCase):
+    """测试K线图重绘判断"""
+
+    def setUp(self):
+        patcher = mock.patch.object(KLineChartWidget, '_draw_kline_chart')
+        self.draw = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.widget = KLineChartWidget("HK.00700", "K_1M")
+        self.widget.config.show_volume = False
+        self.klines = _klines(60)
+        self.widget.update_data(self.klines)
+
+    def _update_last(self, close):
+        self.klines[-1] = replace(self.klines[-1], close=close)
+        self.widget.update_data(self.klines)
+
+    def test_latest_bar_outside_window(self):
+        """测试窗口止于倒数第二根时，最新K线变化不重绘"""
+        self.widget.display_start = 9
+        self.widget._update_chart()
+        calls = self.draw.call_count
+
+        self._update_last(150.0)
+        self.assertEqual(self.draw.call_count, calls)
+
+    def test_latest_bar_inside_window(self):
+        """测试窗口包含最新K线时，最新K线变化重绘"""
+        self.widget.display_start = 10
+        self.widget._update_chart()
+        calls = self.draw.call_count
+
+        self._update_last(150.0)
+        self.assertEqual(self.draw.call_count, calls + 1)
+        self._update_last(150.0)
+        self.assertEqual(self.draw.call_count, calls + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
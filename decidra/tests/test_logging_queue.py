@@ -0,0 +1,126 @@
+"""
+队列日志测试
+
+测试内容：
+1. 日志由后台线程写入文件，多个 logger 共用同一个文件处理器
+2. 消息参数在调用线程渲染一次，日志等级未启用时参数不会被格式化
+3. 记录日志后修改参数不影响写入的内容，异常堆栈入队前转为文本
+4. 同一调用位置的重复日志按时间窗口限流，并注明省略的条数
+"""
+import logging
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from ..utils import logger as logger_module
+from ..utils.logger import RateLimitFilter, get_logger
+
+
+class _Probe:
+    """记录被格式化时所在的线程"""
+
+    def __init__(self):
+        self.threads = []
+
+    def __str__(self):
+        self.threads.append(threading.get_ident())
+        return "probe"
+
+
+class TestQueueLogging(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.config = {'log_level': 'INFO', 'log_to_file': True}
+
+    def tearDown(self):
+        # 只停止本测试目录对应的日志后端
+        for key in [key for key in logger_module._BACKENDS if key[0].startswith(self.tmpdir.name)]:
+            handler = logger_module._BACKENDS.pop(key)
+            handler.listener.stop()
+            for target in handler.listener.handlers:
+                target.close()
+        self.tmpdir.cleanup()
+
+    def _flush(self, logger):
+        handler = logger.handlers[0]
+        handler.listener.stop()
+        handler.listener.start()
+
+    def test_background_formatting(self):
+        first = get_logger('decidra.test.first', app_config=self.config, path=self.tmpdir.name)
+        second = get_logger('decidra.test.second', app_config=self.config, path=self.tmpdir.name)
+        self.assertIs(first.handlers[0], second.handlers[0])
+
+        probe = _Probe()
+        first.info("行情 %s", probe)
+        first.debug("未启用 %s", probe)
+        second.warning("连接断开")
+        self._flush(first)
+
+        self.assertEqual(probe.threads, [threading.get_ident()])
+
+        lines = self._read_log()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('decidra.test.first — INFO — 行情 probe', lines[0])
+        self.assertIn('连接断开', lines[1])
+
+    def test_args_rendered_before_queueing(self):
+        logger = get_logger('decidra.test.mutable', app_config=self.config, path=self.tmpdir.name)
+        listener = logger.handlers[0].listener
+        listener.stop()
+
+        # 后台线程暂停期间修改参数，写入的仍是记录时的值
+        quote = {'price': 300.0}
+        logger.info("报价 %s", quote)
+        quote['price'] = 999.0
+        try:
+            raise ValueError("行情断开")
+        except ValueError:
+            logger.exception("订阅失败")
+
+        records = [listener.queue.get_nowait(), listener.queue.get_nowait()]
+        self.assertIsNone(records[0].args)
+        self.assertIsNone(records[1].exc_info)
+        for record in records:
+            listener.queue.put(record)
+        listener.start()
+        self._flush(logger)
+
+        text = "\n".join(self._read_log())
+        self.assertIn("报价 {'price': 300.0}", text)
+        self.assertNotIn('999.0', text)
+        self.assertIn('订阅失败', text)
+        self.assertIn('ValueError: 行情断开', text)
+
+    def _read_log(self):
+        log_file = Path(self.tmpdir.name) / '.runtime' / 'log' / 'decidra_monitor.log'
+        return log_file.read_text(encoding='utf-8').splitlines()
+
+
+class TestRateLimitFilter(unittest.TestCase):
+
+    def _record(self, created, level=logging.DEBUG, lineno=10):
+        record = logging.LogRecord('test', level, 'quotes.py', lineno, "更新 %s", ('HK.00700',), None)
+        record.created = created
+        return record
+
+    def test_burst_per_call_site(self):
+        rate_filter = RateLimitFilter(burst=3, interval=1.0)
+        passed = [rate_filter.filter(self._record(100 + i * 0.01)) for i in range(10)]
+        self.assertEqual(passed, [True] * 3 + [False] * 7)
+
+        # 其他调用位置和错误日志不受影响
+        self.assertTrue(rate_filter.filter(self._record(100.5, lineno=11)))
+        self.assertTrue(rate_filter.filter(self._record(100.5, level=logging.ERROR)))
+
+        # 新窗口的第一条日志注明省略条数
+        record = self._record(101.5)
+        self.assertTrue(rate_filter.filter(record))
+        self.assertIn('已省略 7 条', record.getMessage())
+        self.assertIn('HK.00700', record.getMessage())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+"""
+通知服务并发投递测试
+
+测试内容：
+1. deliver 并发向各渠道发送，结果按渠道顺序返回并记录耗时
+2. send_async 在事件循环中并发投递
+3. 渠道返回错误或抛出异常时记录失败原因，不影响其他渠道
+4. 投递结果记录实际发出的请求数，分批发送时每批计一次，发送前估算的请求数与实际一致
+5. 多线程同时获取时 HTTP 会话和线程池只创建一次
+"""
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+from ..modules import notification
+from ..modules.notification import ChannelDeliveryResult, NotificationChannel, NotificationService
+
+_CONFIG = {
+    ('Notification', 'WechatWebhookUrl'): 'https://qyapi.weixin.qq.com/cgi-bin/webhook/send?key=test',
+    ('Notification', 'FeishuWebhookUrl'): 'https://open.feishu.cn/open-apis/bot/v2/hook/test',
+    ('Notification', 'CustomWebhookUrls'): 'https://hooks.example.com/notify',
+}
+
+
+def _get_config(section, key, default=None):
+    return _CONFIG.get((section, key), default)
+
+
+class _Response:
+    """模拟 Webhook 响应，企业微信和飞书都以 0 表示成功"""
+
+    def __init__(self, status_code=200, code=0):
+        self.status_code = status_code
+        self.text = ''
+        self._code = code
+
+    def json(self):
+        return {'errcode': self._code, 'code': self._code, 'errmsg': 'test', 'msg': 'test'}
+
+
+class TestNotificationDelivery(unittest.TestCase):
+
+    def setUp(self):
+        with mock.patch.object(notification, 'get_config', _get_config):
+            self.service = NotificationService()
+        self.posts = []
+
+    def tearDown(self):
+        self.service.close()
+
+    def _post(self, delay=0.2, responses=None):
+        def post(session, url, **kwargs):
+            self.posts.append(url)
+            time.sleep(delay)
+            response = (responses or {}).get(url, _Response())
+            if isinstance(response, Exception):
+                raise response
+            return response
+        return mock.patch('requests.Session.post', autospec=True, side_effect=post)
+
+    def test_deliver_fans_out(self):
+        self.assertEqual(self.service.get_available_channels(),
+                         [NotificationChannel.WECHAT, NotificationChannel.FEISHU, NotificationChannel.CUSTOM])
+
+        with self._post(delay=0.2):
+            start = time.perf_counter()
+            results = self.service.deliver("盘后报告")
+            elapsed = time.perf_counter() - start
+
+        # 三个渠道串行需要 0.6 秒
+        self.assertLess(elapsed, 0.45)
+        self.assertEqual(len(self.posts), 3)
+        self.assertEqual([r.channel for r in results], self.service.get_available_channels())
+        self.assertTrue(all(isinstance(r, ChannelDeliveryResult) and r.success for r in results))
+        self.assertTrue(all(r.elapsed >= 0.2 for r in results))
+        self.assertEqual(results[0].channel_name, '企业微信')
+
+    def test_send_async(self):
+        with self._post(delay=0.2):
+            start = time.perf_counter()
+            results = asyncio.run(self.service.send_async("盘后报告"))
+            elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.45)
+        self.assertEqual([r.channel_name for r in results], ['企业微信', '飞书', '自定义Webhook'])
+        self.assertTrue(all(r.success for r in results))
+
+    def test_failures_are_reported_per_channel(self):
+        responses = {
+            _CONFIG[('Notification', 'WechatWebhookUrl')]: _Response(code=93000),
+            _CONFIG[('Notification', 'FeishuWebhookUrl')]: _Response(),
+            _CONFIG[('Notification', 'CustomWebhookUrls')]: _Response(status_code=500),
+        }
+        with self._post(delay=0, responses=responses):
+            results = self.service.deliver("盘后报告")
+            self.assertTrue(self.service.send("盘后报告"))
+
+        wechat, feishu, custom = results
+        self.assertFalse(wechat.success)
+        self.assertEqual(wechat.error_message, '企业微信 发送失败')
+        self.assertTrue(feishu.success)
+        self.assertIsNone(feishu.error_message)
+        self.assertFalse(custom.success)
+
+        with mock.patch.object(self.service, 'send_to_feishu', side_effect=RuntimeError("连接被重置")):
+            with self._post(delay=0):
+                results = self.service.deliver("盘后报告")
+        self.assertEqual(results[1].error_message, '连接被重置')
+        self.assertTrue(results[0].success)
+
+    def test_request_count_includes_chunks(self):
+        config = dict(_CONFIG)
+        config[('Notification', 'FeishuMaxBytes')] = 300
+        with mock.patch.object(notification, 'get_config', lambda s, k, d=None: config.get((s, k), d)):
+            service = NotificationService()
+        self.addCleanup(service.close)
+
+        content = "\n\n".join(f"## 第{i}节\n" + "行情数据" * 10 for i in range(6))
+        with self._post(delay=0), mock.patch.object(notification.time, 'sleep'):
+            feishu = service.send_channel(NotificationChannel.FEISHU, content)
+            wechat = service.send_channel(NotificationChannel.WECHAT, "短消息")
+
+        self.assertTrue(feishu.success)
+        self.assertGreater(feishu.requests, 1)
+        self.assertEqual(feishu.requests + wechat.requests, len(self.posts))
+        self.assertEqual(wechat.requests, 1)
+        self.assertEqual(service.estimate_requests(NotificationChannel.FEISHU, content), feishu.requests)
+        self.assertEqual(service.estimate_requests(NotificationChannel.WECHAT, "短消息"), 1)
+        self.assertEqual(service.estimate_requests(NotificationChannel.CUSTOM, "短消息"), 1)
+
+    def test_lazy_init_is_thread_safe(self):
+        barrier = threading.Barrier(8)
+        sessions, executors = [], []
+
+        def worker():
+            barrier.wait(timeout=2)
+            sessions.append(self.service._get_session(NotificationChannel.WECHAT))
+            executors.append(self.service._get_executor())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len({id(s) for s in sessions}), 1)
+        self.assertEqual(len({id(e) for e in executors}), 1)
+        # 线程池按已配置渠道数创建，不包含 UNKNOWN
+        self.assertEqual(executors[0]._max_workers, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,205 @@
+"""
+通知发件箱测试
+
+测试内容：
+1. 合并窗口内的同渠道消息合并为一次发送
+2. 发送失败后按指数退避重试，超过最大次数标记为死信
+3. 按渠道限速，分批发送的每次请求都计入限额
+4. 发送前按合并后的请求数检查限速，额度不够时减少本批条数
+5. 后台线程运行时调用 flush 不会重复发送同一条消息
+"""
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from ..modules.notification import ChannelDeliveryResult, NotificationChannel
+from ..modules.notification_outbox import (
+    OUTBOX_CONFIG, STATUS_DEAD, STATUS_PENDING, STATUS_SENT, ChannelRateLimiter, NotificationOutbox,
+)
+
+
+class FakeService:
+    """记录发送内容的通知服务，可设置结果、耗时和每条消息的请求数"""
+
+    def __init__(self, success=True, delay=0.0, requests=1):
+        self.success = success
+        self.delay = delay
+        self.requests = requests
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def get_available_channels(self):
+        return [NotificationChannel.FEISHU]
+
+    def estimate_requests(self, channel, content):
+        return self.requests * len(content.split(OUTBOX_CONFIG['batch_separator']))
+
+    def send_channel(self, channel, content):
+        time.sleep(self.delay)
+        with self._lock:
+            self.sent.append(content)
+        return ChannelDeliveryResult(
+            channel=channel,
+            success=self.success,
+            error_message=None if self.success else "HTTP 500",
+            requests=self.estimate_requests(channel, content),
+        )
+
+
+class TestNotificationOutbox(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmpdir.name) / 'outbox.db'
+        self.outboxes = []
+
+    def tearDown(self):
+        for outbox in self.outboxes:
+            outbox.close()
+        self.tmpdir.cleanup()
+
+    def _outbox(self, service, **kwargs):
+        outbox = NotificationOutbox(service=service, db_path=self.db_path, **kwargs)
+        self.outboxes.append(outbox)
+        return outbox
+
+    def _rows(self, outbox):
+        with outbox._lock:
+            return outbox._conn.execute(
+                "SELECT status, attempts, next_attempt_at, last_error FROM outbox ORDER BY id"
+            ).fetchall()
+
+    def test_merge_within_batch_window(self):
+        service = FakeService()
+        outbox = self._outbox(service, batch_window=10.0)
+        for text in ("信号一", "信号二", "信号三"):
+            outbox.enqueue(text)
+
+        now = time.time()
+        self.assertLessEqual(outbox.process_due(now=now), 10.0)
+        self.assertEqual(service.sent, [])
+
+        outbox.process_due(now=now + 11)
+        self.assertEqual(service.sent, [OUTBOX_CONFIG['batch_separator'].join(["信号一", "信号二", "信号三"])])
+        self.assertEqual(outbox.get_stats(), {STATUS_PENDING: 0, STATUS_SENT: 3, STATUS_DEAD: 0})
+
+    def test_retry_backoff_then_dead_letter(self):
+        service = FakeService(success=False)
+        outbox = self._outbox(service, batch_window=0.0, max_attempts=3)
+        outbox.enqueue("告警")
+
+        outbox.process_due(force=True)
+        status, attempts, first_retry, error = self._rows(outbox)[0]
+        self.assertEqual((status, attempts, error), (STATUS_PENDING, 1, "HTTP 500"))
+        self.assertAlmostEqual(first_retry - time.time(), OUTBOX_CONFIG['retry_base_delay'], delta=1.0)
+
+        # 未到重试时间不发送
+        outbox.process_due(now=first_retry - 1)
+        self.assertEqual(len(service.sent), 1)
+
+        outbox.process_due(now=first_retry)
+        status, attempts, second_retry, _ = self._rows(outbox)[0]
+        self.assertEqual((status, attempts), (STATUS_PENDING, 2))
+        self.assertAlmostEqual(second_retry - time.time(), OUTBOX_CONFIG['retry_base_delay'] * 2, delta=1.0)
+
+        outbox.process_due(now=second_retry)
+        self.assertEqual(self._rows(outbox)[0][:2], (STATUS_DEAD, 3))
+        self.assertEqual(outbox.get_stats()[STATUS_DEAD], 1)
+
+        # 死信不再发送，重新入队后恢复
+        outbox.process_due(now=second_retry + 3600)
+        self.assertEqual(len(service.sent), 3)
+        self.assertEqual(outbox.requeue_dead(), 1)
+        self.assertEqual(self._rows(outbox)[0][:2], (STATUS_PENDING, 0))
+
+    def test_rate_limit_counts_requests(self):
+        # 飞书限速 5 次/秒，每条消息分 3 批发送
+        service = FakeService(requests=3)
+        outbox = self._outbox(service, batch_window=0.0)
+        # 固定处理时间，晚于下面所有入队时间
+        now = time.time() + 0.5
+
+        outbox.enqueue("第一条")
+        outbox.process_due(now=now, force=True)
+        # 剩余 2 次额度不够发送 3 批
+        outbox.enqueue("第二条")
+        wait = outbox.process_due(now=now, force=True)
+
+        self.assertEqual(service.sent, ["第一条"])
+        self.assertGreater(wait, 0)
+        self.assertEqual(outbox.get_stats()[STATUS_PENDING], 1)
+
+        # 窗口重置后第二、三条合并需要 6 批，超过额度，只发第二条
+        outbox.enqueue("第三条")
+        outbox.process_due(now=now + 1.0, force=True)
+        self.assertEqual(service.sent, ["第一条", "第二条"])
+
+        outbox.process_due(now=now + 2.0, force=True)
+        self.assertEqual(service.sent, ["第一条", "第二条", "第三条"])
+
+    def test_batch_split_to_fit_rate_limit(self):
+        # 限速 1 次/秒，三条消息合并后需要 3 次请求
+        service = FakeService()
+        outbox = self._outbox(service, batch_window=0.0)
+        limiter = outbox._rate_limiters[NotificationChannel.FEISHU] = ChannelRateLimiter(1, 1.0)
+        for text in ("一", "二", "三"):
+            outbox.enqueue(text)
+        now = time.time() + 0.5
+
+        for i in range(3):
+            outbox.process_due(now=now + i, force=True)
+            self.assertEqual(len(limiter._calls), 1)
+            self.assertGreater(outbox.process_due(now=now + i + 0.5, force=True), 0)
+        self.assertEqual(service.sent, ["一", "二", "三"])
+        self.assertEqual(outbox.get_stats()[STATUS_SENT], 3)
+
+        # 单条消息的请求数超过窗口上限时，等窗口清空后发送，不会一直等待
+        service.requests = 3
+        outbox.enqueue("长消息")
+        outbox.process_due(now=now + 3.0, force=True)
+        self.assertEqual(service.sent[-1], "长消息")
+
+    def test_rate_limiter_window(self):
+        limiter = ChannelRateLimiter(5, 1.0)
+        limiter.record(100.0, count=4)
+        self.assertEqual(limiter.wait_time(100.5), 0.0)
+        self.assertEqual(limiter.available(100.5), 1)
+        self.assertAlmostEqual(limiter.wait_time(100.5, count=2), 0.5)
+        limiter.record(100.5)
+        self.assertAlmostEqual(limiter.wait_time(100.5), 0.5)
+        self.assertEqual(limiter.wait_time(101.0), 0.0)
+        # 需要 5 次额度时要等 100.5 的记录也过期
+        self.assertAlmostEqual(limiter.wait_time(101.0, count=5), 0.5)
+        self.assertEqual(limiter.wait_time(101.0, count=10), limiter.wait_time(101.0, count=5))
+
+    def test_flush_with_worker_running(self):
+        # 发送耗时较长，flush 与后台线程同时处理时容易重复发送
+        service = FakeService(delay=0.2)
+        outbox = self._outbox(service, batch_window=0.0)
+        outbox.start()
+
+        outbox.enqueue("hello")
+        self.assertTrue(outbox.flush(timeout=5))
+        time.sleep(0.3)
+        self.assertEqual(service.sent, ["hello"])
+        self.assertEqual(outbox.get_stats()[STATUS_SENT], 1)
+
+    def test_pending_survives_restart(self):
+        outbox = self._outbox(FakeService(success=False), batch_window=0.0)
+        outbox.enqueue("重启前")
+        outbox.close()
+        self.outboxes.remove(outbox)
+
+        with sqlite3.connect(str(self.db_path)) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0], 1)
+
+        service = FakeService()
+        self._outbox(service, batch_window=0.0).flush(timeout=5)
+        self.assertEqual(service.sent, ["重启前"])
+
+
+if __name__ == '__main__':
+    unittest.main()
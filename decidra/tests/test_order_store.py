@@ -0,0 +1,92 @@
+"""
+本地订单簿测试
+
+测试内容：
+1. 推送增量更新订单，只返回变化的订单
+2. 旧版本推送/查询结果不覆盖新状态
+3. 订单被移除时要求全量重建
+4. 手动刷新订单时只更新变化的订单行，需要重建时才全量刷新表格
+"""
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+from ..monitor.main.order_store import OrderStore
+from ..monitor.manager.user import UserDataManager
+
+
+def _order(order_id, status="SUBMITTED", updated_time="2026-01-09 10:00:00", dealt_qty=0):
+    return {"order_id": order_id, "code": "HK.00700", "stock_name": "腾讯控股",
+            "trd_side": "BUY", "order_status": status, "qty": 100, "price": 300.0,
+            "dealt_qty": dealt_qty, "updated_time": updated_time}
+
+
+class TestOrderStore(unittest.TestCase):
+    """测试本地订单簿"""
+
+    def setUp(self):
+        self.order_data = []
+        self.store = OrderStore(self.order_data)
+        self.store.resync([_order("1"), _order("2")])
+
+    def test_push_returns_changed_orders_only(self):
+        """测试推送只返回有变化的订单，新订单追加到末尾"""
+        changed = self.store.apply_push([
+            _order("1"),
+            _order("2", "FILLED_ALL", "2026-01-09 10:00:05", 100),
+            _order("3"),
+        ])
+
+        self.assertEqual([o["order_id"] for o in changed], ["2", "3"])
+        self.assertEqual([o["order_id"] for o in self.order_data], ["1", "2", "3"])
+        self.assertEqual(self.order_data[1]["order_status"], "FILLED_ALL")
+
+    def test_stale_update_ignored(self):
+        """测试较旧的全量查询结果不覆盖推送的新状态"""
+        self.store.apply_push([_order("1", "FILLED_ALL", "2026-01-09 10:00:05", 100)])
+        changed = self.store.resync([_order("1"), _order("2")])
+
+        self.assertEqual(changed, [])
+        self.assertEqual(self.store.get("1")["order_status"], "FILLED_ALL")
+
+    def test_removed_order_requires_rebuild(self):
+        """测试订单被移除时返回 None 并按查询结果重建"""
+        self.assertIsNone(self.store.resync([_order("2")]))
+        self.assertEqual([o["order_id"] for o in self.order_data], ["2"])
+        self.assertEqual(self.store.get("2")["name"], "腾讯控股")
+
+
+class TestRefreshUserOrders(unittest.IsolatedAsyncioTestCase):
+    """测试手动刷新订单"""
+
+    async def asyncSetUp(self):
+        self.futu_trade = Mock()
+        self.ui_manager = Mock(update_orders_table=AsyncMock(), info_panel=None)
+        app = SimpleNamespace(futu_trade=self.futu_trade, ui_manager=self.ui_manager)
+        self.manager = UserDataManager(SimpleNamespace(app=app, order_data=[]), futu_market=None)
+        self.futu_trade.get_order_list.return_value = [_order("1"), _order("2")]
+        await self.manager.refresh_user_orders()
+        self.ui_manager.update_orders_table.reset_mock()
+
+    async def test_refresh_passes_changed_orders(self):
+        """测试刷新只把变化的订单交给表格，无变化时不刷新"""
+        self.futu_trade.get_order_list.return_value = [
+            _order("1"), _order("2", "FILLED_ALL", "2026-01-09 10:00:05", 100),
+        ]
+        await self.manager.refresh_user_orders()
+        changed = self.ui_manager.update_orders_table.await_args.args[0]
+        self.assertEqual([o["order_id"] for o in changed], ["2"])
+
+        self.ui_manager.update_orders_table.reset_mock()
+        await self.manager.refresh_user_orders()
+        self.ui_manager.update_orders_table.assert_not_awaited()
+
+    async def test_refresh_rebuilds_when_order_removed(self):
+        """测试订单被移除时全量重建表格"""
+        self.futu_trade.get_order_list.return_value = [_order("2")]
+        await self.manager.refresh_user_orders()
+        self.ui_manager.update_orders_table.assert_awaited_once_with(None)
+
+
+if __name__ == '__main__':
+    unittest.main()
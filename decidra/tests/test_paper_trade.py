@@ -0,0 +1,96 @@
+"""
+模拟撮合测试
+
+测试内容：
+1. 限价单被逐笔数据穿价后成交，按成交量部分成交
+2. 订单/成交推送与持仓、资金、已实现盈亏一致
+3. 止损单触发与撤单
+4. 回放时成交量为 0 的数据不产生成交
+"""
+import unittest
+
+from ..api.futu_paper import PaperClient
+from ..base.futu_class import FutuTradeException
+from ..modules.futu_trade import FutuTrade
+
+
+class TestPaperTrade(unittest.TestCase):
+    """测试进程内模拟撮合"""
+
+    def setUp(self):
+        self.client = PaperClient(initial_cash=100000)
+        self.trade = FutuTrade(client=self.client)
+        self.order_pushes = []
+        self.deal_pushes = []
+        self.trade.set_order_callback(lambda df: self.order_pushes.extend(df.to_dict('records')))
+        self.trade.set_deal_callback(lambda df: self.deal_pushes.extend(df.to_dict('records')))
+
+    def test_limit_order_partial_then_full_fill(self):
+        """测试限价买单按成交量部分成交后全部成交"""
+        result = self.trade.place_order("HK.00700", 300.0, 200)
+        self.assertTrue(result["success"])
+
+        ticks = [
+            {"code": "HK.00700", "price": 301.0, "volume": 500, "time": "2026-01-09 10:00:00"},
+            {"code": "HK.00700", "price": 299.5, "volume": 120, "time": "2026-01-09 10:00:01"},
+            {"code": "HK.00700", "price": 299.0, "volume": 1000, "time": "2026-01-09 10:00:02"},
+        ]
+        self.assertEqual(self.client.trade.replay(ticks), 2)
+
+        statuses = [p["order_status"] for p in self.order_pushes]
+        self.assertEqual(statuses, ["SUBMITTED", "FILLED_PART", "FILLED_ALL"])
+        self.assertEqual([d["qty"] for d in self.deal_pushes], [120, 80])
+        # 挂单被穿价时按限价成交
+        self.assertTrue(all(d["price"] == 300.0 for d in self.deal_pushes))
+
+        position = self.trade.get_position_by_code("HK.00700")
+        self.assertEqual(position["qty"], 200)
+        self.assertAlmostEqual(self.client.trade.cash, 100000 - 200 * 300.0)
+
+    def test_zero_volume_tick_fills_nothing(self):
+        """测试回放时成交量为 0 的数据不撮合，成交量缺失视为流动性充足"""
+        self.trade.place_order("HK.00700", 300.0, 200)
+        ticks = [
+            {"code": "HK.00700", "price": 299.0, "volume": 0, "time": "2026-01-09 10:00:00"},
+            {"code": "HK.00700", "price": 298.0, "volume": float("nan"), "time": "2026-01-09 10:00:01"},
+        ]
+        self.assertEqual(self.client.trade.replay(ticks[:1]), 0)
+        self.assertEqual(self.client.trade.last_prices["HK.00700"], 299.0)
+        self.assertEqual(self.deal_pushes, [])
+
+        self.assertEqual(self.client.trade.replay(ticks[1:]), 1)
+        self.assertEqual([d["qty"] for d in self.deal_pushes], [200])
+
+    def test_realized_pnl_and_funds_check(self):
+        """测试卖出产生已实现盈亏，资金不足时拒绝下单"""
+        self.client.trade.feed_tick("HK.00005", 50.0)
+        self.assertTrue(self.trade.place_order("HK.00005", 50.0, 1000)["success"])
+        self.trade.place_order("HK.00005", 55.0, 1000, trd_side="SELL")
+        self.client.trade.feed_tick("HK.00005", 55.0, time="2026-01-09 11:00:00")
+
+        self.assertAlmostEqual(self.deal_pushes[-1]["pnl"], 5000.0)
+        self.assertEqual(self.trade.get_position_list(), [])
+
+        with self.assertRaises(FutuTradeException):
+            self.client.trade.place_order("HK.00005", 50.0, 10 ** 6)
+
+    def test_stop_order_and_cancel(self):
+        """测试止损单触发后按市价成交，挂单可撤销"""
+        self.client.trade.feed_tick("HK.00700", 300.0)
+        self.trade.place_order("HK.00700", 300.0, 100)
+        stop = self.client.trade.place_order("HK.00700", 0, 100, order_type="STOP",
+                                             trd_side="SELL", aux_price=290.0)
+        pending = self.trade.place_order("HK.00700", 250.0, 100)
+
+        self.client.trade.feed_tick("HK.00700", 295.0)
+        self.assertEqual(self.client.trade.orders[stop["order_id"]]["order_status"], "SUBMITTED")
+        self.client.trade.feed_tick("HK.00700", 289.0)
+        self.assertEqual(self.client.trade.orders[stop["order_id"]]["order_status"], "FILLED_ALL")
+        self.assertEqual(self.deal_pushes[-1]["price"], 289.0)
+
+        self.assertTrue(self.trade.cancel_order(pending["order_id"])["success"])
+        self.assertEqual(self.order_pushes[-1]["order_status"], "CANCELLED_ALL")
+
+
+if __name__ == '__main__':
+    unittest.main()
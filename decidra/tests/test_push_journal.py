@@ -0,0 +1,160 @@
+"""
+推送录制与回放测试
+
+测试内容：
+1. QuoteManager 启用录制后，Handler 收到的报价/逐笔/买卖盘推送写入列式日志
+2. 日志可读取为 DataFrame，回放时 Handler 收到与原推送一致的数据
+3. 推送停止后缓冲的行由后台线程按时写盘
+4. 日期切换后关闭前一天的写入器
+"""
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import futu as ft
+
+from ..api import futu_journal
+from ..api.futu_journal import JournalReader, JournalReplayer, PushRecorder
+from ..api.futu_sim_quote import SimQuoteClient
+
+
+class _Collector:
+    """收集推送 DataFrame / 买卖盘字典"""
+
+    def __init__(self):
+        super().__init__()
+        self.items = []
+
+    def on_recv_rsp(self, rsp_pb):
+        ret_code, data = super().on_recv_rsp(rsp_pb)
+        if ret_code == ft.RET_OK:
+            self.items.append(data)
+        return ret_code, data
+
+
+class _QuoteHandler(_Collector, ft.StockQuoteHandlerBase):
+    pass
+
+
+class _TickerHandler(_Collector, ft.TickerHandlerBase):
+    pass
+
+
+class _OrderBookHandler(_Collector, ft.OrderBookHandlerBase):
+    pass
+
+
+class TestPushJournal(unittest.TestCase):
+    """测试推送录制与回放"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.sim = SimQuoteClient()
+        self.codes = ["HK.00700", "HK.00005"]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _record(self, steps=5):
+        handlers = [_QuoteHandler(), _TickerHandler(), _OrderBookHandler()]
+        quote = self.sim.quote
+        quote.register_stock_quote_handler(handlers[0])
+        recorder = quote.enable_recording(self.tmp.name)
+        quote.register_ticker_handler(handlers[1])
+        quote.register_order_book_handler(handlers[2])
+        quote.subscribe(self.codes, ["quote", "ticker", "order_book"], is_first_push=False)
+        for _ in range(steps):
+            self.sim.context.step()
+        quote.disable_recording()
+        return handlers, recorder
+
+    def test_record_and_read(self):
+        """测试录制后读取列数据"""
+        handlers, recorder = self._record()
+        self.assertEqual(recorder.record_count, 5 * 2 * 3)
+
+        reader = JournalReader(self.tmp.name)
+        day = reader.days()[0]
+        self.assertEqual(reader.kinds(day), ["order_book", "quote", "ticker"])
+
+        tickers = reader.to_frame(day, "ticker")
+        live = [row for df in handlers[1].items for row in df.to_dict('records')]
+        self.assertEqual(list(tickers["code"]), [row["code"] for row in live])
+        self.assertEqual(list(tickers["price"]), [row["price"] for row in live])
+        self.assertEqual(list(tickers["volume"]), [row["volume"] for row in live])
+
+        # 列文件定长：逐笔每行 8 + 8 + 4 + 8 + 8 + 8 + 1 + 8 字节
+        self.assertEqual(reader.read(day, "ticker")["price"].nbytes, 8 * 10)
+
+    def test_replay_matches_live(self):
+        """测试回放给 Handler 的数据与原推送一致"""
+        handlers, _ = self._record()
+        day = JournalReader(self.tmp.name).days()[0]
+
+        replay_handlers = [_QuoteHandler(), _TickerHandler(), _OrderBookHandler()]
+        replayer = JournalReplayer(day, speed=None, root=self.tmp.name)
+        for handler in replay_handlers:
+            self.assertTrue(replayer.set_handler(handler))
+        self.assertEqual(replayer.run(), 30)
+
+        columns = ["code", "last_price", "high_price", "low_price", "volume", "data_date", "data_time"]
+        live = [df[columns].to_dict('records') for df in handlers[0].items]
+        replayed = [df[columns].to_dict('records') for df in replay_handlers[0].items]
+        self.assertEqual(replayed, live)
+
+        self.assertEqual([book["Bid"][0][:2] for book in replay_handlers[2].items],
+                         [book["Bid"][0][:2] for book in handlers[2].items])
+
+
+class TestPushRecorder(unittest.TestCase):
+    """测试录制器写盘与日期切换"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.reader = JournalReader(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _ticker(self, code="HK.00700", price=320.0):
+        return [{"code": code, "time": "2026-01-09 10:00:00.000", "price": price, "volume": 100,
+                 "turnover": price * 100, "ticker_direction": "BUY", "sequence": 1}]
+
+    def test_background_flush_without_new_push(self):
+        """测试没有后续推送时缓冲的行也会按时写盘"""
+        recorder = PushRecorder(self.tmp.name, flush_rows=1000, flush_interval=0.1)
+        self.addCleanup(recorder.close)
+        recorder.record("ticker", self._ticker())
+        day = self.reader.days()[0]
+        self.assertEqual(len(self.reader.read(day, "ticker")["price"]), 0)
+
+        time.sleep(0.35)
+        self.assertEqual(list(self.reader.read(day, "ticker")["price"]), [320.0])
+
+        recorder.close()
+        self.assertTrue(recorder._stop_event.is_set())
+        self.assertIsNone(recorder._flusher)
+
+    def test_day_rollover_closes_previous_writers(self):
+        """测试跨日后前一天的文件被写盘关闭，只保留当天的写入器"""
+        recorder = PushRecorder(self.tmp.name, flush_rows=1000, flush_interval=60)
+        self.addCleanup(recorder.close)
+        with mock.patch.object(futu_journal, 'datetime') as clock:
+            clock.now.return_value = datetime(2026, 1, 9, 23, 59, 59)
+            recorder.record("ticker", self._ticker(price=320.0))
+            old_writer = recorder._writers[("20260109", "ticker")]
+
+            clock.now.return_value = datetime(2026, 1, 10, 0, 0, 1)
+            recorder.record("ticker", self._ticker(code="HK.00005", price=60.0))
+
+        self.assertEqual(list(recorder._writers), [("20260110", "ticker")])
+        self.assertEqual(list(recorder._symbols), ["20260110"])
+        self.assertTrue(all(fh.closed for fh in old_writer._files))
+        self.assertEqual(list(self.reader.read("20260109", "ticker")["price"]), [320.0])
+        self.assertEqual(self.reader.symbols("20260110"), ["HK.00005"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+报告分段渲染测试
+
+测试内容：
+1. ReportBuilder 渲染结果与逐行拼接一致
+2. 按字节上限分批时每批不超限且不丢失内容
+"""
+import unittest
+
+from ..modules.report_renderer import RenderedReport, ReportBuilder, utf8_len
+
+
+class TestReportRenderer(unittest.TestCase):
+    """测试报告分段渲染与分批"""
+
+    def _build(self, count):
+        builder = ReportBuilder()
+        lines = ["# 📅 决策仪表盘", ""]
+        builder.extend(lines[:])
+        for i in range(count):
+            builder.section_break()
+            block = [f"### 股票 {i}", "", f"**结论**: 买入 {'测试' * 50}", ""]
+            builder.extend(block)
+            lines.extend(["---", ""] + block)
+        return builder.build(), "\n".join(lines)
+
+    def test_builder_matches_joined_lines(self):
+        """测试分段渲染文本与原逐行拼接完全一致"""
+        report, expected = self._build(5)
+        self.assertEqual(report.text, expected)
+        self.assertEqual(report.total_bytes, utf8_len(expected))
+
+    def test_chunks_respect_byte_limit(self):
+        """测试分批结果不超过字节上限且内容完整"""
+        report, expected = self._build(30)
+        chunks = report.chunks(2000)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(utf8_len(c) <= 2000 for c in chunks))
+        self.assertEqual(report.separator.join(chunks), expected)
+
+    def test_unsplittable_content_chunked_by_lines(self):
+        """测试无分隔线的长文本按行分批"""
+        content = "\n".join(f"第 {i} 行内容" for i in range(500))
+        chunks = RenderedReport.from_markdown(content).chunks(1000)
+
+        self.assertTrue(all(utf8_len(c) <= 900 for c in chunks))
+        self.assertEqual("\n".join(chunks), content)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+行情请求合并与短时缓存测试
+
+测试内容：
+1. 相同参数的并发请求只调用一次，所有调用方拿到相同结果
+2. 有效期内直接返回缓存，失败的请求不缓存
+3. QuoteManager 查询经过合并层
+"""
+import threading
+import time
+import unittest
+
+from ..api.futu_coalesce import RequestCoalescer
+from ..api.futu_sim_quote import SimQuoteClient
+
+
+class TestRequestCoalescer(unittest.TestCase):
+    """测试请求合并与缓存"""
+
+    def test_concurrent_requests_coalesced(self):
+        """测试并发相同请求合并为一次调用"""
+        coalescer = RequestCoalescer({'ttl': {'order_book': 0}})
+        calls = []
+        release = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            release.wait(1)
+            return [1, 2, 3]
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(coalescer.call('order_book', 'k', fetch)))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        while coalescer.stats['coalesced'] < 4:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [[1, 2, 3]] * 5)
+        # 每个调用方拿到独立的副本
+        self.assertEqual(len({id(result) for result in results}), 5)
+
+        # 不缓存时下一次请求重新调用
+        coalescer.call('order_book', 'k', fetch)
+        self.assertEqual(len(calls), 2)
+
+    def test_ttl_cache_and_errors(self):
+        """测试有效期缓存与失败不缓存"""
+        coalescer = RequestCoalescer({'ttl': {'basicinfo': 0.05}})
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("timeout")
+            return {'count': len(calls)}
+
+        with self.assertRaises(RuntimeError):
+            coalescer.call('basicinfo', 'k', fetch)
+        self.assertEqual(coalescer.call('basicinfo', 'k', fetch), {'count': 2})
+        self.assertEqual(coalescer.call('basicinfo', 'k', fetch), {'count': 2})
+        self.assertEqual(coalescer.stats['cache_hits'], 1)
+
+        time.sleep(0.06)
+        self.assertEqual(coalescer.call('basicinfo', 'k', fetch), {'count': 3})
+
+    def test_quote_manager_uses_cache(self):
+        """测试 QuoteManager 查询命中缓存"""
+        quote = SimQuoteClient().quote
+        first = quote.get_market_snapshot(["HK.00700", "HK.00005"])
+        second = quote.get_market_snapshot(["HK.00700", "HK.00005"])
+        quote.get_market_snapshot(["HK.00005"])
+
+        self.assertEqual([item.code for item in first], [item.code for item in second])
+        self.assertEqual(quote.get_request_stats(), {'calls': 2, 'cache_hits': 1, 'coalesced': 0})
+
+        quote.clear_request_cache('market_snapshot')
+        quote.get_market_snapshot(["HK.00700", "HK.00005"])
+        self.assertEqual(quote.get_request_stats()['calls'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+搜索服务测试
+
+测试内容：
+1. 多维度情报搜索并发执行，主引擎失败时回退到其他引擎
+2. 搜索缓存在 TTL 内命中，过期后重新搜索
+3. 跨引擎、跨维度按规范化 URL 去重
+4. batch_search 默认不在请求之间等待
+"""
+import inspect
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from ..modules.analyzer.search_service import (
+    BaseSearchProvider, SearchCache, SearchResponse, SearchResult, SearchService,
+    dedupe_results, normalize_url,
+)
+
+
+class FakeProvider(BaseSearchProvider):
+    """按查询返回固定结果的搜索引擎，可设置耗时、失败和并发屏障"""
+
+    def __init__(self, name, keys=('k1', 'k2', 'k3'), urls=None, delay=0.0, fail=False, barrier=None):
+        super().__init__(list(keys), name)
+        self.urls = urls or {}
+        self.delay = delay
+        self.fail = fail
+        self.barrier = barrier
+        self.queries = []
+
+    def _do_search(self, query, api_key, max_results):
+        self.queries.append(query)
+        if self.barrier is not None:
+            self.barrier.wait(timeout=2)
+        time.sleep(self.delay)
+        if self.fail:
+            return SearchResponse(query=query, results=[], provider=self.name, success=False, error_message="配额已用尽")
+        urls = self.urls.get(query, [f"https://example.com/{abs(hash(query))}"])
+        results = [SearchResult(title=url, snippet='', url=url, source='example.com') for url in urls]
+        return SearchResponse(query=query, results=results, provider=self.name)
+
+
+def _service(*providers, cache=None, max_workers=4):
+    service = SearchService(max_workers=max_workers, cache=cache)
+    service._providers = list(providers)
+    service._max_workers = max_workers
+    return service
+
+
+class TestSearchFanOut(unittest.TestCase):
+
+    def test_dimensions_run_concurrently(self):
+        # 三个维度必须同时在途才能通过屏障，串行执行会超时失败
+        barrier = threading.Barrier(3)
+        provider = FakeProvider('Tavily', barrier=barrier)
+        results = _service(provider).search_comprehensive_intel('00700', '腾讯控股')
+
+        self.assertEqual(list(results), ['latest_news', 'risk_check', 'earnings'])
+        self.assertTrue(all(response.success for response in results.values()))
+        self.assertFalse(barrier.broken)
+
+    def test_fallback_to_other_provider(self):
+        failing = FakeProvider('Tavily', fail=True)
+        backup = FakeProvider('SerpAPI')
+        results = _service(failing, backup).search_comprehensive_intel('00700', '腾讯控股')
+
+        self.assertTrue(all(response.provider == 'SerpAPI' for response in results.values()))
+        self.assertEqual(len(backup.queries), 3)
+
+    def test_batch_search_default_has_no_delay(self):
+        self.assertEqual(inspect.signature(SearchService.batch_search).parameters['delay_between'].default, 0.0)
+
+        provider = FakeProvider('Tavily', delay=0.1)
+        stocks = [{'code': f'0000{i}', 'name': f'股票{i}'} for i in range(3)]
+        start = time.perf_counter()
+        results = _service(provider).batch_search(stocks)
+        self.assertEqual(list(results), ['00000', '00001', '00002'])
+        self.assertLess(time.perf_counter() - start, 0.25)
+
+
+class TestSearchCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = SearchCache(Path(self.tmpdir.name) / 'search.db', ttl_hours=1)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def test_ttl_expiry(self):
+        provider = FakeProvider('Tavily')
+        service = _service(provider, cache=self.cache)
+
+        service.search_stock_news('00700', '腾讯控股')
+        # 规范化后相同的查询命中缓存
+        self.assertIsNotNone(self.cache.get('腾讯控股  00700 股票 最新消息 ', 5))
+        service.search_stock_news('00700', '腾讯控股')
+        self.assertEqual(len(provider.queries), 1)
+
+        with mock.patch('time.time', return_value=time.time() + 3601):
+            self.assertIsNone(self.cache.get('腾讯控股 00700 股票 最新消息', 5))
+            service.search_stock_news('00700', '腾讯控股')
+        self.assertEqual(len(provider.queries), 2)
+
+
+class TestUrlDedup(unittest.TestCase):
+
+    def test_normalize_url(self):
+        self.assertEqual(normalize_url('https://www.Example.com/news/1/?utm=x'), 'example.com/news/1')
+        self.assertEqual(normalize_url('http://example.com/news/1'), 'example.com/news/1')
+
+    def test_dedupe_across_dimensions(self):
+        urls = {
+            "腾讯控股 00700 最新 新闻 2026年1月": ['https://www.a.com/1', 'https://a.com/1/', 'https://b.com/2'],
+            "腾讯控股 减持 处罚 利空 风险": ['http://b.com/2?from=feed', 'https://c.com/3'],
+        }
+        results = _service(FakeProvider('Tavily', urls=urls)).search_comprehensive_intel('00700', '腾讯控股', max_searches=2)
+
+        self.assertEqual([r.url for r in results['latest_news'].results], ['https://www.a.com/1', 'https://b.com/2'])
+        self.assertEqual([r.url for r in results['risk_check'].results], ['https://c.com/3'])
+
+        seen = set()
+        first = [SearchResult(title='t', snippet='', url='https://a.com/1', source='a.com')]
+        self.assertEqual(len(dedupe_results(first, seen)), 1)
+        self.assertEqual(dedupe_results(first, seen), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
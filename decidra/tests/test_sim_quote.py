@@ -0,0 +1,96 @@
+"""
+模拟行情测试
+
+测试内容：
+1. QuoteManager / FutuMarket 通过模拟上下文查询，报价需先订阅
+2. 录制的逐笔按顺序回放，富途 Handler 收到与真实推送相同结构的 DataFrame
+3. 逐笔监听驱动模拟撮合
+"""
+import unittest
+
+import futu as ft
+
+from ..api.futu_paper import PaperClient
+from ..api.futu_sim_quote import SimQuoteClient
+from ..base.futu_class import FutuQuoteException
+from ..modules.futu_market import FutuMarket
+
+
+class _QuoteHandler(ft.StockQuoteHandlerBase):
+    def __init__(self):
+        super().__init__()
+        self.frames = []
+
+    def on_recv_rsp(self, rsp_pb):
+        ret_code, data = super().on_recv_rsp(rsp_pb)
+        if ret_code == ft.RET_OK:
+            self.frames.append(data)
+        return ret_code, data
+
+
+class TestSimQuote(unittest.TestCase):
+    """测试进程内模拟行情"""
+
+    def setUp(self):
+        self.sim = SimQuoteClient(sub_quota=10)
+        self.ticks = [
+            {"price": 300.0, "volume": 100, "time": "2026-01-09 10:00:00"},
+            {"price": 299.0, "volume": 200, "time": "2026-01-09 10:00:03"},
+            {"price": 301.5, "volume": 300, "time": "2026-01-09 10:00:06"},
+        ]
+        self.sim.context.load_ticks("HK.00700", self.ticks)
+
+    def test_quote_requires_subscription(self):
+        """测试报价查询需先订阅，快照不需要"""
+        with self.assertRaises(FutuQuoteException):
+            self.sim.quote.get_stock_quote(["HK.00700"])
+        self.assertEqual(len(self.sim.quote.get_market_snapshot(["HK.00700", "HK.00005"])), 2)
+
+        market = FutuMarket(client=self.sim)
+        quotes = market.get_stock_quote(["HK.00700"])
+        self.assertEqual(quotes[0].code, "HK.00700")
+        self.assertTrue(market.is_subscribed("HK.00700", "quote"))
+
+        # 超出订阅额度
+        codes = [f"HK.{i:05d}" for i in range(1, 20)]
+        with self.assertRaises(FutuQuoteException):
+            self.sim.quote.subscribe(codes, ["quote"])
+
+    def test_replay_pushes_to_handler(self):
+        """测试录制逐笔回放并推送给 Handler"""
+        handler = _QuoteHandler()
+        self.assertTrue(self.sim.quote.register_stock_quote_handler(handler))
+        self.sim.quote.subscribe(["HK.00700"], ["quote", "ticker"], is_first_push=False)
+
+        for _ in self.ticks:
+            self.sim.context.step()
+
+        self.assertEqual(len(handler.frames), 3)
+        last = handler.frames[-1].iloc[0]
+        self.assertEqual(last["last_price"], 301.5)
+        self.assertEqual(last["high_price"], 301.5)
+        self.assertEqual(last["low_price"], 299.0)
+        self.assertEqual(last["volume"], 600)
+        self.assertEqual(last["data_time"], "10:00:06")
+
+        tickers = self.sim.quote.get_rt_ticker("HK.00700")
+        self.assertEqual(list(tickers["price"]), [300.0, 299.0, 301.5])
+        self.assertEqual(self.sim.context.stats()["pushes"], 3)
+
+    def test_tick_listener_drives_paper_trade(self):
+        """测试逐笔监听驱动模拟撮合"""
+        paper = PaperClient(quote=self.sim.quote)
+        self.sim.context.add_tick_listener(paper.trade.feed_tick)
+        paper.trade.place_order("HK.00700", 299.5, 100)
+
+        self.sim.context.step(["HK.00700"])
+        self.assertTrue(paper.trade.get_deal_list().empty)
+        self.sim.context.step(["HK.00700"])
+
+        deals = paper.trade.get_deal_list()
+        self.assertEqual(deals["price"], 299.5)
+        self.assertEqual(deals["qty"], 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+订阅额度管理测试
+
+测试内容：
+1. 从 FutuOpenD 查询账户额度
+2. 额度不足时按 LRU 淘汰，跳过固定股票与未满最短持有时间的订阅
+3. 订阅/反订阅按订阅类型合并为批量调用
+"""
+import unittest
+
+from ..api.futu_sim_quote import SimQuoteClient
+from ..modules.futu_market import FutuMarket
+from ..modules.subscription_manager import SubscriptionManager
+
+
+class TestSubscriptionManager(unittest.TestCase):
+    """测试订阅额度管理"""
+
+    def setUp(self):
+        self.sim = SimQuoteClient(sub_quota=4)
+        self.market = FutuMarket(client=self.sim)
+        self.manager = self.market.subscription_manager
+
+    def _age_all(self, seconds=120):
+        """模拟订阅已持有一段时间"""
+        for key in self.manager._entries:
+            self.manager._entries[key] -= seconds
+
+    def test_quota_from_account(self):
+        """测试额度来自 query_subscription"""
+        self.assertTrue(self.market.ensure_subscription(["HK.00001"], ["quote"]))
+        self.assertEqual(self.manager.quota, 4)
+        self.assertEqual(self.market.get_subscription_summary()['quota']['used'], 1)
+
+    def test_lru_eviction_skips_pinned_and_recent(self):
+        """测试 LRU 淘汰"""
+        codes = ["HK.00001", "HK.00002", "HK.00003", "HK.00004"]
+        self.assertTrue(self.market.ensure_subscription(codes, ["quote"]))
+
+        # 未满最短持有时间，不能淘汰
+        self.assertFalse(self.market.ensure_subscription(["HK.00005"], ["quote"]))
+
+        self._age_all()
+        self.market.pin_subscription(["HK.00001"], "position")
+        self.market.get_stock_quote(["HK.00002"])   # 最近使用
+
+        self.assertTrue(self.market.ensure_subscription(["HK.00005", "HK.00006"], ["quote"]))
+        subscribed = set(self.market.get_all_subscribed_stocks())
+        self.assertEqual(subscribed, {"HK.00001", "HK.00002", "HK.00005", "HK.00006"})
+        self.assertEqual(self.sim.context.query_subscription()[1]['total_used'], 4)
+        self.assertEqual(self.manager.evicted_count, 2)
+
+        # 取消固定后可被淘汰
+        self._age_all()
+        self.market.unpin_subscription(["HK.00001"], "position")
+        self.assertTrue(self.market.ensure_subscription(["HK.00007"], ["quote"]))
+        self.assertNotIn("HK.00001", self.market.get_all_subscribed_stocks())
+
+    def test_batched_calls(self):
+        """测试按订阅类型合并调用"""
+        calls = []
+        manager = SubscriptionManager(
+            lambda codes, types: calls.append(('sub', sorted(codes), sorted(types))) or True,
+            lambda codes, types: calls.append(('unsub', sorted(codes), sorted(types))) or True,
+            config={'default_quota': 6},
+        )
+        manager.on_subscribed(["A", "B", "C"], ["quote", "ticker"], subscribed_at=0)
+        self.assertTrue(manager.ensure(["D", "E"], ["quote", "ticker"]))
+        self.assertEqual(calls, [
+            ('unsub', ["A", "B"], ["quote", "ticker"]),
+            ('sub', ["D", "E"], ["quote", "ticker"]),
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+趋势分析面板模式测试
+
+测试内容：
+1. 批量分析结果与逐只调用 analyze 一致（含停牌缺失日期、数据不足 60 根和不足 20 根的股票）
+2. 长表和 {股票代码: DataFrame} 两种输入结果相同
+"""
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ..modules.analyzer.analyzer_stock import StockTrendAnalyzer
+
+
+def _frames(count=40, seed=11):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2025-01-01', periods=90, freq='D')
+    frames = {}
+    for i in range(count):
+        size = int(rng.integers(12, 90))
+        stock_dates = dates[-size:]
+        if i % 5 == 0:
+            stock_dates = stock_dates.delete([3, 7])  # 停牌缺失的日期
+        close = 10 * np.exp(np.cumsum(rng.normal(0.002, 0.02, len(stock_dates))))
+        frames[f'HK.{i:05d}'] = pd.DataFrame({
+            'date': stock_dates,
+            'open': close,
+            'high': close * (1 + rng.uniform(0, 0.03, len(close))),
+            'low': close * 0.98,
+            'close': close,
+            'volume': rng.integers(100000, 500000, len(close)).astype(float),
+        })
+    return frames
+
+
+class TestTrendPanel(unittest.TestCase):
+
+    def setUp(self):
+        self.analyzer = StockTrendAnalyzer()
+        self.frames = _frames()
+
+    def test_matches_single_analysis(self):
+        table = self.analyzer.analyze_panel(self.frames)
+        self.assertEqual(list(table.index), list(self.frames))
+
+        for code, df in self.frames.items():
+            expected = self.analyzer.analyze(df, code)
+            row = table.loc[code]
+            for key, value in expected.to_dict().items():
+                if key == 'code':
+                    continue
+                if isinstance(value, float):
+                    self.assertAlmostEqual(row[key], value, places=9, msg=f"{code} {key}")
+                else:
+                    self.assertEqual(row[key], value, msg=f"{code} {key}")
+            self.assertEqual(row['support_levels'], expected.support_levels)
+            self.assertEqual(row['resistance_levels'], expected.resistance_levels)
+
+    def test_long_table_input(self):
+        long = pd.concat([df.assign(code=code) for code, df in self.frames.items()], ignore_index=True)
+        pd.testing.assert_frame_equal(self.analyzer.analyze_panel(long), self.analyzer.analyze_panel(self.frames))
+
+        subset = list(self.frames)[:3]
+        self.assertEqual(list(self.analyzer.analyze_panel(long, codes=subset).index), subset)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+分阶段启动测试
+
+测试内容：
+1. 启动快照保存后读取，行情恢复为 StockData，无效行情被跳过，过期快照不再使用
+2. 并行阶段同时执行，单个阶段失败不影响其他阶段并记录在耗时摘要中
+3. 基本信息缓存为空或不完整时，与之并行的快照行情仍然显示（名称暂用股票代码）
+"""
+import asyncio
+import json
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+from ..base.futu_class import MarketSnapshot
+from ..base.monitor import ConnectionStatus, MarketStatus, StockData
+from ..monitor.main.basicinfo_cache import BasicinfoCache
+from ..monitor.main.data import DataManager
+from ..monitor.manager.startup import StartupProfiler, WarmSnapshot
+
+
+def _stock(code='HK.00700', price=320.5):
+    return StockData(
+        code=code, name='腾讯控股', current_price=price, open_price=318.0, prev_close=317.2,
+        change_rate=1.04, change_amount=3.3, volume=12345678, turnover=3.9e9,
+        high_price=322.0, low_price=316.8, update_time=datetime(2025, 3, 7, 15, 59, 58),
+        market_status=MarketStatus.CLOSE,
+    )
+
+
+class TestWarmSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / 'snapshot.json'
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_roundtrip(self):
+        groups = [{'name': '港股', 'stock_list': [{'code': 'HK.00700'}], 'stock_count': 1, 'type': 'CUSTOM'}]
+        snapshot = WarmSnapshot(self.path)
+        self.assertTrue(snapshot.save({'HK.00700': _stock(), 'US.AAPL': _stock('US.AAPL', 180.0)}, groups))
+
+        # 手工写入一条无效行情
+        content = json.loads(self.path.read_text(encoding='utf-8'))
+        content['stocks']['HK.09988'] = dict(content['stocks']['HK.00700'], code='HK.09988', current_price=0)
+        self.path.write_text(json.dumps(content), encoding='utf-8')
+
+        loaded = snapshot.load()
+        self.assertEqual(set(loaded['stocks']), {'HK.00700', 'US.AAPL'})
+        self.assertEqual(loaded['stocks']['HK.00700'], _stock())
+        self.assertEqual(loaded['groups'], groups)
+
+    def test_expired_or_missing(self):
+        self.assertIsNone(WarmSnapshot(self.path).load())
+
+        WarmSnapshot(self.path).save({'HK.00700': _stock()}, [])
+        content = json.loads(self.path.read_text(encoding='utf-8'))
+        content['saved_at'] = (datetime.now() - timedelta(hours=3)).isoformat()
+        self.path.write_text(json.dumps(content), encoding='utf-8')
+
+        self.assertIsNone(WarmSnapshot(self.path, max_age_hours=2).load())
+        self.assertIsNotNone(WarmSnapshot(self.path, max_age_hours=4).load())
+
+
+class TestStartupProfiler(unittest.TestCase):
+
+    def test_parallel_stages(self):
+        async def stage(value, delay=0.2):
+            await asyncio.sleep(delay)
+            return value
+
+        async def failing():
+            await asyncio.sleep(0.05)
+            raise ConnectionError("连接超时")
+
+        async def main():
+            profiler = StartupProfiler()
+            start = time.perf_counter()
+            results = await profiler.run_parallel(("行情", stage(1)), ("分组", stage(2)), ("连接", failing()))
+            return profiler, results, time.perf_counter() - start
+
+        profiler, results, elapsed = asyncio.run(main())
+        self.assertEqual(results, [1, 2, None])
+        self.assertLess(elapsed, 0.35)
+
+        stages = {stage['name']: stage for stage in profiler.stages}
+        self.assertFalse(stages['连接']['ok'])
+        self.assertTrue(stages['行情']['ok'])
+        self.assertIn('连接', profiler.summary())
+        self.assertIn('(失败)', profiler.summary())
+
+
+class TestColdStartQuotes(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = BasicinfoCache(Path(self.tmpdir.name) / 'basicinfo.db')
+        self.app_core = SimpleNamespace(
+            monitored_stocks=['HK.00700', 'HK.09988'], stock_data={},
+            stock_basicinfo_cache=self.cache, connection_status=ConnectionStatus.DISCONNECTED,
+            app=SimpleNamespace(ui_manager=SimpleNamespace(update_stock_table=AsyncMock(), info_panel=None)),
+        )
+        snapshots = [
+            MarketSnapshot(code=code, update_time='2025-03-07 15:59:58', last_price=price, open_price=price,
+                           high_price=price, low_price=price, prev_close_price=price, volume=100, turnover=1.0)
+            for code, price in (('HK.00700', 320.5), ('HK.09988', 88.0))
+        ]
+        self.manager = DataManager(self.app_core, Mock(get_market_snapshot=Mock(return_value=snapshots)))
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def test_empty_basicinfo_cache(self):
+        # 行情阶段先于基本信息阶段完成
+        asyncio.run(self.manager.refresh_stock_data())
+        self.assertEqual(set(self.app_core.stock_data), {'HK.00700', 'HK.09988'})
+        self.assertEqual(self.app_core.stock_data['HK.00700'].name, 'HK.00700')
+        self.assertEqual(self.app_core.connection_status, ConnectionStatus.CONNECTED)
+
+        # 基本信息只加载了一部分（如新加入自选的股票）
+        self.cache.update_entries({'HK.00700': {'code': 'HK.00700', 'name': '腾讯控股'}})
+        asyncio.run(self.manager.refresh_stock_data())
+        self.assertEqual(self.app_core.stock_data['HK.00700'].name, '腾讯控股')
+        self.assertEqual(self.app_core.stock_data['HK.09988'].name, 'HK.09988')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,8 +8,6 @@ import inspect
 import datetime
 import functools
 
-import numpy as np
-
 from functools import lru_cache
 
 
@@ -19,8 +17,11 @@ class FormulaException(Exception):
 
 
 
+# numpy 在使用时才导入，避免 decidra.utils（配置、日志）的导入开销
+
 def suppress_numpy_warn(func):
     def wrapper(*args, **kwargs):
+        import numpy as np
         try:
             old_settings = np.seterr(all='ignore')
             return func(*args, **kwargs)
@@ -97,6 +98,7 @@ def rolling_window(a, window):
     '''
     copy from http://stackoverflow.com/questions/6811183/rolling-window-for-1d-arrays-in-numpy
     '''
+    import numpy as np
     shape = a.shape[:-1] + (a.shape[-1] - window + 1, window)
     strides = a.strides + (a.strides[-1], )
     return np.lib.stride_tricks.as_strided(a, shape=shape, strides=strides)
@@ -105,6 +107,7 @@ def rolling_window(a, window):
 def handle_numpy_warning(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
+        import numpy as np
         with np.errstate(invalid='ignore'):
             return func(*args, **kwargs)
     return wrapper
@@ -70,6 +70,8 @@ class ConfigManager:
                 'logtoconsole': 'false',
                 'logfilemaxsize': '10',
                 'logfilebackupcount': '5',
+                'logratelimitburst': '20',
+                'logratelimitinterval': '1',
                 'debugmode': 'false',
                 'performancemonitoring': 'false',
                 'datacachettl': '300',
@@ -411,6 +413,8 @@ class ConfigManager:
             'log_to_console': config.get('logtoconsole', 'false').lower() == 'true',
             'log_file_max_size': int(config.get('logfilemaxsize', '10')),
             'log_file_backup_count': int(config.get('logfilebackupcount', '5')),
+            'log_rate_limit_burst': int(config.get('logratelimitburst', '20')),
+            'log_rate_limit_interval': float(config.get('logratelimitinterval', '1')),
             'debug_mode': config.get('debugmode', 'false').lower() == 'true',
             'performance_monitoring': config.get('performancemonitoring', 'false').lower() == 'true',
             'data_cache_ttl': int(config.get('datacachettl', '300')),
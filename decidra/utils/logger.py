@@ -1,14 +1,25 @@
+import atexit
+import copy
 import datetime
 import logging
+import queue
 import sys
 import os
-from logging.handlers import RotatingFileHandler
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from colorama import init, Fore, Style, Back
 init(autoreset=True)
 
 FORMATTER = logging.Formatter("%(asctime)s — %(name)s — %(levelname)s — %(message)s")
 
+# 同一调用位置的重复日志限流：每个 interval 秒内最多输出 burst 条，ERROR 及以上不限流
+LOG_RATE_LIMIT_CONFIG = {
+    'burst': 20,
+    'interval': 1.0,
+    'max_level': logging.WARNING,
+}
+
 class ColorFormatter(logging.Formatter):
     # Change this dictionary to suit your coloring needs!
     COLORS = {
@@ -22,12 +33,127 @@ class ColorFormatter(logging.Formatter):
     def format(self, record):
         color = self.COLORS.get(record.levelname, "")
         if color:
+            # 同一条记录还会交给文件处理器，着色只作用于副本
+            record = logging.makeLogRecord(record.__dict__)
+            record.msg = record.getMessage()
+            record.args = None
             record.name = color + record.name
             record.levelname = color + record.levelname
             record.msg = color + record.msg
         return logging.Formatter.format(self, record)
 
 
+class RateLimitFilter(logging.Filter):
+    """按调用位置限流，被丢弃的条数在下一条输出的日志中注明"""
+
+    def __init__(self, burst=None, interval=None, max_level=None):
+        super().__init__()
+        self.burst = LOG_RATE_LIMIT_CONFIG['burst'] if burst is None else burst
+        self.interval = LOG_RATE_LIMIT_CONFIG['interval'] if interval is None else interval
+        self.max_level = LOG_RATE_LIMIT_CONFIG['max_level'] if max_level is None else max_level
+        # (文件, 行号) -> [窗口开始时间, 窗口内已输出条数, 已丢弃条数]
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if self.burst <= 0 or record.levelno > self.max_level:
+            return True
+
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or record.created - window[0] >= self.interval:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [record.created, 1, 0]
+            elif window[1] < self.burst:
+                window[1] += 1
+                return True
+            else:
+                window[2] += 1
+                return False
+
+        if suppressed:
+            record.msg = f"{record.msg} (已省略 {suppressed} 条同位置日志)"
+        return True
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """放入进程内队列，日志行格式化和写入由后台监听线程完成"""
+
+    def prepare(self, record):
+        """
+        入队前在调用线程中渲染消息和异常堆栈
+
+        参数可能是调用方随后会修改的可变对象，异常回溯会让栈帧一直存活到后台线程处理，
+        因此只把渲染好的文本放入队列。未启用的等级在 Logger.isEnabledFor 处已被过滤，不会渲染参数
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+# 日志后端：(文件, 是否写文件, 文件大小, 备份数, 是否输出控制台) -> 共享的 QueueHandler
+_BACKENDS = {}
+_BACKENDS_LOCK = threading.Lock()
+
+
+def _get_queue_handler(log_file, app_config):
+    """获取共享的队列处理器，首次使用时创建文件/控制台处理器并启动后台监听线程"""
+    to_file = app_config is None or app_config.get('log_to_file', True)
+    to_console = bool(app_config and app_config.get('log_to_console', False))
+    # 使用配置的文件大小和备份数量
+    max_bytes = (app_config.get('log_file_max_size', 10) * 1024 * 1024) if app_config else (10 * 1024 * 1024)
+    backup_count = app_config.get('log_file_backup_count', 5) if app_config else 5
+    key = (log_file, to_file, max_bytes, backup_count, to_console)
+
+    with _BACKENDS_LOCK:
+        handler = _BACKENDS.get(key)
+        if handler is None:
+            handlers = []
+            if to_file:
+                file_handler = RotatingFileHandler(
+                    log_file,
+                    maxBytes=max_bytes,
+                    backupCount=backup_count,
+                    encoding='utf-8'
+                )
+                file_handler.setFormatter(FORMATTER)
+                handlers.append(file_handler)
+            if to_console:
+                console_handler = logging.StreamHandler(sys.stdout)
+                console_handler.setFormatter(ColorFormatter("%(asctime)s — %(name)s — %(levelname)s — %(message)s"))
+                handlers.append(console_handler)
+            if not handlers:
+                return None
+
+            handler = _DeferredQueueHandler(queue.SimpleQueue())
+            handler.listener = QueueListener(handler.queue, *handlers)
+            handler.listener.start()
+            _BACKENDS[key] = handler
+    return handler
+
+
+def shutdown_logging():
+    """停止后台日志线程，写完队列中剩余的日志并关闭文件"""
+    with _BACKENDS_LOCK:
+        for handler in _BACKENDS.values():
+            try:
+                handler.listener.stop()
+            except AttributeError:
+                pass    # 监听线程已停止
+            for target in handler.listener.handlers:
+                target.close()
+        _BACKENDS.clear()
+
+
+atexit.register(shutdown_logging)
+
+
 class ColorLogger(logging.Logger):
 
     log_file_name   = "decidra_monitor.log"
@@ -36,6 +162,9 @@ class ColorLogger(logging.Logger):
     def __init__(self, name, app_config=None, path=None):
         """初始化ColorLogger
 
+        日志经队列交给后台线程写入文件和控制台，调用方不等待磁盘 I/O；
+        所有 logger 共用同一组处理器
+
         Args:
             name: logger名称
             app_config: 应用配置字典，如果为None则使用默认配置
@@ -53,26 +182,15 @@ class ColorLogger(logging.Logger):
 
         logging.Logger.__init__(self, name, default_level)
 
-        # 根据配置决定是否添加文件处理器
-        if app_config is None or app_config.get('log_to_file', True):
-            # 使用配置的文件大小和备份数量
-            max_bytes = (app_config.get('log_file_max_size', 10) * 1024 * 1024) if app_config else (10 * 1024 * 1024)
-            backup_count = app_config.get('log_file_backup_count', 5) if app_config else 5
-
-            file_handler = RotatingFileHandler(
-                log_file,
-                maxBytes=max_bytes,
-                backupCount=backup_count,
-                encoding='utf-8'
-            )
-            file_handler.setFormatter(FORMATTER)
-            self.addHandler(file_handler)
-
-        # 根据配置决定是否添加控制台处理器
-        if app_config and app_config.get('log_to_console', False):
-            console_handler = logging.StreamHandler(sys.stdout)
-            console_handler.setFormatter(ColorFormatter("%(asctime)s — %(name)s — %(levelname)s — %(message)s"))
-            self.addHandler(console_handler)
+        # 根据配置添加文件和控制台输出
+        queue_handler = _get_queue_handler(log_file, app_config)
+        if queue_handler is not None:
+            self.addHandler(queue_handler)
+
+        # 重复日志限流
+        rate_config = app_config or {}
+        self.addFilter(RateLimitFilter(rate_config.get('log_rate_limit_burst'),
+                                       rate_config.get('log_rate_limit_interval')))
 
         self.propagate = False
 